@@ -2,15 +2,18 @@
 Demographics extraction agent for patient demographic information.
 """
 
-import json
-import re
 from typing import Dict, Any, Optional
 from core.base import BaseAgent, ProcessingResult
 from core.logging_config import get_logger
+from core.llm_client.structured_output import generate_json, object_schema
+from processors.annotated_document import AnnotatedDocument, annotate
 from processors.patient_segmenter import PatientSegment
+from agents.extraction_agents.patient_record_agent import FIELD_GROUPS, FIELD_SPECS
 
 log = get_logger(__name__)
 
+RESPONSE_SCHEMA = object_schema({name: FIELD_SPECS[name] for name in FIELD_GROUPS["demographics"]})
+
 class DemographicsAgent(BaseAgent):
     """Agent specialized in extracting demographic information from patient text."""
     
@@ -79,11 +82,14 @@ Example output format:
             prompt = self._create_extraction_prompt(patient_segment)
             
             # Generate extraction using LLM
-            result = await self.llm_client.generate(
-                prompt=prompt,
+            result = await generate_json(
+                self.llm_client,
+                prompt,
                 system_prompt=self.system_prompt,
+                schema=RESPONSE_SCHEMA,
                 temperature=0.0,
-                max_tokens=1000
+                max_tokens=1000,
+                schema_name="demographics"
             )
             
             if not result.success:
@@ -92,10 +98,9 @@ Example output format:
                     error=f"LLM generation failed: {result.error}"
                 )
             
-            # Parse the JSON response
-            extracted_data = self._parse_extraction_result(result.data)
+            extracted_data = result.data
             
-            if not extracted_data:
+            if not isinstance(extracted_data, dict) or not extracted_data:
                 return ProcessingResult(
                     success=False,
                     error="Failed to parse extraction result"
@@ -136,26 +141,6 @@ Extract the demographic information and return it as valid JSON following the sp
         
         return prompt
     
-    def _parse_extraction_result(self, llm_output: str) -> Optional[Dict[str, Any]]:
-        """Parse the LLM output to extract JSON data."""
-        try:
-            # Try to find JSON in the output
-            json_match = re.search(r'\{.*\}', llm_output, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                return json.loads(json_str)
-            
-            # If no JSON found, try to parse the entire output
-            return json.loads(llm_output.strip())
-            
-        except json.JSONDecodeError as e:
-            log.error(f"Failed to parse JSON from LLM output: {str(e)}")
-            log.debug(f"LLM output was: {llm_output}")
-            return None
-        except Exception as e:
-            log.error(f"Error parsing extraction result: {str(e)}")
-            return None
-    
     def _validate_and_clean_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean the extracted demographic data."""
         cleaned = {}
@@ -245,25 +230,9 @@ Extract the demographic information and return it as valid JSON following the sp
             log.info("Patient marked as dead, using last_seen as age_of_death")
             data["age_of_death"] = last_seen
     
-    def extract_age_from_text(self, text: str) -> Optional[float]:
-        """Extract age from text using regex patterns."""
-        age_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)\s*old',
-            r'(\d+(?:\.\d+)?)\s*(?:months?|mos?)\s*old',
-            r'age\s*(?:of\s*)?(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*(?:year|yr)[-\s]old',
-        ]
-        
-        for pattern in age_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                age_value = float(match.group(1))
-                
-                # Convert months to years if needed
-                if 'month' in match.group(0).lower():
-                    age_value = age_value / 12
-                
-                return age_value
-        
-        return None
+    def extract_age_from_text(self, text: str,
+                              annotations: Optional[AnnotatedDocument] = None) -> Optional[float]:
+        """Extract the first age mentioned in the text, in years."""
+        ages = (annotations or annotate(text)).ages()
+        return ages[0] if ages else None
 
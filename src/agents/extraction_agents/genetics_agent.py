@@ -2,47 +2,25 @@
 Genetics extraction agent for genetic information from patient cases.
 """
 
-import json
 import re
 from typing import Dict, Any, Optional, List
 from core.base import BaseAgent, ProcessingResult
 from core.logging_config import get_logger
+from core.llm_client.structured_output import generate_json, object_schema
+from processors.annotated_document import AnnotatedDocument, annotate
 from processors.patient_segmenter import PatientSegment
+from agents.extraction_agents.patient_record_agent import FIELD_GROUPS, FIELD_SPECS
 
 log = get_logger(__name__)
 
+RESPONSE_SCHEMA = object_schema({name: FIELD_SPECS[name] for name in FIELD_GROUPS["genetics"]})
+
 class GeneticsAgent(BaseAgent):
     """Agent specialized in extracting genetic information from patient text."""
     
     def __init__(self, llm_client, **kwargs):
         super().__init__(name="genetics_agent", llm_client=llm_client, **kwargs)
         self.system_prompt = self._create_system_prompt()
-        self._compile_genetic_patterns()
-    
-    def _compile_genetic_patterns(self):
-        """Compile regex patterns for genetic information."""
-        # Gene name patterns
-        self.gene_patterns = [
-            re.compile(r'\b([A-Z]{2,}[0-9]*[A-Z]*)\s+gene\b', re.IGNORECASE),
-            re.compile(r'\bgene\s+([A-Z]{2,}[0-9]*[A-Z]*)\b', re.IGNORECASE),
-            re.compile(r'\b([A-Z]{2,}[0-9]*[A-Z]*)\s+mutation', re.IGNORECASE),
-        ]
-        
-        # Mutation patterns
-        self.mutation_patterns = [
-            re.compile(r'\bc\.([0-9]+[A-Z]>[A-Z])\b'),  # c.123A>G
-            re.compile(r'\bp\.([A-Z][a-z]{2}[0-9]+[A-Z][a-z]{2})\b'),  # p.Arg123Gln
-            re.compile(r'\b([A-Z][0-9]+[A-Z])\b'),  # R123Q
-            re.compile(r'\b([0-9]+[A-Z]>[A-Z])\b'),  # 123A>G
-        ]
-        
-        # Inheritance patterns
-        self.inheritance_patterns = [
-            re.compile(r'autosomal\s+recessive', re.IGNORECASE),
-            re.compile(r'autosomal\s+dominant', re.IGNORECASE),
-            re.compile(r'X-linked', re.IGNORECASE),
-            re.compile(r'mitochondrial', re.IGNORECASE),
-        ]
     
     def _create_system_prompt(self) -> str:
         """Create the system prompt for genetics extraction."""
@@ -96,18 +74,22 @@ Example output format:
             
             log.info(f"Extracting genetics for {patient_segment.patient_id}")
             
-            # Pre-process text to identify genetic elements
-            genetic_hints = self._extract_genetic_hints(patient_segment.content)
+            # Pre-process text to identify genetic elements (annotated once per segment)
+            annotations = patient_segment.metadata.get("annotations") or annotate(patient_segment.content)
+            genetic_hints = self._extract_genetic_hints(patient_segment.content, annotations)
             
             # Create extraction prompt
             prompt = self._create_extraction_prompt(patient_segment, genetic_hints)
             
             # Generate extraction using LLM
-            result = await self.llm_client.generate(
-                prompt=prompt,
+            result = await generate_json(
+                self.llm_client,
+                prompt,
                 system_prompt=self.system_prompt,
+                schema=RESPONSE_SCHEMA,
                 temperature=0.0,
-                max_tokens=1000
+                max_tokens=1000,
+                schema_name="genetics"
             )
             
             if not result.success:
@@ -116,10 +98,9 @@ Example output format:
                     error=f"LLM generation failed: {result.error}"
                 )
             
-            # Parse the JSON response
-            extracted_data = self._parse_extraction_result(result.data)
+            extracted_data = result.data
             
-            if not extracted_data:
+            if not isinstance(extracted_data, dict) or not extracted_data:
                 return ProcessingResult(
                     success=False,
                     error="Failed to parse extraction result"
@@ -129,7 +110,7 @@ Example output format:
             cleaned_data = self._validate_and_clean_data(extracted_data)
             
             # Enhance with regex-based extraction
-            enhanced_data = self._enhance_with_regex(cleaned_data, patient_segment.content)
+            enhanced_data = self._enhance_with_regex(cleaned_data, patient_segment.content, annotations)
             
             log.info(f"Successfully extracted genetics for {patient_segment.patient_id}")
             
@@ -152,34 +133,15 @@ Example output format:
                 error=f"Genetics extraction failed: {str(e)}"
             )
     
-    def _extract_genetic_hints(self, text: str) -> Dict[str, List[str]]:
-        """Extract genetic hints using regex patterns."""
-        hints = {
-            "genes": [],
-            "mutations": [],
-            "inheritance": []
+    def _extract_genetic_hints(self, text: str,
+                               annotations: Optional[AnnotatedDocument] = None) -> Dict[str, List[str]]:
+        """Extract genetic hints from the pre-annotated text."""
+        doc = annotations or annotate(text)
+        return {
+            "genes": doc.gene_mentions(),
+            "mutations": doc.texts("variant"),
+            "inheritance": doc.texts("inheritance")
         }
-        
-        # Extract gene names
-        for pattern in self.gene_patterns:
-            matches = pattern.findall(text)
-            hints["genes"].extend(matches)
-        
-        # Extract mutations
-        for pattern in self.mutation_patterns:
-            matches = pattern.findall(text)
-            hints["mutations"].extend(matches)
-        
-        # Extract inheritance patterns
-        for pattern in self.inheritance_patterns:
-            matches = pattern.findall(text)
-            hints["inheritance"].extend(matches)
-        
-        # Remove duplicates and clean
-        for key in hints:
-            hints[key] = list(set(hints[key]))
-        
-        return hints
     
     def _create_extraction_prompt(self, patient_segment: PatientSegment, genetic_hints: Dict[str, List[str]]) -> str:
         """Create the extraction prompt for the patient segment."""
@@ -205,26 +167,6 @@ PATIENT TEXT:
         
         return prompt
     
-    def _parse_extraction_result(self, llm_output: str) -> Optional[Dict[str, Any]]:
-        """Parse the LLM output to extract JSON data."""
-        try:
-            # Try to find JSON in the output
-            json_match = re.search(r'\{.*\}', llm_output, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                return json.loads(json_str)
-            
-            # If no JSON found, try to parse the entire output
-            return json.loads(llm_output.strip())
-            
-        except json.JSONDecodeError as e:
-            log.error(f"Failed to parse JSON from LLM output: {str(e)}")
-            log.debug(f"LLM output was: {llm_output}")
-            return None
-        except Exception as e:
-            log.error(f"Error parsing extraction result: {str(e)}")
-            return None
-    
     def _validate_and_clean_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean the extracted genetic data."""
         cleaned = {}
@@ -301,47 +243,34 @@ PATIENT TEXT:
         if origin and origin.lower() not in [v.lower() for v in valid_origins]:
             log.warning(f"Non-standard parental origin: {origin}")
     
-    def _enhance_with_regex(self, data: Dict[str, Any], text: str) -> Dict[str, Any]:
+    def _enhance_with_regex(self, data: Dict[str, Any], text: str,
+                            annotations: Optional[AnnotatedDocument] = None) -> Dict[str, Any]:
         """Enhance extracted data with regex-based findings."""
         enhanced = data.copy()
+        doc = annotations or annotate(text)
         
         # If no gene found by LLM, try regex
         if not enhanced.get("gene"):
-            genes = []
-            for pattern in self.gene_patterns:
-                matches = pattern.findall(text)
-                genes.extend(matches)
-            
+            genes = [span.text.upper() for span in doc.get("gene")]
             if genes:
                 # Take the most frequently mentioned gene
-                gene_counts = {}
-                for gene in genes:
-                    gene_upper = gene.upper()
-                    gene_counts[gene_upper] = gene_counts.get(gene_upper, 0) + 1
-                
-                most_common_gene = max(gene_counts, key=gene_counts.get)
+                most_common_gene = max(dict.fromkeys(genes), key=genes.count)
                 enhanced["gene"] = most_common_gene
                 log.info(f"Enhanced gene extraction with regex: {most_common_gene}")
         
         # If no mutations found by LLM, try regex
         if not enhanced.get("mutations"):
-            mutations = []
-            for pattern in self.mutation_patterns:
-                matches = pattern.findall(text)
-                mutations.extend(matches)
-            
+            mutations = doc.texts("variant")
             if mutations:
-                enhanced["mutations"] = ", ".join(set(mutations))
+                enhanced["mutations"] = ", ".join(mutations)
                 log.info(f"Enhanced mutation extraction with regex: {enhanced['mutations']}")
         
         # If no inheritance found by LLM, try regex
         if not enhanced.get("inheritance"):
-            for pattern in self.inheritance_patterns:
-                match = pattern.search(text)
-                if match:
-                    enhanced["inheritance"] = match.group(0).lower()
-                    log.info(f"Enhanced inheritance extraction with regex: {enhanced['inheritance']}")
-                    break
+            inheritance = doc.get("inheritance")
+            if inheritance:
+                enhanced["inheritance"] = inheritance[0].text.lower()
+                log.info(f"Enhanced inheritance extraction with regex: {enhanced['inheritance']}")
         
         return enhanced
     
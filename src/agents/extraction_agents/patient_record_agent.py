@@ -0,0 +1,258 @@
+"""
+Combined patient record extraction agent.
+
+Extracts the demographics, genetics, phenotype and treatment fields of a
+patient segment in one structured LLM call, instead of one call per
+specialised agent. The model also reports a confidence per field, so callers
+can re-run only the specialised agents whose fields came back missing or
+uncertain.
+"""
+
+from typing import Dict, Any
+from core.base import BaseAgent, ProcessingResult
+from core.logging_config import get_logger
+from core.llm_client.structured_output import generate_json, object_schema
+from processors.patient_segmenter import PatientSegment
+
+log = get_logger(__name__)
+
+# Fields extracted by each specialised agent (and by the combined call)
+FIELD_GROUPS = {
+    "demographics": (
+        "patient_id", "sex", "age_of_onset", "last_seen", "_0_alive_1_dead",
+        "age_of_death", "ethnicity", "consanguinity", "family_history"
+    ),
+    "genetics": (
+        "gene", "mutations", "inheritance", "zygosity", "parental_origin",
+        "genetic_testing", "additional_genes"
+    ),
+    "phenotypes": (
+        "phenotypes", "symptoms", "diagnostic_findings", "lab_values", "imaging_findings"
+    ),
+    "treatments": (
+        "treatment_description", "outcome"
+    )
+}
+
+# Fields a case report almost always states; a follow-up runs when the
+# combined answer omits one (an explicit null is an answer)
+KEY_FIELDS = {
+    "demographics": ("sex", "age_of_onset"),
+    "genetics": ("gene", "mutations"),
+    "phenotypes": ("phenotypes",),
+    "treatments": ()
+}
+
+FIELD_SPECS = {
+    "patient_id": str,
+    "sex": int,
+    "age_of_onset": float,
+    "last_seen": float,
+    "_0_alive_1_dead": int,
+    "age_of_death": float,
+    "ethnicity": str,
+    "consanguinity": int,
+    "family_history": str,
+    "gene": str,
+    "mutations": str,
+    "inheritance": str,
+    "zygosity": str,
+    "parental_origin": str,
+    "genetic_testing": str,
+    "additional_genes": list,
+    "phenotypes": list,
+    "symptoms": list,
+    "diagnostic_findings": list,
+    "lab_values": list,
+    "imaging_findings": list,
+    "treatment_description": str,
+    "outcome": str
+}
+
+DEFAULT_FIELD_CONFIDENCE = 0.85
+
+RESPONSE_SCHEMA = object_schema({**FIELD_SPECS, "confidence": dict})
+
+
+class PatientRecordAgent(BaseAgent):
+    """Agent extracting the whole patient record schema in a single call."""
+
+    def __init__(self, llm_client, **kwargs):
+        super().__init__(name="patient_record_agent", llm_client=llm_client, **kwargs)
+        self.system_prompt = self._create_system_prompt()
+
+    def _create_system_prompt(self) -> str:
+        """Create the system prompt for combined extraction."""
+        return """You are a medical data extraction specialist extracting structured patient records from clinical case reports.
+
+Extract the following fields for the patient described in the text:
+
+Demographics:
+- patient_id: Patient identifier (e.g., "Patient 1", "Case A", etc.)
+- sex: Patient sex (0 for male, 1 for female, null if unknown)
+- age_of_onset: Age when symptoms first appeared (in years, as number)
+- last_seen: Age at last clinical visit or follow-up (in years, as number)
+- _0_alive_1_dead: Patient status (0 for alive, 1 for dead, null if unknown)
+- age_of_death: Age at death (in years, as number, null if alive or unknown)
+- ethnicity: Patient ethnicity/race if mentioned
+- consanguinity: Whether parents are related (0 for no, 1 for yes, null if unknown)
+- family_history: Brief description of relevant family history
+
+Genetics:
+- gene: Primary gene involved (official gene symbol, e.g., "SURF1")
+- mutations: Specific mutations/variants (e.g., "c.845_846delCT", "p.Arg123Gln")
+- inheritance: Inheritance pattern (e.g., "autosomal recessive", "X-linked")
+- zygosity: "homozygous", "heterozygous" or "compound heterozygous"
+- parental_origin: "maternal", "paternal", "de novo" or "unknown"
+- genetic_testing: Type of genetic testing performed
+- additional_genes: Other genes mentioned or tested (list)
+
+Phenotypes (lists of short phrases):
+- phenotypes: Clinical phenotypes/features
+- symptoms: Symptoms reported
+- diagnostic_findings: Diagnostic test results or findings
+- lab_values: Laboratory results
+- imaging_findings: Imaging study results
+
+Treatments:
+- treatment_description: Treatments or interventions administered
+- outcome: Response to treatment or clinical outcome
+
+Also return "confidence": an object mapping each field to your confidence (0 to 1) that the value (or null) is correct.
+
+IMPORTANT RULES:
+1. Extract ONLY information explicitly stated in the text
+2. Use null (or [] for lists) for missing or unclear information
+3. Convert ages to numbers in years (e.g., "18 months" → 1.5)
+4. Use official gene symbols and full mutation nomenclature
+5. Return a single valid JSON object only"""
+
+    async def execute(self, task: Dict[str, Any]) -> ProcessingResult[Dict[str, Any]]:
+        """
+        Execute combined extraction task.
+
+        Args:
+            task: Task containing the patient segment
+
+        Returns:
+            ProcessingResult with the extracted fields; per-field confidences
+            are in ``metadata["field_confidence"]`` and fields the model did not
+            return at all in ``metadata["missing_fields"]``
+        """
+        try:
+            patient_segment = task.get("patient_segment")
+            if not isinstance(patient_segment, PatientSegment):
+                return ProcessingResult(
+                    success=False,
+                    error="Invalid patient segment provided"
+                )
+
+            log.info(f"Extracting patient record for {patient_segment.patient_id}")
+
+            result = await generate_json(
+                self.llm_client,
+                self._create_extraction_prompt(patient_segment),
+                system_prompt=self.system_prompt,
+                schema=RESPONSE_SCHEMA,
+                temperature=0.0,
+                max_tokens=2000,
+                schema_name="patient_record"
+            )
+
+            if not result.success:
+                return ProcessingResult(
+                    success=False,
+                    error=f"LLM generation failed: {result.error}"
+                )
+
+            extracted_data = result.data
+            if not isinstance(extracted_data, dict) or not extracted_data:
+                return ProcessingResult(
+                    success=False,
+                    error="Failed to parse extraction result"
+                )
+
+            missing_fields = [name for name in FIELD_SPECS if name not in extracted_data]
+            cleaned_data = self._validate_and_clean_data(extracted_data)
+            field_confidence = self._field_confidence(extracted_data.get("confidence"), cleaned_data)
+
+            return ProcessingResult(
+                success=True,
+                data=cleaned_data,
+                confidence_score=(
+                    sum(field_confidence.values()) / len(field_confidence)
+                    if field_confidence else None
+                ),
+                metadata={
+                    "agent": self.name,
+                    "patient_id": patient_segment.patient_id,
+                    "extraction_method": "llm_combined",
+                    "field_confidence": field_confidence,
+                    "missing_fields": missing_fields,
+                    "llm_metadata": result.metadata
+                }
+            )
+
+        except Exception as e:
+            log.error(f"Error in combined patient record extraction: {str(e)}")
+            return ProcessingResult(
+                success=False,
+                error=f"Patient record extraction failed: {str(e)}"
+            )
+
+    def _create_extraction_prompt(self, patient_segment: PatientSegment) -> str:
+        """Create the extraction prompt for the patient segment."""
+        return f"""Extract the patient record from the following patient case text:
+
+PATIENT TEXT:
+{patient_segment.content}
+
+Return the record as a single valid JSON object with the fields listed above and "confidence"."""
+
+    def _validate_and_clean_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce extracted values to the field types; unusable values become null."""
+        cleaned = {}
+
+        for field, expected_type in FIELD_SPECS.items():
+            value = data.get(field)
+            if value is None or value == "" or (isinstance(value, str) and value.lower() in ("null", "none")):
+                cleaned[field] = [] if expected_type == list else None
+                continue
+
+            try:
+                if expected_type == list:
+                    if isinstance(value, list):
+                        cleaned[field] = [str(item).strip() for item in value if item]
+                    else:
+                        cleaned[field] = [item.strip() for item in str(value).split(',') if item.strip()]
+                elif expected_type == int:
+                    cleaned[field] = int(float(value))
+                elif expected_type == float:
+                    cleaned[field] = float(value)
+                else:
+                    cleaned[field] = str(value).strip()
+            except (ValueError, TypeError) as e:
+                log.warning(f"Error converting field {field} with value {value}: {str(e)}")
+                cleaned[field] = None
+
+        for field in ("sex", "_0_alive_1_dead", "consanguinity"):
+            if cleaned.get(field) not in (None, 0, 1):
+                log.warning(f"Invalid {field} value: {cleaned[field]}, setting to null")
+                cleaned[field] = None
+        if cleaned.get("gene"):
+            cleaned["gene"] = cleaned["gene"].upper()
+
+        return cleaned
+
+    def _field_confidence(self, reported: Any, data: Dict[str, Any]) -> Dict[str, float]:
+        """Reported confidence per field; non-empty fields without one get a default."""
+        reported = reported if isinstance(reported, dict) else {}
+        confidence = {}
+        for field, value in data.items():
+            if field not in reported and (value is None or value == []):
+                continue
+            try:
+                confidence[field] = min(1.0, max(0.0, float(reported.get(field, DEFAULT_FIELD_CONFIDENCE))))
+            except (TypeError, ValueError):
+                confidence[field] = DEFAULT_FIELD_CONFIDENCE
+        return confidence
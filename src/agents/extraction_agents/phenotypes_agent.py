@@ -11,7 +11,6 @@ Location: src/agents/extraction_agents/phenotypes_agent.py
 
 import json
 import logging
-import re
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -20,8 +19,10 @@ import uuid
 from core.base import ProcessingResult, PatientRecord
 from core.llm_client.openrouter_client import OpenRouterClient
 from core.llm_client.huggingface_client import HuggingFaceClient
+from core.llm_client.structured_output import parse_json_response
 from ontologies.hpo_manager import HPOManager
 from ontologies.hpo_manager_optimized import OptimizedHPOManager
+from processors.annotated_document import AnnotatedDocument, annotate
 
 
 @dataclass
@@ -74,67 +75,11 @@ class PhenotypesAgent:
             else:
                 self.hpo_manager = HPOManager()
         
-        # Pattern-based phenotype recognition
-        self.phenotype_patterns = self._init_phenotype_patterns()
-        
         # Clinical terminology mappings
         self.clinical_terms = self._init_clinical_terms()
         
         logging.info("Phenotypes agent initialized")
     
-    def _init_phenotype_patterns(self) -> Dict[str, List[str]]:
-        """Initialize pattern-based phenotype recognition."""
-        return {
-            'developmental': [
-                r'\b(?:developmental|development)\s+(?:delay|regression|disorder|abnormality)\b',
-                r'\b(?:delayed|delayed)\s+(?:milestone|development|growth)\b',
-                r'\b(?:failure\s+to\s+thrive|FTT)\b',
-                r'\b(?:psychomotor\s+)?retardation\b'
-            ],
-            'neurological': [
-                r'\b(?:seizure|epileptic|convulsion)\b',
-                r'\b(?:muscular\s+)?hypotonia\b',
-                r'\b(?:hypertonia|spasticity|rigidity)\b',
-                r'\b(?:ataxia|dysmetria|dysdiadochokinesia)\b',
-                r'\b(?:tremor|myoclonus|chorea)\b',
-                r'\b(?:dystonia|dyskinesia)\b'
-            ],
-            'cognitive': [
-                r'\b(?:intellectual\s+)?disability\b',
-                r'\b(?:learning\s+)?difficulty\b',
-                r'\b(?:cognitive\s+)?impairment\b',
-                r'\b(?:mental\s+)?retardation\b',
-                r'\b(?:autism|autistic)\b'
-            ],
-            'sensory': [
-                r'\b(?:visual|vision)\s+(?:impairment|loss|defect)\b',
-                r'\b(?:hearing|auditory)\s+(?:loss|impairment|deafness)\b',
-                r'\b(?:blindness|deafness)\b'
-            ],
-            'cardiac': [
-                r'\b(?:cardiac|heart)\s+(?:defect|anomaly|disease)\b',
-                r'\b(?:cardiomyopathy|arrhythmia)\b',
-                r'\b(?:ventricular|atrial)\s+(?:septal\s+)?defect\b'
-            ],
-            'respiratory': [
-                r'\b(?:respiratory|breathing)\s+(?:distress|failure|difficulty)\b',
-                r'\b(?:apnea|apneic)\b',
-                r'\b(?:tachypnea|dyspnea)\b'
-            ],
-            'gastrointestinal': [
-                r'\b(?:feeding|swallowing)\s+(?:difficulty|disorder)\b',
-                r'\b(?:gastroesophageal\s+)?reflux\b',
-                r'\b(?:vomiting|nausea|diarrhea)\b',
-                r'\b(?:constipation|obstruction)\b'
-            ],
-            'musculoskeletal': [
-                r'\b(?:joint\s+)?contracture\b',
-                r'\b(?:scoliosis|kyphosis|lordosis)\b',
-                r'\b(?:clubfoot|talipes)\b',
-                r'\b(?:hip\s+)?dysplasia\b'
-            ]
-        }
-    
     def _init_clinical_terms(self) -> Dict[str, List[str]]:
         """Initialize clinical terminology mappings."""
         return {
@@ -152,20 +97,22 @@ class PhenotypesAgent:
     
     async def extract_phenotypes(self, 
                                patient_text: str,
-                               patient_id: Optional[str] = None) -> ProcessingResult[PhenotypeExtraction]:
+                               patient_id: Optional[str] = None,
+                               annotations: Optional[AnnotatedDocument] = None) -> ProcessingResult[PhenotypeExtraction]:
         """
         Extract phenotypic information from patient text.
         
         Args:
             patient_text: Text describing the patient's phenotype
             patient_id: Optional patient identifier
+            annotations: Pre-annotation of the text shared with the other agents
             
         Returns:
             ProcessingResult containing PhenotypeExtraction
         """
         try:
             # Pattern-based extraction first
-            pattern_results = self._extract_by_patterns(patient_text)
+            pattern_results = self._extract_by_patterns(patient_text, annotations)
             
             # LLM-based extraction
             llm_results = await self._extract_by_llm(patient_text)
@@ -212,57 +159,17 @@ class PhenotypesAgent:
                 metadata={'agent_type': 'phenotypes'}
             )
     
-    def _extract_by_patterns(self, text: str) -> Dict[str, List[str]]:
-        """Extract phenotypes using pattern matching."""
-        results = {
-            'phenotypes': [],
+    def _extract_by_patterns(self, text: str,
+                             annotations: Optional[AnnotatedDocument] = None) -> Dict[str, List[str]]:
+        """Extract phenotypes, lab values and imaging findings from the pre-annotated text."""
+        doc = annotations or annotate(text)
+        return {
+            'phenotypes': doc.texts('hpo', lower=True),
             'symptoms': [],
             'diagnostic_findings': [],
-            'lab_values': [],
-            'imaging_findings': []
+            'lab_values': doc.texts('lab_value', lower=True),
+            'imaging_findings': doc.texts('imaging', lower=True)
         }
-        
-        text_lower = text.lower()
-        
-        # Extract phenotypes by category
-        for category, patterns in self.phenotype_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-                for match in matches:
-                    phenotype = match.group(0)
-                    if phenotype not in results['phenotypes']:
-                        results['phenotypes'].append(phenotype)
-        
-        # Extract lab values (numbers with units)
-        lab_patterns = [
-            r'\b\d+(?:\.\d+)?\s*(?:mg/dL|mmol/L|g/dL|mEq/L|U/L|ng/mL|pg/mL)\b',
-            r'\b(?:glucose|glu)\s*[:=]\s*\d+(?:\.\d+)?\b',
-            r'\b(?:creatinine|creat)\s*[:=]\s*\d+(?:\.\d+)?\b',
-            r'\b(?:hemoglobin|hgb|hb)\s*[:=]\s*\d+(?:\.\d+)?\b'
-        ]
-        
-        for pattern in lab_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                lab_value = match.group(0)
-                if lab_value not in results['lab_values']:
-                    results['lab_values'].append(lab_value)
-        
-        # Extract imaging findings
-        imaging_patterns = [
-            r'\b(?:MRI|CT|X-ray|ultrasound|echocardiogram)\s+(?:shows|reveals|demonstrates)\b',
-            r'\b(?:brain|cardiac|abdominal)\s+(?:MRI|CT|ultrasound)\b',
-            r'\b(?:enlarged|atrophic|dysplastic)\s+(?:ventricles|brain|heart|liver)\b'
-        ]
-        
-        for pattern in imaging_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                imaging_finding = match.group(0)
-                if imaging_finding not in results['imaging_findings']:
-                    results['imaging_findings'].append(imaging_finding)
-        
-        return results
     
     async def _extract_by_llm(self, text: str) -> Dict[str, List[str]]:
         """Extract phenotypes using LLM."""
@@ -300,16 +207,10 @@ Focus on medical terminology and clinical observations. Only include information
             response = await self.llm_client.generate(messages, max_tokens=1000)
             
             if response and response.content:
-                try:
-                    # Try to parse JSON response
-                    content = response.content.strip()
-                    if content.startswith('```json'):
-                        content = content[7:]
-                    if content.endswith('```'):
-                        content = content[:-3]
-                    
-                    llm_results = json.loads(content)
-                    
+                # Parse (and if needed repair) the JSON response
+                llm_results = parse_json_response(response.content)
+                
+                if isinstance(llm_results, dict):
                     # Ensure all fields are lists
                     for field in ['phenotypes', 'symptoms', 'diagnostic_findings', 'lab_values', 'imaging_findings']:
                         if field not in llm_results:
@@ -318,11 +219,10 @@ Focus on medical terminology and clinical observations. Only include information
                             llm_results[field] = [llm_results[field]] if llm_results[field] else []
                     
                     return llm_results
-                    
-                except json.JSONDecodeError as e:
-                    logging.warning(f"Failed to parse LLM response as JSON: {e}")
-                    # Fallback: extract text patterns
-                    return self._extract_fallback_from_llm(response.content)
+                
+                logging.warning("Failed to parse LLM response as JSON")
+                # Fallback: extract text patterns
+                return self._extract_fallback_from_llm(response.content)
             
         except Exception as e:
             logging.error(f"LLM extraction failed: {e}")
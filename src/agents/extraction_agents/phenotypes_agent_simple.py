@@ -12,6 +12,7 @@ from datetime import datetime
 
 from core.base import ProcessingResult
 from core.llm_client.openrouter_client import OpenRouterClient
+from processors.annotated_document import AnnotatedDocument
 
 
 @dataclass
@@ -35,11 +36,12 @@ class SimplePhenotypesAgent:
     
     async def extract_phenotypes(self, 
                                patient_text: str,
-                               patient_id: Optional[str] = None) -> ProcessingResult[SimplePhenotypeExtraction]:
+                               patient_id: Optional[str] = None,
+                               annotations: Optional[AnnotatedDocument] = None) -> ProcessingResult[SimplePhenotypeExtraction]:
         """Extract phenotypes using simple pattern matching."""
         try:
             # Simple pattern-based extraction
-            phenotypes = self._extract_simple_patterns(patient_text)
+            phenotypes = self._extract_simple_patterns(patient_text, annotations)
             
             # Create extraction result
             extraction = SimplePhenotypeExtraction(
@@ -72,10 +74,11 @@ class SimplePhenotypesAgent:
                 metadata={'agent_type': 'simple_phenotypes'}
             )
     
-    def _extract_simple_patterns(self, text: str) -> List[str]:
+    def _extract_simple_patterns(self, text: str,
+                                 annotations: Optional[AnnotatedDocument] = None) -> List[str]:
         """Extract phenotypes using simple text patterns."""
         phenotypes = []
-        text_lower = text.lower()
+        text_lower = annotations.lower if annotations else text.lower()
         
         # Simple keyword matching
         keywords = [
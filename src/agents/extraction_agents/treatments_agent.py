@@ -29,10 +29,11 @@ Example usage::
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from core.llm_client.structured_output import parse_json_response
+
 
 @dataclass
 class ProcessingResult:
@@ -130,11 +131,10 @@ class TreatmentsAgent:
             # responses we expect response.content; adjust as needed for other
             # clients.
             content = response.content if hasattr(response, "content") else response
-            # Try to parse JSON from the response.  If parsing fails, we'll
-            # return an error.
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
+            # Parse (and if needed repair) the JSON in the response.  If that
+            # fails, we'll return an error.
+            data = parse_json_response(content)
+            if not isinstance(data, dict):
                 return ProcessingResult(
                     success=False,
                     error="Failed to parse JSON from model response",
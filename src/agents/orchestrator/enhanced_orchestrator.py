@@ -12,11 +12,12 @@ Location: src/agents/orchestrator/enhanced_orchestrator.py
 """
 
 import asyncio
+import copy
 import json
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 import click
@@ -35,6 +36,7 @@ from core.prompt_optimization import PromptOptimizer
 # LLM clients
 from core.llm_client.openrouter_client import OpenRouterClient
 from core.llm_client.huggingface_client import HuggingFaceClient, HuggingFaceModelManager
+from core.llm_client.cascade import build_cascade_client
 
 # RAG system
 from rag.rag_integration import RAGIntegration
@@ -44,10 +46,14 @@ from agents.extraction_agents.demographics_agent import DemographicsAgent
 from agents.extraction_agents.genetics_agent import GeneticsAgent
 from agents.extraction_agents.phenotypes_agent import PhenotypesAgent
 from agents.extraction_agents.treatments_agent import TreatmentsAgent
+from agents.extraction_agents.patient_record_agent import FIELD_GROUPS, PatientRecordAgent
+from agents.orchestrator.segment_extractor import SegmentExtractor
 
 # Processors
 from processors.pdf_parser import PDFParser
-from processors.patient_segmenter import PatientSegmenter
+from processors.patient_segmenter import PATIENT_LABEL_MARKER, PatientSegmenter
+from processors.relevance_filter import RelevanceFilter
+from processors.table_mapper import TablePatientMapper, normalize_patient_key
 
 # Database
 from database.sqlite_manager import SQLiteManager
@@ -70,6 +76,10 @@ class ExtractionConfig:
     save_to_database: bool = True
     batch_size: int = 5
     max_workers: int = 3
+    use_table_extraction: bool = True
+    extraction_mode: str = 'per_agent'  # per_agent, combined
+    followup_confidence_threshold: float = 0.6
+    reduce_input: bool = True  # forward only sections likely to hold patient data
 
 
 @dataclass
@@ -101,7 +111,8 @@ class EnhancedExtractionOrchestrator:
         
         Args:
             config: Extraction configuration
-            llm_client_type: Type of LLM client to use ("auto", "openrouter", "huggingface", "ollama")
+            llm_client_type: Type of LLM client to use ("auto", "openrouter", "huggingface", "ollama",
+                "cascade" for the LLM_CASCADE_MODELS cascade)
         """
         self.config = config or ExtractionConfig()
         self.llm_client_type = llm_client_type
@@ -112,6 +123,9 @@ class EnhancedExtractionOrchestrator:
         # Initialize components
         self.llm_clients = {}
         self.agents = {}
+        self.segment_extractor = None
+        self.table_mapper = TablePatientMapper()
+        self.relevance_filter = RelevanceFilter()
         self.rag_system = None
         self.feedback_system = None
         self.prompt_optimizer = None
@@ -198,6 +212,14 @@ class EnhancedExtractionOrchestrator:
             except Exception as e:
                 logging.warning(f"Failed to initialize Ollama client: {e}")
             
+            # Cheap-model-first cascade (opt-in)
+            if self.llm_client_type == "cascade":
+                try:
+                    self.llm_clients['cascade'] = build_cascade_client()
+                    logging.info("LLM cascade initialized")
+                except Exception as e:
+                    logging.warning(f"Failed to initialize LLM cascade: {e}")
+            
             if not self.llm_clients:
                 raise RuntimeError("No LLM clients could be initialized")
                 
@@ -322,11 +344,20 @@ class EnhancedExtractionOrchestrator:
             
             # Initialize agents with appropriate LLM clients
             self.agents['demographics'] = DemographicsAgent(llm_client=primary_client)
-            self.agents['genetics'] = GeneticsAgent(llm_client=primary_client, gene_manager=self.gene_manager)
+            self.agents['genetics'] = GeneticsAgent(llm_client=primary_client,
+                                                    config={'gene_manager': self.gene_manager})
             self.agents['phenotypes'] = PhenotypesAgent(llm_client=primary_client, hpo_manager=self.hpo_manager)
             self.agents['treatments'] = TreatmentsAgent(llm_client=primary_client)
             
-            logging.info(f"Initialized {len(self.agents)} extraction agents")
+            self.segment_extractor = SegmentExtractor(
+                self.agents,
+                combined_agent=PatientRecordAgent(llm_client=primary_client),
+                mode=self.config.extraction_mode,
+                followup_threshold=self.config.followup_confidence_threshold
+            )
+            
+            logging.info(f"Initialized {len(self.agents)} extraction agents "
+                         f"({self.config.extraction_mode} mode)")
             
         except Exception as e:
             logging.error(f"Agent initialization failed: {e}")
@@ -334,7 +365,9 @@ class EnhancedExtractionOrchestrator:
     
     def _get_primary_llm_client(self):
         """Get the primary LLM client based on configuration."""
-        if self.llm_client_type == "openrouter" and 'openrouter' in self.llm_clients:
+        if self.llm_client_type == "cascade" and 'cascade' in self.llm_clients:
+            return self.llm_clients['cascade']
+        elif self.llm_client_type == "openrouter" and 'openrouter' in self.llm_clients:
             return self.llm_clients['openrouter']
         elif self.llm_client_type == "huggingface" and 'huggingface' in self.llm_clients:
             return self.llm_clients['huggingface']
@@ -375,7 +408,7 @@ class EnhancedExtractionOrchestrator:
                 
                 # Parse document
                 task = progress.add_task("Parsing document...", total=None)
-                pdf_parser = PDFParser()
+                pdf_parser = PDFParser(enable_table_extraction=self.config.use_table_extraction)
                 parse_result = pdf_parser.process(file_path)
                 
                 if not parse_result.success:
@@ -387,27 +420,56 @@ class EnhancedExtractionOrchestrator:
                 document = parse_result.data
                 progress.update(task, description=f"Document parsed: {len(document.content)} characters")
                 
+                # Map patient tables to record fields (used instead of LLM calls)
+                table_records = self.table_mapper.map_tables(document.metadata.get("tables", []))
+                if table_records:
+                    progress.add_task(f"Mapped {len(table_records)} patients from tables", total=None)
+                
+                # Drop references, methods boilerplate and front matter
+                reduced = None
+                if self.config.reduce_input:
+                    reduced = self.relevance_filter.reduce(document.content)
+                    progress.add_task(f"Reduced input to {len(reduced.text)} characters", total=None)
+                
                 # Segment patients
                 task = progress.add_task("Segmenting patients...", total=None)
                 segmenter = PatientSegmenter()
-                segments = segmenter.segment_patients(document.content)
+                if reduced is not None:
+                    reduced_document = copy.copy(document)
+                    reduced_document.content = reduced.text
+                    segments = segmenter.process(reduced_document)
+                    # Segment positions refer to the original document
+                    for segment in segments:
+                        segment.start_position, segment.end_position = reduced.interval_to_original(
+                            segment.start_position, segment.end_position
+                        )
+                else:
+                    segments = segmenter.process(document)
                 progress.update(task, description=f"Found {len(segments)} patient segments")
                 
                 # Extract data from each segment
                 task = progress.add_task("Extracting patient data...", total=len(segments))
                 all_records = []
+                segment_keys, table_only_keys = self._assign_table_rows(segments, table_records)
                 
                 for i, segment in enumerate(segments):
                     progress.update(task, description=f"Processing segment {i+1}/{len(segments)}")
                     
+                    key = segment_keys[i]
+                    table_data = table_records[key] if key else None
+                    
                     # Extract data using all agents
-                    record = await self._extract_from_segment(segment, f"segment_{i+1}")
+                    record = await self._extract_from_segment(segment.content, f"segment_{i+1}", table_data)
                     
                     if record:
                         all_records.append(record)
                     
                     progress.advance(task)
                 
+                # Patients that only appear in tables need no LLM calls at all
+                for key in table_only_keys:
+                    all_records.append(self._record_from_table(table_records[key]))
+                
                 # Validate against ground truth if requested
                 if validate and self.config.validate_against_truth:
                     validation_result = await self._validate_extraction(all_records)
@@ -431,7 +493,9 @@ class EnhancedExtractionOrchestrator:
                     metadata={
                         'source_file': file_path,
                         'total_segments': len(segments),
+                        'table_patients': len(table_records),
                         'extracted_records': len(all_records),
+                        'input_reduction': reduced.stats() if reduced is not None else None,
                         'extraction_method': 'enhanced_orchestrator'
                     }
                 )
@@ -446,58 +510,40 @@ class EnhancedExtractionOrchestrator:
     
     async def _extract_from_segment(self, 
                                    segment_text: str, 
-                                   segment_id: str) -> Optional[PatientRecord]:
+                                   segment_id: str,
+                                   table_data: Optional[Dict[str, Any]] = None) -> Optional[PatientRecord]:
         """Extract data from a single patient segment."""
         try:
+            # Agents whose fields are fully covered by a patient table are skipped
+            skipped_agents = self.table_mapper.covered_agents(table_data, FIELD_GROUPS)
+            
             # Get RAG context if available
             rag_context = None
             if self.rag_system:
                 rag_context = self.rag_system.get_context(segment_text, max_examples=3, max_rules=2)
             
-            # Extract demographics
-            demographics_result = await self.agents['demographics'].extract_demographics(segment_text)
-            
-            # Extract genetics
-            genetics_result = await self.agents['genetics'].extract_genetics(segment_text)
-            
-            # Extract phenotypes
-            phenotypes_result = await self.agents['phenotypes'].extract_phenotypes(segment_text)
-            
-            # Extract treatments
-            treatments_result = await self.agents['treatments'].extract_treatments(segment_text)
-            
-            # Combine all extractions
-            combined_data = {}
+            # One combined call (plus targeted follow-ups) or one call per agent
+            extraction = await self.segment_extractor.extract(segment_text, segment_id, skipped_agents)
+            combined_data = extraction.data
             
-            if demographics_result.success:
-                combined_data.update(demographics_result.data)
-            
-            if genetics_result.success:
-                combined_data.update(genetics_result.data)
-            
-            if phenotypes_result.success:
-                # Extract phenotype data
-                phenotype_data = phenotypes_result.data
-                combined_data.update({
-                    'phenotypes': phenotype_data.phenotypes,
-                    'symptoms': phenotype_data.symptoms,
-                    'diagnostic_findings': phenotype_data.diagnostic_findings,
-                    'lab_values': phenotype_data.lab_values,
-                    'imaging_findings': phenotype_data.imaging_findings
-                })
-            
-            if treatments_result.success:
-                combined_data.update(treatments_result.data)
+            # Table values are taken verbatim and override LLM output
+            table_fields = self.table_mapper.table_fields(table_data) if table_data else []
+            for field in table_fields:
+                combined_data[field] = table_data[field]
             
             # Create patient record
             record = PatientRecord(
                 patient_id=segment_id,
                 data=combined_data,
                 source_document_id=f"segment_{segment_id}",
+                confidence_scores={**extraction.confidence_scores, **{field: 0.95 for field in table_fields}},
                 extraction_metadata={
                     'extraction_method': 'enhanced_orchestrator',
+                    'extraction_mode': extraction.mode,
                     'rag_context_used': rag_context is not None,
-                    'agents_used': list(self.agents.keys()),
+                    'agents_used': extraction.agents_used,
+                    'followup_agents': extraction.followup_agents,
+                    'table_fields': table_fields,
                     'extraction_timestamp': datetime.now().isoformat()
                 }
             )
@@ -510,8 +556,8 @@ class EnhancedExtractionOrchestrator:
                     logging.warning(f"Failed to store record in database: {e}")
             
             # Update RAG system with successful extraction
-            if self.rag_system and phenotypes_result.success:
-                self._update_rag_with_success(segment_text, phenotypes_result.data)
+            if self.rag_system and extraction.phenotype_extraction is not None:
+                self._update_rag_with_success(segment_text, extraction.phenotype_extraction)
             
             return record
             
@@ -519,6 +565,74 @@ class EnhancedExtractionOrchestrator:
             logging.error(f"Failed to extract from segment {segment_id}: {e}")
             return None
     
+    @staticmethod
+    def _table_key(segment: Any) -> Optional[str]:
+        """
+        Table patient key of a segment opened by a named label ("Patient 2").
+        
+        Ordinal ids of narrative or section segments never match a table row,
+        so table values cannot land on the wrong patient.
+        """
+        marker = segment.metadata.get("marker") or ""
+        if segment.metadata.get("method") != "explicit_markers" or not PATIENT_LABEL_MARKER.fullmatch(marker):
+            return None
+        return normalize_patient_key(marker)
+    
+    @classmethod
+    def _assign_table_rows(cls,
+                           segments: List[Any],
+                           table_records: Dict[str, Dict[str, Any]]) -> Tuple[List[Optional[str]], List[str]]:
+        """
+        Match patient segments to mapped table patients.
+        
+        Segments opened by a named label match the table row with that label.
+        A single narrative segment is the patient of a one-patient table.
+        Unmatched table patients get records of their own only when the text
+        has fewer segments than the tables have patients; otherwise the
+        unkeyed (narrative) segments already describe them.
+        
+        Args:
+            segments: Patient segments of the document
+            table_records: Mapped table patients by normalized key
+            
+        Returns:
+            Table key of each segment (or None) and the keys of table-only patients
+        """
+        keys = [cls._table_key(segment) for segment in segments]
+        if len(segments) == 1 and len(table_records) == 1 and keys[0] is None:
+            keys = list(table_records)
+        keys = [key if key in table_records else None for key in keys]
+        
+        if len(segments) >= len(table_records):
+            return keys, []
+        matched = set(keys)
+        return keys, [key for key in table_records if key not in matched]
+    
+    def _record_from_table(self, table_data: Dict[str, Any]) -> PatientRecord:
+        """Build a patient record directly from mapped table values."""
+        table_fields = self.table_mapper.table_fields(table_data)
+        record = PatientRecord(
+            patient_id=table_data["patient_id"],
+            data={field: table_data[field] for field in table_fields},
+            source_document_id=f"table_{table_data['patient_id']}",
+            confidence_scores={field: 0.95 for field in table_fields},
+            extraction_metadata={
+                'extraction_method': 'table',
+                'agents_used': [],
+                'table_fields': table_fields,
+                'table_sources': table_data.get("_source", []),
+                'extraction_timestamp': datetime.now().isoformat()
+            }
+        )
+        
+        if self.config.save_to_database:
+            try:
+                self.database_manager.store_patient_records([record])
+            except Exception as e:
+                logging.warning(f"Failed to store record in database: {e}")
+        
+        return record
+    
     def _update_rag_with_success(self, text: str, extraction_data):
         """Update RAG system with successful extraction."""
         try:
@@ -852,11 +966,14 @@ def cli():
 @click.option('--model', '-m', default='auto', help='LLM model to use')
 @click.option('--no-rag', is_flag=True, help='Disable RAG integration')
 @click.option('--no-feedback', is_flag=True, help='Disable feedback loop')
-def extract(input, output, truth, model, no_rag, no_feedback):
+@click.option('--mode', type=click.Choice(['per_agent', 'combined']), default='per_agent',
+              help='One LLM call per agent, or one combined call with targeted follow-ups')
+def extract(input, output, truth, model, no_rag, no_feedback, mode):
     """Extract patient data from a single PDF file"""
     config = ExtractionConfig(
         use_rag=not no_rag,
         use_feedback=not no_feedback,
+        extraction_mode=mode,
         validate_against_truth=bool(truth),
         ground_truth_path=truth,
         output_format='json' if not output else output.split('.')[-1],
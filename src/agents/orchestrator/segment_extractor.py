@@ -0,0 +1,198 @@
+"""
+Per-segment extraction with the specialised agents.
+
+Two modes are supported:
+
+- ``per_agent``: every specialised agent (demographics, genetics, phenotypes,
+  treatments) extracts its fields from the segment, one LLM call each.
+- ``combined``: a PatientRecordAgent extracts the whole record in one call;
+  a specialised agent only runs as a follow-up when the answer omits one of
+  its key fields or any of its fields is below the confidence threshold.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from agents.extraction_agents.patient_record_agent import FIELD_GROUPS, KEY_FIELDS
+from processors.annotated_document import annotate
+from processors.patient_segmenter import PatientSegment
+
+EXTRACTION_MODES = ("per_agent", "combined")
+
+# Confidence assumed for values returned by a specialised agent
+AGENT_FIELD_CONFIDENCE = 0.85
+
+
+@dataclass
+class SegmentExtraction:
+    """Fields extracted from one patient segment and how they were obtained."""
+    data: Dict[str, Any] = field(default_factory=dict)
+    confidence_scores: Dict[str, float] = field(default_factory=dict)
+    mode: str = "per_agent"
+    agents_used: List[str] = field(default_factory=list)
+    followup_agents: List[str] = field(default_factory=list)
+    phenotype_extraction: Any = None
+
+
+class SegmentExtractor:
+    """Runs the extraction agents over a patient segment."""
+
+    def __init__(self,
+                 agents: Dict[str, Any],
+                 combined_agent: Any = None,
+                 mode: str = "per_agent",
+                 followup_threshold: float = 0.6):
+        """
+        Initialize the segment extractor.
+
+        Args:
+            agents: Specialised agents by name ("demographics", "genetics",
+                "phenotypes", "treatments")
+            combined_agent: PatientRecordAgent used in combined mode
+            mode: "per_agent" or "combined"
+            followup_threshold: In combined mode, fields below this confidence
+                are re-extracted by their specialised agent
+        """
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode '{mode}', expected one of {EXTRACTION_MODES}")
+        if mode == "combined" and combined_agent is None:
+            raise ValueError("Combined extraction mode requires a combined agent")
+
+        self.agents = agents
+        self.combined_agent = combined_agent
+        self.mode = mode
+        self.followup_threshold = followup_threshold
+
+    async def extract(self,
+                      segment_text: str,
+                      segment_id: str,
+                      skipped_agents: Iterable[str] = ()) -> SegmentExtraction:
+        """
+        Extract the fields of one patient segment.
+
+        Args:
+            segment_text: Patient segment text
+            segment_id: Segment identifier
+            skipped_agents: Agents whose fields are already known (e.g. from a patient table)
+
+        Returns:
+            SegmentExtraction with the combined fields
+        """
+        skipped = set(skipped_agents)
+        if self.mode == "per_agent":
+            extraction = SegmentExtraction(mode=self.mode)
+            for name in self.agents:
+                if name not in skipped:
+                    await self._merge_agent(extraction, name, segment_text, segment_id)
+            return extraction
+        return await self._extract_combined(segment_text, segment_id, skipped)
+
+    async def _extract_combined(self, segment_text: str, segment_id: str, skipped: set) -> SegmentExtraction:
+        extraction = SegmentExtraction(mode=self.mode, agents_used=["combined"])
+        result = await self.combined_agent.execute({"patient_segment": self._segment(segment_text, segment_id)})
+
+        if result.success:
+            extraction.data.update(result.data)
+            field_confidence = result.metadata.get("field_confidence", {})
+            missing_fields = set(result.metadata.get("missing_fields", ()))
+            extraction.confidence_scores.update(field_confidence)
+        else:
+            # Every agent falls back to its own call
+            logging.warning(f"Combined extraction failed for {segment_id}: {result.error}")
+            field_confidence = {}
+            missing_fields = {name for fields in FIELD_GROUPS.values() for name in fields}
+
+        for name in self.agents:
+            if name in skipped or not self._needs_followup(name, missing_fields, field_confidence):
+                continue
+            extraction.followup_agents.append(name)
+            await self._merge_agent(extraction, name, segment_text, segment_id, only_uncertain=True)
+
+        return extraction
+
+    def _needs_followup(self, agent_name: str, missing_fields: set, field_confidence: Dict[str, float]) -> bool:
+        """Whether the combined answer omitted an agent's key fields or is unsure about any of its fields."""
+        if any(name in missing_fields for name in KEY_FIELDS.get(agent_name, ())):
+            return True
+        return any(
+            field_confidence.get(name, 1.0) < self.followup_threshold
+            for name in FIELD_GROUPS.get(agent_name, ())
+        )
+
+    async def _merge_agent(self, extraction: SegmentExtraction, name: str, segment_text: str,
+                           segment_id: str, only_uncertain: bool = False):
+        """Run one specialised agent and merge its fields into the extraction."""
+        agent_data = await self.run_agent(name, segment_text, segment_id, extraction)
+        if agent_data is None:
+            return
+        extraction.agents_used.append(name)
+
+        for key, value in agent_data.items():
+            if value in (None, "", []):
+                continue
+            if only_uncertain and extraction.data.get(key) not in (None, "", []) \
+                    and extraction.confidence_scores.get(key, 1.0) >= self.followup_threshold:
+                continue
+            extraction.data[key] = value
+            extraction.confidence_scores[key] = AGENT_FIELD_CONFIDENCE
+
+    async def run_agent(self, name: str, segment_text: str, segment_id: str,
+                        extraction: Optional[SegmentExtraction] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run one specialised agent.
+
+        The agents expose different interfaces (``execute`` with a patient
+        segment, ``extract_phenotypes`` or a synchronous ``extract``).
+
+        Returns:
+            The agent's fields, or None if it failed
+        """
+        agent = self.agents.get(name)
+        if agent is None:
+            return None
+
+        try:
+            if name == "phenotypes" and hasattr(agent, "extract_phenotypes"):
+                result = await agent.extract_phenotypes(segment_text, patient_id=segment_id,
+                                                        annotations=annotate(segment_text))
+                if not result.success:
+                    logging.warning(f"Phenotypes agent failed for {segment_id}: {result.error}")
+                    return None
+                phenotype_data = result.data
+                if extraction is not None:
+                    extraction.phenotype_extraction = phenotype_data
+                return {
+                    'phenotypes': phenotype_data.phenotypes,
+                    'symptoms': phenotype_data.symptoms,
+                    'diagnostic_findings': phenotype_data.diagnostic_findings,
+                    'lab_values': phenotype_data.lab_values,
+                    'imaging_findings': phenotype_data.imaging_findings
+                }
+
+            if hasattr(agent, "execute"):
+                result = await agent.execute({"patient_segment": self._segment(segment_text, segment_id)})
+            else:
+                result = await asyncio.to_thread(agent.extract, segment_text)
+
+            if not result.success:
+                logging.warning(f"{name} agent failed for {segment_id}: {result.error}")
+                return None
+            return result.data
+
+        except Exception as e:
+            logging.error(f"{name} agent raised for {segment_id}: {e}")
+            return None
+
+    @staticmethod
+    def _segment(segment_text: str, segment_id: str) -> PatientSegment:
+        # The pre-annotation is computed once per segment text and shared by every agent
+        return PatientSegment(
+            patient_id=segment_id,
+            content=segment_text,
+            start_position=0,
+            end_position=len(segment_text),
+            confidence=1.0,
+            metadata={"annotations": annotate(segment_text)}
+        )
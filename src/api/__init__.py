@@ -13,18 +13,30 @@ This module provides a single REST API interface that connects all system compon
 - Metadata browsing and search
 """
 
-from .main import create_api_router
-from .endpoints import (
-    metadata_triage_router,
-    extraction_router,
-    database_router,
-    rag_router,
-    user_router,
-    dashboard_router,
-    agents_router,
-    documents_router,
-    metadata_router
-)
+import importlib
+
+# Routers are imported on first access; importing the package does not load
+# every endpoint module.
+_LAZY_EXPORTS = {
+    'create_api_router': '.main',
+    'metadata_triage_router': '.endpoints',
+    'extraction_router': '.endpoints',
+    'database_router': '.endpoints',
+    'rag_router': '.endpoints',
+    'user_router': '.endpoints',
+    'dashboard_router': '.endpoints',
+    'agents_router': '.endpoints',
+    'documents_router': '.endpoints',
+    'metadata_router': '.endpoints',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'create_api_router',
@@ -0,0 +1,120 @@
+"""
+Response caching and conditional GET support for API routes.
+
+``cached_response`` wraps a GET handler so that its payload is serialized
+once (with orjson when available) and served from the response cache until
+its TTL expires or one of its tags is invalidated. Responses carry ETag and
+Last-Modified headers; requests with a matching ``If-None-Match`` or
+``If-Modified-Since`` get an empty 304.
+"""
+
+import functools
+import inspect
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from core.response_cache import CachedResponse, ResponseCache, get_response_cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_REQUEST_PARAM = "_cache_request"
+
+
+def serialize_payload(payload: Any) -> bytes:
+    """Serialize a JSON payload, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Pydantic models, datetimes in odd places, etc.
+            return orjson.dumps(jsonable_encoder(payload), option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}
+        return entry.etag in tags or "*" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(entry.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """Build a 200 or 304 response for a cache entry."""
+    headers = {
+        "ETag": f'"{entry.etag}"',
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        # Clients revalidate on every request and receive 304 while unchanged
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def cached_response(ttl: float, tags: Iterable[str] = (), cache: Optional[ResponseCache] = None) -> Callable:
+    """
+    Cache a GET route's JSON payload.
+
+    Args:
+        ttl: Seconds a cached payload stays fresh
+        tags: Invalidation tags (see core.response_cache)
+        cache: Cache to use (the process-wide cache if None)
+
+    Handlers called directly from Python (not through FastAPI) bypass the
+    cache and return their payload unchanged.
+    """
+    tags = tuple(tags)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_param = next(
+            (name for name, param in signature.parameters.items() if param.annotation is Request),
+            None
+        )
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if request_param is None:
+                request = kwargs.pop(_REQUEST_PARAM, None)
+            else:
+                request = kwargs.get(request_param)
+            if request is None:
+                return await func(*args, **kwargs)
+
+            store = cache or get_response_cache()
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+            key = f"{func.__module__}.{func.__qualname__}:{request.url.path}?{query}"
+
+            entry = store.get(key)
+            if entry is None:
+                payload = await func(*args, **kwargs)
+                if isinstance(payload, Response):
+                    return payload
+                entry = store.set(key, serialize_payload(payload), ttl, tags)
+            return cached_json_response(request, entry)
+
+        if request_param is None:
+            # Let FastAPI inject the request without changing the handler
+            parameters = list(signature.parameters.values()) + [
+                inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ]
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,40 @@
+"""
+FastAPI dependencies for application-scoped services.
+
+Handlers declare the services they need with ``Depends(service("name"))``
+instead of constructing managers per request. The container lives on
+``app.state.services`` and is created by the application lifespan.
+"""
+
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request
+
+from core.service_container import ServiceContainer, create_default_container
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """Return the application's service container, creating it if missing."""
+    container = getattr(request.app.state, "services", None)
+    if container is None:
+        # Routers mounted on an app without the unified lifespan
+        container = create_default_container()
+        request.app.state.services = container
+    return container
+
+
+def service(name: str) -> Callable[[Request], Any]:
+    """
+    Build a dependency that resolves a named service.
+
+    The service is constructed in a worker thread on first use if it was not
+    preloaded. A service that fails to initialize yields 503.
+    """
+    async def dependency(request: Request) -> Any:
+        try:
+            return await get_services(request).aget(name)
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    dependency.__name__ = f"get_{name}"
+    return dependency
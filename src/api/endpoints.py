@@ -14,6 +14,14 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .dependencies import service
+from .realtime import serve_event_socket, DASHBOARD_TOPICS, METADATA_TOPICS
+from .caching import cached_response
+from .extraction_jobs import extraction_jobs_router, ExtractionRequest
+from core.response_cache import (
+    TAG_AGENTS, TAG_ANALYTICS, TAG_METADATA, TAG_ONTOLOGIES, invalidate_responses
+)
+
 # Import core system components
 # Commented out imports that don't exist yet - will be implemented later
 # from metadata_triage.metadata_orchestrator import MetadataOrchestrator
@@ -30,45 +38,11 @@ class MetadataOrchestrator:
 class LangExtractEngine:
     pass
 
-class SQLiteManager:
-    pass
-
-class VectorManager:
-    pass
-
-class RAGSystem:
-    pass
-
 class OpenRouterClient:
     pass
 
 logger = logging.getLogger(__name__)
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove dead connections
-                self.active_connections.remove(connection)
-
-manager = ConnectionManager()
-
 # ============================================================================
 # Dashboard Endpoints
 # ============================================================================
@@ -77,14 +51,8 @@ dashboard_router = APIRouter()
 
 @dashboard_router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            # Echo back for now, can be extended for real-time updates
-            await manager.send_personal_message(f"Message received: {data}", websocket)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+    """Push task, queue and metrics events to dashboard clients."""
+    await serve_event_socket(websocket, DASHBOARD_TOPICS)
 
 @dashboard_router.get("/overview")
 async def get_dashboard_overview() -> Dict[str, Any]:
@@ -298,6 +266,7 @@ async def get_recent_results() -> Dict[str, Any]:
 agents_router = APIRouter()
 
 @agents_router.get("/")
+@cached_response(ttl=10, tags=[TAG_AGENTS])
 async def get_agents() -> Dict[str, Any]:
     """Get all agents with real status from your system."""
     try:
@@ -323,6 +292,7 @@ async def start_agent(agent_id: str) -> Dict[str, Any]:
     """Start a specific agent."""
     try:
         # This would integrate with your orchestrator
+        invalidate_responses(TAG_AGENTS)
         return {"message": f"Agent {agent_id} started", "status": "success"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -332,6 +302,7 @@ async def stop_agent(agent_id: str) -> Dict[str, Any]:
     """Stop a specific agent."""
     try:
         # This would integrate with your orchestrator
+        invalidate_responses(TAG_AGENTS)
         return {"message": f"Agent {agent_id} stopped", "status": "success"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -689,6 +660,7 @@ def parse_metadata_csv(csv_file: Path) -> List[Dict[str, Any]]:
 metadata_router = APIRouter()
 
 @metadata_router.get("/")
+@cached_response(ttl=60, tags=[TAG_METADATA])
 async def get_metadata_overview() -> Dict[str, Any]:
     """Get overview of all metadata collections."""
     try:
@@ -712,6 +684,7 @@ async def get_metadata_overview() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 @metadata_router.get("/collections/{collection_name}")
+@cached_response(ttl=60, tags=[TAG_METADATA])
 async def get_collection_metadata(collection_name: str) -> Dict[str, Any]:
     """Get metadata for a specific collection."""
     try:
@@ -818,14 +791,11 @@ async def search_metadata_with_slash(
 async def get_stored_documents(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    pmid: Optional[str] = Query(None, description="Filter by PMID")
+    pmid: Optional[str] = Query(None, description="Filter by PMID"),
+    sqlite_manager=Depends(service("sqlite_manager"))
 ) -> Dict[str, Any]:
     """Get documents stored in the local database."""
     try:
-        from database.sqlite_manager import SQLiteManager
-        
-        sqlite_manager = SQLiteManager()
-        
         # Get documents from database
         if pmid:
             # Get specific document by PMID
@@ -870,18 +840,17 @@ async def get_stored_documents(
 @metadata_router.post("/download-document")
 async def download_document(
     pmid: str = Query(..., description="PubMed ID"),
-    source: str = Query("pubmed", description="Source: pubmed or europepmc")
+    source: str = Query("pubmed", description="Source: pubmed or europepmc"),
+    sqlite_manager=Depends(service("sqlite_manager"))
 ) -> Dict[str, Any]:
     """Download and store a full-text document."""
     try:
         from metadata_triage.pubmed_client import PubMedClient
         from metadata_triage.europepmc_client import EuropePMCClient
-        from database.sqlite_manager import SQLiteManager
         
         # Initialize clients
         pubmed_client = PubMedClient()
         europepmc_client = EuropePMCClient()
-        sqlite_manager = SQLiteManager()
         
         # Get article metadata
         if source == "pubmed":
@@ -953,18 +922,9 @@ async def download_document(
         raise HTTPException(status_code=500, detail=f"Document download failed: {str(e)}")
 
 @metadata_router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates."""
-    await websocket.accept()
-    try:
-        while True:
-            data = await websocket.receive_text()
-            # Echo back for now, can be extended for real-time updates
-            await websocket.send_text(f"Message received: {data}")
-    except WebSocketDisconnect:
-        pass
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+async def metadata_websocket_endpoint(websocket: WebSocket):
+    """Push triage task progress and metrics events to metadata browser clients."""
+    await serve_event_socket(websocket, METADATA_TOPICS)
 
 def get_collection_info(collection_dir: Path, detailed: bool = False) -> Dict[str, Any]:
     """Get information about a metadata collection."""
@@ -1164,48 +1124,8 @@ async def search_metadata_triage(query: MetadataQuery):
 
 extraction_router = APIRouter()
 
-class ExtractionRequest(BaseModel):
-    text: str
-    extraction_passes: int = 2
-    use_patient_segmentation: bool = True
-
-@extraction_router.post("/extract")
-async def extract_from_text(request: ExtractionRequest):
-    """Extract biomedical information from text using LangExtract."""
-    try:
-        # Initialize LangExtract engine
-        engine = LangExtractEngine()
-        
-        # Run extraction
-        result = engine.extract_from_text(
-            text=request.text,
-            extraction_passes=request.extraction_passes,
-            use_patient_segmentation=request.use_patient_segmentation
-        )
-        
-        return JSONResponse(content=result, status_code=200)
-    except Exception as e:
-        logger.error(f"Extraction failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@extraction_router.post("/upload")
-async def extract_from_file(file: UploadFile = File(...)):
-    """Extract biomedical information from uploaded file."""
-    try:
-        # Read file content
-        content = await file.read()
-        text = content.decode('utf-8')
-        
-        # Initialize LangExtract engine
-        engine = LangExtractEngine()
-        
-        # Run extraction
-        result = engine.extract_from_text(text=text)
-        
-        return JSONResponse(content=result, status_code=200)
-    except Exception as e:
-        logger.error(f"File extraction failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+# Extraction runs as background jobs (POST /extract, /upload -> 202 + job ID)
+extraction_router.include_router(extraction_jobs_router)
 
 # ============================================================================
 # Database Endpoints
@@ -1214,12 +1134,12 @@ async def extract_from_file(file: UploadFile = File(...)):
 database_router = APIRouter()
 
 @database_router.get("/status")
-async def get_database_status():
+async def get_database_status(
+    sqlite_manager=Depends(service("sqlite_manager")),
+    vector_manager=Depends(service("vector_manager"))
+):
     """Get database status and statistics."""
     try:
-        sqlite_manager = SQLiteManager()
-        vector_manager = VectorManager()
-        
         # Get database statistics
         sqlite_stats = sqlite_manager.get_database_stats()
         vector_stats = vector_manager.get_database_stats()
@@ -1234,10 +1154,10 @@ async def get_database_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 @database_router.get("/patients")
-async def get_patients(limit: int = 100, offset: int = 0):
+async def get_patients(limit: int = 100, offset: int = 0,
+                       sqlite_manager=Depends(service("sqlite_manager"))):
     """Get patient records from database."""
     try:
-        sqlite_manager = SQLiteManager()
         patients = sqlite_manager.get_patient_records(limit=limit, offset=offset)
         
         return JSONResponse(content=patients, status_code=200)
@@ -1256,17 +1176,9 @@ class RAGQuestion(BaseModel):
     max_results: int = 5
 
 @rag_router.post("/ask")
-async def ask_question(request: RAGQuestion):
+async def ask_question(request: RAGQuestion, rag_system=Depends(service("rag_system"))):
     """Ask a question using the RAG system."""
     try:
-        # Initialize RAG system
-        sqlite_manager = SQLiteManager()
-        vector_manager = VectorManager()
-        rag_system = RAGSystem(
-            vector_manager=vector_manager,
-            sqlite_manager=sqlite_manager
-        )
-        
         # Get answer
         answer = await rag_system.ask_question(
             question=request.question,
@@ -1388,6 +1300,7 @@ async def get_usage() -> Dict[str, Any]:
 ontologies_router = APIRouter()
 
 @ontologies_router.get("/")
+@cached_response(ttl=3600, tags=[TAG_ONTOLOGIES])
 async def get_ontologies() -> Dict[str, Any]:
     """Get all available ontologies."""
     return {
@@ -1493,6 +1406,7 @@ async def get_langextract_instructions() -> Dict[str, Any]:
 analytics_router = APIRouter()
 
 @analytics_router.get("/visualizations")
+@cached_response(ttl=30, tags=[TAG_ANALYTICS])
 async def get_visualizations(time_range: str = "7d") -> Dict[str, Any]:
     """Get analytics data for visualizations."""
     return {
@@ -1678,13 +1592,12 @@ async def health_check() -> Dict[str, Any]:
     }
 
 @health_router.get("/system/status")
-async def system_status() -> Dict[str, Any]:
+async def system_status(
+    sqlite_manager=Depends(service("sqlite_manager")),
+    vector_manager=Depends(service("vector_manager"))
+) -> Dict[str, Any]:
     """System status endpoint."""
     try:
-        # Get basic system info
-        sqlite_manager = SQLiteManager()
-        vector_manager = VectorManager()
-        
         # Get database stats
         sqlite_stats = sqlite_manager.get_statistics()
         vector_stats = vector_manager.get_statistics()
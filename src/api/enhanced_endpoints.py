@@ -15,13 +15,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import asyncio
 
-# Import core system components
-from metadata_triage.metadata_orchestrator import MetadataOrchestrator
-from langextract_integration.extractor import LangExtractEngine
-from database.sqlite_manager import SQLiteManager
-from database.vector_manager import VectorManager
-from rag.rag_system import RAGSystem
-from core.llm_client.openrouter_client import OpenRouterClient
+# Core system components (orchestrators, managers, RAG) are not imported here:
+# they pull in the ML stack and are resolved lazily from the app service container.
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,114 @@
+"""
+Extraction job endpoints.
+
+Extraction runs for minutes, so ``/extract`` and ``/upload`` only queue a job
+on the application's ``ExtractionJobManager`` and answer 202 with its ID.
+Clients poll ``/jobs/{job_id}`` (or listen for ``task_progress`` events on the
+dashboard WebSocket) and fetch ``/jobs/{job_id}/result`` once it completes.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from .dependencies import service
+from core.extraction_jobs import ExtractionJob, JobQueueFullError, JobState
+
+extraction_jobs_router = APIRouter()
+
+
+class ExtractionRequest(BaseModel):
+    text: str
+    extraction_passes: int = 2
+    use_patient_segmentation: bool = True
+
+
+def _accepted(request: Request, job: ExtractionJob) -> JSONResponse:
+    status_url = str(request.url_for("get_extraction_job", job_id=job.job_id))
+    return JSONResponse(
+        status_code=202,
+        headers={"Location": status_url},
+        content={
+            **job.to_dict(),
+            "status_url": status_url,
+            "result_url": str(request.url_for("get_extraction_job_result", job_id=job.job_id))
+        }
+    )
+
+
+def _submit(jobs, text: str, source: str, **options) -> ExtractionJob:
+    try:
+        return jobs.submit(text, source=source, **options)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+
+def _get_job(jobs, job_id: str) -> ExtractionJob:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Extraction job {job_id} not found or expired")
+    return job
+
+
+@extraction_jobs_router.post("/extract", status_code=202)
+async def extract_from_text(request: ExtractionRequest, http_request: Request,
+                            jobs=Depends(service("extraction_jobs"))):
+    """Queue extraction of biomedical information from text."""
+    job = _submit(
+        jobs, request.text, "text",
+        extraction_passes=request.extraction_passes,
+        segment_patients=request.use_patient_segmentation
+    )
+    return _accepted(http_request, job)
+
+
+@extraction_jobs_router.post("/upload", status_code=202)
+async def extract_from_file(http_request: Request, file: UploadFile = File(...),
+                            jobs=Depends(service("extraction_jobs"))):
+    """Queue extraction of biomedical information from an uploaded text file."""
+    content = await file.read()
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Uploaded file is not UTF-8 text")
+
+    job = _submit(jobs, text, file.filename or "upload")
+    return _accepted(http_request, job)
+
+
+@extraction_jobs_router.get("/jobs")
+async def list_extraction_jobs(state: Optional[str] = Query(None), limit: int = Query(50, ge=1, le=500),
+                               jobs=Depends(service("extraction_jobs"))) -> Dict[str, Any]:
+    """List recent extraction jobs."""
+    return {
+        "jobs": [job.to_dict() for job in jobs.list_jobs(state=state, limit=limit)],
+        "stats": jobs.get_stats()
+    }
+
+
+@extraction_jobs_router.get("/jobs/{job_id}", name="get_extraction_job")
+async def get_extraction_job(job_id: str, jobs=Depends(service("extraction_jobs"))) -> Dict[str, Any]:
+    """Get the state and progress of an extraction job."""
+    return _get_job(jobs, job_id).to_dict()
+
+
+@extraction_jobs_router.get("/jobs/{job_id}/result", name="get_extraction_job_result")
+async def get_extraction_job_result(job_id: str, jobs=Depends(service("extraction_jobs"))):
+    """Get the result of a completed extraction job."""
+    job = _get_job(jobs, job_id)
+    if job.state == JobState.COMPLETED:
+        return JSONResponse(content=job.result, status_code=200)
+    if job.state == JobState.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    raise HTTPException(status_code=409, detail=f"Extraction job {job_id} is {job.state}")
+
+
+@extraction_jobs_router.delete("/jobs/{job_id}")
+async def cancel_extraction_job(job_id: str, jobs=Depends(service("extraction_jobs"))) -> Dict[str, Any]:
+    """Cancel a queued or running extraction job."""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Extraction job {job_id} not found or expired")
+    return {**job.to_dict(), "cancel_requested": job.cancel_requested.is_set()}
@@ -0,0 +1,133 @@
+"""
+WebSocket server push for Biomedical Text Agent.
+
+Connects WebSocket clients to the in-process event bus. Clients manage
+their topics with ``{"type": "subscribe", "data": {"topic": ...}}`` and
+``{"type": "unsubscribe", ...}`` messages and receive published events as
+``{"id", "type", "topic", "data", "timestamp"}`` JSON messages.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Iterable, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from core.event_bus import Event, EventBus, Subscription, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+# Topics sent to dashboard clients before they subscribe explicitly
+DASHBOARD_TOPICS = ("task_progress", "queue_depth", "extraction_completed", "metrics")
+METADATA_TOPICS = ("task_progress", "queue_depth", "metrics")
+
+
+async def serve_event_socket(websocket: WebSocket,
+                             topics: Iterable[str] = (),
+                             bus: Optional[EventBus] = None):
+    """
+    Serve a WebSocket connection from the event bus until it disconnects.
+
+    Args:
+        websocket: Connection to serve
+        topics: Topics subscribed on connect
+        bus: Event bus (the process-wide bus if None)
+    """
+    bus = bus or get_event_bus()
+    await websocket.accept()
+    subscription = bus.subscribe(topics)
+    sender = asyncio.create_task(_send_events(websocket, subscription))
+
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            _handle_client_message(raw, subscription)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
+    finally:
+        sender.cancel()
+        bus.unsubscribe(subscription)
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription):
+    """Forward pending events; events published while sending are coalesced."""
+    try:
+        while True:
+            for event in await subscription.next_batch():
+                await websocket.send_text(json.dumps(event.to_message(), default=str))
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.debug(f"WebSocket sender stopped: {e}")
+
+
+def _handle_client_message(raw: str, subscription: Subscription):
+    """Apply a subscribe/unsubscribe/ping message from a client."""
+    try:
+        message = json.loads(raw)
+    except ValueError:
+        logger.debug(f"Ignoring non-JSON WebSocket message: {raw[:100]}")
+        return
+    if not isinstance(message, dict):
+        return
+
+    message_type = message.get("type")
+    topic = (message.get("data") or {}).get("topic") or message.get("topic")
+
+    if message_type == "subscribe" and topic:
+        subscription.subscribe(topic)
+        reply = "subscription_confirmed"
+    elif message_type == "unsubscribe" and topic:
+        subscription.unsubscribe(topic)
+        reply = "unsubscription_confirmed"
+    elif message_type == "ping":
+        reply = "heartbeat"
+    else:
+        return
+
+    subscription.send(Event(topic="_control", data={"topic": topic}, type=reply))
+
+
+def sample_system_metrics() -> dict:
+    """CPU, memory and disk usage in percent (psutil if installed)."""
+    try:
+        import psutil  # type: ignore
+        return {
+            "cpu": psutil.cpu_percent(interval=None),
+            "memory": psutil.virtual_memory().percent,
+            "disk": psutil.disk_usage('/').percent
+        }
+    except ImportError:
+        import os
+        import shutil
+        disk = shutil.disk_usage('/')
+        try:
+            cpu = min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100)
+        except (AttributeError, OSError):
+            cpu = None
+        return {
+            "cpu": round(cpu, 1) if cpu is not None else None,
+            "memory": None,
+            "disk": round(disk.used / disk.total * 100, 1)
+        }
+
+
+async def publish_system_metrics(bus: Optional[EventBus] = None, interval: float = 5.0):
+    """
+    Publish system metrics periodically while anyone is subscribed.
+
+    One sampler serves all connected dashboards, so the sampling cost does not
+    grow with the number of clients.
+    """
+    bus = bus or get_event_bus()
+    while True:
+        if bus.has_subscribers("system_metrics"):
+            try:
+                metrics = await asyncio.to_thread(sample_system_metrics)
+                bus.publish("system_metrics", metrics, coalesce_key="system")
+            except Exception as e:
+                logger.debug(f"System metrics sampling failed: {e}")
+        await asyncio.sleep(interval)
@@ -4,7 +4,7 @@ Simplified API endpoints for Biomedical Text Agent.
 This module defines all the API endpoints without complex imports.
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
@@ -12,32 +12,14 @@ import logging
 import json
 from datetime import datetime, timedelta
 
-logger = logging.getLogger(__name__)
-
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+from .realtime import serve_event_socket, DASHBOARD_TOPICS, METADATA_TOPICS
+from .caching import cached_response
+from .extraction_jobs import extraction_jobs_router
+from core.response_cache import (
+    TAG_AGENTS, TAG_ANALYTICS, TAG_METADATA, TAG_ONTOLOGIES, invalidate_responses
+)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove dead connections
-                self.active_connections.remove(connection)
-
-manager = ConnectionManager()
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # Dashboard Endpoints
@@ -47,14 +29,8 @@ dashboard_router = APIRouter()
 
 @dashboard_router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            # Echo back for now, can be extended for real-time updates
-            await manager.send_personal_message(f"Message received: {data}", websocket)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+    """Push task, queue and metrics events to dashboard clients."""
+    await serve_event_socket(websocket, DASHBOARD_TOPICS)
 
 @dashboard_router.get("/overview")
 async def get_dashboard_overview() -> Dict[str, Any]:
@@ -211,6 +187,7 @@ async def get_recent_results() -> Dict[str, Any]:
 agents_router = APIRouter()
 
 @agents_router.get("/")
+@cached_response(ttl=10, tags=[TAG_AGENTS])
 async def get_agents() -> Dict[str, Any]:
     """Get all agents with mock data."""
     return {
@@ -263,11 +240,13 @@ async def get_agent(agent_id: str) -> Dict[str, Any]:
 @agents_router.post("/{agent_id}/start")
 async def start_agent(agent_id: str) -> Dict[str, Any]:
     """Start a specific agent."""
+    invalidate_responses(TAG_AGENTS)
     return {"message": f"Agent {agent_id} started", "status": "success"}
 
 @agents_router.post("/{agent_id}/stop")
 async def stop_agent(agent_id: str) -> Dict[str, Any]:
     """Stop a specific agent."""
+    invalidate_responses(TAG_AGENTS)
     return {"message": f"Agent {agent_id} stopped", "status": "success"}
 
 # ============================================================================
@@ -346,7 +325,13 @@ async def get_document_fulltext(document_id: str) -> Dict[str, Any]:
 
 metadata_router = APIRouter()
 
+@metadata_router.websocket("/ws")
+async def metadata_websocket_endpoint(websocket: WebSocket):
+    """Push triage task progress and metrics events to metadata browser clients."""
+    await serve_event_socket(websocket, METADATA_TOPICS)
+
 @metadata_router.get("/")
+@cached_response(ttl=60, tags=[TAG_METADATA])
 async def get_metadata() -> Dict[str, Any]:
     """Get metadata overview."""
     return {
@@ -538,6 +523,7 @@ async def get_usage() -> Dict[str, Any]:
 ontologies_router = APIRouter()
 
 @ontologies_router.get("/")
+@cached_response(ttl=3600, tags=[TAG_ONTOLOGIES])
 async def get_ontologies() -> Dict[str, Any]:
     """Get all available ontologies."""
     return {
@@ -651,6 +637,7 @@ async def test_prompt(id: str, data: Dict[str, Any]) -> Dict[str, Any]:
 analytics_router = APIRouter()
 
 @analytics_router.get("/visualizations")
+@cached_response(ttl=30, tags=[TAG_ANALYTICS])
 async def get_visualizations(time_range: str = "7d") -> Dict[str, Any]:
     """Get analytics data for visualizations."""
     return {
@@ -833,10 +820,13 @@ async def health_check() -> Dict[str, Any]:
     }
 
 @health_router.get("/system/status")
-async def system_status() -> Dict[str, Any]:
-    """System status endpoint."""
+async def system_status(request: Request) -> Dict[str, Any]:
+    """System status endpoint, including readiness of app-scoped services."""
+    services = getattr(request.app.state, "services", None)
+    readiness = services.readiness() if services is not None else {"ready": True, "services": {}}
     return {
-        "status": "operational",
+        "status": "operational" if readiness["ready"] else "starting",
+        "services": readiness["services"],
         "service": "biomedical-text-agent",
         "version": "2.0.0",
         "timestamp": datetime.utcnow().isoformat(),
@@ -867,6 +857,8 @@ async def metadata_triage_overview():
 async def extraction_overview():
     return {"message": "Extraction system"}
 
+extraction_router.include_router(extraction_jobs_router)
+
 @rag_router.get("/")
 async def rag_overview():
     return {"message": "RAG system"}
@@ -0,0 +1,39 @@
+"""
+Extraction benchmarks for Biomedical Text Agent.
+
+This package provides:
+- A deterministic local mock LLM server (no network, no API spend)
+- A harness that replays the bundled corpus through the extraction pipeline
+- A results database and run comparison for regression tracking
+- A comparison of the agent orchestrator's per-agent and combined modes
+
+Usage (from src/):
+    python -m benchmarks run --label baseline
+    python -m benchmarks compare previous latest
+"""
+
+from .mock_llm import MockLLMServer, mock_extract_patients
+from .agent_modes import AgentModeBenchmark, ModeRun
+from .harness import (
+    BenchmarkDocument,
+    BenchmarkHarness,
+    BenchmarkResultsDB,
+    BenchmarkRun,
+    Regression,
+    compare_runs,
+    load_corpus
+)
+
+__all__ = [
+    'MockLLMServer',
+    'mock_extract_patients',
+    'AgentModeBenchmark',
+    'ModeRun',
+    'BenchmarkDocument',
+    'BenchmarkHarness',
+    'BenchmarkResultsDB',
+    'BenchmarkRun',
+    'Regression',
+    'compare_runs',
+    'load_corpus'
+]
@@ -0,0 +1,145 @@
+"""
+Command-line interface for the extraction benchmark.
+
+Examples (from src/):
+    python -m benchmarks run --limit 20 --latency 0.05 --label "before caching"
+    python -m benchmarks run --compare-to latest --fail-on-regression
+    python -m benchmarks compare previous latest
+    python -m benchmarks list
+    python -m benchmarks modes --limit 10 --latency 0.05
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from .agent_modes import AgentModeBenchmark, format_mode_runs
+from .harness import (
+    DEFAULT_GROUND_TRUTH,
+    DEFAULT_INPUT_DIR,
+    DEFAULT_RESULTS_DB,
+    BenchmarkHarness,
+    BenchmarkResultsDB,
+    compare_runs,
+    format_comparison,
+    format_run,
+    load_corpus
+)
+
+
+def _report_comparison(db: BenchmarkResultsDB, baseline_id: str, candidate_id: str, args) -> int:
+    baseline = db.get_run(baseline_id)
+    candidate = db.get_run(candidate_id)
+    if baseline is None or candidate is None:
+        print(f"Run not found: {baseline_id if baseline is None else candidate_id}")
+        return 2
+
+    comparisons = compare_runs(baseline, candidate, args.performance_tolerance, args.accuracy_tolerance)
+    print(f"\nBaseline {baseline.run_id} vs candidate {candidate.run_id}")
+    print(format_comparison(comparisons))
+    regressed = [c.metric for c in comparisons if c.regressed]
+    if regressed:
+        print(f"\nRegressions: {', '.join(regressed)}")
+        return 1 if args.fail_on_regression else 0
+    print("\nNo regressions")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Extraction benchmark harness")
+    parser.add_argument("--db", type=Path, default=DEFAULT_RESULTS_DB, help="Results database")
+    parser.add_argument("--performance-tolerance", type=float, default=0.10,
+                        help="Allowed relative slowdown or token increase (default 0.10)")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.02,
+                        help="Allowed absolute F1 drop (default 0.02)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a regression is found")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Replay the corpus and store the results")
+    run_parser.add_argument("--label", default="")
+    run_parser.add_argument("--input-dir", type=Path, default=DEFAULT_INPUT_DIR)
+    run_parser.add_argument("--ground-truth", type=Path, default=DEFAULT_GROUND_TRUTH)
+    run_parser.add_argument("--limit", type=int, default=20, help="Number of abstracts (default 20)")
+    run_parser.add_argument("--no-pdfs", action="store_true", help="Skip the bundled PDFs")
+    run_parser.add_argument("--latency", type=float, default=0.0, help="Mock LLM latency per request (s)")
+    run_parser.add_argument("--latency-per-token", type=float, default=0.0,
+                            help="Mock LLM latency per completion token (s)")
+    run_parser.add_argument("--passes", type=int, default=1, help="Extraction passes")
+    run_parser.add_argument("--workers", type=int, default=1, help="Extraction workers")
+    run_parser.add_argument("--chunk-size", type=int, default=1200, help="Max characters per chunk")
+    run_parser.add_argument("--no-reduce", action="store_true",
+                            help="Forward whole documents instead of their relevant sections")
+    run_parser.add_argument("--compare-to", help="Run id (or 'latest') to compare the new run with")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two stored runs")
+    compare_parser.add_argument("baseline", help="Baseline run id, 'previous' or 'latest'")
+    compare_parser.add_argument("candidate", help="Candidate run id, 'previous' or 'latest'")
+
+    modes_parser = subparsers.add_parser("modes", help="Compare the per-agent and combined extraction modes")
+    modes_parser.add_argument("--input-dir", type=Path, default=DEFAULT_INPUT_DIR)
+    modes_parser.add_argument("--ground-truth", type=Path, default=DEFAULT_GROUND_TRUTH)
+    modes_parser.add_argument("--limit", type=int, default=20, help="Number of abstracts (default 20)")
+    modes_parser.add_argument("--no-pdfs", action="store_true", help="Skip the bundled PDFs")
+    modes_parser.add_argument("--latency", type=float, default=0.0, help="Mock LLM latency per request (s)")
+    modes_parser.add_argument("--latency-per-token", type=float, default=0.0,
+                              help="Mock LLM latency per completion token (s)")
+    modes_parser.add_argument("--followup-threshold", type=float, default=0.6,
+                              help="Confidence below which combined mode runs a follow-up agent")
+    modes_parser.add_argument("--no-reduce", action="store_true",
+                              help="Forward whole documents instead of their relevant sections")
+
+    list_parser = subparsers.add_parser("list", help="List stored runs")
+    list_parser.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    db = BenchmarkResultsDB(args.db)
+
+    if args.command == "run":
+        baseline = db.get_run(args.compare_to) if args.compare_to else None
+        documents = load_corpus(args.input_dir, args.ground_truth, args.limit, include_pdfs=not args.no_pdfs)
+        harness = BenchmarkHarness(
+            documents,
+            ground_truth_file=args.ground_truth,
+            results_db=db,
+            latency=args.latency,
+            latency_per_token=args.latency_per_token,
+            extraction_passes=args.passes,
+            max_workers=args.workers,
+            max_char_buffer=args.chunk_size,
+            reduce_input=not args.no_reduce
+        )
+        run = harness.run(label=args.label)
+        print(format_run(run))
+        if baseline is not None:
+            return _report_comparison(db, baseline.run_id, run.run_id, args)
+        return 0
+
+    if args.command == "modes":
+        documents = load_corpus(args.input_dir, args.ground_truth, args.limit, include_pdfs=not args.no_pdfs)
+        benchmark = AgentModeBenchmark(
+            documents,
+            ground_truth_file=args.ground_truth,
+            latency=args.latency,
+            latency_per_token=args.latency_per_token,
+            followup_threshold=args.followup_threshold,
+            reduce_input=not args.no_reduce
+        )
+        print(format_mode_runs(benchmark.run()))
+        return 0
+
+    if args.command == "compare":
+        return _report_comparison(db, args.baseline, args.candidate, args)
+
+    for row in db.list_runs(args.limit):
+        print(f"{row['run_id']}  {row['started_at'][:19]}  {row['git_commit'] or '-':<8} "
+              f"docs {row['documents']:<4} {row['throughput']:.2f} docs/s  "
+              f"p95 {row['latency_p95'] * 1000:.0f}ms  tokens {row['tokens']}  F1 {row['macro_f1']:.3f}  "
+              f"{row['label'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
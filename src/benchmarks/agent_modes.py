@@ -0,0 +1,200 @@
+"""
+Benchmark of the agent orchestrator's extraction modes.
+
+Runs the same corpus through the specialised extraction agents once per
+mode ("per_agent": one LLM call per agent, "combined": one structured call
+plus targeted follow-ups) against the local mock LLM server, and reports
+requests, tokens, latency and field-level F1 for each mode.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .harness import DEFAULT_GROUND_TRUTH, BenchmarkDocument, _percentile, score_records
+from .mock_llm import MockLLMServer
+
+logger = logging.getLogger(__name__)
+
+SEX_LABELS = {0: "m", 1: "f"}
+
+
+@dataclass
+class ModeRun:
+    """Measurements of one extraction mode over the corpus."""
+    mode: str
+    documents: int
+    segments: int
+    failed_documents: int
+    wall_time: float
+    latency_p50: float
+    latency_p95: float
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    macro_f1: float
+    followups: Dict[str, int] = field(default_factory=dict)
+    field_metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class AgentModeBenchmark:
+    """Compares the per-agent and combined extraction modes on a corpus."""
+
+    def __init__(self,
+                 documents: List[BenchmarkDocument],
+                 ground_truth_file: Optional[Path] = DEFAULT_GROUND_TRUTH,
+                 latency: float = 0.0,
+                 latency_per_token: float = 0.0,
+                 followup_threshold: float = 0.6,
+                 reduce_input: bool = True):
+        """
+        Initialize the benchmark.
+
+        Args:
+            documents: Corpus to replay
+            ground_truth_file: Ground truth CSV for field-level F1 (None to skip)
+            latency: Simulated fixed LLM latency per request, in seconds
+            latency_per_token: Simulated LLM latency per completion token
+            followup_threshold: Confidence below which combined mode runs a follow-up agent
+            reduce_input: Whether the agents get only the relevant sections
+        """
+        self.documents = documents
+        self.ground_truth_file = ground_truth_file
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.followup_threshold = followup_threshold
+        self.reduce_input = reduce_input
+
+    def run(self, modes: Sequence[str] = ("per_agent", "combined")) -> List[ModeRun]:
+        """
+        Run the corpus once per mode.
+
+        Returns:
+            One ModeRun per mode, in the given order
+        """
+        from agents.extraction_agents.demographics_agent import DemographicsAgent
+        from agents.extraction_agents.genetics_agent import GeneticsAgent
+        from agents.extraction_agents.patient_record_agent import PatientRecordAgent
+        from agents.extraction_agents.phenotypes_agent import PhenotypesAgent
+        from agents.extraction_agents.treatments_agent import TreatmentsAgent
+        from core.llm_client.openrouter_client import OpenRouterClient
+
+        texts = [self._document_text(doc) for doc in self.documents]
+        if self.reduce_input:
+            from processors.relevance_filter import RelevanceFilter
+            relevance_filter = RelevanceFilter()
+            texts = [relevance_filter.reduce(text).text if text else text for text in texts]
+        with MockLLMServer(latency=self.latency, latency_per_token=self.latency_per_token) as server:
+            client = OpenRouterClient(model_name="gpt-4o-mini", api_key="mock",
+                                      api_base=server.base_url, track_usage=False)
+            # The mock server is not rate limited
+            client.max_requests_per_minute = float("inf")
+            agents = {
+                "demographics": DemographicsAgent(llm_client=client),
+                "genetics": GeneticsAgent(llm_client=client),
+                "phenotypes": PhenotypesAgent(llm_client=client),
+                "treatments": TreatmentsAgent(llm_client=client)
+            }
+            combined_agent = PatientRecordAgent(llm_client=client)
+            return [
+                asyncio.run(self._run_mode(mode, agents, combined_agent, server, texts))
+                for mode in modes
+            ]
+
+    async def _run_mode(self, mode: str, agents: Dict[str, Any], combined_agent: Any,
+                        server: MockLLMServer, texts: List[Optional[str]]) -> ModeRun:
+        from agents.orchestrator.segment_extractor import SegmentExtractor
+
+        extractor = SegmentExtractor(agents, combined_agent=combined_agent, mode=mode,
+                                     followup_threshold=self.followup_threshold)
+        before = server.snapshot()
+        records: List[Dict[str, Any]] = []
+        latencies: List[float] = []
+        followups: Dict[str, int] = {}
+        segments = failed = 0
+
+        wall_start = time.perf_counter()
+        for document, text in zip(self.documents, texts):
+            if text is None:
+                failed += 1
+                continue
+            start = time.perf_counter()
+            for segment_id, segment_text in self._segments(text):
+                extraction = await extractor.extract(segment_text, segment_id)
+                segments += 1
+                for name in extraction.followup_agents:
+                    followups[name] = followups.get(name, 0) + 1
+                records.append(self._to_record(extraction.data, segment_id, document.pmid))
+            latencies.append(time.perf_counter() - start)
+        wall_time = time.perf_counter() - wall_start
+
+        after = server.snapshot()
+        field_metrics = score_records(records, {d.pmid for d in self.documents if d.pmid},
+                                      self.ground_truth_file)
+        return ModeRun(
+            mode=mode,
+            documents=len(self.documents),
+            segments=segments,
+            failed_documents=failed,
+            wall_time=wall_time,
+            latency_p50=_percentile(latencies, 50),
+            latency_p95=_percentile(latencies, 95),
+            requests=after.requests - before.requests,
+            prompt_tokens=after.prompt_tokens - before.prompt_tokens,
+            completion_tokens=after.completion_tokens - before.completion_tokens,
+            macro_f1=statistics.fmean([m["f1"] for m in field_metrics.values()]) if field_metrics else 0.0,
+            followups=followups,
+            field_metrics=field_metrics
+        )
+
+    @staticmethod
+    def _document_text(document: BenchmarkDocument) -> Optional[str]:
+        if document.text:
+            return document.text
+        if document.path:
+            from processors.pdf_parser import PDFParser
+            parsed = PDFParser().process(document.path)
+            if parsed.success:
+                return parsed.data.content
+            logger.error(f"Benchmark document {document.document_id} failed: {parsed.error}")
+        return None
+
+    @staticmethod
+    def _segments(text: str) -> List[tuple]:
+        """(patient id, text) per labelled patient ("Patient 2"), or the whole text."""
+        from processors.patient_segmenter import PatientSegmenter
+
+        spans = PatientSegmenter().find_labeled_spans(text, min_length=1)
+        if not spans:
+            return [("Patient 1", text)]
+        return [(span.patient_id, span.text(text)) for span in spans]
+
+    @staticmethod
+    def _to_record(data: Dict[str, Any], segment_id: str, pmid: Optional[str]) -> Dict[str, Any]:
+        """Agent output in ground truth conventions (sex as m/f)."""
+        record = {**data, "patient_id": segment_id, "pmid": pmid}
+        record["sex"] = SEX_LABELS.get(data.get("sex"))
+        return record
+
+
+def format_mode_runs(runs: List[ModeRun]) -> str:
+    """Human-readable side-by-side comparison of the modes."""
+    lines = [f"{'mode':<12}{'segments':>9}{'requests':>10}{'tokens':>10}{'p50 ms':>9}{'p95 ms':>9}"
+             f"{'macro F1':>10}  fields / follow-ups"]
+    for run in runs:
+        fields = "  ".join(f"{k} {m['f1']:.3f}" for k, m in sorted(run.field_metrics.items()))
+        followups = ", ".join(f"{k} {v}" for k, v in sorted(run.followups.items()))
+        lines.append(
+            f"{run.mode:<12}{run.segments:>9}{run.requests:>10}{run.total_tokens:>10}"
+            f"{run.latency_p50 * 1000:>9.0f}{run.latency_p95 * 1000:>9.0f}{run.macro_f1:>10.3f}  "
+            f"{fields}{'  | ' + followups if followups else ''}"
+        )
+    return "\n".join(lines)
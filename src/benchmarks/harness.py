@@ -0,0 +1,562 @@
+"""
+Reproducible extraction benchmark.
+
+Replays a fixed corpus (the bundled Leigh syndrome PDF and the abstracts that
+have ground truth) through the LangExtract pipeline against the local mock
+LLM server, and records per-document stage timings, token usage and
+field-level F1 in a SQLite results database. Runs can be compared to flag
+throughput, latency, token and accuracy regressions.
+"""
+
+import json
+import logging
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .mock_llm import MockLLMServer
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INPUT_DIR = REPO_ROOT / "data" / "input"
+DEFAULT_GROUND_TRUTH = REPO_ROOT / "data" / "ground_truth" / "full-Items.csv"
+DEFAULT_RESULTS_DB = REPO_ROOT / "data" / "benchmarks" / "benchmarks.db"
+
+# Fields scored against ground truth (normalized FeedbackLoop names)
+SCORED_FIELDS = ("sex", "age_of_onset", "gene", "mutations")
+
+
+@dataclass
+class BenchmarkDocument:
+    """A corpus document; ``text`` is None for PDFs until parsed."""
+    document_id: str
+    source: str
+    pmid: Optional[str] = None
+    path: Optional[str] = None
+    text: Optional[str] = None
+
+
+@dataclass
+class DocumentResult:
+    """Measurements for one document of a benchmark run."""
+    document_id: str
+    source: str
+    pmid: Optional[str]
+    chars: int
+    latency: float
+    stage_timings: Dict[str, float]
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class BenchmarkRun:
+    """Summary of a benchmark run."""
+    run_id: str
+    label: str
+    started_at: str
+    git_commit: Optional[str]
+    config: Dict[str, Any]
+    documents: int
+    failed_documents: int
+    wall_time: float
+    throughput: float
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    macro_f1: float
+    stage_totals: Dict[str, float] = field(default_factory=dict)
+    field_metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class Regression:
+    """Change of one metric between two runs."""
+    metric: str
+    baseline: float
+    candidate: float
+    change: float
+    regressed: bool
+
+
+def load_corpus(input_dir: Path = DEFAULT_INPUT_DIR,
+                ground_truth_file: Path = DEFAULT_GROUND_TRUTH,
+                limit: Optional[int] = 20,
+                include_pdfs: bool = True) -> List[BenchmarkDocument]:
+    """
+    Load the fixed benchmark corpus.
+
+    Args:
+        input_dir: Directory with PDFs and the abstracts CSV
+        ground_truth_file: Ground truth CSV; only abstracts with ground truth are used
+        limit: Maximum number of abstracts (in file order)
+        include_pdfs: Whether to include the bundled PDFs
+
+    Returns:
+        Documents in a deterministic order
+    """
+    input_dir = Path(input_dir)
+    truth_pmids = set()
+    if Path(ground_truth_file).exists():
+        truth = pd.read_csv(ground_truth_file, usecols=["PMID"]).dropna()
+        truth_pmids = {str(int(p)) for p in truth["PMID"]}
+
+    documents = []
+    if include_pdfs:
+        for pdf in sorted(input_dir.glob("*.pdf")):
+            pmid = pdf.stem.upper().replace("PMID", "") or None
+            documents.append(BenchmarkDocument(document_id=pdf.stem, source="pdf", pmid=pmid, path=str(pdf)))
+
+    abstracts_file = next(iter(sorted(input_dir.glob("*abstracts*.csv"))), None)
+    if abstracts_file is not None:
+        abstracts = pd.read_csv(abstracts_file, usecols=["PMID", "Title", "Abstract"]).dropna(subset=["Abstract"])
+        count = 0
+        for row in abstracts.itertuples(index=False):
+            pmid = str(int(row.PMID))
+            if truth_pmids and pmid not in truth_pmids:
+                continue
+            if limit is not None and count >= limit:
+                break
+            documents.append(BenchmarkDocument(
+                document_id=f"PMID{pmid}", source="abstract", pmid=pmid,
+                text=f"{row.Title}\n\n{row.Abstract}"
+            ))
+            count += 1
+
+    return documents
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class BenchmarkResultsDB:
+    """SQLite store for benchmark runs."""
+
+    def __init__(self, db_path: Path = DEFAULT_RESULTS_DB):
+        """
+        Initialize the results database.
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_database()
+
+    def _init_database(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS benchmark_runs (
+                    run_id TEXT PRIMARY KEY,
+                    label TEXT,
+                    started_at TEXT,
+                    git_commit TEXT,
+                    config TEXT,
+                    documents INTEGER,
+                    failed_documents INTEGER,
+                    wall_time REAL,
+                    throughput REAL,
+                    latency_p50 REAL,
+                    latency_p95 REAL,
+                    latency_max REAL,
+                    requests INTEGER,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    macro_f1 REAL,
+                    stage_totals TEXT
+                );
+                CREATE TABLE IF NOT EXISTS benchmark_documents (
+                    run_id TEXT,
+                    document_id TEXT,
+                    source TEXT,
+                    chars INTEGER,
+                    latency REAL,
+                    stage_timings TEXT,
+                    requests INTEGER,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    records INTEGER,
+                    error TEXT,
+                    PRIMARY KEY (run_id, document_id)
+                );
+                CREATE TABLE IF NOT EXISTS benchmark_field_metrics (
+                    run_id TEXT,
+                    field_name TEXT,
+                    precision_score REAL,
+                    recall_score REAL,
+                    f1_score REAL,
+                    support INTEGER,
+                    PRIMARY KEY (run_id, field_name)
+                );
+                CREATE INDEX IF NOT EXISTS idx_benchmark_runs_started ON benchmark_runs(started_at);
+            """)
+
+    def save_run(self, run: BenchmarkRun, documents: List[DocumentResult]):
+        """Store a run with its per-document results and field metrics."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT INTO benchmark_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                run.run_id, run.label, run.started_at, run.git_commit, json.dumps(run.config),
+                run.documents, run.failed_documents, run.wall_time, run.throughput,
+                run.latency_p50, run.latency_p95, run.latency_max, run.requests,
+                run.prompt_tokens, run.completion_tokens, run.macro_f1, json.dumps(run.stage_totals)
+            ))
+            conn.executemany("""
+                INSERT INTO benchmark_documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (run.run_id, d.document_id, d.source, d.chars, d.latency, json.dumps(d.stage_timings),
+                 d.requests, d.prompt_tokens, d.completion_tokens, len(d.records), d.error)
+                for d in documents
+            ])
+            conn.executemany("""
+                INSERT INTO benchmark_field_metrics VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (run.run_id, name, m["precision"], m["recall"], m["f1"], m["support"])
+                for name, m in run.field_metrics.items()
+            ])
+
+    def get_run(self, run_id: str) -> Optional[BenchmarkRun]:
+        """Load a run by id, or 'latest' / 'previous' for the newest two runs."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            if run_id in ("latest", "previous"):
+                offset = 0 if run_id == "latest" else 1
+                row = conn.execute(
+                    "SELECT * FROM benchmark_runs ORDER BY started_at DESC LIMIT 1 OFFSET ?", (offset,)
+                ).fetchone()
+            else:
+                row = conn.execute("SELECT * FROM benchmark_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+
+            data = dict(row)
+            data["config"] = json.loads(data["config"] or "{}")
+            data["stage_totals"] = json.loads(data["stage_totals"] or "{}")
+            data["field_metrics"] = {
+                r["field_name"]: {
+                    "precision": r["precision_score"], "recall": r["recall_score"],
+                    "f1": r["f1_score"], "support": r["support"]
+                }
+                for r in conn.execute(
+                    "SELECT * FROM benchmark_field_metrics WHERE run_id = ?", (data["run_id"],)
+                )
+            }
+            return BenchmarkRun(**data)
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("""
+                SELECT run_id, label, started_at, git_commit, documents, throughput,
+                       latency_p50, latency_p95, prompt_tokens + completion_tokens AS tokens, macro_f1
+                FROM benchmark_runs ORDER BY started_at DESC LIMIT ?
+            """, (limit,)).fetchall()
+            return [dict(r) for r in rows]
+
+
+class BenchmarkHarness:
+    """Runs the corpus through the extraction pipeline against the mock LLM."""
+
+    def __init__(self,
+                 documents: List[BenchmarkDocument],
+                 ground_truth_file: Optional[Path] = DEFAULT_GROUND_TRUTH,
+                 results_db: Optional[BenchmarkResultsDB] = None,
+                 latency: float = 0.0,
+                 latency_per_token: float = 0.0,
+                 extraction_passes: int = 1,
+                 max_workers: int = 1,
+                 max_char_buffer: int = 1200,
+                 reduce_input: bool = True):
+        """
+        Initialize the harness.
+
+        Args:
+            documents: Corpus to replay
+            ground_truth_file: Ground truth CSV for field-level F1 (None to skip)
+            results_db: Where to store runs (None to keep results in memory only)
+            latency: Simulated fixed LLM latency per request, in seconds
+            latency_per_token: Simulated LLM latency per completion token
+            extraction_passes: LangExtract passes per chunk
+            max_workers: LangExtract parallel workers
+            max_char_buffer: LangExtract chunk size
+            reduce_input: Whether LangExtract gets only the relevant sections
+        """
+        self.documents = documents
+        self.ground_truth_file = ground_truth_file
+        self.results_db = results_db
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.reduce_input = reduce_input
+        self.extraction_options = {
+            "extraction_passes": extraction_passes,
+            "max_workers": max_workers,
+            "max_char_buffer": max_char_buffer
+        }
+
+    def run(self, label: str = "") -> BenchmarkRun:
+        """
+        Replay the corpus once.
+
+        Args:
+            label: Free-form label stored with the run
+
+        Returns:
+            Run summary (also stored in the results database if configured)
+        """
+        from langextract_integration.extractor import LangExtractEngine
+
+        started_at = datetime.now().isoformat()
+        with MockLLMServer(latency=self.latency, latency_per_token=self.latency_per_token) as server:
+            # The segment cache would hide the extraction path being measured
+            engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                       api_base=server.base_url, enable_cache=False,
+                                       reduce_input=self.reduce_input)
+            wall_start = time.perf_counter()
+            results = [self._run_document(engine, server, doc) for doc in self.documents]
+            wall_time = time.perf_counter() - wall_start
+
+        latencies = [r.latency for r in results if r.error is None]
+        stage_totals: Dict[str, float] = {}
+        for result in results:
+            for stage, seconds in result.stage_timings.items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+        field_metrics = self.score(results)
+        run = BenchmarkRun(
+            run_id=f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}",
+            label=label,
+            started_at=started_at,
+            git_commit=_git_commit(),
+            config={
+                **self.extraction_options,
+                "latency": self.latency,
+                "latency_per_token": self.latency_per_token,
+                "reduce_input": self.reduce_input,
+                "documents": [d.document_id for d in self.documents]
+            },
+            documents=len(results),
+            failed_documents=sum(1 for r in results if r.error),
+            wall_time=wall_time,
+            throughput=len(latencies) / wall_time if wall_time > 0 else 0.0,
+            latency_p50=_percentile(latencies, 50),
+            latency_p95=_percentile(latencies, 95),
+            latency_max=max(latencies, default=0.0),
+            requests=sum(r.requests for r in results),
+            prompt_tokens=sum(r.prompt_tokens for r in results),
+            completion_tokens=sum(r.completion_tokens for r in results),
+            macro_f1=statistics.fmean([m["f1"] for m in field_metrics.values()]) if field_metrics else 0.0,
+            stage_totals=stage_totals,
+            field_metrics=field_metrics
+        )
+
+        if self.results_db is not None:
+            self.results_db.save_run(run, results)
+        return run
+
+    def _run_document(self, engine, server: MockLLMServer, document: BenchmarkDocument) -> DocumentResult:
+        before = server.snapshot()
+        stage_timings: Dict[str, float] = {}
+        records: List[Dict[str, Any]] = []
+        error = None
+        text = document.text or ""
+
+        start = time.perf_counter()
+        try:
+            if text == "" and document.path:
+                from processors.pdf_parser import PDFParser
+                parse_start = time.perf_counter()
+                parsed = PDFParser().process(document.path)
+                stage_timings["parse"] = time.perf_counter() - parse_start
+                if not parsed.success:
+                    raise RuntimeError(parsed.error)
+                text = parsed.data.content
+
+            result = engine.extract_from_text(text, include_visualization=False, **self.extraction_options)
+            stage_timings.update(result.get("extraction_metadata", {}).get("stage_timings", {}))
+            records = [
+                {**record, "pmid": document.pmid} for record in result.get("normalized_data", [])
+            ]
+        except Exception as e:
+            logger.error(f"Benchmark document {document.document_id} failed: {e}")
+            error = str(e)
+        latency = time.perf_counter() - start
+
+        after = server.snapshot()
+        return DocumentResult(
+            document_id=document.document_id,
+            source=document.source,
+            pmid=document.pmid,
+            chars=len(text),
+            latency=latency,
+            stage_timings=stage_timings,
+            requests=after.requests - before.requests,
+            prompt_tokens=after.prompt_tokens - before.prompt_tokens,
+            completion_tokens=after.completion_tokens - before.completion_tokens,
+            records=records,
+            error=error
+        )
+
+    def score(self, results: List[DocumentResult]) -> Dict[str, Dict[str, float]]:
+        """Field-level precision, recall and F1 of the run against ground truth."""
+        return score_records(
+            [record for result in results for record in result.records],
+            {r.pmid for r in results if r.pmid},
+            self.ground_truth_file
+        )
+
+
+def score_records(records: List[Dict[str, Any]],
+                  pmids: set,
+                  ground_truth_file: Optional[Path]) -> Dict[str, Dict[str, float]]:
+    """
+    Field-level precision, recall and F1 against ground truth.
+
+    Predictions and ground truth rows for the given PMIDs are aligned per
+    patient by FeedbackLoop and scored on SCORED_FIELDS.
+
+    Args:
+        records: Predicted patient records, each with a ``pmid``
+        pmids: PMIDs of the scored documents
+        ground_truth_file: Ground truth CSV (None or missing to skip scoring)
+
+    Returns:
+        Metrics per scored field
+    """
+    if not ground_truth_file or not Path(ground_truth_file).exists():
+        return {}
+
+    from core.feedback_loop import FeedbackLoop
+
+    truth = pd.read_csv(ground_truth_file, dtype=object)
+    truth = truth[truth["PMID"].isin(pmids)]
+
+    with tempfile.TemporaryDirectory() as storage:
+        feedback = FeedbackLoop(storage_path=storage)
+        keep = set(SCORED_FIELDS) | {"pmid", "patient_id"}
+        ground_truth = [
+            {k: v for k, v in feedback._normalize_record(row).items() if k in keep}
+            for row in truth.to_dict("records")
+        ]
+        predictions = [
+            {k: v for k, v in feedback._normalize_record(record).items() if k in keep}
+            for record in records
+        ]
+        validation = feedback.compare_predictions(predictions, ground_truth, "benchmark")
+
+    metrics = {}
+    for name in SCORED_FIELDS:
+        field_metrics = validation.field_metrics.get(name)
+        if field_metrics is None:
+            continue
+        p, r = field_metrics.precision, field_metrics.recall
+        metrics[name] = {
+            "precision": p,
+            "recall": r,
+            "f1": 2 * p * r / (p + r) if p + r > 0 else 0.0,
+            "support": field_metrics.total_ground_truth
+        }
+    return metrics
+
+
+def compare_runs(baseline: BenchmarkRun,
+                 candidate: BenchmarkRun,
+                 performance_tolerance: float = 0.10,
+                 accuracy_tolerance: float = 0.02,
+                 latency_floor: float = 0.05) -> List[Regression]:
+    """
+    Compare two runs metric by metric.
+
+    Args:
+        baseline: Reference run
+        candidate: Run to check
+        performance_tolerance: Allowed relative slowdown / token increase
+        accuracy_tolerance: Allowed absolute F1 drop
+        latency_floor: Latency changes smaller than this many seconds are noise
+
+    Returns:
+        One entry per compared metric; ``regressed`` marks the ones outside tolerance
+    """
+    comparisons = []
+
+    def relative(metric: str, base: float, cand: float, higher_is_better: bool, floor: float = 0.0):
+        change = (cand - base) / base if base else 0.0
+        worse = -change if higher_is_better else change
+        regressed = worse > performance_tolerance and abs(cand - base) > floor
+        comparisons.append(Regression(metric, base, cand, change, regressed))
+
+    def absolute(metric: str, base: float, cand: float):
+        change = cand - base
+        comparisons.append(Regression(metric, base, cand, change, -change > accuracy_tolerance))
+
+    relative("throughput", baseline.throughput, candidate.throughput, higher_is_better=True)
+    relative("latency_p50", baseline.latency_p50, candidate.latency_p50, higher_is_better=False,
+             floor=latency_floor)
+    relative("latency_p95", baseline.latency_p95, candidate.latency_p95, higher_is_better=False,
+             floor=latency_floor)
+    relative("requests", baseline.requests, candidate.requests, higher_is_better=False)
+    relative("total_tokens", baseline.prompt_tokens + baseline.completion_tokens,
+             candidate.prompt_tokens + candidate.completion_tokens, higher_is_better=False)
+    absolute("macro_f1", baseline.macro_f1, candidate.macro_f1)
+    for name, metrics in baseline.field_metrics.items():
+        if name in candidate.field_metrics:
+            absolute(f"f1.{name}", metrics["f1"], candidate.field_metrics[name]["f1"])
+
+    return comparisons
+
+
+def format_run(run: BenchmarkRun) -> str:
+    """Human-readable run summary."""
+    lines = [
+        f"Run {run.run_id} {run.label}".rstrip(),
+        f"  commit {run.git_commit or '-'}  documents {run.documents} ({run.failed_documents} failed)",
+        f"  wall {run.wall_time:.2f}s  throughput {run.throughput:.2f} docs/s",
+        f"  latency p50 {run.latency_p50 * 1000:.0f}ms  p95 {run.latency_p95 * 1000:.0f}ms  "
+        f"max {run.latency_max * 1000:.0f}ms",
+        f"  requests {run.requests}  tokens {run.prompt_tokens} prompt / {run.completion_tokens} completion",
+        "  stages " + "  ".join(f"{k} {v:.2f}s" for k, v in sorted(run.stage_totals.items())),
+        f"  macro F1 {run.macro_f1:.3f}  " + "  ".join(
+            f"{k} {m['f1']:.3f}" for k, m in sorted(run.field_metrics.items())
+        ),
+    ]
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: List[Regression]) -> str:
+    """Human-readable comparison table."""
+    lines = [f"{'metric':<18}{'baseline':>12}{'candidate':>12}{'change':>10}"]
+    for c in comparisons:
+        change = f"{c.change:+.1%}" if not c.metric.startswith(("f1", "macro")) else f"{c.change:+.3f}"
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(f"{c.metric:<18}{c.baseline:>12.4g}{c.candidate:>12.4g}{change:>10}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,323 @@
+"""
+Deterministic local mock of an OpenAI-compatible chat completions API.
+
+The benchmark harness points the extraction pipeline at this server so runs
+need no network access or API spend. Answers are produced by simple regex
+rules over the text being extracted (patients, sex, age, genes, variants,
+phenotypes), so the same prompt always yields the same answer, token count
+and simulated latency.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PATIENT_MARKER = re.compile(r'\b(?:Patient|Case|Proband)\s+(\d+|[A-Z])\b')
+SEX_WORDS = {
+    'girl': 'f', 'female': 'f', 'woman': 'f', 'daughter': 'f', 'she': 'f',
+    'boy': 'm', 'male': 'm', 'man': 'm', 'son': 'm', 'he': 'm'
+}
+SEX_PATTERN = re.compile(r'\b(' + '|'.join(SEX_WORDS) + r')\b', re.IGNORECASE)
+AGE_PATTERN = re.compile(r'\b(\d+(?:\.\d+)?)[- ](year|month|week|day)s?[- ]old\b', re.IGNORECASE)
+AGE_UNITS = {'year': 1.0, 'month': 1 / 12, 'week': 1 / 52, 'day': 1 / 365}
+GENE_PATTERN = re.compile(r'\b((?:MT-)?[A-Z][A-Z0-9]{1,9}\d[A-Z0-9]*)\b')
+CDNA_PATTERN = re.compile(r'\b([cm]\.\d[\w+*>_-]*)')
+PROTEIN_PATTERN = re.compile(r'\b(p\.\(?[A-Z][a-z]{2}\d+[A-Za-z*]+\)?)')
+PHENOTYPE_TERMS = (
+    'seizures', 'epilepsy', 'hypotonia', 'developmental delay', 'developmental regression',
+    'ataxia', 'dystonia', 'lactic acidosis', 'encephalopathy', 'nystagmus', 'ophthalmoplegia',
+    'respiratory failure', 'spasticity', 'optic atrophy', 'hearing loss', 'cardiomyopathy',
+    'failure to thrive', 'vomiting', 'ptosis', 'dysphagia'
+)
+DEATH_PATTERN = re.compile(r'\b(died|death|deceased|passed away)\b', re.IGNORECASE)
+# Field lists of the agent system prompts ("- field_name: description")
+FIELD_LIST_PATTERN = re.compile(r'^\s*-\s*(\w+):', re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def mock_extract_patients(text: str) -> List[Dict[str, Any]]:
+    """
+    Rule-based patient extraction used to answer mock LLM requests.
+
+    Args:
+        text: Text to extract from
+
+    Returns:
+        One attribute dict per patient, in the PatientRecord schema
+    """
+    markers = list(PATIENT_MARKER.finditer(text))
+    if markers:
+        sections = [
+            (f"Patient {m.group(1)}", text[m.start():markers[i + 1].start() if i + 1 < len(markers) else len(text)])
+            for i, m in enumerate(markers)
+        ]
+        # Repeated mentions of the same patient describe one record
+        merged: Dict[str, str] = {}
+        for label, section in sections:
+            merged[label] = merged.get(label, '') + ' ' + section
+        sections = list(merged.items())
+    else:
+        sections = [("Patient 1", text)]
+
+    patients = []
+    for label, section in sections:
+        sex_match = SEX_PATTERN.search(section)
+        age_match = AGE_PATTERN.search(section)
+        genes = list(dict.fromkeys(GENE_PATTERN.findall(section)))
+        cdnas = CDNA_PATTERN.findall(section)
+        proteins = PROTEIN_PATTERN.findall(section)
+        lowered = section.lower()
+
+        mutations = []
+        for i, gene in enumerate(genes[:2]):
+            mutations.append({"Mutation": {
+                "gene": gene,
+                "cdna": cdnas[i] if i < len(cdnas) else None,
+                "protein": proteins[i] if i < len(proteins) else None,
+                "zygosity": "unknown",
+                "inheritance": None
+            }})
+
+        patients.append({
+            "patient_label": label,
+            "sex": SEX_WORDS[sex_match.group(1).lower()] if sex_match else None,
+            "age_of_onset_years": (
+                round(float(age_match.group(1)) * AGE_UNITS[age_match.group(2).lower()], 2)
+                if age_match else None
+            ),
+            "age_at_diagnosis_years": None,
+            "last_seen_age_years": None,
+            "alive_flag": 1 if DEATH_PATTERN.search(section) else None,
+            "consanguinity": None,
+            "family_history": None,
+            "mutations": mutations,
+            "phenotypes": [
+                {"PhenotypeMention": {"surface_form": term, "negated": False}}
+                for term in PHENOTYPE_TERMS if term in lowered
+            ],
+            "treatments": []
+        })
+    return patients
+
+
+def mock_flat_record(text: str) -> Dict[str, Any]:
+    """
+    First patient of ``mock_extract_patients`` in the flat schema of the
+    extraction agents (sex 0=male/1=female, mutations as a string).
+    """
+    patient = mock_extract_patients(text)[0]
+    mutation = patient["mutations"][0]["Mutation"] if patient["mutations"] else {}
+    return {
+        "patient_id": patient["patient_label"],
+        "sex": {"m": 0, "f": 1}.get(patient["sex"]),
+        "age_of_onset": patient["age_of_onset_years"],
+        "_0_alive_1_dead": patient["alive_flag"],
+        "gene": mutation.get("gene"),
+        "mutations": mutation.get("cdna") or mutation.get("protein"),
+        "additional_genes": [m["Mutation"]["gene"] for m in patient["mutations"][1:]],
+        "phenotypes": [p["PhenotypeMention"]["surface_form"] for p in patient["phenotypes"]],
+        "symptoms": [],
+        "treatment_description": None,
+        "outcome": None
+    }
+
+
+def _grounding_text(text: str) -> str:
+    """A short verbatim span of the source text for LangExtract alignment."""
+    sentence = re.split(r'(?<=[.!?])\s', text.strip(), maxsplit=1)[0]
+    return sentence[:160]
+
+
+def build_completion(messages: List[Dict[str, Any]], langextract: bool) -> str:
+    """
+    Build the assistant answer for a chat request.
+
+    LangExtract requests get ``{"extractions": [...]}`` for the text of the
+    final ``Q:`` block. Agent requests whose system prompt lists fields get
+    those fields of the first patient (plus per-field confidences when asked
+    for); other requests get the first patient as flat JSON.
+    """
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    if langextract:
+        question = prompt.rsplit("\nQ: ", 1)[-1] if "\nQ: " in prompt else prompt
+        text = question.rsplit("\nA:", 1)[0].strip()
+        patients = mock_extract_patients(text)
+        grounding = _grounding_text(text)
+        return json.dumps({"extractions": [
+            {"PatientRecord": grounding, "PatientRecord_attributes": patient} for patient in patients
+        ]})
+    system = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    requested = FIELD_LIST_PATTERN.findall(system)
+    if requested:
+        text = prompt.split("PATIENT TEXT:", 1)[-1]
+        record = mock_flat_record(text)
+        answer = {name: record.get(name) for name in requested}
+        if '"confidence"' in system:
+            answer["confidence"] = {name: 0.9 for name, value in answer.items() if value not in (None, [])}
+        return json.dumps(answer)
+    return json.dumps(mock_extract_patients(prompt)[0])
+
+
+@dataclass
+class MockUsage:
+    """Cumulative usage served by the mock server."""
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+class MockLLMServer:
+    """
+    Local OpenAI-compatible server for benchmarks and tests.
+
+    Example:
+        with MockLLMServer(latency=0.02) as server:
+            engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                       api_base=server.base_url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, latency_per_token: float = 0.0,
+                 model_id: str = "mock/biomedical-extractor"):
+        """
+        Initialize the mock server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Fixed simulated latency per request, in seconds
+            latency_per_token: Additional simulated latency per completion token
+            model_id: Model id reported by /models
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.model_id = model_id
+        self.usage = MockUsage()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def snapshot(self) -> MockUsage:
+        """Copy of the cumulative usage counters."""
+        with self._lock:
+            return MockUsage(**asdict(self.usage))
+
+    def complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a chat completions payload (also usable without HTTP)."""
+        messages = payload.get("messages", [])
+        response_format = payload.get("response_format") or {}
+        langextract = (
+            response_format.get("json_schema", {}).get("name") == "langextract_extractions"
+            or any("\nQ: " in str(m.get("content", "")) for m in messages)
+        )
+        content = build_completion(messages, langextract)
+
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = estimate_tokens(content)
+        with self._lock:
+            self.usage.requests += 1
+            self.usage.prompt_tokens += prompt_tokens
+            self.usage.completion_tokens += completion_tokens
+
+        delay = self.latency + self.latency_per_token * completion_tokens
+        if delay > 0:
+            time.sleep(delay)
+
+        return {
+            "id": f"mock-{self.usage.requests}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": payload.get("model", self.model_id),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, body: Dict[str, Any]):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"data": [{"id": server.model_id, "pricing": {}}]})
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                    self._send_json(200, server.complete(payload))
+                except Exception as e:
+                    logger.error(f"Mock LLM request failed: {e}")
+                    self._send_json(500, {"error": {"message": str(e)}})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -10,15 +10,41 @@ This module provides the core system components:
 - Prompt optimization
 - Document loading
 - Unified orchestrator
+- Durable task queue
+- Event bus for server push
+- Background extraction jobs
 """
 
-from .config import Config
-from .base import BaseProcessor, ProcessingResult
-from .logging_config import setup_logging
-from .api_usage_tracker import APIUsageTracker
-from .feedback_loop import FeedbackLoop
-from .prompt_optimization import PromptOptimizer
-from .unified_orchestrator import UnifiedOrchestrator
+import importlib
+
+# Exports are imported on first access so that lightweight submodules (config,
+# service container, task queue) can be used without loading the extraction
+# and ML stack pulled in by the orchestrators.
+_LAZY_EXPORTS = {
+    'Config': '.config',
+    'BaseProcessor': '.base',
+    'ProcessingResult': '.base',
+    'setup_logging': '.logging_config',
+    'APIUsageTracker': '.api_usage_tracker',
+    'FeedbackLoop': '.feedback_loop',
+    'PromptOptimizer': '.prompt_optimization',
+    'UnifiedOrchestrator': '.unified_orchestrator',
+    'DurableTaskQueue': '.task_queue',
+    'EventBus': '.event_bus',
+    'get_event_bus': '.event_bus',
+    'ResponseCache': '.response_cache',
+    'get_response_cache': '.response_cache',
+    'invalidate_responses': '.response_cache',
+    'ExtractionJobManager': '.extraction_jobs',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'Config',
@@ -28,5 +54,11 @@ __all__ = [
     'APIUsageTracker',
     'FeedbackLoop',
     'PromptOptimizer',
-    'UnifiedOrchestrator'
+    'UnifiedOrchestrator',
+    'DurableTaskQueue',
+    'EventBus',
+    'get_event_bus',
+    'ResponseCache',
+    'get_response_cache',
+    'invalidate_responses'
 ]
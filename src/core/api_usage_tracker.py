@@ -1,10 +1,21 @@
 """
 API Usage Tracker for monitoring and limiting API requests.
+
+Quota checks are answered from in-memory per-day and per-month request
+counters, rehydrated at startup from the daily rows of ``usage_summaries``.
+Usage records are queued and written by a background thread in batches
+(when ``batch_size`` records are pending or ``flush_interval`` seconds have
+passed), together with the matching daily summary increments. Read methods
+flush pending records first.
 """
 
+import atexit
+import queue
 import sqlite3
 import json
+import threading
 import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
@@ -37,13 +48,57 @@ class UsageStats:
     total_cost: float
     average_response_time: float
 
+_STOP = object()
+
+
+def _day_start(timestamp: float) -> float:
+    """Local midnight of the day containing ``timestamp``."""
+    return datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def _month_start(timestamp: float) -> float:
+    """Local midnight of the first day of the month containing ``timestamp``."""
+    return datetime.fromtimestamp(timestamp).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    ).timestamp()
+
+
+def _close_on_exit(tracker_ref: 'weakref.ref[APIUsageTracker]'):
+    tracker = tracker_ref()
+    if tracker is not None:
+        tracker.close()
+
+
 class APIUsageTracker:
     """Tracks API usage and enforces limits."""
     
-    def __init__(self, database_path: str = "./data/api_usage.db"):
+    def __init__(self, database_path: str = "./data/api_usage.db",
+                 batch_size: int = 100, flush_interval: float = 1.0):
+        """
+        Initialize the usage tracker.
+        
+        Args:
+            database_path: SQLite database path
+            batch_size: Pending records that trigger a write
+            flush_interval: Maximum seconds a record waits before being written
+        """
         self.database_path = Path(database_path)
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        # Request counters keyed by (provider, period start)
+        self._daily_requests: Dict[Tuple[str, float], int] = {}
+        self._monthly_requests: Dict[Tuple[str, float], int] = {}
+        self._counter_lock = threading.Lock()
+        
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        
         self._init_database()
+        self._load_counters()
+        atexit.register(_close_on_exit, weakref.ref(self))
     
     def _init_database(self):
         """Initialize the SQLite database with required tables."""
@@ -102,6 +157,10 @@ class APIUsageTracker:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_usage_timestamp ON api_usage(timestamp)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_usage_provider ON api_usage(api_provider)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_usage_success ON api_usage(success)")
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_usage_summaries_period
+                    ON usage_summaries(period_type, period_start, api_provider)
+                """)
                 
                 conn.commit()
                 log.info(f"API usage database initialized at {self.database_path}")
@@ -110,32 +169,169 @@ class APIUsageTracker:
             log.error(f"Failed to initialize API usage database: {e}")
             raise
     
-    def record_request(self, record: APIUsageRecord) -> bool:
-        """Record an API request in the database."""
+    def _load_counters(self):
+        """Rehydrate quota counters for the current month from daily summaries."""
         try:
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
                 
+                cursor.execute("SELECT 1 FROM usage_summaries WHERE period_type = 'day' LIMIT 1")
+                if cursor.fetchone() is None:
+                    # Databases written before daily summaries existed
+                    cursor.execute("""
+                        INSERT INTO usage_summaries (
+                            period_start, period_end, period_type, api_provider, total_requests,
+                            successful_requests, failed_requests, total_tokens, total_cost
+                        )
+                        SELECT
+                            CAST(strftime('%s', date(timestamp, 'unixepoch', 'localtime'), 'utc') AS REAL),
+                            CAST(strftime('%s', date(timestamp, 'unixepoch', 'localtime', '+1 day'), 'utc') AS REAL),
+                            'day', api_provider, COUNT(*),
+                            SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
+                            SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END),
+                            COALESCE(SUM(total_tokens), 0), COALESCE(SUM(cost), 0.0)
+                        FROM api_usage
+                        GROUP BY 1, api_provider
+                    """)
+                    conn.commit()
+                
+                month_start = _month_start(time.time())
                 cursor.execute("""
+                    SELECT api_provider, period_start, total_requests FROM usage_summaries
+                    WHERE period_type = 'day' AND period_start >= ?
+                """, (month_start,))
+                
+                with self._counter_lock:
+                    for api_provider, period_start, total_requests in cursor.fetchall():
+                        self._daily_requests[(api_provider, period_start)] = total_requests
+                        month_key = (api_provider, _month_start(period_start))
+                        self._monthly_requests[month_key] = (
+                            self._monthly_requests.get(month_key, 0) + total_requests
+                        )
+        except Exception as e:
+            log.error(f"Failed to load API usage counters: {e}")
+    
+    def record_request(self, record: APIUsageRecord) -> bool:
+        """Count an API request and queue it for the batched database writer."""
+        try:
+            with self._counter_lock:
+                day_key = (record.api_provider, _day_start(record.timestamp))
+                month_key = (record.api_provider, _month_start(record.timestamp))
+                self._daily_requests[day_key] = self._daily_requests.get(day_key, 0) + 1
+                self._monthly_requests[month_key] = self._monthly_requests.get(month_key, 0) + 1
+            
+            self._ensure_writer()
+            self._queue.put(record)
+            log.debug(f"Recorded API request: {record.api_provider} - {record.model}")
+            return True
+            
+        except Exception as e:
+            log.error(f"Failed to record API request: {e}")
+            return False
+    
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="api-usage-writer", daemon=True)
+                self._writer.start()
+    
+    def _writer_loop(self):
+        """Write queued records when the batch is full, stale, or a flush is requested."""
+        batch: List[APIUsageRecord] = []
+        waiters: List[threading.Event] = []
+        deadline = 0.0
+        
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None and item is not _STOP:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+            
+            if batch and (item is None or item is _STOP or waiters or len(batch) >= self.batch_size):
+                self._write_batch(batch)
+                batch = []
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+            
+            if item is _STOP:
+                return
+    
+    def _write_batch(self, records: List[APIUsageRecord]):
+        """Insert records and increment their daily summaries in one transaction."""
+        summaries: Dict[Tuple[str, float], List[float]] = {}
+        for record in records:
+            totals = summaries.setdefault((record.api_provider, _day_start(record.timestamp)), [0, 0, 0, 0, 0.0])
+            totals[0] += 1
+            totals[1 if record.success else 2] += 1
+            totals[3] += record.total_tokens or 0
+            totals[4] += record.cost or 0.0
+        
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.executemany("""
                     INSERT INTO api_usage (
                         timestamp, api_provider, model, prompt_tokens, 
                         completion_tokens, total_tokens, cost, success, 
                         error_message, request_id
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                """, [(
                     record.timestamp, record.api_provider, record.model,
                     record.prompt_tokens, record.completion_tokens, 
                     record.total_tokens, record.cost, record.success,
                     record.error_message, record.request_id
-                ))
+                ) for record in records])
+                
+                cursor.executemany("""
+                    INSERT INTO usage_summaries (
+                        period_start, period_end, period_type, api_provider, total_requests,
+                        successful_requests, failed_requests, total_tokens, total_cost
+                    ) VALUES (?, ?, 'day', ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(period_type, period_start, api_provider) DO UPDATE SET
+                        total_requests = total_requests + excluded.total_requests,
+                        successful_requests = successful_requests + excluded.successful_requests,
+                        failed_requests = failed_requests + excluded.failed_requests,
+                        total_tokens = total_tokens + excluded.total_tokens,
+                        total_cost = total_cost + excluded.total_cost
+                """, [(
+                    day_start,
+                    (datetime.fromtimestamp(day_start) + timedelta(days=1)).timestamp(),
+                    api_provider, *totals
+                ) for (api_provider, day_start), totals in summaries.items()])
                 
                 conn.commit()
-                log.debug(f"Recorded API request: {record.api_provider} - {record.model}")
-                return True
+                log.debug(f"Wrote {len(records)} API usage records")
                 
         except Exception as e:
-            log.error(f"Failed to record API request: {e}")
-            return False
+            log.error(f"Failed to write {len(records)} API usage records: {e}")
+    
+    def flush(self, timeout: Optional[float] = 10.0):
+        """Block until all queued usage records are written."""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def close(self):
+        """Write pending records and stop the writer thread."""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        writer.join(timeout=10.0)
     
     def check_daily_limit(self, api_provider: str, limit: int) -> Tuple[bool, int, int]:
         """
@@ -145,21 +341,12 @@ class APIUsageTracker:
             Tuple of (can_proceed, current_usage, remaining_requests)
         """
         try:
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+            key = (api_provider, _day_start(time.time()))
+            with self._counter_lock:
+                current_usage = self._daily_requests.get(key, 0)
             
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT COUNT(*) FROM api_usage 
-                    WHERE api_provider = ? AND timestamp >= ?
-                """, (api_provider, today_start))
-                
-                current_usage = cursor.fetchone()[0]
-                remaining = max(0, limit - current_usage)
-                can_proceed = current_usage < limit
-                
-                return can_proceed, current_usage, remaining
+            remaining = max(0, limit - current_usage)
+            return current_usage < limit, current_usage, remaining
                 
         except Exception as e:
             log.error(f"Failed to check daily limit: {e}")
@@ -173,21 +360,12 @@ class APIUsageTracker:
             Tuple of (can_proceed, current_usage, remaining_requests)
         """
         try:
-            month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp()
+            key = (api_provider, _month_start(time.time()))
+            with self._counter_lock:
+                current_usage = self._monthly_requests.get(key, 0)
             
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT COUNT(*) FROM api_usage 
-                    WHERE api_provider = ? AND timestamp >= ?
-                """, (api_provider, month_start))
-                
-                current_usage = cursor.fetchone()[0]
-                remaining = max(0, limit - current_usage)
-                can_proceed = current_usage < limit
-                
-                return can_proceed, current_usage, remaining
+            remaining = max(0, limit - current_usage)
+            return current_usage < limit, current_usage, remaining
                 
         except Exception as e:
             log.error(f"Failed to check monthly limit: {e}")
@@ -195,6 +373,7 @@ class APIUsageTracker:
     
     def get_usage_stats(self, api_provider: str, days: int = 30) -> UsageStats:
         """Get usage statistics for the specified period."""
+        self.flush()
         try:
             start_time = (datetime.now() - timedelta(days=days)).timestamp()
             
@@ -236,6 +415,7 @@ class APIUsageTracker:
         
         date_start = date.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
         date_end = date.replace(hour=23, minute=59, second=59, microsecond=999999).timestamp()
+        self.flush()
         
         try:
             with sqlite3.connect(self.database_path) as conn:
@@ -267,6 +447,7 @@ class APIUsageTracker:
     
     def cleanup_old_records(self, days_to_keep: int = 90):
         """Clean up old usage records to prevent database bloat."""
+        self.flush()
         try:
             cutoff_time = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
             
@@ -284,6 +465,7 @@ class APIUsageTracker:
     
     def export_usage_data(self, output_path: str, format: str = "csv"):
         """Export usage data to a file."""
+        self.flush()
         try:
             with sqlite3.connect(self.database_path) as conn:
                 if format.lower() == "csv":
@@ -326,6 +508,7 @@ class APIUsageTracker:
     
     async def get_current_usage(self) -> Dict[str, Any]:
         """Get current API usage statistics."""
+        self.flush()
         try:
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
@@ -364,6 +547,7 @@ class APIUsageTracker:
     
     def get_usage_summary(self) -> Dict[str, any]:
         """Get a comprehensive usage summary."""
+        self.flush()
         try:
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
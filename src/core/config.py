@@ -49,6 +49,13 @@ class LLMConfig(BaseSettings):
     # Fallback Model Configuration
     enable_fallback_models: bool = Field(default=True, env="ENABLE_FALLBACK_MODELS")
     fallback_strategy: str = Field(default="ollama,huggingface", env="FALLBACK_STRATEGY")
+    enable_request_hedging: bool = Field(default=False, env="ENABLE_REQUEST_HEDGING")
+    circuit_breaker_failures: int = Field(default=3, env="CIRCUIT_BREAKER_FAILURES")
+    circuit_breaker_reset_seconds: float = Field(default=30.0, env="CIRCUIT_BREAKER_RESET_SECONDS")
+    
+    # Cascade Routing (provider:model entries, cheapest first)
+    cascade_models: str = Field(default="", env="LLM_CASCADE_MODELS")
+    cascade_min_confidence: float = Field(default=0.7, env="LLM_CASCADE_MIN_CONFIDENCE")
     
     # Ollama Configuration
     ollama_base_url: str = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
@@ -0,0 +1,252 @@
+"""
+In-process publish/subscribe event bus for Biomedical Text Agent.
+
+Orchestrators, the task queue and database writers publish events (task
+progress, completed extractions, queue depth, metric deltas); WebSocket
+clients subscribe to topics and receive them as server push instead of
+polling REST endpoints.
+
+Publishing never blocks: each subscriber has a bounded buffer of pending
+events. Events with a coalescing key replace (or, for counters, accumulate
+into) the pending event with the same key, so a slow client receives the
+latest state rather than a backlog. When a buffer is full the oldest event
+is dropped.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Topics published by the system
+TOPIC_TASK_PROGRESS = "task_progress"
+TOPIC_QUEUE_DEPTH = "queue_depth"
+TOPIC_EXTRACTION_COMPLETED = "extraction_completed"
+TOPIC_METRICS = "metrics"
+TOPIC_SYSTEM_METRICS = "system_metrics"
+
+# Subscribing to this topic receives every event
+ALL_TOPICS = "*"
+
+
+@dataclass
+class Event:
+    """An event delivered to subscribers."""
+    topic: str
+    data: Dict[str, Any]
+    type: str
+    coalesce_key: Optional[str] = None
+    accumulate: bool = False
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+
+    def to_message(self) -> Dict[str, Any]:
+        """Message sent to WebSocket clients."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "topic": self.topic,
+            "data": self.data,
+            "timestamp": self.timestamp
+        }
+
+
+class Subscription:
+    """
+    A subscriber's topic set and bounded buffer of pending events.
+
+    Buffer operations run on the subscriber's event loop; publishers on other
+    threads hand events over with ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, topics: Iterable[str], loop: asyncio.AbstractEventLoop, max_pending: int = 100):
+        self.topics: Set[str] = set(topics)
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._loop = loop
+        self._pending: "OrderedDict[Any, Event]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def wants(self, topic: str) -> bool:
+        """Whether the subscriber receives events of a topic."""
+        return topic in self.topics or ALL_TOPICS in self.topics
+
+    def subscribe(self, topic: str):
+        self.topics.add(topic)
+
+    def unsubscribe(self, topic: str):
+        self.topics.discard(topic)
+
+    def send(self, event: Event):
+        """Queue an event for this subscriber only (must run on its loop)."""
+        if self.closed:
+            return
+
+        key = (event.topic, event.coalesce_key) if event.coalesce_key else event.id
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            self.coalesced += 1
+            if event.accumulate:
+                event = Event(
+                    topic=event.topic,
+                    data=_accumulate(previous.data, event.data),
+                    type=event.type,
+                    coalesce_key=event.coalesce_key,
+                    accumulate=True
+                )
+        elif len(self._pending) >= self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self) -> List[Event]:
+        """Wait for pending events and take all of them."""
+        await self._ready.wait()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return batch
+
+    def close(self):
+        self.closed = True
+        self._pending.clear()
+
+
+class EventBus:
+    """Thread-safe fan-out of events to subscriptions."""
+
+    def __init__(self, max_pending: int = 100):
+        """
+        Initialize the event bus.
+
+        Args:
+            max_pending: Default per-subscriber buffer size
+        """
+        self.max_pending = max_pending
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, topics: Iterable[str] = (), max_pending: Optional[int] = None) -> Subscription:
+        """
+        Create a subscription bound to the running event loop.
+
+        Args:
+            topics: Initial topics ('*' for all)
+            max_pending: Buffer size for this subscriber
+        """
+        subscription = Subscription(
+            topics, asyncio.get_running_loop(), max_pending or self.max_pending
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Whether any subscriber wants a topic; lets publishers skip costly payloads."""
+        with self._lock:
+            return any(s.wants(topic) for s in self._subscriptions)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def publish(self,
+                topic: str,
+                data: Dict[str, Any],
+                event_type: Optional[str] = None,
+                coalesce_key: Optional[str] = None,
+                accumulate: bool = False) -> int:
+        """
+        Publish an event. Safe to call from any thread.
+
+        Args:
+            topic: Event topic
+            data: JSON-serializable payload
+            event_type: Message type sent to clients (defaults to the topic)
+            coalesce_key: Pending events with the same topic and key are merged
+            accumulate: When coalescing, add numeric fields instead of replacing
+
+        Returns:
+            Number of subscribers the event was handed to
+        """
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.wants(topic)]
+        if not targets:
+            return 0
+
+        event = Event(topic=topic, data=data, type=event_type or topic,
+                      coalesce_key=coalesce_key, accumulate=accumulate)
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        delivered = 0
+        for subscription in targets:
+            if subscription._loop is current_loop:
+                subscription.send(event)
+            else:
+                try:
+                    subscription._loop.call_soon_threadsafe(subscription.send, event)
+                except RuntimeError:
+                    # Subscriber's loop is closed
+                    self.unsubscribe(subscription)
+                    continue
+            delivered += 1
+
+        self.published += 1
+        return delivered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bus statistics for monitoring."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return {
+            "subscribers": len(subscriptions),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in subscriptions),
+            "coalesced": sum(s.coalesced for s in subscriptions)
+        }
+
+
+def _accumulate(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Add numeric fields of two metric deltas; other fields take the newer value."""
+    merged = dict(previous)
+    for key, value in current.items():
+        old = merged.get(key)
+        if (isinstance(value, (int, float)) and isinstance(old, (int, float))
+                and not isinstance(value, bool) and not isinstance(old, bool)):
+            merged[key] = old + value
+        else:
+            merged[key] = value
+    return merged
+
+
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide event bus shared by publishers and WebSocket endpoints."""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                _event_bus = EventBus()
+    return _event_bus
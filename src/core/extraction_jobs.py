@@ -0,0 +1,265 @@
+"""
+Background extraction jobs for the API.
+
+Extraction requests are submitted as jobs and run on a bounded thread pool,
+so a multi-minute LLM extraction never blocks the event loop. Jobs report
+progress (published on the event bus as ``task_progress`` events), can be
+cancelled, and finished jobs are kept only for ``result_ttl`` seconds and up
+to ``max_retained`` jobs.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .event_bus import EventBus, get_event_bus, TOPIC_EXTRACTION_COMPLETED, TOPIC_TASK_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+
+class JobState:
+    """Extraction job states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are queued or running."""
+    pass
+
+
+class JobCancelledError(Exception):
+    """Raised inside a running job once it has been cancelled."""
+    pass
+
+
+@dataclass
+class ExtractionJob:
+    """An extraction job and its outcome."""
+    job_id: str
+    text: str
+    options: Dict[str, Any]
+    source: str = "text"
+    text_length: int = 0
+    state: str = JobState.QUEUED
+    stage: Optional[str] = None
+    progress: float = 0.0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in JobState.FINISHED
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status without the result payload."""
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "source": self.source,
+            "text_length": self.text_length,
+            "options": self.options,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+
+def _default_engine_factory():
+    from langextract_integration.extractor import LangExtractEngine
+    return LangExtractEngine()
+
+
+class ExtractionJobManager:
+    """
+    Runs extraction jobs on a bounded worker pool.
+
+    Queued jobs are cancelled immediately; running jobs stop at the next
+    progress checkpoint (between patient segments and stages), since an
+    in-flight LLM call cannot be interrupted.
+    """
+
+    def __init__(self,
+                 max_workers: int = 2,
+                 max_pending: int = 100,
+                 max_retained: int = 200,
+                 result_ttl: float = 3600.0,
+                 engine_factory: Optional[Callable[[], Any]] = None,
+                 event_bus: Optional[EventBus] = None):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Extractions running at the same time
+            max_pending: Maximum queued plus running jobs before submissions are refused
+            max_retained: Maximum finished jobs kept for status and result queries
+            result_ttl: Seconds a finished job is kept
+            engine_factory: Builds the extraction engine for a job
+                (a LangExtractEngine if None)
+            event_bus: Bus receiving job progress (the process-wide bus if None)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self.result_ttl = result_ttl
+        self.engine_factory = engine_factory or _default_engine_factory
+        self.event_bus = event_bus or get_event_bus()
+
+        self._jobs: "OrderedDict[str, ExtractionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extraction-job")
+
+    def submit(self, text: str, source: str = "text", **options) -> ExtractionJob:
+        """
+        Queue an extraction.
+
+        Args:
+            text: Text to extract from
+            source: Where the text came from (e.g. "text" or the uploaded filename)
+            **options: Keyword arguments for ``extract_from_text``
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If ``max_pending`` jobs are already queued or running
+        """
+        with self._lock:
+            self._prune()
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_pending:
+                raise JobQueueFullError(f"{active} extraction jobs already pending")
+
+            job = ExtractionJob(job_id=uuid.uuid4().hex, text=text, options=options,
+                                source=source, text_length=len(text))
+            self._jobs[job.job_id] = job
+
+        job.future = self._executor.submit(self._run, job)
+        self._publish(job)
+        logger.info(f"Queued extraction job {job.job_id} ({len(text)} characters)")
+        return job
+
+    def get(self, job_id: str) -> Optional[ExtractionJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, state: Optional[str] = None, limit: int = 100) -> List[ExtractionJob]:
+        """Most recent jobs first, optionally filtered by state."""
+        with self._lock:
+            self._prune()
+            jobs = [job for job in reversed(self._jobs.values()) if state is None or job.state == state]
+        return jobs[:limit]
+
+    def cancel(self, job_id: str) -> Optional[ExtractionJob]:
+        """
+        Cancel a job.
+
+        Returns:
+            The job, or None if it is unknown
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, JobState.CANCELLED)
+        return job
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {state: 0 for state in (JobState.QUEUED, JobState.RUNNING) + JobState.FINISHED}
+            for job in self._jobs.values():
+                stats[job.state] += 1
+        return stats
+
+    def shutdown(self, wait: bool = False):
+        """Cancel queued jobs and stop accepting work."""
+        for job in self.list_jobs(limit=len(self._jobs)):
+            if job.state == JobState.QUEUED:
+                self.cancel(job.job_id)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def close(self):
+        self.shutdown()
+
+    def _run(self, job: ExtractionJob):
+        if job.cancel_requested.is_set():
+            self._finish(job, JobState.CANCELLED)
+            return
+
+        job.state = JobState.RUNNING
+        job.started_at = time.time()
+        self._publish(job)
+
+        def on_progress(stage: str, fraction: float):
+            if job.cancel_requested.is_set():
+                raise JobCancelledError(job.job_id)
+            job.stage = stage
+            job.progress = fraction
+            self._publish(job)
+
+        try:
+            engine = self.engine_factory()
+            result = engine.extract_from_text(job.text, progress_callback=on_progress, **job.options)
+            job.result = result
+            job.progress = 1.0
+            self._finish(job, JobState.COMPLETED)
+        except JobCancelledError:
+            self._finish(job, JobState.CANCELLED)
+        except Exception as e:
+            logger.error(f"Extraction job {job.job_id} failed: {e}")
+            job.error = str(e)
+            self._finish(job, JobState.FAILED)
+
+    def _finish(self, job: ExtractionJob, state: str):
+        job.state = state
+        job.finished_at = time.time()
+        # Retained jobs keep their result, not their input
+        job.text = ""
+        self._publish(job)
+        if state == JobState.COMPLETED:
+            try:
+                self.event_bus.publish(TOPIC_EXTRACTION_COMPLETED, {"job_id": job.job_id, "source": job.source})
+            except Exception as e:
+                logger.debug(f"Failed to publish extraction event: {e}")
+        logger.info(f"Extraction job {job.job_id} {state}")
+
+    def _prune(self):
+        """Drop expired finished jobs and the oldest beyond ``max_retained`` (caller holds the lock)."""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        for i, job in enumerate(finished):
+            if now - job.finished_at > self.result_ttl or len(finished) - i > self.max_retained:
+                del self._jobs[job.job_id]
+
+    def _publish(self, job: ExtractionJob):
+        try:
+            self.event_bus.publish(
+                TOPIC_TASK_PROGRESS,
+                {"task_id": job.job_id, "task_type": "extraction", "status": job.state,
+                 "stage": job.stage, "progress": round(job.progress, 3)},
+                coalesce_key=job.job_id
+            )
+        except Exception as e:
+            logger.debug(f"Failed to publish job event: {e}")
+
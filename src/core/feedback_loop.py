@@ -20,6 +20,15 @@ from datetime import datetime
 from collections import defaultdict
 import re
 
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Patient identifiers such as "P1", "Patient 1", "Pt0589" or "case #3"
+_PATIENT_ID_PATTERN = re.compile(r'^(?:patient|pt|case|subject|p)?[\s#._-]*0*(\d+)$')
+
 
 @dataclass
 class FieldMetrics:
@@ -54,6 +63,16 @@ class ErrorPattern:
         return asdict(self)
 
 
+@dataclass
+class FieldComparison:
+    """Cell-wise comparison of aligned records (rows) over all fields (columns)."""
+    fields: List[str]
+    has_field: np.ndarray
+    predicted_present: np.ndarray
+    truth_present: np.ndarray
+    matches: np.ndarray
+
+
 @dataclass
 class ValidationResult:
     """Result of validation against ground truth."""
@@ -80,6 +99,20 @@ class FeedbackLoop:
     Main feedback loop system for validation and continuous improvement.
     """
     
+    # Weights of the identifying fields used to pair predicted and true patients
+    ALIGNMENT_WEIGHTS = {
+        'pmid': 2.0,
+        'patient_id': 3.0,
+        'gene': 2.0,
+        'sex': 1.0,
+        'age': 1.0,
+        'age_of_onset': 1.0,
+        'age_at_diagnosis': 1.0
+    }
+    
+    # Paired records less similar than this count as one missed and one extra patient
+    MIN_ALIGNMENT_SIMILARITY = 0.3
+    
     def __init__(self, storage_path: str = "data/feedback"):
         """
         Initialize feedback loop system.
@@ -96,6 +129,7 @@ class FeedbackLoop:
         
         # Field mappings for normalization
         self.field_mappings = self._init_field_mappings()
+        self._normalized_names: Dict[str, str] = {}
         
         logging.info("Feedback loop system initialized")
     
@@ -168,6 +202,8 @@ class FeedbackLoop:
     def _init_field_mappings(self) -> Dict[str, List[str]]:
         """Initialize field name mappings for normalization."""
         return {
+            'pmid': ['pmid', 'pubmed_id'],
+            'patient_id': ['patient_id', 'patient', 'case_id', 'subject_id'],
             'sex': ['sex', 'gender', 'male', 'female'],
             'age_of_onset': ['age_of_onset', 'onset_age', 'age_onset', 'symptom_onset'],
             'age_at_diagnosis': ['age_at_diagnosis', 'diagnosis_age', 'age_diagnosis'],
@@ -183,13 +219,21 @@ class FeedbackLoop:
     
     def normalize_field_name(self, field_name: str) -> str:
         """Normalize field name to standard format."""
+        normalized = self._normalized_names.get(field_name)
+        if normalized is not None:
+            return normalized
+        
         field_lower = field_name.lower().strip()
+        field_key = re.sub(r'[\s\-]+', '_', field_lower)
+        normalized = field_lower
         
         for standard_name, variants in self.field_mappings.items():
-            if field_lower in variants:
-                return standard_name
+            if field_lower in variants or field_key in variants:
+                normalized = standard_name
+                break
         
-        return field_lower
+        self._normalized_names[field_name] = normalized
+        return normalized
     
     def compare_predictions(self, 
                           predictions: List[Dict[str, Any]], 
@@ -211,29 +255,21 @@ class FeedbackLoop:
         # Normalize and align records
         aligned_predictions, aligned_ground_truth = self._align_records(predictions, ground_truth)
         
-        # Calculate field-level metrics
-        field_metrics = {}
+        # Collect all field names, without metadata fields
         all_fields = set()
-        
-        # Collect all field names
         for record in aligned_predictions + aligned_ground_truth:
             all_fields.update(record.keys())
+        all_fields = sorted(f for f in all_fields if not f.startswith('_'))
         
-        # Remove metadata fields
-        all_fields = {f for f in all_fields if not f.startswith('_')}
-        
-        # Calculate metrics for each field
-        for field in all_fields:
-            metrics = self._calculate_field_metrics(
-                field, aligned_predictions, aligned_ground_truth
-            )
-            field_metrics[field] = metrics
+        # Compare every field of every record pair at once
+        comparison = self._compare_fields(aligned_predictions, aligned_ground_truth, all_fields)
+        field_metrics = self._calculate_field_metrics(comparison)
         
         # Calculate overall accuracy
-        overall_accuracy = self._calculate_overall_accuracy(aligned_predictions, aligned_ground_truth)
+        overall_accuracy = self._calculate_overall_accuracy(comparison)
         
         # Analyze error patterns
-        error_patterns = self.analyze_errors(aligned_predictions, aligned_ground_truth)
+        error_patterns = self.analyze_errors(aligned_predictions, aligned_ground_truth, comparison)
         
         # Generate improvement suggestions
         improvement_suggestions = self._generate_improvement_suggestions(field_metrics, error_patterns)
@@ -244,8 +280,8 @@ class FeedbackLoop:
             field_metrics=field_metrics,
             error_patterns=error_patterns,
             improvement_suggestions=improvement_suggestions,
-            total_records=len(aligned_ground_truth),
-            successful_records=len(aligned_predictions)
+            total_records=len(ground_truth),
+            successful_records=sum(1 for p, t in zip(aligned_predictions, aligned_ground_truth) if p and t)
         )
         
         # Store results in database
@@ -253,87 +289,256 @@ class FeedbackLoop:
         
         return result
     
+    def _normalize_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a record with normalized field names."""
+        return {self.normalize_field_name(key): value for key, value in record.items()}
+    
     def _align_records(self, 
                       predictions: List[Dict[str, Any]], 
                       ground_truth: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Align prediction and ground truth records."""
-        # Simple alignment by index for now
-        # In a more sophisticated system, you might align by patient ID or other identifiers
-        
-        min_length = min(len(predictions), len(ground_truth))
+        """
+        Align prediction and ground truth records.
         
-        aligned_predictions = []
-        aligned_ground_truth = []
+        Patients are paired by the similarity of their identifying fields
+        (see ALIGNMENT_WEIGHTS) with an optimal assignment, so a missed or extra
+        patient in a case series does not shift later comparisons. Unpaired
+        records are aligned with an empty record and count as missing or
+        extra predictions.
         
-        for i in range(min_length):
-            pred = predictions[i].copy()
-            truth = ground_truth[i].copy()
-            
-            # Normalize field names
-            normalized_pred = {}
-            for key, value in pred.items():
-                normalized_key = self.normalize_field_name(key)
-                normalized_pred[normalized_key] = value
-            
-            normalized_truth = {}
-            for key, value in truth.items():
-                normalized_key = self.normalize_field_name(key)
-                normalized_truth[normalized_key] = value
+        Args:
+            predictions: Predicted records
+            ground_truth: Ground truth records
             
-            aligned_predictions.append(normalized_pred)
-            aligned_ground_truth.append(normalized_truth)
+        Returns:
+            Tuple of equally long lists of aligned, normalized records
+        """
+        normalized_predictions = [self._normalize_record(r) for r in predictions]
+        normalized_truth = [self._normalize_record(r) for r in ground_truth]
+        pairs = self._match_records(normalized_predictions, normalized_truth)
+        
+        aligned_predictions = [normalized_predictions[i] for i, _ in pairs]
+        aligned_ground_truth = [normalized_truth[j] for _, j in pairs]
+        
+        paired_predictions = {i for i, _ in pairs}
+        paired_truth = {j for _, j in pairs}
+        for j, truth in enumerate(normalized_truth):
+            if j not in paired_truth:
+                aligned_predictions.append({})
+                aligned_ground_truth.append(truth)
+        for i, pred in enumerate(normalized_predictions):
+            if i not in paired_predictions:
+                aligned_predictions.append(pred)
+                aligned_ground_truth.append({})
         
         return aligned_predictions, aligned_ground_truth
     
-    def _calculate_field_metrics(self, 
-                                field_name: str, 
-                                predictions: List[Dict[str, Any]], 
-                                ground_truth: List[Dict[str, Any]]) -> FieldMetrics:
-        """Calculate metrics for a specific field."""
-        pred_values = []
-        truth_values = []
-        
-        # Extract values for this field
-        for pred, truth in zip(predictions, ground_truth):
-            pred_val = pred.get(field_name)
-            truth_val = truth.get(field_name)
+    def _match_records(self,
+                       predictions: List[Dict[str, Any]],
+                       ground_truth: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """
+        Pair records by maximum total similarity.
+        
+        Returns:
+            (prediction index, ground truth index) pairs in ground truth order
+        """
+        if not predictions or not ground_truth:
+            return []
+        
+        similarity = self._similarity_matrix(predictions, ground_truth)
+        comparable = ~np.isnan(similarity)
+        
+        # Records sharing no identifying fields fall back to index order
+        rows, cols = np.indices(similarity.shape)
+        proximity = 1.0 - np.abs(rows - cols) / max(similarity.shape)
+        score = np.where(comparable, similarity, 0.0) + 1e-3 * proximity
+        
+        if SCIPY_AVAILABLE:
+            pred_idx, truth_idx = linear_sum_assignment(score, maximize=True)
+        else:
+            pred_idx, truth_idx = self._greedy_assignment(score)
+        
+        keep = ~comparable[pred_idx, truth_idx] | (
+            similarity[pred_idx, truth_idx] >= self.MIN_ALIGNMENT_SIMILARITY
+        )
+        return sorted(zip(pred_idx[keep].tolist(), truth_idx[keep].tolist()), key=lambda pair: pair[1])
+    
+    @staticmethod
+    def _greedy_assignment(score: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Highest-score-first assignment, used when scipy is unavailable."""
+        used_rows, used_cols, pairs = set(), set(), []
+        for flat in np.argsort(-score, axis=None, kind='stable'):
+            i, j = divmod(int(flat), score.shape[1])
+            if i not in used_rows and j not in used_cols:
+                used_rows.add(i)
+                used_cols.add(j)
+                pairs.append((i, j))
+        pairs.sort()
+        return np.array([i for i, _ in pairs], dtype=int), np.array([j for _, j in pairs], dtype=int)
+    
+    def _similarity_matrix(self,
+                           predictions: List[Dict[str, Any]],
+                           ground_truth: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Pairwise similarity of records over the identifying fields.
+        
+        Returns:
+            (predictions x ground truth) matrix of weighted similarities in
+            [0, 1]; NaN where two records share no identifying field
+        """
+        shape = (len(predictions), len(ground_truth))
+        score = np.zeros(shape)
+        weight = np.zeros(shape)
+        
+        for field, field_weight in self.ALIGNMENT_WEIGHTS.items():
+            if field.startswith('age'):
+                pred_age = self._numeric_values(predictions, field)
+                truth_age = self._numeric_values(ground_truth, field)
+                both = ~np.isnan(pred_age)[:, None] & ~np.isnan(truth_age)[None, :]
+                with np.errstate(invalid='ignore'):
+                    similarity = 1.0 / (1.0 + np.abs(pred_age[:, None] - truth_age[None, :]))
+            else:
+                pred_keys = np.array([self._identity_key(field, r.get(field)) for r in predictions])
+                truth_keys = np.array([self._identity_key(field, r.get(field)) for r in ground_truth])
+                both = (pred_keys != '')[:, None] & (truth_keys != '')[None, :]
+                similarity = (pred_keys[:, None] == truth_keys[None, :]).astype(float)
             
-            pred_values.append(pred_val)
-            truth_values.append(truth_val)
-        
-        # Calculate metrics
-        total_predictions = sum(1 for v in pred_values if v is not None and v != "")
-        total_ground_truth = sum(1 for v in truth_values if v is not None and v != "")
-        
-        correct_predictions = 0
-        for pred_val, truth_val in zip(pred_values, truth_values):
-            if self._values_match(pred_val, truth_val):
-                correct_predictions += 1
-        
-        # Calculate precision, recall, accuracy
-        precision = correct_predictions / total_predictions if total_predictions > 0 else 0.0
-        recall = correct_predictions / total_ground_truth if total_ground_truth > 0 else 0.0
-        accuracy = correct_predictions / len(predictions) if len(predictions) > 0 else 0.0
-        
-        # Calculate completeness (how many ground truth values were predicted)
-        completeness = total_predictions / total_ground_truth if total_ground_truth > 0 else 0.0
-        
-        missing_predictions = total_ground_truth - correct_predictions
-        extra_predictions = total_predictions - correct_predictions
-        
-        return FieldMetrics(
-            field_name=field_name,
-            precision=precision,
-            recall=recall,
-            accuracy=accuracy,
-            completeness=completeness,
-            total_predictions=total_predictions,
-            total_ground_truth=total_ground_truth,
-            correct_predictions=correct_predictions,
-            missing_predictions=missing_predictions,
-            extra_predictions=extra_predictions
+            score += np.where(both, field_weight * similarity, 0.0)
+            weight += np.where(both, field_weight, 0.0)
+        
+        return np.divide(score, weight, out=np.full(shape, np.nan), where=weight > 0)
+    
+    @staticmethod
+    def _numeric_values(records: List[Dict[str, Any]], field: str) -> np.ndarray:
+        values = pd.Series([r.get(field) for r in records], dtype=object)
+        return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    
+    @staticmethod
+    def _identity_key(field: str, value: Any) -> str:
+        """Canonical form of an identifying value ('' if missing)."""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return ''
+        text = str(value).strip().lower()
+        if not text:
+            return ''
+        
+        if field == 'patient_id':
+            match = _PATIENT_ID_PATTERN.match(text)
+            return match.group(1) if match else re.sub(r'[^a-z0-9]', '', text)
+        if field == 'pmid':
+            return re.sub(r'\.0+$', '', text)
+        if field == 'sex':
+            return text[0] if text[0] in ('m', 'f') else text
+        if field == 'gene':
+            return re.split(r'[\s,;/()]+', text)[0]
+        return text
+    
+    def _compare_fields(self,
+                        predictions: List[Dict[str, Any]],
+                        ground_truth: List[Dict[str, Any]],
+                        fields: List[str]) -> FieldComparison:
+        """
+        Compare aligned records over all fields at once.
+        
+        Vectorized equivalent of applying _values_match to every cell, except
+        that NaN (e.g. empty CSV cells) is treated as a missing value.
+        """
+        pred_values, pred_keys = self._value_matrix(predictions, fields)
+        truth_values, truth_keys = self._value_matrix(ground_truth, fields)
+        shape = pred_values.shape
+        
+        pred_missing = pd.isna(pred_values)
+        truth_missing = pd.isna(truth_values)
+        
+        pred_str = self._normalized_strings(pred_values)
+        truth_str = self._normalized_strings(truth_values)
+        pred_num = pd.to_numeric(pd.Series(pred_str.ravel()), errors='coerce').to_numpy(dtype=float).reshape(shape)
+        truth_num = pd.to_numeric(pd.Series(truth_str.ravel()), errors='coerce').to_numpy(dtype=float).reshape(shape)
+        
+        comparable = ~pred_missing & ~truth_missing
+        equal = comparable & (pred_str == truth_str)
+        both_numeric = ~np.isnan(pred_num) & ~np.isnan(truth_num)
+        with np.errstate(invalid='ignore'):
+            numeric_match = both_numeric & (np.abs(pred_num - truth_num) < 0.01)
+        
+        is_sequence = np.frompyfunc(lambda v: isinstance(v, (list, tuple)), 1, 1)
+        both_lists = is_sequence(pred_values).astype(bool) & is_sequence(truth_values).astype(bool)
+        undecided = comparable & ~equal & ~both_numeric
+        
+        # Set comparison for lists and substring matching for longer strings
+        # only touch the few cells that are still undecided
+        other_match = np.zeros(shape, dtype=bool)
+        for i, j in np.argwhere(undecided & both_lists):
+            other_match[i, j] = (
+                {str(v).strip().lower() for v in pred_values[i, j]} ==
+                {str(v).strip().lower() for v in truth_values[i, j]}
+            )
+        str_len = np.frompyfunc(len, 1, 1)
+        long_strings = (str_len(pred_str).astype(int) > 3) & (str_len(truth_str).astype(int) > 3)
+        for i, j in np.argwhere(undecided & ~both_lists & long_strings):
+            other_match[i, j] = pred_str[i, j] in truth_str[i, j] or truth_str[i, j] in pred_str[i, j]
+        
+        matches = (pred_missing & truth_missing) | equal | numeric_match | other_match
+        
+        return FieldComparison(
+            fields=list(fields),
+            has_field=pred_keys | truth_keys,
+            predicted_present=~pred_missing & (pred_values != ''),
+            truth_present=~truth_missing & (truth_values != ''),
+            matches=matches
         )
     
+    @staticmethod
+    def _value_matrix(records: List[Dict[str, Any]], fields: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Records as a (records x fields) object matrix plus a key-presence mask."""
+        column = {field: j for j, field in enumerate(fields)}
+        values = np.full((len(records), len(fields)), None, dtype=object)
+        has_key = np.zeros(values.shape, dtype=bool)
+        for i, record in enumerate(records):
+            for key, value in record.items():
+                j = column.get(key)
+                if j is not None:
+                    values[i, j] = value
+                    has_key[i, j] = True
+        return values, has_key
+    
+    @staticmethod
+    def _normalized_strings(values: np.ndarray) -> np.ndarray:
+        flat = pd.Series(values.ravel(), dtype=object).map(str).str.strip().str.lower()
+        return flat.to_numpy(dtype=object).reshape(values.shape)
+    
+    def _calculate_field_metrics(self, comparison: FieldComparison) -> Dict[str, FieldMetrics]:
+        """Calculate metrics for all fields from a field comparison."""
+        num_records = comparison.matches.shape[0]
+        both_present = comparison.predicted_present & comparison.truth_present
+        
+        total_predictions = comparison.predicted_present.sum(axis=0)
+        total_ground_truth = comparison.truth_present.sum(axis=0)
+        correct_predictions = (comparison.matches & both_present).sum(axis=0)
+        agreements = comparison.matches.sum(axis=0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(total_predictions > 0, correct_predictions / total_predictions, 0.0)
+            recall = np.where(total_ground_truth > 0, correct_predictions / total_ground_truth, 0.0)
+            # Completeness: how many ground truth values were predicted
+            completeness = np.where(total_ground_truth > 0, total_predictions / total_ground_truth, 0.0)
+        accuracy = agreements / num_records if num_records > 0 else np.zeros(len(comparison.fields))
+        
+        return {
+            field: FieldMetrics(
+                field_name=field,
+                precision=float(precision[j]),
+                recall=float(recall[j]),
+                accuracy=float(accuracy[j]),
+                completeness=float(completeness[j]),
+                total_predictions=int(total_predictions[j]),
+                total_ground_truth=int(total_ground_truth[j]),
+                correct_predictions=int(correct_predictions[j]),
+                missing_predictions=int(total_ground_truth[j] - correct_predictions[j]),
+                extra_predictions=int(total_predictions[j] - correct_predictions[j])
+            )
+            for j, field in enumerate(comparison.fields)
+        }
+    
     def _values_match(self, pred_val: Any, truth_val: Any) -> bool:
         """Check if predicted and ground truth values match."""
         if pred_val is None and truth_val is None:
@@ -370,51 +575,47 @@ class FeedbackLoop:
         
         return False
     
-    def _calculate_overall_accuracy(self, 
-                                  predictions: List[Dict[str, Any]], 
-                                  ground_truth: List[Dict[str, Any]]) -> float:
-        """Calculate overall accuracy across all fields."""
-        total_comparisons = 0
-        correct_comparisons = 0
-        
-        for pred, truth in zip(predictions, ground_truth):
-            all_fields = set(pred.keys()) | set(truth.keys())
-            
-            for field in all_fields:
-                if not field.startswith('_'):  # Skip metadata fields
-                    total_comparisons += 1
-                    if self._values_match(pred.get(field), truth.get(field)):
-                        correct_comparisons += 1
-        
-        return correct_comparisons / total_comparisons if total_comparisons > 0 else 0.0
+    def _calculate_overall_accuracy(self, comparison: FieldComparison) -> float:
+        """Calculate overall accuracy across all fields present in either record."""
+        total_comparisons = comparison.has_field.sum()
+        correct_comparisons = (comparison.matches & comparison.has_field).sum()
+        return float(correct_comparisons / total_comparisons) if total_comparisons > 0 else 0.0
     
     def analyze_errors(self, 
                       predictions: List[Dict[str, Any]], 
-                      ground_truth: List[Dict[str, Any]]) -> List[ErrorPattern]:
-        """Analyze errors and identify patterns."""
+                      ground_truth: List[Dict[str, Any]],
+                      comparison: Optional[FieldComparison] = None) -> List[ErrorPattern]:
+        """
+        Analyze errors and identify patterns.
+        
+        Args:
+            predictions: Aligned predicted records
+            ground_truth: Aligned ground truth records
+            comparison: Precomputed field comparison of the same records
+            
+        Returns:
+            Identified error patterns
+        """
+        if comparison is None:
+            fields = sorted({
+                f for record in predictions + ground_truth for f in record if not f.startswith('_')
+            })
+            comparison = self._compare_fields(predictions, ground_truth, fields)
+        
         error_patterns = []
         field_errors = defaultdict(list)
         
-        # Collect errors by field
-        for i, (pred, truth) in enumerate(zip(predictions, ground_truth)):
-            all_fields = set(pred.keys()) | set(truth.keys())
-            
-            for field in all_fields:
-                if field.startswith('_'):  # Skip metadata
-                    continue
-                
-                pred_val = pred.get(field)
-                truth_val = truth.get(field)
-                
-                if not self._values_match(pred_val, truth_val):
-                    error_info = {
-                        'record_index': i,
-                        'field': field,
-                        'predicted': pred_val,
-                        'ground_truth': truth_val,
-                        'context': pred.get('_context', '')
-                    }
-                    field_errors[field].append(error_info)
+        # Collect errors by field, in record order
+        for j, i in np.argwhere((comparison.has_field & ~comparison.matches).T):
+            field = comparison.fields[j]
+            pred, truth = predictions[i], ground_truth[i]
+            field_errors[field].append({
+                'record_index': int(i),
+                'field': field,
+                'predicted': pred.get(field),
+                'ground_truth': truth.get(field),
+                'context': pred.get('_context', '')
+            })
         
         # Analyze patterns for each field
         for field, errors in field_errors.items():
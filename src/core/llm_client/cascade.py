@@ -0,0 +1,276 @@
+"""
+Cascade routing between a cheap and a strong LLM.
+
+A cascade tries its stages cheapest first (e.g. a small Ollama or local
+HuggingFace model, then OpenRouter) and escalates to the next stage only when
+an answer is unusable: the call failed, the output is not valid against the
+expected schema, or the model's self-reported confidence is below the stage
+threshold. The last stage's answer is always returned. Per-stage escalation
+rates are recorded so the thresholds can be tuned.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.base import BaseLLMClient, ProcessingResult
+from core.config import get_config
+from core.logging_config import get_logger
+from core.llm_client.structured_output import parse_json_response
+
+log = get_logger(__name__)
+
+# Keys under which prompts in this repo ask for a self-reported confidence
+CONFIDENCE_KEYS = ("confidence_score", "confidence")
+
+ESCALATION_REASONS = ("error", "invalid", "low_confidence")
+
+
+@dataclass
+class CascadeStage:
+    """One model of a cascade."""
+    name: str
+    client: Any
+    min_confidence: float = 0.7
+
+
+class CascadeStats:
+    """Thread-safe per-stage counters of a cascade."""
+
+    def __init__(self, stage_names: Iterable[str]):
+        self._lock = threading.Lock()
+        self._stages = {
+            name: {"calls": 0, "accepted": 0, "escalated": 0, "latency": 0.0,
+                   "reasons": {reason: 0 for reason in ESCALATION_REASONS}}
+            for name in stage_names
+        }
+
+    def record(self, stage: str, latency: float, escalation_reason: Optional[str] = None):
+        """Record one call of a stage and, if it escalated, why."""
+        with self._lock:
+            counters = self._stages[stage]
+            counters["calls"] += 1
+            counters["latency"] += latency
+            if escalation_reason is None:
+                counters["accepted"] += 1
+            else:
+                counters["escalated"] += 1
+                counters["reasons"][escalation_reason] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage calls, acceptance/escalation counts, escalation rate and mean latency."""
+        with self._lock:
+            snapshot = {}
+            for name, counters in self._stages.items():
+                calls = counters["calls"]
+                snapshot[name] = {
+                    "calls": calls,
+                    "accepted": counters["accepted"],
+                    "escalated": counters["escalated"],
+                    "escalation_rate": counters["escalated"] / calls if calls else 0.0,
+                    "escalation_reasons": dict(counters["reasons"]),
+                    "avg_latency": counters["latency"] / calls if calls else 0.0
+                }
+            return snapshot
+
+
+def reported_confidence(data: Dict[str, Any]) -> Optional[float]:
+    """
+    Self-reported confidence of a parsed answer.
+
+    Either a number, or a mapping of per-field confidences (averaged).
+    """
+    for key in CONFIDENCE_KEYS:
+        value = data.get(key)
+        if isinstance(value, dict):
+            values = [float(v) for v in value.values() if isinstance(v, (int, float))]
+            if values:
+                return sum(values) / len(values)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+class CascadeLLMClient(BaseLLMClient):
+    """
+    LLM client trying cheap models first and escalating uncertain answers.
+
+    It is a drop-in ``llm_client`` for the extraction agents and
+    AbstractClassifier: ``generate`` has the same signature and result.
+    """
+
+    # Forwarded to the stages that support it
+    supports_response_format = True
+
+    def __init__(self,
+                 stages: List[CascadeStage],
+                 required_fields: Iterable[str] = (),
+                 validator: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 stats: Optional[CascadeStats] = None):
+        """
+        Initialize the cascade.
+
+        Args:
+            stages: Models cheapest first; the last stage is never escalated
+            required_fields: Keys a valid JSON answer must contain
+            validator: Extra schema check of the parsed JSON answer
+            stats: Counters shared with other views of the same cascade
+        """
+        if not stages:
+            raise ValueError("A cascade needs at least one stage")
+        self.stages = list(stages)
+        self.required_fields = tuple(required_fields)
+        self.validator = validator
+        self.stats = stats or CascadeStats(stage.name for stage in self.stages)
+        super().__init__(model_name=" -> ".join(stage.name for stage in self.stages))
+
+    def with_validator(self,
+                       validator: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                       required_fields: Iterable[str] = ()) -> "CascadeLLMClient":
+        """
+        View of this cascade validating answers against a caller's schema.
+
+        The view shares the stages and the statistics of this cascade.
+        """
+        return CascadeLLMClient(self.stages, required_fields=required_fields or self.required_fields,
+                                validator=validator or self.validator, stats=self.stats)
+
+    def _escalation_reason(self, result: Any, stage: CascadeStage) -> Optional[str]:
+        """Why a stage's answer is not good enough, or None to accept it."""
+        if not getattr(result, "success", False):
+            return "error"
+        data = parse_json_response(result.data)
+        if not isinstance(data, dict) or any(name not in data for name in self.required_fields):
+            return "invalid"
+        if self.validator is not None:
+            try:
+                if not self.validator(data):
+                    return "invalid"
+            except Exception:
+                return "invalid"
+        confidence = reported_confidence(data)
+        if confidence is not None and confidence < stage.min_confidence:
+            return "low_confidence"
+        return None
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ProcessingResult[str]:
+        """
+        Generate text with the cheapest stage whose answer is acceptable.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Returns:
+            ProcessingResult of the accepting stage; ``metadata["cascade"]``
+            names the stage and the escalations on the way
+        """
+        from core.llm_client.smart_llm_manager import call_llm_client
+
+        escalations = []
+        result = None
+        for index, stage in enumerate(self.stages):
+            start = time.perf_counter()
+            try:
+                result = await call_llm_client(stage.client, prompt, system_prompt,
+                                               temperature, max_tokens, **kwargs)
+            except Exception as e:
+                result = ProcessingResult(success=False, error=f"{stage.name}: {e}")
+
+            is_last = index == len(self.stages) - 1
+            reason = None if is_last else self._escalation_reason(result, stage)
+            self.stats.record(stage.name, time.perf_counter() - start, reason)
+            if reason is None:
+                break
+            log.debug(f"Cascade escalating from {stage.name}: {reason}")
+            escalations.append({"stage": stage.name, "reason": reason})
+
+        if result.metadata is None:
+            result.metadata = {}
+        result.metadata["cascade"] = {"stage": stage.name, "escalations": escalations}
+        return result
+
+    def generate_sync(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ProcessingResult[str]:
+        """Synchronous version of ``generate``."""
+        return asyncio.run(self.generate(prompt, system_prompt, temperature, max_tokens, **kwargs))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage escalation statistics."""
+        return self.stats.snapshot()
+
+
+def parse_cascade_spec(spec: str) -> List[Tuple[str, str]]:
+    """
+    Parse a cascade specification into (provider, model) pairs.
+
+    The specification lists ``provider:model`` entries cheapest first,
+    e.g. ``"ollama:llama3.2:3b,openrouter:deepseek/deepseek-chat-v3-0324:free"``.
+    """
+    stages = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        provider, _, model = entry.partition(":")
+        provider = provider.strip().lower()
+        if provider not in ("ollama", "huggingface", "openrouter"):
+            raise ValueError(f"Unknown cascade provider '{provider}' in '{entry}'")
+        stages.append((provider, model.strip() or None))
+    return stages
+
+
+def build_cascade_client(spec: Optional[str] = None,
+                         min_confidence: Optional[float] = None) -> CascadeLLMClient:
+    """
+    Build a cascade from a specification (defaults to ``LLM_CASCADE_MODELS``).
+
+    Args:
+        spec: ``provider:model`` entries cheapest first
+        min_confidence: Confidence below which a stage escalates
+            (defaults to ``LLM_CASCADE_MIN_CONFIDENCE``)
+
+    Returns:
+        CascadeLLMClient over the configured models
+    """
+    from core.llm_client.huggingface_client import HuggingFaceClient
+    from core.llm_client.ollama_client import OllamaClient
+    from core.llm_client.openrouter_client import OpenRouterClient
+
+    llm_config = get_config().llm
+    spec = spec or llm_config.cascade_models
+    if min_confidence is None:
+        min_confidence = llm_config.cascade_min_confidence
+    if not spec:
+        raise ValueError("No cascade models configured (set LLM_CASCADE_MODELS)")
+
+    stages = []
+    for provider, model in parse_cascade_spec(spec):
+        if provider == "ollama":
+            client = OllamaClient(model)
+        elif provider == "huggingface":
+            client = HuggingFaceClient(model or llm_config.huggingface_default_model)
+        else:
+            client = OpenRouterClient(model_name=model or llm_config.default_model)
+        stages.append(CascadeStage(name=f"{provider}:{model or 'default'}", client=client,
+                                   min_confidence=min_confidence))
+    log.info(f"LLM cascade: {' -> '.join(stage.name for stage in stages)}")
+    return CascadeLLMClient(stages)
@@ -5,13 +5,22 @@ This module provides a client for running HuggingFace models locally,
 supporting both CPU and GPU execution. It's compatible with the existing
 LLM client interface used by the extraction agents.
 
+Prompts are generated in batches: ``generate_batch`` left-pads many prompts
+and decodes them together in one ``model.generate`` call (sharing the KV
+cache pass), and ``submit``/``agenerate`` feed a micro-batching worker thread
+that groups concurrent requests arriving within a few milliseconds.
+
 Location: src/core/llm_client/huggingface_client.py
 """
 
+import asyncio
 import logging
+import queue
+import threading
 import torch
+from concurrent.futures import Future
 from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
 import time
 from pathlib import Path
@@ -52,6 +61,130 @@ class HuggingFaceResponse:
         }
 
 
+_STOP = object()
+
+
+@dataclass
+class _GenerationRequest:
+    """A queued generation request and the future it resolves."""
+    messages: List[Dict[str, str]]
+    kwargs: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+class GenerationBatcher:
+    """
+    Micro-batching queue in front of ``HuggingFaceClient.generate_batch``.
+    
+    A dedicated worker thread takes the first queued request, waits up to
+    ``max_wait`` seconds for more, and generates each group of requests that
+    share generation parameters in a single batch.
+    """
+    
+    def __init__(self, client: 'HuggingFaceClient', max_batch_size: int = 8, max_wait: float = 0.005):
+        """
+        Initialize the batcher.
+        
+        Args:
+            client: Client whose model runs the batches
+            max_batch_size: Maximum prompts per forward pass
+            max_wait: Seconds to wait for more requests after the first
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = self._start_worker()
+    
+    def _start_worker(self) -> threading.Thread:
+        thread = threading.Thread(target=self._run, name="hf-generation", daemon=True)
+        thread.start()
+        return thread
+    
+    def submit(self, messages: List[Dict[str, str]], **kwargs) -> Future:
+        """Queue a request; the returned future resolves to a HuggingFaceResponse."""
+        request = _GenerationRequest(messages=messages, kwargs=kwargs)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Generation batcher is closed")
+            if not self._thread.is_alive():
+                logging.warning("Generation worker thread died, restarting it")
+                self._thread = self._start_worker()
+            self._queue.put(request)
+        return request.future
+    
+    def close(self):
+        """Finish queued requests and stop the worker thread."""
+        with self._lock:
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+    
+    @staticmethod
+    def _resolve(request: _GenerationRequest, response: Any = None, error: Optional[BaseException] = None):
+        """Resolve one request's future, ignoring futures that are already done."""
+        if request.future.done():
+            return
+        try:
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(response)
+        except Exception as e:
+            # Cancelled or resolved concurrently by its caller
+            logging.debug(f"Dropping result of a finished generation request: {e}")
+    
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                batch.append(request)
+            
+            # Drop requests their callers cancelled while queued; the rest can
+            # no longer be cancelled
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            
+            # Only requests with identical generation parameters share a pass
+            groups: Dict[str, List[_GenerationRequest]] = {}
+            for request in batch:
+                key = json.dumps(request.kwargs, sort_keys=True, default=str)
+                groups.setdefault(key, []).append(request)
+            
+            for requests in groups.values():
+                try:
+                    responses = self.client.generate_batch(
+                        [request.messages for request in requests], **requests[0].kwargs
+                    )
+                except Exception as e:
+                    for request in requests:
+                        self._resolve(request, error=e)
+                    continue
+                for request, response in zip(requests, responses):
+                    self._resolve(request, response)
+            
+            if stop:
+                return
+
+
 class HuggingFaceClient:
     """
     HuggingFace client for running local models.
@@ -63,7 +196,9 @@ class HuggingFaceClient:
                  device: str = "auto",
                  cache_dir: Optional[str] = None,
                  use_quantization: bool = False,
-                 max_memory: Optional[Dict[str, str]] = None):
+                 max_memory: Optional[Dict[str, str]] = None,
+                 max_batch_size: int = 8,
+                 batch_wait_ms: float = 5.0):
         """
         Initialize HuggingFace client.
         
@@ -73,6 +208,8 @@ class HuggingFaceClient:
             cache_dir: Directory to cache models
             use_quantization: Whether to use 4-bit quantization
             max_memory: Memory allocation per device
+            max_batch_size: Maximum prompts per batched forward pass
+            batch_wait_ms: Milliseconds the batcher waits to collect concurrent requests
         """
         if not TRANSFORMERS_AVAILABLE:
             raise ImportError("transformers library is required for HuggingFace client")
@@ -82,11 +219,15 @@ class HuggingFaceClient:
         self.cache_dir = cache_dir or os.path.expanduser("~/.cache/huggingface")
         self.use_quantization = use_quantization
         self.max_memory = max_memory
+        self.max_batch_size = max_batch_size
+        self.batch_wait_ms = batch_wait_ms
         
         # Model and tokenizer
         self.tokenizer = None
         self.model = None
         self.pipeline = None
+        self._batcher: Optional[GenerationBatcher] = None
+        self._batcher_lock = threading.Lock()
         
         # Model configuration
         self.model_config = {
@@ -103,6 +244,42 @@ class HuggingFaceClient:
         
         logging.info(f"HuggingFace client initialized with model: {model_name}")
     
+    @classmethod
+    def from_model(cls, model, tokenizer, model_name: Optional[str] = None,
+                   device: str = "cpu", **kwargs) -> 'HuggingFaceClient':
+        """
+        Wrap an already loaded model and tokenizer.
+        
+        Args:
+            model: Causal language model
+            tokenizer: Matching tokenizer
+            model_name: Name reported in responses
+            device: Device the model is on
+            **kwargs: Batching options (max_batch_size, batch_wait_ms)
+            
+        Returns:
+            HuggingFaceClient instance
+        """
+        client = cls.__new__(cls)
+        client.model_name = model_name or getattr(model.config, 'name_or_path', None) or 'local-model'
+        client.device = device
+        client.cache_dir = None
+        client.use_quantization = False
+        client.max_memory = None
+        client.max_batch_size = kwargs.get('max_batch_size', 8)
+        client.batch_wait_ms = kwargs.get('batch_wait_ms', 5.0)
+        client.model = model
+        client.tokenizer = tokenizer
+        client.pipeline = None
+        client._batcher = None
+        client._batcher_lock = threading.Lock()
+        
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
+        client.model_config = {'pad_token_id': tokenizer.pad_token_id}
+        return client
+    
     def _determine_device(self, device: str) -> str:
         """Determine the best device to use."""
         if device == "auto":
@@ -145,6 +322,9 @@ class HuggingFaceClient:
             
             self.model_config['pad_token_id'] = self.tokenizer.pad_token_id
             
+            # Decoder-only models continue from the right edge of each prompt
+            self.tokenizer.padding_side = "left"
+            
             # Load model
             model_kwargs = {
                 'cache_dir': self.cache_dir,
@@ -204,74 +384,116 @@ class HuggingFaceClient:
         Returns:
             HuggingFaceResponse object
         """
+        return self.generate_batch([messages], temperature=temperature, max_tokens=max_tokens,
+                                   top_p=top_p, **kwargs)[0]
+    
+    def generate_batch(self,
+                       messages_list: List[List[Dict[str, str]]],
+                       temperature: float = 0.7,
+                       max_tokens: int = 1000,
+                       top_p: float = 0.9,
+                       **kwargs) -> List[HuggingFaceResponse]:
+        """
+        Generate responses for several conversations in one forward pass.
+        
+        Args:
+            messages_list: One message list per conversation
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p sampling parameter
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            One HuggingFaceResponse per conversation, in order
+        """
         if not self.model or not self.tokenizer:
             raise RuntimeError("Model not loaded")
+        if not messages_list:
+            return []
         
-        # Convert messages to prompt
-        prompt = self._messages_to_prompt(messages)
+        prompts = [self._messages_to_prompt(messages) for messages in messages_list]
         
         # Update generation config
         generation_config = {
             'max_new_tokens': max_tokens,
-            'temperature': temperature,
-            'top_p': top_p,
             'do_sample': temperature > 0,
             'pad_token_id': self.model_config['pad_token_id'],
-            'eos_token_id': self.tokenizer.eos_token_id,
-            'return_full_text': False
+            'eos_token_id': self.tokenizer.eos_token_id
         }
+        if temperature > 0:
+            generation_config.update(temperature=temperature, top_p=top_p)
         
         # Add any additional kwargs
+        kwargs.pop('model', None)
+        kwargs.pop('return_full_text', None)
         generation_config.update(kwargs)
         
         try:
             start_time = time.time()
             
-            # Generate response
-            if self.pipeline:
-                outputs = self.pipeline(
-                    prompt,
-                    **generation_config
-                )
-                generated_text = outputs[0]['generated_text']
-            else:
-                # Fallback to direct model generation
-                inputs = self.tokenizer.encode(prompt, return_tensors="pt").to(self.device)
-                
-                with torch.no_grad():
-                    outputs = self.model.generate(
-                        inputs,
-                        **generation_config
-                    )
-                
-                # Decode only the new tokens
-                generated_tokens = outputs[0][inputs.shape[1]:]
-                generated_text = self.tokenizer.decode(generated_tokens, skip_special_tokens=True)
+            inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+            with torch.inference_mode():
+                outputs = self.model.generate(**inputs, **generation_config)
             
             generation_time = time.time() - start_time
             
-            # Calculate token usage
-            input_tokens = len(self.tokenizer.encode(prompt))
-            output_tokens = len(self.tokenizer.encode(generated_text))
-            
-            # Clean up the generated text
-            generated_text = self._clean_generated_text(generated_text)
-            
-            return HuggingFaceResponse(
-                content=generated_text,
-                model=self.model_name,
-                usage={
-                    'prompt_tokens': input_tokens,
-                    'completion_tokens': output_tokens,
-                    'total_tokens': input_tokens + output_tokens,
-                    'generation_time': generation_time
-                }
-            )
+            # Token usage from the tensors: prompt tokens are the unmasked
+            # positions, completion tokens run up to the first eos/pad
+            prompt_lengths = inputs['attention_mask'].sum(dim=1).tolist()
+            new_tokens = outputs[:, inputs['input_ids'].shape[1]:]
+            stop_ids = [t for t in {self.tokenizer.eos_token_id, self.model_config['pad_token_id']} if t is not None]
+            if stop_ids:
+                stopped = torch.isin(new_tokens, torch.tensor(stop_ids, device=new_tokens.device))
+                completion_lengths = (stopped.cumsum(dim=1) == 0).sum(dim=1).tolist()
+            else:
+                completion_lengths = [new_tokens.shape[1]] * len(prompts)
+            
+            responses = []
+            for i, (input_tokens, output_tokens) in enumerate(zip(prompt_lengths, completion_lengths)):
+                generated_text = self.tokenizer.decode(new_tokens[i, :output_tokens], skip_special_tokens=True)
+                
+                responses.append(HuggingFaceResponse(
+                    content=self._clean_generated_text(generated_text),
+                    model=self.model_name,
+                    usage={
+                        'prompt_tokens': input_tokens,
+                        'completion_tokens': output_tokens,
+                        'total_tokens': input_tokens + output_tokens,
+                        'generation_time': generation_time,
+                        'batch_size': len(prompts)
+                    },
+                    finish_reason="stop" if output_tokens < new_tokens.shape[1] else "length"
+                ))
+            
+            return responses
             
         except Exception as e:
             logging.error(f"Generation failed: {e}")
             raise
     
+    def submit(self, messages: List[Dict[str, str]], **kwargs) -> Future:
+        """
+        Queue a request on the micro-batching worker thread.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            **kwargs: Generation parameters (temperature, max_tokens, top_p, ...)
+            
+        Returns:
+            Future resolving to a HuggingFaceResponse
+        """
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = GenerationBatcher(
+                        self, max_batch_size=self.max_batch_size, max_wait=self.batch_wait_ms / 1000
+                    )
+        return self._batcher.submit(messages, **kwargs)
+    
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> HuggingFaceResponse:
+        """Generate without blocking the event loop, batched with concurrent callers."""
+        return await asyncio.wrap_future(self.submit(messages, **kwargs))
+    
     def _messages_to_prompt(self, messages: List[Dict[str, str]]) -> str:
         """Convert messages to a single prompt string."""
         prompt_parts = []
@@ -346,6 +568,10 @@ class HuggingFaceClient:
     
     def unload_model(self):
         """Unload the model to free memory."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        
         if self.model:
             del self.model
             self.model = None
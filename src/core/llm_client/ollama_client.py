@@ -16,6 +16,8 @@ log = get_logger(__name__)
 class OllamaClient(BaseLLMClient):
     """Client for Ollama local models."""
     
+    supports_response_format = True
+    
     def __init__(self, model_name: str = None, config: Optional[Dict[str, Any]] = None):
         app_config = get_config()
         self.base_url = app_config.llm.ollama_base_url
@@ -82,6 +84,7 @@ class OllamaClient(BaseLLMClient):
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> ProcessingResult[str]:
         """
@@ -92,6 +95,8 @@ class OllamaClient(BaseLLMClient):
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            response_format: OpenAI-style structured output request, sent
+                as Ollama's ``format`` (the JSON schema, or "json")
             **kwargs: Additional parameters
             
         Returns:
@@ -124,6 +129,9 @@ class OllamaClient(BaseLLMClient):
                     **kwargs
                 }
             }
+            if response_format:
+                json_schema = response_format.get("json_schema", {}).get("schema")
+                payload["format"] = json_schema or "json"
             
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(
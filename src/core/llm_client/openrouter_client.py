@@ -10,11 +10,14 @@ from typing import Dict, List, Optional, Any
 import httpx
 import asyncio
 
+# The usage tracker only depends on the standard library, so importing it
+# here does not create a cycle with core
+from core.api_usage_tracker import APIUsageTracker, APIUsageRecord
+
 # Remove circular imports
 # from core.base import BaseLLMClient, ProcessingResult, LLMError
 # from core.config import get_config
 # from core.logging_config import get_logger
-# from core.api_usage_tracker import APIUsageTracker, APIUsageRecord
 
 log = logging.getLogger(__name__)
 
@@ -37,23 +40,6 @@ class LLMError(Exception):
     """Simple LLM error class."""
     pass
 
-class APIUsageTracker:
-    """Simple API usage tracker class."""
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-    
-    def check_daily_limit(self, provider: str, limit: int) -> tuple[bool, int, int]:
-        return True, 0, limit
-    
-    def check_monthly_limit(self, provider: str, limit: int) -> tuple[bool, int, int]:
-        return True, 0, limit
-
-class APIUsageRecord:
-    """Simple API usage record class."""
-    def __init__(self, **kwargs):
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-
 def get_config():
     """Simple config getter to avoid circular imports."""
     class SimpleConfig:
@@ -63,7 +49,7 @@ def get_config():
     class SimpleLLMConfig:
         def __init__(self):
             self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY", "")
-            self.openrouter_api_base = "https://openrouter.ai/api/v1"
+            self.openrouter_api_base = os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
             self.default_model = "gpt-3.5-turbo"
             self.temperature = 0.1
             self.max_tokens = 2048
@@ -79,10 +65,24 @@ def get_config():
 class OpenRouterClient(BaseLLMClient):
     """Client for OpenRouter API supporting various LLM models."""
     
-    def __init__(self, model_name: str = None, config: Optional[Dict[str, Any]] = None):
+    supports_response_format = True
+    
+    def __init__(self, model_name: str = None, config: Optional[Dict[str, Any]] = None,
+                 api_key: Optional[str] = None, api_base: Optional[str] = None,
+                 track_usage: Optional[bool] = None):
+        """
+        Initialize the client.
+        
+        Args:
+            model_name: Model to use (defaults to the configured default model)
+            config: Client configuration
+            api_key: API key (defaults to the configured OpenRouter key)
+            api_base: OpenAI-compatible API base (defaults to the configured OpenRouter base)
+            track_usage: Whether to record API usage (defaults to the configuration)
+        """
         app_config = get_config()
-        self.api_key = app_config.llm.openrouter_api_key
-        self.api_base = app_config.llm.openrouter_api_base
+        self.api_key = api_key or app_config.llm.openrouter_api_key
+        self.api_base = api_base or app_config.llm.openrouter_api_base
         
         if not self.api_key:
             raise LLMError("OpenRouter API key not configured")
@@ -101,7 +101,7 @@ class OpenRouterClient(BaseLLMClient):
         
         # API usage tracking
         self.usage_tracker = None
-        if app_config.llm.enable_usage_tracking:
+        if app_config.llm.enable_usage_tracking if track_usage is None else track_usage:
             try:
                 self.usage_tracker = APIUsageTracker(app_config.llm.usage_database_path)
                 log.info("API usage tracking enabled")
@@ -163,7 +163,8 @@ class OpenRouterClient(BaseLLMClient):
         top_p: Optional[float] = None,
         frequency_penalty: Optional[float] = None,
         presence_penalty: Optional[float] = None,
-        stream: bool = False
+        stream: bool = False,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> ProcessingResult:
         """
         Generate text using OpenRouter API.
@@ -178,6 +179,7 @@ class OpenRouterClient(BaseLLMClient):
             frequency_penalty: Frequency penalty (-2.0 to 2.0)
             presence_penalty: Presence penalty (-2.0 to 2.0)
             stream: Whether to stream the response
+            response_format: OpenAI-style structured output request (JSON mode or schema)
             
         Returns:
             ProcessingResult containing the generated text
@@ -220,6 +222,8 @@ class OpenRouterClient(BaseLLMClient):
                 payload["presence_penalty"] = presence_penalty
             if stream:
                 payload["stream"] = stream
+            if response_format:
+                payload["response_format"] = response_format
             
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(
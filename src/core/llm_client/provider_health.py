@@ -0,0 +1,153 @@
+"""
+Per-provider latency/error statistics and circuit breakers for LLM routing.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class ProviderStats:
+    """
+    Rolling latency and error statistics of one provider.
+
+    Latency and error rate are tracked as exponentially weighted moving
+    averages (recent calls dominate); latency percentiles come from a window
+    of the most recent successful (or abandoned) calls.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 200):
+        """
+        Initialize the statistics.
+
+        Args:
+            alpha: EWMA smoothing factor (weight of the newest observation)
+            window: Number of recent latencies kept for percentiles
+        """
+        self.alpha = alpha
+        self.latencies = deque(maxlen=window)
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.abandoned = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.latencies.append(latency)
+            self.ewma_latency = latency if self.ewma_latency is None else \
+                self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            self.error_rate = (1 - self.alpha) * self.error_rate
+
+    def record_failure(self, latency: float, error: Optional[str] = None):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = error
+            # A failure costs at least as much time as a typical success
+            latency = max(latency, self.ewma_latency or 0.0)
+            self.ewma_latency = latency if self.ewma_latency is None else \
+                self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+
+    def record_abandoned(self, latency: float):
+        """
+        Record a call cancelled after ``latency`` seconds (e.g. it lost a hedge).
+
+        The elapsed time is a lower bound of the provider's latency, so it is
+        folded into the latency statistics without counting as an error.
+        """
+        with self._lock:
+            self.requests += 1
+            self.abandoned += 1
+            self.latencies.append(latency)
+            self.ewma_latency = latency if self.ewma_latency is None else \
+                self.alpha * max(latency, self.ewma_latency) + (1 - self.alpha) * self.ewma_latency
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile over the recent window, or None without samples."""
+        with self._lock:
+            if not self.latencies:
+                return None
+            return float(np.percentile(np.fromiter(self.latencies, dtype=float), pct))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "abandoned": self.abandoned,
+            "error_rate": round(self.error_rate, 4),
+            "ewma_latency": self.ewma_latency,
+            "p50_latency": self.percentile(50),
+            "p95_latency": self.percentile(95),
+            "last_error": self.last_error
+        }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one provider.
+
+    ``closed``: requests flow. After ``failure_threshold`` consecutive
+    failures the breaker opens and the provider receives no traffic. Once
+    ``reset_timeout`` has passed it is ``half_open``: a single background
+    probe decides whether it closes again or re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds an open breaker waits before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether regular traffic may be routed to the provider."""
+        return self.state == self.CLOSED
+
+    def needs_probe(self) -> bool:
+        return self.state == self.HALF_OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.consecutive_failures}
@@ -1,8 +1,21 @@
 """
 Smart LLM Manager that automatically switches between different providers.
+
+Requests are routed by each provider's recent health instead of sticking to
+one provider until it raises:
+
+- every provider keeps rolling latency/error statistics (EWMA + percentiles)
+  and a circuit breaker; a provider whose breaker is open receives no traffic
+  until a background probe finds it healthy again,
+- healthy providers are ranked by expected latency (EWMA latency weighted by
+  the error rate); a failed attempt fails over to the next one,
+- with hedging enabled, a request that has not answered within the
+  provider's p95 latency is raced against the next provider and the first
+  answer wins, bounding tail latency when a provider degrades.
 """
 
 import asyncio
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from core.base import BaseLLMClient, ProcessingResult, LLMError
 from core.config import get_config
@@ -10,45 +23,134 @@ from core.logging_config import get_logger
 from core.llm_client.openrouter_client import OpenRouterClient
 from core.llm_client.ollama_client import OllamaClient
 from core.llm_client.huggingface_client import HuggingFaceClient
+from core.llm_client.provider_health import CircuitBreaker, ProviderStats
 
 log = get_logger(__name__)
 
+# Samples needed before a provider's own p95 is trusted as hedge delay
+MIN_HEDGE_SAMPLES = 5
+
+
+async def call_llm_client(
+    client: Any,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> ProcessingResult[str]:
+    """
+    Call an LLM client through its own interface.
+
+    OpenRouter and Ollama clients take a prompt; the local HuggingFace client
+    takes chat messages and is called through its non-blocking ``agenerate``.
+    A ``response_format`` is only passed to clients that support it.
+    """
+    if "response_format" in kwargs and not getattr(client, "supports_response_format", False):
+        kwargs.pop("response_format")
+    if isinstance(client, HuggingFaceClient):
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        options = {key: value for key, value in
+                   (("temperature", temperature), ("max_tokens", max_tokens)) if value is not None}
+        response = await client.agenerate(messages, **options)
+        return ProcessingResult(
+            success=True,
+            data=response.content,
+            metadata={"model": response.model, "usage": response.usage}
+        )
+
+    return await client.generate(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                 max_tokens=max_tokens, **kwargs)
+
+
 class SmartLLMManager(BaseLLMClient):
-    """Smart LLM manager that automatically switches between providers."""
-    
-    def __init__(self, model_name: str = None, config: Optional[Dict[str, Any]] = None):
+    """Smart LLM manager that routes requests across providers by health."""
+
+    # Forwarded to the providers that support it
+    supports_response_format = True
+
+    def __init__(self,
+                 model_name: str = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 clients: Optional[Dict[str, Any]] = None,
+                 hedge_requests: Optional[bool] = None,
+                 hedge_delay: float = 5.0,
+                 failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None,
+                 probe_interval: float = 5.0):
+        """
+        Initialize the manager.
+
+        Args:
+            model_name: Model of the primary (OpenRouter) client
+            config: Client configuration
+            clients: Providers by name in preference order; built from the
+                LLM configuration when omitted
+            hedge_requests: Race a second provider when the first one is slow
+                (defaults to ``enable_request_hedging``)
+            hedge_delay: Hedge delay used until a provider has latency samples
+            failure_threshold: Consecutive failures that open a provider's breaker
+            reset_timeout: Seconds before an open breaker is probed
+            probe_interval: Seconds between background probes of open breakers
+        """
         app_config = get_config()
         self.config = app_config.llm
-        
-        # Initialize primary client (OpenRouter)
+
         self.primary_client = None
-        if self.config.openrouter_api_key:
-            try:
-                self.primary_client = OpenRouterClient(model_name, config)
-                log.info("Primary OpenRouter client initialized")
-            except Exception as e:
-                log.warning(f"Failed to initialize OpenRouter client: {e}")
-        
-        # Initialize fallback clients
         self.fallback_clients = {}
         self.fallback_strategy = self.config.fallback_strategy.split(',')
-        
-        if self.config.enable_fallback_models:
-            self._initialize_fallback_clients()
-        
-        # Set current active client
-        self.current_client = self.primary_client
-        self.current_provider = "openrouter" if self.primary_client else "none"
-        
+
+        if clients is not None:
+            self.providers = dict(clients)
+        else:
+            # Initialize primary client (OpenRouter)
+            if self.config.openrouter_api_key:
+                try:
+                    self.primary_client = OpenRouterClient(model_name, config)
+                    log.info("Primary OpenRouter client initialized")
+                except Exception as e:
+                    log.warning(f"Failed to initialize OpenRouter client: {e}")
+
+            # Initialize fallback clients
+            if self.config.enable_fallback_models:
+                self._initialize_fallback_clients()
+
+            self.providers = {}
+            if self.primary_client:
+                self.providers["openrouter"] = self.primary_client
+            self.providers.update(self.fallback_clients)
+
+        self.preferred_provider = next(iter(self.providers), "none")
+        self.hedge_requests = self.config.enable_request_hedging if hedge_requests is None else hedge_requests
+        self.hedge_delay = hedge_delay
+        self.probe_interval = probe_interval
+        self.stats = {name: ProviderStats() for name in self.providers}
+        self.breakers = {
+            name: CircuitBreaker(
+                failure_threshold=failure_threshold or self.config.circuit_breaker_failures,
+                reset_timeout=self.config.circuit_breaker_reset_seconds if reset_timeout is None else reset_timeout
+            )
+            for name in self.providers
+        }
+        self._pinned_provider: Optional[str] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+        # Set current active client (the provider that answered last)
+        self.current_provider = self.preferred_provider
+        self.current_client = self.providers.get(self.current_provider)
+
         super().__init__(model_name=model_name, config=config)
-        log.info(f"Smart LLM Manager initialized with provider: {self.current_provider}")
-    
+        log.info(f"Smart LLM Manager initialized with providers: {list(self.providers) or 'none'}")
+
     def _initialize_fallback_clients(self):
         """Initialize fallback clients based on strategy."""
         try:
             for strategy in self.fallback_strategy:
                 strategy = strategy.strip().lower()
-                
+
                 if strategy == "ollama":
                     try:
                         ollama_client = OllamaClient(self.config.ollama_default_model)
@@ -59,7 +161,7 @@ class SmartLLMManager(BaseLLMClient):
                             log.warning("Ollama server not running, skipping Ollama client")
                     except Exception as e:
                         log.warning(f"Failed to initialize Ollama client: {e}")
-                
+
                 elif strategy == "huggingface":
                     try:
                         hf_client = HuggingFaceClient(self.config.huggingface_default_model)
@@ -67,80 +169,68 @@ class SmartLLMManager(BaseLLMClient):
                         log.info("HuggingFace fallback client initialized")
                     except Exception as e:
                         log.warning(f"Failed to initialize HuggingFace client: {e}")
-                
+
                 else:
                     log.warning(f"Unknown fallback strategy: {strategy}")
-                    
+
         except Exception as e:
             log.error(f"Failed to initialize fallback clients: {e}")
-    
-    async def _check_primary_client_health(self) -> bool:
-        """Check if primary client is healthy and within limits."""
-        if not self.primary_client:
-            return False
-        
+
+    def _expected_latency(self, provider: str) -> float:
+        """EWMA latency inflated by the error rate; unmeasured providers rank last."""
+        stats = self.stats[provider]
+        if stats.ewma_latency is None:
+            return float("inf")
+        return stats.ewma_latency / max(1.0 - stats.error_rate, 0.05)
+
+    def _route(self) -> List[str]:
+        """
+        Providers to try for a request, best first.
+
+        Providers with a closed breaker are ranked by expected latency (ties
+        keep the configured preference order). If every breaker is open, the
+        remaining providers are tried in preference order as a last resort.
+        """
+        order = list(self.providers)
+        healthy = [name for name in order if self.breakers[name].allow_request()]
+        if not healthy:
+            return order
+
+        ranked = sorted(healthy, key=lambda name: (self._expected_latency(name), order.index(name)))
+        if self._pinned_provider in ranked:
+            ranked.remove(self._pinned_provider)
+            ranked.insert(0, self._pinned_provider)
+        return ranked
+
+    def _hedge_delay_for(self, provider: str) -> float:
+        """Time to wait for a provider before hedging: its p95 latency once known."""
+        stats = self.stats[provider]
+        if len(stats.latencies) >= MIN_HEDGE_SAMPLES:
+            return stats.percentile(95)
+        return self.hedge_delay
+
+    async def _attempt(self, provider: str, *args, **kwargs) -> Tuple[str, ProcessingResult[str]]:
+        """Call one provider and record the outcome in its statistics and breaker."""
+        start = time.perf_counter()
         try:
-            # Check if we can make a simple request
-            test_result = await self.primary_client.generate(
-                "test", 
-                max_tokens=10,
-                temperature=0.0
-            )
-            return test_result.success
+            result = await call_llm_client(self.providers[provider], *args, **kwargs)
+        except asyncio.CancelledError:
+            self.stats[provider].record_abandoned(time.perf_counter() - start)
+            raise
         except Exception as e:
-            log.debug(f"Primary client health check failed: {e}")
-            return False
-    
-    async def _switch_to_fallback(self, reason: str = "primary client unavailable") -> bool:
-        """Switch to an available fallback client."""
-        log.info(f"Switching to fallback client: {reason}")
-        
-        for provider, client in self.fallback_clients.items():
-            try:
-                # Test the fallback client
-                if provider == "ollama":
-                    if client.is_server_running():
-                        self.current_client = client
-                        self.current_provider = provider
-                        log.info(f"Switched to {provider} fallback client")
-                        return True
-                elif provider == "huggingface":
-                    # Simple test for HuggingFace
-                    self.current_client = client
-                    self.current_provider = provider
-                    log.info(f"Switched to {provider} fallback client")
-                    return True
-                    
-            except Exception as e:
-                log.warning(f"Failed to test {provider} fallback client: {e}")
-                continue
-        
-        log.error("No fallback clients available")
-        return False
-    
-    async def _ensure_client_available(self) -> bool:
-        """Ensure we have an available client."""
-        if self.current_client and self.current_provider == "openrouter":
-            # Check if primary client is still healthy
-            if await self._check_primary_client_health():
-                return True
-            else:
-                log.warning("Primary client unhealthy, switching to fallback")
-                return await self._switch_to_fallback("primary client unhealthy")
-        
-        elif self.current_client and self.current_provider in self.fallback_clients:
-            # We're already using a fallback
-            return True
-        
+            result = ProcessingResult(success=False, error=str(e))
+
+        elapsed = time.perf_counter() - start
+        if result.success:
+            self.stats[provider].record_success(elapsed)
+            self.breakers[provider].record_success()
         else:
-            # No client available, try to get one
-            if self.primary_client and await self._check_primary_client_health():
-                self.current_client = self.primary_client
-                self.current_provider = "openrouter"
-                return True
-            else:
-                return await self._switch_to_fallback("no primary client")
-    
+            self.stats[provider].record_failure(elapsed, result.error)
+            self.breakers[provider].record_failure()
+            if not self.breakers[provider].allow_request():
+                log.warning(f"Circuit breaker opened for {provider}: {result.error}")
+        return provider, result
+
     async def generate(
         self,
         prompt: str,
@@ -151,66 +241,115 @@ class SmartLLMManager(BaseLLMClient):
     ) -> ProcessingResult[str]:
         """
         Generate text using the best available client.
-        
+
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             **kwargs: Additional parameters
-            
+
         Returns:
             ProcessingResult containing generated text
         """
-        # Ensure we have an available client
-        if not await self._ensure_client_available():
+        candidates = self._route()
+        if not candidates:
             return ProcessingResult(
                 success=False,
                 error="No LLM clients available"
             )
-        
+        self._ensure_probing()
+
+        call_args = (prompt, system_prompt, temperature, max_tokens)
+        in_flight: Dict[asyncio.Task, Tuple[str, float]] = {}
+        errors = []
+        hedged = False
+
+        def launch():
+            provider = candidates.pop(0)
+            task = asyncio.create_task(self._attempt(provider, *call_args, **kwargs))
+            in_flight[task] = (provider, time.perf_counter())
+
+        launch()
         try:
-            # Generate using current client
-            result = await self.current_client.generate(
-                prompt, system_prompt, temperature, max_tokens, **kwargs
+            while in_flight:
+                timeout = None
+                if self.hedge_requests and candidates and len(in_flight) == 1:
+                    provider, started = next(iter(in_flight.values()))
+                    timeout = max(0.0, self._hedge_delay_for(provider) - (time.perf_counter() - started))
+
+                done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The lone attempt is slower than usual, race the next provider
+                    log.debug(f"Hedging request to {candidates[0]}")
+                    hedged = True
+                    launch()
+                    continue
+
+                for task in done:
+                    del in_flight[task]
+                    provider, result = task.result()
+                    if result.success:
+                        self.current_provider = provider
+                        self.current_client = self.providers[provider]
+                        result.metadata["provider"] = provider
+                        result.metadata["fallback_used"] = provider != self.preferred_provider
+                        result.metadata["hedged"] = hedged
+                        return result
+                    log.warning(f"Generation failed with {provider}: {result.error}")
+                    errors.append(f"{provider}: {result.error}")
+
+                if not in_flight and candidates:
+                    launch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        return ProcessingResult(
+            success=False,
+            error=f"All clients failed. Errors: {'; '.join(errors)}"
+        )
+
+    def _ensure_probing(self):
+        """Start the background probe of open breakers on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._probe_task is None or self._probe_task.done() or self._probe_task.get_loop() is not loop:
+            self._probe_task = loop.create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        """Periodically send a tiny request to half-open providers."""
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            await self.probe_providers()
+
+    async def probe_providers(self) -> Dict[str, str]:
+        """
+        Probe every provider whose breaker is half-open.
+
+        A successful probe closes the breaker, a failed one re-opens it.
+
+        Returns:
+            Breaker state per probed provider
+        """
+        probed = [name for name in self.providers if self.breakers[name].needs_probe()]
+        if probed:
+            await asyncio.gather(
+                *(self._attempt(name, "ping", None, 0.0, 1) for name in probed),
+                return_exceptions=True
             )
-            
-            # Add provider information to metadata
-            if result.success and result.metadata:
-                result.metadata["provider"] = self.current_provider
-                result.metadata["fallback_used"] = self.current_provider != "openrouter"
-            
-            return result
-            
-        except Exception as e:
-            error_msg = f"Generation failed with {self.current_provider}: {str(e)}"
-            log.error(error_msg)
-            
-            # Try to switch to another fallback if available
-            if await self._switch_to_fallback(f"client error: {str(e)}"):
-                # Retry with new client
-                try:
-                    result = await self.current_client.generate(
-                        prompt, system_prompt, temperature, max_tokens, **kwargs
-                    )
-                    
-                    if result.success and result.metadata:
-                        result.metadata["provider"] = self.current_provider
-                        result.metadata["fallback_used"] = True
-                    
-                    return result
-                    
-                except Exception as retry_error:
-                    return ProcessingResult(
-                        success=False,
-                        error=f"All clients failed. Last error: {str(retry_error)}"
-                    )
-            else:
-                return ProcessingResult(
-                    success=False,
-                    error=error_msg
-                )
-    
+            for name in probed:
+                log.info(f"Probe of {name}: breaker {self.breakers[name].state}")
+        return {name: self.breakers[name].state for name in probed}
+
+    async def stop_probing(self):
+        """Cancel the background probe task."""
+        task, self._probe_task = self._probe_task, None
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
     def generate_sync(
         self,
         prompt: str,
@@ -221,14 +360,14 @@ class SmartLLMManager(BaseLLMClient):
     ) -> ProcessingResult[str]:
         """
         Generate text using the best available client (synchronous).
-        
+
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             **kwargs: Additional parameters
-            
+
         Returns:
             ProcessingResult containing generated text
         """
@@ -242,8 +381,10 @@ class SmartLLMManager(BaseLLMClient):
                 )
                 return result
             finally:
+                # The probe task lives on this loop
+                loop.run_until_complete(self.stop_probing())
                 loop.close()
-                
+
         except Exception as e:
             error_msg = f"Sync generation error: {str(e)}"
             log.error(error_msg)
@@ -251,102 +392,57 @@ class SmartLLMManager(BaseLLMClient):
                 success=False,
                 error=error_msg
             )
-    
+
     def get_current_provider(self) -> str:
         """Get the current active provider."""
         return self.current_provider
-    
+
     def get_available_providers(self) -> List[str]:
         """Get list of available providers."""
-        providers = []
-        if self.primary_client:
-            providers.append("openrouter")
-        providers.extend(self.fallback_clients.keys())
-        return providers
-    
+        return list(self.providers)
+
     def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get status of all providers."""
+        """Get status, latency statistics and breaker state of all providers."""
         status = {}
-        
-        # Primary client status
-        if self.primary_client:
-            try:
-                # Check if primary client is healthy
-                status["openrouter"] = {
-                    "available": True,
-                    "healthy": True,  # Will be updated on first use
-                    "current": self.current_provider == "openrouter"
-                }
-            except Exception:
-                status["openrouter"] = {
-                    "available": True,
-                    "healthy": False,
-                    "current": False
-                }
-        
-        # Fallback clients status
-        for provider, client in self.fallback_clients.items():
-            try:
-                if provider == "ollama":
-                    healthy = client.is_server_running()
-                else:
-                    healthy = True  # Assume healthy for other providers
-                
-                status[provider] = {
-                    "available": True,
-                    "healthy": healthy,
-                    "current": self.current_provider == provider
-                }
-            except Exception:
-                status[provider] = {
-                    "available": False,
-                    "healthy": False,
-                    "current": False
-                }
-        
+        for provider in self.providers:
+            breaker = self.breakers[provider]
+            status[provider] = {
+                "available": True,
+                "healthy": breaker.allow_request(),
+                "current": self.current_provider == provider,
+                "breaker": breaker.to_dict(),
+                "stats": self.stats[provider].to_dict()
+            }
         return status
-    
+
     async def test_all_providers(self) -> Dict[str, bool]:
         """Test all available providers."""
         results = {}
-        
-        # Test primary client
-        if self.primary_client:
-            try:
-                test_result = await self.primary_client.generate("test", max_tokens=5)
-                results["openrouter"] = test_result.success
-            except Exception:
-                results["openrouter"] = False
-        
-        # Test fallback clients
-        for provider, client in self.fallback_clients.items():
+
+        for provider, client in self.providers.items():
             try:
                 if provider == "ollama":
                     results[provider] = client.is_server_running()
                 elif provider == "huggingface":
-                    # Simple test for HuggingFace
+                    # Avoid loading the local model just for a test
                     results[provider] = True
                 else:
-                    results[provider] = False
+                    test_result = await client.generate("test", max_tokens=5)
+                    results[provider] = test_result.success
             except Exception:
                 results[provider] = False
-        
+
         return results
-    
+
     def switch_provider(self, provider: str) -> bool:
-        """Manually switch to a specific provider."""
-        if provider == "openrouter" and self.primary_client:
-            self.current_client = self.primary_client
-            self.current_provider = "openrouter"
-            log.info("Switched to OpenRouter provider")
-            return True
-        
-        elif provider in self.fallback_clients:
-            self.current_client = self.fallback_clients[provider]
+        """Manually switch to a specific provider; it is tried first while healthy."""
+        if provider in self.providers:
+            self._pinned_provider = provider
+            self.current_client = self.providers[provider]
             self.current_provider = provider
             log.info(f"Switched to {provider} provider")
             return True
-        
+
         else:
             log.warning(f"Provider {provider} not available")
             return False
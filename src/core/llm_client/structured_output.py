@@ -0,0 +1,331 @@
+"""
+Structured (JSON) output for LLM calls.
+
+``generate_json`` asks providers that support it (OpenRouter
+``response_format``, Ollama ``format``) for schema-constrained JSON. Any
+answer is parsed with a lenient single-pass repair parser, which handles
+code fences, prose around the object, single quotes, Python literals,
+trailing or missing commas and output truncated mid-object. Only when that
+still fails, or the answer breaks the schema, is the model asked again. The
+retry is bounded and resends just the broken answer and the error, not the
+original document.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.base import ProcessingResult
+from core.logging_config import get_logger
+
+log = get_logger(__name__)
+
+RETRY_PROMPT = """Your previous answer could not be used: {error}
+
+Previous answer:
+{previous}
+
+Reply with only the corrected JSON."""
+
+# Longest previous answer resent in a retry prompt
+MAX_RETRY_ECHO_CHARS = 4000
+
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object"
+}
+
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_WORD_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-]*")
+_LITERALS = {"true": "true", "false": "false", "null": "null",
+             "True": "true", "False": "false", "None": "null", "NaN": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> str:
+    """
+    Repair the first JSON object or array in an LLM answer.
+
+    Args:
+        text: Raw LLM output
+
+    Returns:
+        JSON text (not guaranteed to parse if the answer is too broken)
+
+    Raises:
+        ValueError: If the answer contains no JSON object or array
+    """
+    fenced = _FENCE_PATTERN.search(text)
+    if fenced and re.search(r"[\[{]", fenced.group(1)):
+        text = fenced.group(1)
+    match = re.search(r"[\[{]", text)
+    if not match:
+        raise ValueError("no JSON object found in the answer")
+
+    out: List[str] = []
+    stack: List[str] = []
+    quote = None
+    escaped = False
+    i = match.start()
+
+    def last_significant() -> str:
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped[-1]
+        return ""
+
+    def separate():
+        # A value directly after another value lacks its comma
+        if last_significant() in ('"', "}", "]") or last_significant().isalnum():
+            out.append(",")
+
+    def drop_trailing_comma():
+        while out and not out[-1].strip():
+            out.pop()
+        if out and out[-1].rstrip().endswith(","):
+            out[-1] = out[-1].rstrip()[:-1]
+
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if escaped:
+                out.append(char)
+                escaped = False
+            elif char == "\\":
+                out.append(char)
+                escaped = True
+            elif char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char in ('"', "'"):
+            if last_significant() != ":":
+                separate()
+            out.append('"')
+            quote = char
+        elif char in _CLOSERS:
+            if last_significant() != ":":
+                separate()
+            stack.append(_CLOSERS[char])
+            out.append(char)
+        elif char in "}]":
+            drop_trailing_comma()
+            if last_significant() == ":":
+                out.append("null")
+            if stack and stack[-1] == char:
+                stack.pop()
+                out.append(char)
+                if not stack:
+                    break
+        elif char.isdigit() or (char == "-" and i + 1 < len(text) and text[i + 1].isdigit()):
+            number = _NUMBER_PATTERN.match(text, i)
+            if last_significant() != ":":
+                separate()
+            out.append(number.group(0))
+            i = number.end()
+            continue
+        elif char.isalpha() or char == "_":
+            word = _WORD_PATTERN.match(text, i).group(0)
+            if last_significant() != ":":
+                separate()
+            # Unquoted keys and bare words become strings
+            out.append(_LITERALS.get(word, json.dumps(word)))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    # Close whatever a truncated answer left open
+    if quote:
+        out.append('"')
+    drop_trailing_comma()
+    if last_significant() == ":":
+        out.append("null")
+    while stack:
+        out.append(stack.pop())
+    return "".join(out)
+
+
+def _parse(text: Any) -> Tuple[Optional[Any], Optional[str], bool]:
+    """(parsed value, error, whether it needed repair)."""
+    if isinstance(text, (dict, list)):
+        return text, None, False
+    if not isinstance(text, str) or not text.strip():
+        return None, "empty answer", False
+    try:
+        return json.loads(text.strip()), None, False
+    except json.JSONDecodeError as e:
+        error = f"invalid JSON ({e.msg} at line {e.lineno} column {e.colno})"
+    try:
+        return json.loads(repair_json(text)), None, True
+    except ValueError as e:
+        if not isinstance(e, json.JSONDecodeError):
+            error = str(e)
+    return None, error, False
+
+
+def parse_json_response(text: Any) -> Optional[Any]:
+    """Parse (and if needed repair) the JSON in an LLM answer; None if impossible."""
+    data, error, _ = _parse(text)
+    if error:
+        log.debug(f"Unparseable LLM answer ({error}): {str(text)[:200]}")
+    return data
+
+
+def object_schema(field_types: Dict[str, type],
+                  required: Tuple[str, ...] = (),
+                  enums: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+    """
+    JSON schema of a flat object whose fields are nullable.
+
+    Args:
+        field_types: Python type per field (lists are lists of strings)
+        required: Fields the object must contain
+        enums: Allowed values per field
+
+    Returns:
+        JSON schema dictionary
+    """
+    properties = {}
+    for name, field_type in field_types.items():
+        json_type = JSON_TYPES.get(field_type, "string")
+        prop: Dict[str, Any] = {"type": [json_type, "null"]}
+        if field_type == list:
+            prop["items"] = {"type": "string"}
+        if enums and name in enums:
+            prop["enum"] = list(enums[name])
+        properties[name] = prop
+    return {"type": "object", "properties": properties, "required": list(required)}
+
+
+def schema_errors(data: Any, schema: Optional[Dict[str, Any]]) -> List[str]:
+    """Violations of the top-level type, required fields, property types and enums."""
+    if not schema:
+        return []
+    expected = schema.get("type")
+    if expected == "object" and not isinstance(data, dict):
+        return [f"expected a JSON object, got {type(data).__name__}"]
+    if expected == "array" and not isinstance(data, list):
+        return [f"expected a JSON array, got {type(data).__name__}"]
+    if not isinstance(data, dict):
+        return []
+
+    errors = [f"missing field '{name}'" for name in schema.get("required", ()) if name not in data]
+    python_types = {"string": str, "integer": int, "number": (int, float), "boolean": bool,
+                    "array": list, "object": dict, "null": type(None)}
+    for name, prop in schema.get("properties", {}).items():
+        if name not in data:
+            continue
+        value = data[name]
+        types = prop.get("type")
+        types = [types] if isinstance(types, str) else (types or [])
+        if types and not any(
+            isinstance(value, python_types[t]) and not (t in ("integer", "number") and isinstance(value, bool))
+            for t in types if t in python_types
+        ):
+            errors.append(f"field '{name}' must be {' or '.join(types)}")
+        elif "enum" in prop and value is not None and value not in prop["enum"]:
+            errors.append(f"field '{name}' must be one of {prop['enum']}")
+    return errors
+
+
+def response_format_for(schema: Optional[Dict[str, Any]], name: str = "response") -> Dict[str, Any]:
+    """OpenAI-style ``response_format`` for a schema (plain JSON mode without one)."""
+    if schema is None:
+        return {"type": "json_object"}
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": False}}
+
+
+def _rejected_response_format(error: Optional[str]) -> bool:
+    error = (error or "").lower()
+    return "response_format" in error or "requested parameters" in error
+
+
+async def generate_json(
+    client: Any,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    schema: Optional[Dict[str, Any]] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    max_retries: int = 1,
+    schema_name: str = "response"
+) -> ProcessingResult[Any]:
+    """
+    Generate a JSON answer.
+
+    Args:
+        client: LLM client (any of the repo's clients)
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        schema: JSON schema of the answer, passed to providers with JSON
+            mode and used to validate the answer
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        max_retries: Retries sending back the parse or schema error
+        schema_name: Schema name reported to the provider
+
+    Returns:
+        ProcessingResult with the parsed JSON; ``metadata["structured_output"]``
+        tells whether it was repaired, how many retries were needed and any
+        schema errors left
+    """
+    from core.llm_client.smart_llm_manager import call_llm_client
+
+    json_mode = bool(getattr(client, "supports_response_format", False))
+    options = {"response_format": response_format_for(schema, schema_name)} if json_mode else {}
+
+    result = await call_llm_client(client, prompt, system_prompt, temperature, max_tokens, **options)
+    if not result.success and options and _rejected_response_format(result.error):
+        log.warning(f"Provider rejected structured output, retrying without it: {result.error}")
+        client.supports_response_format = json_mode = False
+        options = {}
+        result = await call_llm_client(client, prompt, system_prompt, temperature, max_tokens)
+    if not result.success:
+        return ProcessingResult(success=False, error=result.error, metadata=result.metadata or {})
+
+    answer = result.data
+    data, error, repaired = _parse(answer)
+    errors = schema_errors(data, schema) if error is None else [error]
+    retries = 0
+    while errors and retries < max_retries:
+        retries += 1
+        log.info(f"Retrying malformed JSON answer: {'; '.join(errors)}")
+        retry = await call_llm_client(
+            client,
+            RETRY_PROMPT.format(error="; ".join(errors), previous=str(answer)[:MAX_RETRY_ECHO_CHARS]),
+            system_prompt, temperature, max_tokens, **options
+        )
+        if not retry.success:
+            break
+        retry_data, retry_error, retry_repaired = _parse(retry.data)
+        retry_errors = schema_errors(retry_data, schema) if retry_error is None else [retry_error]
+        # Keep the better of the two answers
+        if data is None or len(retry_errors) < len(errors):
+            answer, data, errors, repaired = retry.data, retry_data, retry_errors, retry_repaired
+
+    metadata = dict(result.metadata or {})
+    metadata["structured_output"] = {
+        "provider_json_mode": json_mode,
+        "repaired": repaired,
+        "retries": retries,
+        "schema_errors": errors if data is not None else []
+    }
+    if data is None:
+        return ProcessingResult(success=False, error=f"Unparseable JSON answer: {errors[0]}", metadata=metadata)
+    return ProcessingResult(success=True, data=data, metadata=metadata)
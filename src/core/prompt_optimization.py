@@ -8,9 +8,12 @@ example management and automatic prompt selection based on performance feedback.
 Location: src/core/prompt_optimization.py
 """
 
+import atexit
 import json
 import logging
 import sqlite3
+import threading
+import weakref
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -57,6 +60,53 @@ class FewShotExample:
         return asdict(self)
 
 
+@dataclass
+class BanditArmState:
+    """
+    Sufficient statistics for one bandit arm.
+
+    Contexts are accumulated as a sum of unit vectors, so the mean cosine
+    similarity between a new context and every past context is a single dot
+    product with the stored sum.
+    """
+    plays: int = 0
+    reward_sum: float = 0.0
+    context_sum: Optional[np.ndarray] = None
+
+    @property
+    def mean_reward(self) -> float:
+        return self.reward_sum / self.plays if self.plays else 0.0
+
+    @property
+    def context_centroid(self) -> Optional[np.ndarray]:
+        if self.context_sum is None or not self.plays:
+            return None
+        return self.context_sum / self.plays
+
+    def update(self, reward: float, context_features: List[float]):
+        self.plays += 1
+        self.reward_sum += reward
+
+        vector = np.asarray(context_features, dtype=float)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        if self.context_sum is None:
+            self.context_sum = vector / norm
+        elif self.context_sum.shape == vector.shape:
+            self.context_sum = self.context_sum + vector / norm
+        # Contexts of a different dimension count as zero similarity
+
+    def to_snapshot(self) -> Tuple[int, float, Optional[str]]:
+        context_sum = json.dumps(self.context_sum.tolist()) if self.context_sum is not None else None
+        return self.plays, self.reward_sum, context_sum
+
+    @classmethod
+    def from_snapshot(cls, plays: int, reward_sum: float, context_sum: Optional[str]) -> 'BanditArmState':
+        vector = np.asarray(json.loads(context_sum), dtype=float) if context_sum else None
+        return cls(plays=plays, reward_sum=reward_sum, context_sum=vector)
+
+
 class ContextualBandit:
     """
     Contextual bandit algorithm for prompt selection.
@@ -71,8 +121,7 @@ class ContextualBandit:
             exploration_factor: Controls exploration vs exploitation trade-off
         """
         self.exploration_factor = exploration_factor
-        self.arm_rewards: Dict[str, List[float]] = defaultdict(list)
-        self.arm_contexts: Dict[str, List[List[float]]] = defaultdict(list)
+        self.arms: Dict[str, BanditArmState] = defaultdict(BanditArmState)
     
     def select_prompt(self, 
                      available_prompts: List[PromptVariant], 
@@ -134,45 +183,41 @@ class ContextualBandit:
             reward: Reward value (0.0 to 1.0)
             context_features: Context features used
         """
-        self.arm_rewards[prompt_id].append(reward)
-        self.arm_contexts[prompt_id].append(context_features)
+        self.arms[prompt_id].update(reward, context_features)
     
     def _calculate_context_bonus(self, 
                                prompt_id: str, 
                                current_context: List[float]) -> float:
         """Calculate context similarity bonus."""
-        if prompt_id not in self.arm_contexts or not self.arm_contexts[prompt_id]:
+        state = self.arms.get(prompt_id)
+        if state is None or state.context_sum is None or not state.plays:
             return 0.0
         
-        # Calculate average similarity with previous contexts
-        similarities = []
-        for past_context in self.arm_contexts[prompt_id]:
-            similarity = self._cosine_similarity(current_context, past_context)
-            similarities.append(similarity)
+        current = np.asarray(current_context, dtype=float)
+        norm = np.linalg.norm(current)
+        if norm == 0 or current.shape != state.context_sum.shape:
+            return 0.0
         
-        # Return average similarity as bonus
-        return np.mean(similarities) * 0.1  # Small bonus factor
+        # Average cosine similarity with previous contexts
+        similarity = float(np.dot(current, state.context_sum)) / (norm * state.plays)
+        return similarity * 0.1  # Small bonus factor
 
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        if len(vec1) != len(vec2):
-            return 0.0
-        
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = np.sqrt(sum(a * a for a in vec1))
-        norm2 = np.sqrt(sum(b * b for b in vec2))
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return dot_product / (norm1 * norm2)
+def _flush_on_exit(optimizer_ref: 'weakref.ref[PromptOptimizer]'):
+    optimizer = optimizer_ref()
+    if optimizer is not None:
+        optimizer.flush_usage()
 
 
 class PromptOptimizer:
     """
     Main prompt optimization system that manages prompt variants,
     few-shot examples, and performance tracking.
+    
+    Prompt variants and bandit state are held in memory, so ``get_best_prompt``
+    never touches SQLite. Usage counters are written behind (on the next
+    performance update, ``flush_usage`` or interpreter exit) and bandit state
+    is persisted as per-arm snapshots rather than replayed from history.
     """
     
     def __init__(self, storage_path: str = "data/prompt_optimization"):
@@ -189,12 +234,20 @@ class PromptOptimizer:
         self.db_path = self.storage_path / "prompts.db"
         self._init_database()
         
+        # In-memory prompt variants with write-behind usage counters
+        self._lock = threading.RLock()
+        self._variants: Dict[str, PromptVariant] = {}
+        self._pending_usage: Dict[str, int] = {}
+        self._load_prompt_variants()
+        
         # Contextual bandit for prompt selection
         self.bandit = ContextualBandit()
         
         # Load existing data
         self._load_bandit_data()
         
+        atexit.register(_flush_on_exit, weakref.ref(self))
+        
         # Default prompt templates
         self._init_default_prompts()
     
@@ -248,28 +301,92 @@ class PromptOptimizer:
                 )
             """)
             
+            # Bandit sufficient statistics, one row per arm
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bandit_state (
+                    prompt_id TEXT PRIMARY KEY,
+                    plays INTEGER NOT NULL,
+                    reward_sum REAL NOT NULL,
+                    context_sum TEXT,
+                    last_performance_id INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            
             # Create indices
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_agent_field ON prompt_variants(agent_type, field_name)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_performance_prompt ON prompt_performance(prompt_id)")
             
             conn.commit()
     
+    def _load_prompt_variants(self):
+        """Load all prompt variants into memory."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM prompt_variants")
+            columns = [desc[0] for desc in cursor.description]
+            
+            for row in cursor.fetchall():
+                prompt_data = dict(zip(columns, row))
+                prompt_data['few_shot_examples'] = json.loads(prompt_data['few_shot_examples'] or '[]')
+                prompt_data['is_active'] = bool(prompt_data['is_active'])
+                self._variants[prompt_data['prompt_id']] = PromptVariant(**prompt_data)
+    
     def _load_bandit_data(self):
-        """Load historical performance data for the bandit algorithm."""
+        """
+        Restore bandit state from the per-arm snapshots.
+        
+        Only performance rows recorded after an arm's snapshot are replayed
+        (all of them for databases created before snapshots existed), and the
+        snapshots are then brought up to date.
+        """
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT prompt_id, context_features, reward 
-                FROM prompt_performance 
-                ORDER BY timestamp
+                SELECT prompt_id, plays, reward_sum, context_sum
+                FROM bandit_state
             """)
+            for prompt_id, plays, reward_sum, context_sum in cursor.fetchall():
+                self.bandit.arms[prompt_id] = BanditArmState.from_snapshot(plays, reward_sum, context_sum)
             
-            for prompt_id, context_features_json, reward in cursor.fetchall():
+            cursor.execute("""
+                SELECT p.id, p.prompt_id, p.context_features, p.reward
+                FROM prompt_performance p
+                LEFT JOIN bandit_state s ON s.prompt_id = p.prompt_id
+                WHERE p.id > COALESCE(s.last_performance_id, 0)
+                ORDER BY p.id
+            """)
+            
+            replayed: Dict[str, int] = {}
+            for row_id, prompt_id, context_features_json, reward in cursor.fetchall():
+                replayed[prompt_id] = row_id
                 try:
                     context_features = json.loads(context_features_json)
                     self.bandit.update_reward(prompt_id, reward, context_features)
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, TypeError):
                     continue
+            
+            for prompt_id, row_id in replayed.items():
+                self._save_arm_snapshot(cursor, prompt_id, row_id)
+            conn.commit()
+        
+        if replayed:
+            logging.info(f"Replayed performance history into bandit snapshots for {len(replayed)} prompts")
+    
+    def _save_arm_snapshot(self, cursor: sqlite3.Cursor, prompt_id: str, last_performance_id: int):
+        """Upsert the bandit snapshot for one arm."""
+        plays, reward_sum, context_sum = self.bandit.arms[prompt_id].to_snapshot()
+        cursor.execute("""
+            INSERT INTO bandit_state
+            (prompt_id, plays, reward_sum, context_sum, last_performance_id, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(prompt_id) DO UPDATE SET
+                plays = excluded.plays,
+                reward_sum = excluded.reward_sum,
+                context_sum = excluded.context_sum,
+                last_performance_id = excluded.last_performance_id,
+                updated_at = excluded.updated_at
+        """, (prompt_id, plays, reward_sum, context_sum, last_performance_id, datetime.now().isoformat()))
     
     def _init_default_prompts(self):
         """Initialize default prompt variants for each agent type."""
@@ -430,11 +547,8 @@ Return JSON with:
                     )
     
     def _prompt_exists(self, prompt_id: str) -> bool:
-        """Check if a prompt variant exists in the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM prompt_variants WHERE prompt_id = ?", (prompt_id,))
-            return cursor.fetchone() is not None
+        """Check if a prompt variant exists."""
+        return prompt_id in self._variants
     
     def add_prompt_variant(self, 
                           prompt_id: str,
@@ -460,6 +574,19 @@ Return JSON with:
         if self._prompt_exists(prompt_id):
             return False
         
+        variant = PromptVariant(
+            prompt_id=prompt_id,
+            agent_type=agent_type,
+            field_name=field_name,
+            system_prompt=system_prompt,
+            user_prompt_template=user_prompt_template,
+            few_shot_examples=few_shot_examples or [],
+            performance_score=0.0,
+            usage_count=0,
+            success_count=0,
+            created_at=datetime.now().isoformat()
+        )
+        
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -473,11 +600,14 @@ Return JSON with:
                 field_name,
                 system_prompt,
                 user_prompt_template,
-                json.dumps(few_shot_examples or []),
-                datetime.now().isoformat()
+                json.dumps(variant.few_shot_examples),
+                variant.created_at
             ))
             conn.commit()
         
+        with self._lock:
+            self._variants[prompt_id] = variant
+        
         logging.info(f"Added prompt variant: {prompt_id}")
         return True
     
@@ -517,32 +647,13 @@ Return JSON with:
                              agent_type: str, 
                              field_name: Optional[str] = None) -> List[PromptVariant]:
         """Get available prompt variants for the given criteria."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if field_name:
-                cursor.execute("""
-                    SELECT * FROM prompt_variants 
-                    WHERE agent_type = ? AND (field_name = ? OR field_name = 'all') 
-                    AND is_active = 1
-                    ORDER BY performance_score DESC
-                """, (agent_type, field_name))
-            else:
-                cursor.execute("""
-                    SELECT * FROM prompt_variants 
-                    WHERE agent_type = ? AND is_active = 1
-                    ORDER BY performance_score DESC
-                """, (agent_type,))
-            
-            columns = [desc[0] for desc in cursor.description]
-            prompts = []
-            
-            for row in cursor.fetchall():
-                prompt_data = dict(zip(columns, row))
-                prompt_data['few_shot_examples'] = json.loads(prompt_data['few_shot_examples'] or '[]')
-                prompts.append(PromptVariant(**prompt_data))
-            
-            return prompts
+        with self._lock:
+            prompts = [
+                prompt for prompt in self._variants.values()
+                if prompt.is_active and prompt.agent_type == agent_type
+                and (not field_name or prompt.field_name in (field_name, 'all'))
+            ]
+        return sorted(prompts, key=lambda prompt: prompt.performance_score, reverse=True)
     
     def _extract_default_context_features(self, agent_type: str) -> List[float]:
         """Extract default context features for an agent type."""
@@ -561,15 +672,36 @@ Return JSON with:
         return features
     
     def _update_prompt_usage(self, prompt_id: str):
-        """Update the usage count for a prompt variant."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        """Count a use of a prompt variant in memory; persisted by ``flush_usage``."""
+        with self._lock:
+            variant = self._variants.get(prompt_id)
+            if variant is None:
+                return
+            variant.usage_count += 1
+            variant.last_used = datetime.now().isoformat()
+            self._pending_usage[prompt_id] = self._pending_usage.get(prompt_id, 0) + 1
+    
+    def _write_pending_usage(self, cursor: sqlite3.Cursor):
+        """Write buffered usage counters (caller holds the lock)."""
+        for prompt_id, count in self._pending_usage.items():
             cursor.execute("""
                 UPDATE prompt_variants 
-                SET usage_count = usage_count + 1, last_used = ?
+                SET usage_count = usage_count + ?, last_used = ?
                 WHERE prompt_id = ?
-            """, (datetime.now().isoformat(), prompt_id))
-            conn.commit()
+            """, (count, self._variants[prompt_id].last_used, prompt_id))
+        self._pending_usage.clear()
+    
+    def flush_usage(self):
+        """Persist buffered prompt usage counters."""
+        with self._lock:
+            if not self._pending_usage:
+                return
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    self._write_pending_usage(conn.cursor())
+                    conn.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to flush prompt usage counters: {e}")
     
     def update_prompt_performance(self, 
                                 prompt_id: str, 
@@ -588,50 +720,44 @@ Return JSON with:
         if context_features is None:
             context_features = [0.0] * 10  # Default features
         
-        # Update bandit
-        self.bandit.update_reward(prompt_id, reward, context_features)
-        
-        # Update database
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Record performance
-            cursor.execute("""
-                INSERT INTO prompt_performance (prompt_id, context_features, reward, timestamp)
-                VALUES (?, ?, ?, ?)
-            """, (
-                prompt_id,
-                json.dumps(context_features),
-                reward,
-                datetime.now().isoformat()
-            ))
+        with self._lock:
+            # Update bandit
+            self.bandit.update_reward(prompt_id, reward, context_features)
             
             # Update prompt variant stats
-            if success:
-                cursor.execute("""
-                    UPDATE prompt_variants 
-                    SET success_count = success_count + 1
-                    WHERE prompt_id = ?
-                """, (prompt_id,))
-            
-            # Recalculate performance score
-            cursor.execute("""
-                SELECT usage_count, success_count FROM prompt_variants 
-                WHERE prompt_id = ?
-            """, (prompt_id,))
+            variant = self._variants.get(prompt_id)
+            if variant is not None:
+                if success:
+                    variant.success_count += 1
+                variant.performance_score = (
+                    variant.success_count / variant.usage_count if variant.usage_count > 0 else 0.0
+                )
             
-            result = cursor.fetchone()
-            if result:
-                usage_count, success_count = result
-                performance_score = success_count / usage_count if usage_count > 0 else 0.0
+            # Update database
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
                 
+                # Record performance
                 cursor.execute("""
-                    UPDATE prompt_variants 
-                    SET performance_score = ?
-                    WHERE prompt_id = ?
-                """, (performance_score, prompt_id))
-            
-            conn.commit()
+                    INSERT INTO prompt_performance (prompt_id, context_features, reward, timestamp)
+                    VALUES (?, ?, ?, ?)
+                """, (
+                    prompt_id,
+                    json.dumps(context_features),
+                    reward,
+                    datetime.now().isoformat()
+                ))
+                self._save_arm_snapshot(cursor, prompt_id, cursor.lastrowid)
+                
+                self._write_pending_usage(cursor)
+                if variant is not None:
+                    cursor.execute("""
+                        UPDATE prompt_variants 
+                        SET success_count = success_count + ?, performance_score = ?
+                        WHERE prompt_id = ?
+                    """, (int(success), variant.performance_score, prompt_id))
+                
+                conn.commit()
     
     def add_few_shot_example(self, 
                            agent_type: str,
@@ -769,6 +895,7 @@ Return JSON with:
     
     def get_optimization_statistics(self) -> Dict[str, Any]:
         """Get statistics about prompt optimization."""
+        self.flush_usage()
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
@@ -0,0 +1,158 @@
+"""
+In-memory cache of serialized API responses.
+
+Read-heavy endpoints store their serialized payload together with an ETag
+and Last-Modified time. Entries expire after a per-route TTL and are
+invalidated by tag when the underlying data changes: database writers and the
+metadata triage pipeline call ``invalidate_responses`` with the tags they
+affect.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Cache tags used by the API and the components that invalidate them
+TAG_METADATA = "metadata"
+TAG_DOCUMENTS = "documents"
+TAG_ANALYTICS = "analytics"
+TAG_AGENTS = "agents"
+TAG_ONTOLOGIES = "ontologies"
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response body with its validators."""
+    body: bytes
+    etag: str
+    last_modified: float
+    expires_at: float
+    tags: FrozenSet[str]
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of response bodies keyed by route and query.
+
+    Invalidated and expired entries are kept (until evicted) so that a
+    recomputed identical body keeps its original Last-Modified time and
+    clients holding it continue to get 304s.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a fresh entry, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fresh:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def set(self, key: str, body: bytes, ttl: float, tags: Iterable[str] = ()) -> CachedResponse:
+        """
+        Store a serialized body.
+
+        Args:
+            key: Cache key
+            body: Serialized response body
+            ttl: Seconds the entry stays fresh
+            tags: Invalidation tags
+
+        Returns:
+            The stored entry
+        """
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        now = time.time()
+        tags = frozenset(tags)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            last_modified = previous.last_modified if previous and previous.etag == etag else now
+            entry = CachedResponse(body=body, etag=etag, last_modified=last_modified,
+                                   expires_at=now + ttl, tags=tags)
+            self._entries[key] = entry
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                for tag in evicted.tags:
+                    self._tag_index.get(tag, set()).discard(evicted_key)
+        return entry
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Expire all entries carrying any of the tags.
+
+        Returns:
+            Number of entries expired
+        """
+        expired = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tag_index.get(tag, ()):
+                    entry = self._entries.get(key)
+                    if entry is not None and entry.expires_at > 0:
+                        entry.expires_at = 0
+                        expired += 1
+        if expired:
+            logger.debug(f"Invalidated {expired} cached responses for tags {tags}")
+        return expired
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+
+def invalidate_responses(*tags: str) -> int:
+    """Expire cached API responses for the given tags (safe to call from any thread)."""
+    try:
+        return get_response_cache().invalidate(*tags)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached responses: {e}")
+        return 0
@@ -0,0 +1,255 @@
+"""
+Application-scoped service container for Biomedical Text Agent.
+
+Heavy components (database managers, the vector store with its embedding model
+and FAISS index, the RAG system, ontology-backed normalizer) are constructed
+once per application and shared by all requests. Services are built lazily on
+first use and can be preloaded in the background at startup; their readiness
+is exposed for health checks.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceState:
+    """Lifecycle states of a service."""
+    NOT_STARTED = "not_started"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class ServiceStatus:
+    """Readiness information for a single service."""
+    name: str
+    state: str = ServiceState.NOT_STARTED
+    load_time: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ServiceContainer:
+    """
+    Lazily constructs and caches application-wide services.
+
+    Factories receive the container, so a service can depend on others
+    (e.g. the RAG system reuses the shared SQLite and vector managers).
+    Construction of each service is guarded by its own lock, so concurrent
+    first requests build it only once.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[["ServiceContainer"], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._status: Dict[str, ServiceStatus] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._preload_task: Optional[asyncio.Task] = None
+        # Services readiness depends on; None means all registered services
+        self._preloaded: Optional[Set[str]] = None
+
+    def register(self, name: str, factory: Callable[["ServiceContainer"], Any]):
+        """
+        Register a service factory.
+
+        Args:
+            name: Service name
+            factory: Callable taking the container and returning the service
+        """
+        with self._registry_lock:
+            self._factories[name] = factory
+            self._status[name] = ServiceStatus(name=name)
+            self._locks[name] = threading.Lock()
+
+    def provide(self, name: str, instance: Any):
+        """Register an already constructed service (useful for tests)."""
+        self.register(name, lambda container: instance)
+        self._instances[name] = instance
+        self._status[name].state = ServiceState.READY
+
+    def get(self, name: str) -> Any:
+        """
+        Get a service, constructing it on first use.
+
+        Raises:
+            KeyError: If the service is not registered
+            RuntimeError: If the service failed to construct
+        """
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"Unknown service: {name}")
+
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+
+            status = self._status[name]
+            status.state = ServiceState.LOADING
+            status.error = None
+            started = time.perf_counter()
+            try:
+                instance = self._factories[name](self)
+            except Exception as e:
+                status.state = ServiceState.FAILED
+                status.error = str(e)
+                logger.error(f"Failed to initialize service {name}: {e}")
+                raise RuntimeError(f"Service {name} failed to initialize: {e}") from e
+
+            self._instances[name] = instance
+            status.state = ServiceState.READY
+            status.load_time = time.perf_counter() - started
+            logger.info(f"Service {name} ready in {status.load_time:.2f}s")
+            return instance
+
+    async def aget(self, name: str) -> Any:
+        """Get a service without blocking the event loop while it loads."""
+        if name in self._instances:
+            return self._instances[name]
+        return await asyncio.to_thread(self.get, name)
+
+    def is_ready(self, name: str) -> bool:
+        """Whether a service has been constructed."""
+        return name in self._instances
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None):
+        """
+        Construct services in a worker thread, one after another.
+
+        Failures are recorded in the readiness state and do not stop the
+        remaining services from loading.
+        """
+        for name in (list(names) if names is not None else list(self._factories)):
+            try:
+                await self.aget(name)
+            except Exception:
+                # Already logged and recorded in the service status
+                continue
+
+    def start_preload(self, names: Optional[Iterable[str]] = None) -> asyncio.Task:
+        """
+        Start background warm-up of services on the running event loop.
+
+        Only the preloaded services count towards readiness; the others are
+        built on first use and reported for information.
+
+        Args:
+            names: Services to preload (all registered services if None,
+                none for an empty list)
+        """
+        names = list(names) if names is not None else list(self._factories)
+        self._preloaded = set(names)
+        self._preload_task = asyncio.create_task(self.warm_up(names))
+        return self._preload_task
+
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness state of all registered services."""
+        preloaded = self._preloaded if self._preloaded is not None else set(self._status)
+        services = {
+            name: {
+                "state": status.state,
+                "load_time": round(status.load_time, 3) if status.load_time is not None else None,
+                "error": status.error,
+                "preload": name in preloaded
+            }
+            for name, status in self._status.items()
+        }
+        return {
+            "ready": all(s["state"] == ServiceState.READY for s in services.values() if s["preload"]),
+            "preloading": bool(self._preload_task and not self._preload_task.done()),
+            "services": services
+        }
+
+    async def shutdown(self):
+        """Cancel preloading and close services that support it."""
+        if self._preload_task and not self._preload_task.done():
+            self._preload_task.cancel()
+            try:
+                await self._preload_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+        for name, instance in reversed(list(self._instances.items())):
+            close = getattr(instance, "close", None)
+            if not callable(close):
+                continue
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Error closing service {name}: {e}")
+        self._instances.clear()
+
+
+def create_default_container() -> ServiceContainer:
+    """
+    Create a container with the standard application services.
+
+    Imports happen inside the factories so that registering services does not
+    load heavy dependencies.
+    """
+    container = ServiceContainer()
+
+    def sqlite_manager(c):
+        from database.sqlite_manager import SQLiteManager
+        return SQLiteManager()
+
+    def vector_manager(c):
+        from database.vector_manager import VectorManager
+        return VectorManager()
+
+    def enhanced_db_manager(c):
+        from database.enhanced_sqlite_manager import EnhancedSQLiteManager
+        return EnhancedSQLiteManager(sqlite_manager=c.get("sqlite_manager"))
+
+    def rag_system(c):
+        from rag.rag_system import RAGSystem
+        return RAGSystem(
+            vector_manager=c.get("vector_manager"),
+            sqlite_manager=c.get("sqlite_manager")
+        )
+
+    def hpo_manager(c):
+        from ontologies.hpo_manager import HPOManager
+        return HPOManager()
+
+    def gene_manager(c):
+        from ontologies.gene_manager import GeneManager
+        return GeneManager()
+
+    def normalizer(c):
+        from langextract_integration.normalizer import BiomedicNormalizer
+        return BiomedicNormalizer(
+            hpo_manager=_optional(c, "hpo_manager"),
+            gene_manager=_optional(c, "gene_manager")
+        )
+
+    def extraction_jobs(c):
+        from core.extraction_jobs import ExtractionJobManager
+        return ExtractionJobManager()
+
+    container.register("sqlite_manager", sqlite_manager)
+    container.register("vector_manager", vector_manager)
+    container.register("enhanced_db_manager", enhanced_db_manager)
+    container.register("rag_system", rag_system)
+    container.register("hpo_manager", hpo_manager)
+    container.register("gene_manager", gene_manager)
+    container.register("normalizer", normalizer)
+    container.register("extraction_jobs", extraction_jobs)
+    return container
+
+
+def _optional(container: ServiceContainer, name: str) -> Any:
+    """Get a service, or None if it cannot be constructed."""
+    try:
+        return container.get(name)
+    except RuntimeError:
+        return None
@@ -0,0 +1,622 @@
+"""
+Durable Task Queue for Biomedical Text Agent
+
+This module provides a SQLite-backed task queue that survives restarts and can
+be shared by workers in several processes. Tasks are claimed atomically under a
+lease (visibility timeout); a task whose lease expires becomes claimable again.
+Failed tasks are retried with exponential backoff and moved to a dead-letter
+state once they exhaust their retries.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from .event_bus import EventBus, get_event_bus, TOPIC_TASK_PROGRESS, TOPIC_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+
+class TaskState:
+    """Task states stored in the queue."""
+    PENDING = "pending"
+    LEASED = "leased"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    DEAD = "dead"
+
+
+@dataclass
+class QueuedTask:
+    """A task claimed from the durable queue."""
+    task_id: str
+    task_type: str
+    payload: Dict[str, Any]
+    priority: int
+    attempts: int
+    max_retries: int
+    lease_owner: Optional[str]
+    lease_expires_at: Optional[float]
+    created_at: float
+    last_error: Optional[str] = None
+
+
+class DurableTaskQueue:
+    """
+    SQLite-backed priority queue with leases, retries and dead-lettering.
+
+    Higher ``priority`` values are claimed first; ties are served in
+    submission order. Workers in the same process are woken as soon as a task
+    is enqueued; workers in other processes wake when the next scheduled task
+    becomes available or after ``idle_poll_interval`` at the latest.
+    """
+
+    def __init__(self,
+                 db_path: str = "data/database/task_queue.db",
+                 visibility_timeout: float = 300.0,
+                 max_retries: int = 3,
+                 retry_base_delay: float = 5.0,
+                 retry_max_delay: float = 600.0,
+                 idle_poll_interval: float = 5.0,
+                 event_bus: Optional[EventBus] = None):
+        """
+        Initialize the durable task queue.
+
+        Args:
+            db_path: Path to the SQLite database
+            visibility_timeout: Default lease duration in seconds
+            max_retries: Default number of retries before dead-lettering
+            retry_base_delay: Initial retry backoff in seconds
+            retry_max_delay: Upper bound for retry backoff in seconds
+            idle_poll_interval: Longest wait before re-checking the database
+                for tasks enqueued by other processes
+            event_bus: Bus receiving task state changes and queue depth
+                (the process-wide bus if None)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.visibility_timeout = visibility_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.idle_poll_interval = idle_poll_interval
+        self.event_bus = event_bus or get_event_bus()
+
+        # Event loop waiters to wake on enqueue
+        self._waiters_lock = threading.Lock()
+        self._waiters: List[tuple] = []
+
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def _initialize_database(self):
+        """Create queue tables and indexes."""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_queue (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_id TEXT UNIQUE NOT NULL,
+                    task_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_retries INTEGER NOT NULL DEFAULT 3,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_task_queue_ready
+                ON task_queue(state, priority DESC, available_at, seq)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_task_queue_lease
+                ON task_queue(state, lease_expires_at)
+            """)
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def enqueue(self,
+                task_type: str,
+                payload: Optional[Dict[str, Any]] = None,
+                priority: int = 0,
+                task_id: Optional[str] = None,
+                max_retries: Optional[int] = None,
+                delay: float = 0.0) -> str:
+        """
+        Add a task to the queue.
+
+        Args:
+            task_type: Task type used by workers to dispatch
+            payload: JSON-serializable task parameters
+            priority: Higher values are claimed first
+            task_id: Optional explicit task ID (must be unique)
+            max_retries: Retries before dead-lettering (defaults to queue setting)
+            delay: Seconds before the task becomes claimable
+
+        Returns:
+            Task ID
+        """
+        task_id = task_id or f"task_{uuid.uuid4().hex}"
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO task_queue (
+                    task_id, task_type, payload, priority, state, max_retries,
+                    available_at, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                task_id, task_type, json.dumps(payload or {}, default=str), priority,
+                TaskState.PENDING,
+                self.max_retries if max_retries is None else max_retries,
+                now + delay, now, now
+            ))
+        finally:
+            conn.close()
+
+        self._notify()
+        self._publish(task_id, TaskState.PENDING, previous=None, task_type=task_type, priority=priority)
+        return task_id
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+
+    def claim(self,
+              worker_id: str,
+              task_types: Optional[List[str]] = None,
+              lease_seconds: Optional[float] = None) -> Optional[QueuedTask]:
+        """
+        Atomically claim the highest-priority available task.
+
+        Pending tasks whose ``available_at`` has passed and leased tasks whose
+        lease expired are both eligible.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            task_types: Restrict to these task types
+            lease_seconds: Lease duration (defaults to the visibility timeout)
+
+        Returns:
+            The claimed task, or None if nothing is available
+        """
+        now = time.time()
+        lease = lease_seconds or self.visibility_timeout
+
+        type_filter = ""
+        params: List[Any] = [now, now]
+        if task_types:
+            type_filter = f"AND task_type IN ({','.join('?' * len(task_types))})"
+            params.extend(task_types)
+
+        dead_letters = []
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock up front so two workers
+            # can never select the same row
+            conn.execute("BEGIN IMMEDIATE")
+            while True:
+                row = conn.execute(f"""
+                    SELECT * FROM task_queue
+                    WHERE ((state = 'pending' AND available_at <= ?)
+                           OR (state = 'leased' AND lease_expires_at <= ?))
+                      {type_filter}
+                    ORDER BY priority DESC, available_at, seq
+                    LIMIT 1
+                """, params).fetchone()
+
+                if row is None or row['state'] != TaskState.LEASED:
+                    break
+
+                # An expired lease counts as a failed attempt, with the same
+                # retry budget as fail()
+                if row['attempts'] <= row['max_retries']:
+                    logger.warning(f"Lease expired for task {row['task_id']} (owner {row['lease_owner']}), reclaiming")
+                    break
+
+                error = f"Lease expired after {row['attempts']} attempts"
+                conn.execute("""
+                    UPDATE task_queue
+                    SET state = 'dead', last_error = ?, lease_owner = NULL,
+                        lease_expires_at = NULL, updated_at = ?
+                    WHERE seq = ?
+                """, (error, now, row['seq']))
+                dead_letters.append((row['task_id'], row['attempts'], error))
+
+            if row is None:
+                conn.execute("COMMIT")
+                self._publish_dead_letters(dead_letters)
+                return None
+
+            conn.execute("""
+                UPDATE task_queue
+                SET state = 'leased', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE seq = ?
+            """, (worker_id, now + lease, now, row['seq']))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._publish_dead_letters(dead_letters)
+        self._publish(row['task_id'], TaskState.LEASED, previous=row['state'], task_type=row['task_type'],
+                      attempts=row['attempts'] + 1, worker_id=worker_id)
+        return QueuedTask(
+            task_id=row['task_id'],
+            task_type=row['task_type'],
+            payload=json.loads(row['payload']),
+            priority=row['priority'],
+            attempts=row['attempts'] + 1,
+            max_retries=row['max_retries'],
+            lease_owner=worker_id,
+            lease_expires_at=now + lease,
+            created_at=row['created_at'],
+            last_error=row['last_error']
+        )
+
+    def _publish_dead_letters(self, dead_letters: List[tuple]) -> None:
+        """Log and publish tasks dead-lettered while claiming."""
+        for task_id, attempts, error in dead_letters:
+            logger.error(f"Task {task_id} moved to dead-letter after {attempts} attempts: {error}")
+            self._publish(task_id, TaskState.DEAD, previous=TaskState.LEASED, error=error, attempts=attempts)
+
+    async def get(self,
+                  worker_id: str,
+                  task_types: Optional[List[str]] = None,
+                  timeout: Optional[float] = None) -> Optional[QueuedTask]:
+        """
+        Wait for and claim the next task.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            task_types: Restrict to these task types
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            The claimed task, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        deadline = None if timeout is None else loop.time() + timeout
+
+        with self._waiters_lock:
+            self._waiters.append(waiter)
+        try:
+            while True:
+                event.clear()
+                # SQLite calls block, so they run in a worker thread
+                task = await asyncio.to_thread(self.claim, worker_id, task_types)
+                if task:
+                    return task
+
+                next_available = await asyncio.to_thread(self._seconds_until_next, task_types)
+                wait = min(next_available, self.idle_poll_interval)
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return None
+                    wait = min(wait, remaining)
+
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=max(wait, 0.01))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._waiters_lock:
+                self._waiters.remove(waiter)
+
+    def _seconds_until_next(self, task_types: Optional[List[str]] = None) -> float:
+        """Seconds until a delayed task or an expiring lease becomes claimable."""
+        type_filter = ""
+        params: List[Any] = []
+        if task_types:
+            type_filter = f"AND task_type IN ({','.join('?' * len(task_types))})"
+            params.extend(task_types)
+
+        conn = self._connect()
+        try:
+            row = conn.execute(f"""
+                SELECT MIN(CASE WHEN state = 'pending' THEN available_at ELSE lease_expires_at END)
+                FROM task_queue
+                WHERE state IN ('pending', 'leased') {type_filter}
+            """, params).fetchone()
+        finally:
+            conn.close()
+
+        if row[0] is None:
+            return float('inf')
+        return max(row[0] - time.time(), 0.0)
+
+    def _notify(self):
+        """Wake workers waiting in this process."""
+        with self._waiters_lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+    def extend_lease(self, task_id: str, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Extend the lease of a task held by the worker.
+
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        lease = lease_seconds or self.visibility_timeout
+        now = time.time()
+        return self._update_owned(task_id, worker_id, """
+            UPDATE task_queue SET lease_expires_at = ?, updated_at = ?
+            WHERE task_id = ? AND lease_owner = ? AND state = 'leased'
+        """, (now + lease, now, task_id, worker_id))
+
+    async def keep_alive(self, task_id: str, worker_id: str, lease_seconds: Optional[float] = None):
+        """Extend a lease periodically until cancelled."""
+        lease = lease_seconds or self.visibility_timeout
+        while True:
+            await asyncio.sleep(lease / 3)
+            if not await asyncio.to_thread(self.extend_lease, task_id, worker_id, lease):
+                logger.warning(f"Lost lease on task {task_id}")
+                return
+
+    def complete(self, task_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a leased task as completed."""
+        completed = self._update_owned(task_id, worker_id, """
+            UPDATE task_queue
+            SET state = 'completed', result = ?, lease_owner = NULL,
+                lease_expires_at = NULL, updated_at = ?
+            WHERE task_id = ? AND lease_owner = ? AND state = 'leased'
+        """, (json.dumps(result, default=str) if result is not None else None,
+              time.time(), task_id, worker_id))
+        if completed:
+            self._publish(task_id, TaskState.COMPLETED, previous=TaskState.LEASED)
+        return completed
+
+    def fail(self, task_id: str, worker_id: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt.
+
+        The task is rescheduled with exponential backoff, or dead-lettered when
+        it has used all its retries or ``retry`` is False.
+
+        Returns:
+            Resulting task state ('pending' or 'dead'), or '' if the worker
+            no longer held the lease
+        """
+        conn = self._connect()
+        try:
+            # The retry decision and the update share one write transaction,
+            # so a concurrent claim or fail cannot interleave
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts, max_retries FROM task_queue "
+                "WHERE task_id = ? AND lease_owner = ? AND state = 'leased'",
+                (task_id, worker_id)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return ""
+
+            now = time.time()
+            if retry and row['attempts'] <= row['max_retries']:
+                delay = self.get_retry_delay(row['attempts'])
+                state = TaskState.PENDING
+            else:
+                delay = 0.0
+                state = TaskState.DEAD
+
+            conn.execute("""
+                UPDATE task_queue
+                SET state = ?, last_error = ?, available_at = ?, lease_owner = NULL,
+                    lease_expires_at = NULL, updated_at = ?
+                WHERE task_id = ? AND lease_owner = ?
+            """, (state, error, now + delay, now, task_id, worker_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if state == TaskState.DEAD:
+            logger.error(f"Task {task_id} moved to dead-letter after {row['attempts']} attempts: {error}")
+        else:
+            logger.info(f"Task {task_id} scheduled for retry in {delay:.1f}s")
+        self._publish(task_id, state, previous=TaskState.LEASED, error=error, attempts=row['attempts'])
+        return state
+
+    def get_retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the given attempt count."""
+        delay = min(self.retry_base_delay * (2 ** max(attempts - 1, 0)), self.retry_max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
+    def release(self, task_id: str, worker_id: str) -> bool:
+        """Return a leased task to the queue without counting the attempt."""
+        released = self._update_owned(task_id, worker_id, """
+            UPDATE task_queue
+            SET state = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL,
+                lease_expires_at = NULL, available_at = ?, updated_at = ?
+            WHERE task_id = ? AND lease_owner = ? AND state = 'leased'
+        """, (time.time(), time.time(), task_id, worker_id))
+        if released:
+            self._notify()
+            self._publish(task_id, TaskState.PENDING, previous=TaskState.LEASED)
+        return released
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a pending or leased task."""
+        previous = self._update_from(task_id, (TaskState.PENDING, TaskState.LEASED), """
+            UPDATE task_queue SET state = 'cancelled', lease_owner = NULL,
+                lease_expires_at = NULL, updated_at = ?
+            WHERE task_id = ?
+        """, (time.time(), task_id))
+
+        if previous:
+            self._publish(task_id, TaskState.CANCELLED, previous=previous)
+        return previous is not None
+
+    def requeue(self, task_id: str, reset_attempts: bool = True) -> bool:
+        """Make a cancelled or dead-lettered task pending again."""
+        previous = self._update_from(task_id, (TaskState.CANCELLED, TaskState.DEAD), f"""
+            UPDATE task_queue SET state = 'pending', available_at = ?, updated_at = ?
+                {', attempts = 0' if reset_attempts else ''}
+            WHERE task_id = ?
+        """, (time.time(), time.time(), task_id))
+
+        if previous:
+            self._notify()
+            self._publish(task_id, TaskState.PENDING, previous=previous)
+        return previous is not None
+
+    def _publish(self, task_id: str, state: str, previous: Optional[str] = None, **fields):
+        """
+        Publish a task state change and the queue depth change it causes.
+
+        The depth event carries per-state deltas (e.g. ``{"pending": -1,
+        "leased": 1}``); the bus sums coalesced deltas, so no counting query
+        runs per state change.
+        """
+        try:
+            self.event_bus.publish(
+                TOPIC_TASK_PROGRESS,
+                {"task_id": task_id, "status": state, **fields},
+                coalesce_key=task_id
+            )
+            if previous != state:
+                delta = {state: 1}
+                if previous:
+                    delta[previous] = -1
+                self.event_bus.publish(TOPIC_QUEUE_DEPTH, delta, coalesce_key="depth", accumulate=True)
+        except Exception as e:
+            logger.debug(f"Failed to publish task event: {e}")
+
+    def _update_from(self, task_id: str, from_states: tuple, sql: str, params: tuple) -> Optional[str]:
+        """
+        Update a task if it is in one of the given states.
+
+        Returns:
+            The task's previous state, or None if it was not updated
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT state FROM task_queue WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None or row['state'] not in from_states:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(sql, params)
+            conn.execute("COMMIT")
+            return row['state']
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _update_owned(self, task_id: str, worker_id: str, sql: str, params: tuple) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task record by ID."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM task_queue WHERE task_id = ?", (task_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+
+        task = dict(row)
+        task['payload'] = json.loads(task['payload'])
+        task['result'] = json.loads(task['result']) if task['result'] else None
+        return task
+
+    def list_tasks(self, state: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """List tasks in a given state, oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT task_id, task_type, priority, attempts, last_error, created_at, updated_at "
+                "FROM task_queue WHERE state = ? ORDER BY seq LIMIT ?",
+                (state, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def get_dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """List dead-lettered tasks."""
+        return self.list_tasks(TaskState.DEAD, limit)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Count tasks by state."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT state, COUNT(*) FROM task_queue GROUP BY state").fetchall()
+        finally:
+            conn.close()
+
+        stats = {state: 0 for state in (TaskState.PENDING, TaskState.LEASED, TaskState.COMPLETED,
+                                        TaskState.CANCELLED, TaskState.DEAD)}
+        stats.update({row[0]: row[1] for row in rows})
+        return stats
+
+    def qsize(self) -> int:
+        """Number of tasks waiting to be claimed."""
+        return self.get_stats()[TaskState.PENDING]
+
+    def purge_completed(self, max_age_seconds: float = 86400) -> int:
+        """Delete completed and cancelled tasks older than the given age."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute("""
+                DELETE FROM task_queue
+                WHERE state IN ('completed', 'cancelled') AND updated_at < ?
+            """, (time.time() - max_age_seconds,))
+            return cursor.rowcount
+        finally:
+            conn.close()
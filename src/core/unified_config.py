@@ -104,7 +104,12 @@ class ProcessingConfig(BaseSettings):
     extraction_passes: int = Field(default=2, env="EXTRACTION_PASSES")
     use_patient_segmentation: bool = Field(default=True, env="USE_PATIENT_SEGMENTATION")
     confidence_threshold: float = Field(default=0.7, env="CONFIDENCE_THRESHOLD")
-    
+
+    # Durable task queue
+    task_queue_path: str = Field(default="./data/database/task_queue.db", env="TASK_QUEUE_PATH")
+    task_visibility_timeout: int = Field(default=300, env="TASK_VISIBILITY_TIMEOUT")
+    task_max_retries: int = Field(default=3, env="TASK_MAX_RETRIES")
+
     @field_validator('supported_formats', mode='before')
     @classmethod
     def parse_supported_formats(cls, v):
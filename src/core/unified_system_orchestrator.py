@@ -8,12 +8,17 @@ storage, and UI components.
 
 import asyncio
 import logging
+import os
+import socket
+import uuid
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
 
 from .unified_config import get_config, UnifiedConfig
+from .task_queue import DurableTaskQueue
+from .event_bus import get_event_bus, TOPIC_EXTRACTION_COMPLETED
 from ..database.sqlite_manager import SQLiteManager
 from ..database.vector_manager import VectorManager
 from ..metadata_triage.metadata_orchestrator import UnifiedMetadataOrchestrator
@@ -65,7 +70,12 @@ class UnifiedSystemOrchestrator:
         
         # System state
         self.active_processes = 0
-        self.processing_queue = asyncio.Queue()
+        self.processing_queue = DurableTaskQueue(
+            db_path=self.config.processing.task_queue_path,
+            visibility_timeout=self.config.processing.task_visibility_timeout,
+            max_retries=self.config.processing.task_max_retries
+        )
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:system"
         self.system_status = SystemStatus(
             overall_status="initializing",
             components={},
@@ -180,20 +190,31 @@ class UnifiedSystemOrchestrator:
             self.logger.error(f"Failed to update system status: {e}")
     
     async def _process_queue(self):
-        """Process items in the processing queue."""
+        """Process items in the durable processing queue."""
         while True:
             try:
-                if not self.processing_queue.empty():
-                    task = await self.processing_queue.get()
-                    await self._execute_task(task)
-                    self.processing_queue.task_done()
+                # Wakes on local enqueue; tasks from other processes are
+                # picked up when they become due
+                queued = await self.processing_queue.get(self.worker_id)
+                heartbeat = asyncio.create_task(
+                    self.processing_queue.keep_alive(queued.task_id, self.worker_id)
+                )
+                try:
+                    result = await self._execute_task({**queued.payload, "id": queued.task_id})
+                finally:
+                    heartbeat.cancel()
+                
+                if result.success:
+                    self.processing_queue.complete(queued.task_id, self.worker_id)
                 else:
-                    await asyncio.sleep(1)
+                    self.processing_queue.fail(queued.task_id, self.worker_id, result.error or "unknown error")
+            except asyncio.CancelledError:
+                break
             except Exception as e:
                 self.logger.error(f"Queue processing error: {e}")
                 await asyncio.sleep(5)
     
-    async def _execute_task(self, task: Dict[str, Any]):
+    async def _execute_task(self, task: Dict[str, Any]) -> ProcessingResult:
         """Execute a processing task."""
         task_type = task.get("type")
         task_id = task.get("id")
@@ -237,6 +258,8 @@ class UnifiedSystemOrchestrator:
             )
         finally:
             self.active_processes -= 1
+        
+        return result
     
     async def _store_task_result(self, task_id: str, result: ProcessingResult):
         """Store task result in database."""
@@ -292,19 +315,7 @@ class UnifiedSystemOrchestrator:
         try:
             start_time = datetime.now()
             
-            # Add to processing queue
-            task = {
-                "type": "metadata_search",
-                "id": f"search_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "query": query,
-                "max_results": max_results,
-                "include_europepmc": include_europepmc
-            }
-            
-            await self.processing_queue.put(task)
-            
-            # For now, return immediate response
-            # In production, this would return a task ID for tracking
+            # Runs inline; queued tasks call back into this method
             result = await self.metadata_orchestrator.run_complete_pipeline(
                 query=query,
                 max_results=max_results,
@@ -336,16 +347,6 @@ class UnifiedSystemOrchestrator:
         try:
             start_time = datetime.now()
             
-            # Add to processing queue
-            task = {
-                "type": "document_extraction",
-                "id": f"extract_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "document_path": document_path,
-                "extraction_type": extraction_type
-            }
-            
-            await self.processing_queue.put(task)
-            
             # Use LangExtract engine for extraction
             if extraction_type == "full":
                 result = await self.langextract_engine.extract_from_file(document_path)
@@ -355,6 +356,13 @@ class UnifiedSystemOrchestrator:
             
             processing_time = (datetime.now() - start_time).total_seconds()
             
+            get_event_bus().publish(TOPIC_EXTRACTION_COMPLETED, {
+                "document_path": document_path,
+                "extraction_type": extraction_type,
+                "records": len(result) if isinstance(result, list) else 1,
+                "processing_time": processing_time
+            })
+            
             return ProcessingResult(
                 success=True,
                 data=result,
@@ -378,16 +386,6 @@ class UnifiedSystemOrchestrator:
         try:
             start_time = datetime.now()
             
-            # Add to processing queue
-            task = {
-                "type": "rag_query",
-                "id": f"rag_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "question": question,
-                "max_results": max_results
-            }
-            
-            await self.processing_queue.put(task)
-            
             # Use RAG system
             result = await self.rag_system.ask_question(
                 question=question,
@@ -496,7 +494,7 @@ class UnifiedSystemOrchestrator:
             
             # Store document metadata
             document_data = {
-                "id": f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "id": f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
                 "title": metadata.get("title", file_path_obj.name),
                 "source_path": str(file_path_obj),
                 "pmid": metadata.get("pmid"),
@@ -518,13 +516,16 @@ class UnifiedSystemOrchestrator:
                     error=f"Failed to store document: {store_result.error}"
                 )
             
-            # Add extraction task to queue
-            await self.processing_queue.put({
-                "type": "document_extraction",
-                "id": f"extract_{document_data['id']}",
-                "document_path": str(file_path_obj),
-                "extraction_type": "full"
-            })
+            # Add extraction task to the durable queue
+            self.processing_queue.enqueue(
+                task_type="document_extraction",
+                payload={
+                    "type": "document_extraction",
+                    "document_path": str(file_path_obj),
+                    "extraction_type": "full"
+                },
+                task_id=f"extract_{document_data['id']}"
+            )
             
             processing_time = (datetime.now() - start_time).total_seconds()
             
@@ -565,13 +566,10 @@ class UnifiedSystemOrchestrator:
             self.logger.info(f"Waiting for {self.active_processes} active processes to complete...")
             await asyncio.sleep(5)
         
-        # Clear processing queue
-        while not self.processing_queue.empty():
-            try:
-                self.processing_queue.get_nowait()
-                self.processing_queue.task_done()
-            except asyncio.QueueEmpty:
-                break
+        # Queued tasks are durable and resume on the next start
+        pending = self.processing_queue.qsize()
+        if pending:
+            self.logger.info(f"{pending} queued tasks will resume on next start")
         
         self.logger.info("Unified System Orchestrator shutdown complete")
 
@@ -19,6 +19,7 @@ import queue
 
 # Import the original SQLite manager for compatibility
 from .sqlite_manager import SQLiteManager
+from core.response_cache import TAG_ANALYTICS, TAG_DOCUMENTS, invalidate_responses
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +148,181 @@ class EnhancedRelationshipsSchema:
         "CREATE INDEX IF NOT EXISTS idx_enhanced_relationships_confidence ON enhanced_relationships(confidence_score)"
     ]
 
+class MetricsRollupSchema:
+    """
+    Materialized dashboard metrics maintained incrementally by triggers.
+
+    ``metrics_counters`` holds running totals (documents and extractions by
+    status, processing time sum/count); ``metrics_rollups`` holds per-minute,
+    per-hour and per-day counters of created documents, finished extractions
+    and a processing time histogram. Dashboard reads touch a handful of rows
+    instead of scanning the document and extraction tables.
+    """
+    
+    VERSION = 1
+    
+    GRANULARITIES = {
+        "minute": "%Y-%m-%dT%H:%M",
+        "hour": "%Y-%m-%dT%H:00",
+        "day": "%Y-%m-%d",
+    }
+    
+    # Upper bounds (seconds) of the processing time histogram buckets
+    LATENCY_BUCKETS = (1, 5, 10, 30, 60, 300)
+    
+    CREATE_TABLE_SQL = [
+        """
+        CREATE TABLE IF NOT EXISTS metrics_counters (
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS metrics_rollups (
+            granularity TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (granularity, metric, bucket_start)
+        ) WITHOUT ROWID
+        """
+    ]
+    
+    @classmethod
+    def latency_bucket_sql(cls, column: str) -> str:
+        """SQL expression naming the histogram bucket of a processing time."""
+        cases = " ".join(f"WHEN {column} <= {bound} THEN 'latency_le_{bound}'" for bound in cls.LATENCY_BUCKETS)
+        return f"CASE {cases} ELSE 'latency_le_inf' END"
+    
+    @staticmethod
+    def counter_sql(name: str, delta: str, condition: str = "1") -> str:
+        return f"""
+            INSERT INTO metrics_counters (name, value) SELECT {name}, {delta} WHERE {condition}
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;"""
+    
+    @classmethod
+    def rollup_sql(cls, metric: str, value: str, timestamp: str, condition: str = "1") -> str:
+        return "".join(f"""
+            INSERT INTO metrics_rollups (granularity, bucket_start, metric, value)
+            SELECT '{granularity}', strftime('{fmt}', {timestamp}), {metric}, {value} WHERE {condition}
+            ON CONFLICT(granularity, metric, bucket_start) DO UPDATE SET value = value + excluded.value;"""
+            for granularity, fmt in cls.GRANULARITIES.items())
+    
+    @classmethod
+    def trigger_sql(cls) -> List[str]:
+        """Triggers keeping counters and rollups in step with the base tables."""
+        c, r = cls.counter_sql, cls.rollup_sql
+        finished = "COALESCE(NEW.completed_at, NEW.updated_at, CURRENT_TIMESTAMP)"
+        has_time = "NEW.processing_time IS NOT NULL"
+        
+        def extraction_finished() -> str:
+            return (r("'extractions_' || NEW.status", "1", finished)
+                    + r("'processing_time_sum'", "NEW.processing_time", finished, has_time)
+                    + r("'processing_time_count'", "1", finished, has_time)
+                    + r(cls.latency_bucket_sql("NEW.processing_time"), "1", finished, has_time))
+        
+        return [
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_documents_insert
+            AFTER INSERT ON enhanced_documents BEGIN
+            {c("'documents_total'", "1")}
+            {c("'documents_status:' || COALESCE(NEW.processing_status, 'pending')", "1")}
+            {r("'documents_created'", "1", "COALESCE(NEW.created_at, CURRENT_TIMESTAMP)")}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_documents_delete
+            AFTER DELETE ON enhanced_documents BEGIN
+            {c("'documents_total'", "-1")}
+            {c("'documents_status:' || COALESCE(OLD.processing_status, 'pending')", "-1")}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_documents_status
+            AFTER UPDATE OF processing_status ON enhanced_documents
+            WHEN OLD.processing_status IS NOT NEW.processing_status BEGIN
+            {c("'documents_status:' || COALESCE(OLD.processing_status, 'pending')", "-1")}
+            {c("'documents_status:' || COALESCE(NEW.processing_status, 'pending')", "1")}
+            {r("'documents_' || NEW.processing_status", "1", "CURRENT_TIMESTAMP",
+               "NEW.processing_status IN ('completed', 'failed')")}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_insert
+            AFTER INSERT ON enhanced_extractions BEGIN
+            {c("'extractions_status:' || COALESCE(NEW.status, 'pending')", "1")}
+            {c("'processing_time_sum'", "NEW.processing_time", has_time)}
+            {c("'processing_time_count'", "1", has_time)}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_insert_finished
+            AFTER INSERT ON enhanced_extractions
+            WHEN NEW.status IN ('completed', 'failed') BEGIN
+            {extraction_finished()}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_delete
+            AFTER DELETE ON enhanced_extractions BEGIN
+            {c("'extractions_status:' || COALESCE(OLD.status, 'pending')", "-1")}
+            {c("'processing_time_sum'", "-OLD.processing_time", "OLD.processing_time IS NOT NULL")}
+            {c("'processing_time_count'", "-1", "OLD.processing_time IS NOT NULL")}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_status
+            AFTER UPDATE OF status ON enhanced_extractions
+            WHEN OLD.status IS NOT NEW.status BEGIN
+            {c("'extractions_status:' || COALESCE(OLD.status, 'pending')", "-1")}
+            {c("'extractions_status:' || COALESCE(NEW.status, 'pending')", "1")}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_finished
+            AFTER UPDATE OF status ON enhanced_extractions
+            WHEN OLD.status IS NOT NEW.status AND NEW.status IN ('completed', 'failed') BEGIN
+            {extraction_finished()}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_metrics_extractions_time
+            AFTER UPDATE OF processing_time ON enhanced_extractions
+            WHEN OLD.processing_time IS NOT NEW.processing_time BEGIN
+            {c("'processing_time_sum'", "COALESCE(NEW.processing_time, 0) - COALESCE(OLD.processing_time, 0)")}
+            {c("'processing_time_count'", "(NEW.processing_time IS NOT NULL) - (OLD.processing_time IS NOT NULL)")}
+            END""",
+        ]
+    
+    @classmethod
+    def rebuild_sql(cls) -> List[str]:
+        """Statements recomputing all counters and rollups from the base tables."""
+        statements = [
+            "DELETE FROM metrics_counters",
+            "DELETE FROM metrics_rollups",
+            "INSERT INTO metrics_counters (name, value) SELECT 'documents_total', COUNT(*) FROM enhanced_documents",
+            """INSERT INTO metrics_counters (name, value)
+               SELECT 'documents_status:' || COALESCE(processing_status, 'pending'), COUNT(*)
+               FROM enhanced_documents GROUP BY 1""",
+            """INSERT INTO metrics_counters (name, value)
+               SELECT 'extractions_status:' || COALESCE(status, 'pending'), COUNT(*)
+               FROM enhanced_extractions GROUP BY 1""",
+            """INSERT INTO metrics_counters (name, value)
+               SELECT 'processing_time_sum', COALESCE(SUM(processing_time), 0) FROM enhanced_extractions""",
+            """INSERT INTO metrics_counters (name, value)
+               SELECT 'processing_time_count', COUNT(processing_time) FROM enhanced_extractions""",
+        ]
+        finished = "COALESCE(completed_at, updated_at, created_at)"
+        for granularity, fmt in cls.GRANULARITIES.items():
+            rollups = [
+                ("'documents_created'", "COALESCE(created_at, CURRENT_TIMESTAMP)", "enhanced_documents", "1"),
+                ("'documents_' || processing_status", "updated_at", "enhanced_documents",
+                 "processing_status IN ('completed', 'failed')"),
+                ("'extractions_' || status", finished, "enhanced_extractions", "status IN ('completed', 'failed')"),
+                (cls.latency_bucket_sql("processing_time"), finished, "enhanced_extractions",
+                 "status IN ('completed', 'failed') AND processing_time IS NOT NULL"),
+            ]
+            for metric, timestamp, table, condition in rollups:
+                statements.append(f"""
+                    INSERT INTO metrics_rollups (granularity, bucket_start, metric, value)
+                    SELECT '{granularity}', strftime('{fmt}', {timestamp}), {metric}, COUNT(*)
+                    FROM {table} WHERE {condition} GROUP BY 2, 3""")
+            statements.append(f"""
+                INSERT INTO metrics_rollups (granularity, bucket_start, metric, value)
+                SELECT '{granularity}', strftime('{fmt}', {finished}), m.metric,
+                       CASE m.metric WHEN 'processing_time_sum' THEN SUM(processing_time) ELSE COUNT(*) END
+                FROM enhanced_extractions,
+                     (SELECT 'processing_time_sum' AS metric UNION ALL SELECT 'processing_time_count') m
+                WHERE status IN ('completed', 'failed') AND processing_time IS NOT NULL
+                GROUP BY 2, 3""")
+        statements.append(
+            f"INSERT INTO metrics_counters (name, value) VALUES ('_rollup_version', {cls.VERSION})"
+        )
+        return statements
+
 # ============================================================================
 # Enhanced SQLite Manager Class
 # ============================================================================
@@ -154,7 +330,9 @@ class EnhancedRelationshipsSchema:
 class EnhancedSQLiteManager:
     """Enhanced SQLite manager with advanced features for linked data storage."""
     
-    def __init__(self, db_path: str = "data/database/enhanced_biomedical_agent.db"):
+    def __init__(self,
+                 db_path: str = "data/database/enhanced_biomedical_agent.db",
+                 sqlite_manager: Optional[SQLiteManager] = None):
         """Initialize the enhanced SQLite manager."""
         self.db_path = db_path
         self.connection = None
@@ -163,7 +341,7 @@ class EnhancedSQLiteManager:
         self._initialize_database()
         
         # Initialize the original SQLite manager for compatibility
-        self.original_manager = SQLiteManager()
+        self.original_manager = sqlite_manager or SQLiteManager()
     
     def _initialize_database(self):
         """Initialize the enhanced database with all schemas."""
@@ -194,6 +372,20 @@ class EnhancedSQLiteManager:
                 for index_sql in EnhancedRelationshipsSchema.CREATE_INDEXES_SQL:
                     cursor.execute(index_sql)
                 
+                # Materialized dashboard metrics
+                for table_sql in MetricsRollupSchema.CREATE_TABLE_SQL:
+                    cursor.execute(table_sql)
+                for trigger_sql in MetricsRollupSchema.trigger_sql():
+                    cursor.execute(trigger_sql)
+                
+                cursor.execute("SELECT value FROM metrics_counters WHERE name = '_rollup_version'")
+                version = cursor.fetchone()
+                if version is None or version[0] != MetricsRollupSchema.VERSION:
+                    # Backfill rollups for data written before they existed
+                    logger.info("Building dashboard metrics rollups...")
+                    for statement in MetricsRollupSchema.rebuild_sql():
+                        cursor.execute(statement)
+                
                 conn.commit()
                 logger.info("Enhanced database tables created successfully")
                 
@@ -272,6 +464,7 @@ class EnhancedSQLiteManager:
                 ))
                 
                 conn.commit()
+                invalidate_responses(TAG_DOCUMENTS, TAG_ANALYTICS)
                 logger.info(f"Created enhanced document: {document_id}")
                 return document_id
                 
@@ -282,7 +475,7 @@ class EnhancedSQLiteManager:
     async def get_enhanced_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve an enhanced document by ID."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -305,7 +498,7 @@ class EnhancedSQLiteManager:
     ) -> bool:
         """Update an enhanced document."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Build update query dynamically
@@ -341,7 +534,7 @@ class EnhancedSQLiteManager:
     async def delete_enhanced_document(self, document_id: str) -> bool:
         """Delete an enhanced document."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("DELETE FROM enhanced_documents WHERE id = ?", (document_id,))
@@ -468,7 +661,7 @@ class EnhancedSQLiteManager:
     ) -> bool:
         """Update extraction request status."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 updates = {
@@ -507,6 +700,7 @@ class EnhancedSQLiteManager:
                 
                 cursor.execute(query, values)
                 conn.commit()
+                invalidate_responses(TAG_ANALYTICS)
                 
                 logger.info(f"Updated extraction status: {request_id} -> {status}")
                 return cursor.rowcount > 0
@@ -518,7 +712,7 @@ class EnhancedSQLiteManager:
     async def get_extraction_request(self, request_id: str) -> Optional[Dict[str, Any]]:
         """Get extraction request by ID."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -541,7 +735,7 @@ class EnhancedSQLiteManager:
     ) -> List[Dict[str, Any]]:
         """Get pending extraction requests."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 where_clause = "status = 'pending'"
@@ -622,7 +816,7 @@ class EnhancedSQLiteManager:
     ) -> List[Dict[str, Any]]:
         """Retrieve metrics with filtering."""
         try:
-            with self._get_connection() as conn:
+            async with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 where_clauses = []
@@ -744,30 +938,130 @@ class EnhancedSQLiteManager:
     # API Endpoint Support Methods
     # ============================================================================
 
+    # ------------------------------------------------------------------------
+    # Materialized metrics (see MetricsRollupSchema)
+    # ------------------------------------------------------------------------
+
+    def get_counters(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Read materialized counters.
+
+        Args:
+            names: Counter names to read (all counters if None)
+
+        Returns:
+            Mapping of counter name to value; missing counters are 0
+        """
+        with self._get_connection_sync() as conn:
+            if names is None:
+                rows = conn.execute("SELECT name, value FROM metrics_counters").fetchall()
+            else:
+                placeholders = ", ".join("?" for _ in names)
+                rows = conn.execute(
+                    f"SELECT name, value FROM metrics_counters WHERE name IN ({placeholders})", names
+                ).fetchall()
+        counters = {name: 0 for name in names or []}
+        counters.update({name: value for name, value in rows})
+        return counters
+
+    def get_rollup(self, metric: str, granularity: str = "day", bucket_start: Optional[str] = None) -> float:
+        """Value of a metric in one rollup bucket (the current UTC bucket by default)."""
+        fmt = MetricsRollupSchema.GRANULARITIES[granularity]
+        bucket_start = bucket_start or datetime.utcnow().strftime(fmt)
+        with self._get_connection_sync() as conn:
+            row = conn.execute(
+                "SELECT value FROM metrics_rollups WHERE granularity = ? AND metric = ? AND bucket_start = ?",
+                (granularity, metric, bucket_start)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_metric_timeseries(self, metric: str, granularity: str = "hour",
+                              since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Per-bucket values of a metric.
+
+        Args:
+            metric: Rollup metric (e.g. 'documents_created', 'extractions_failed')
+            granularity: 'minute', 'hour' or 'day'
+            since: Start time (UTC); defaults to the last 24 buckets
+
+        Returns:
+            List of {bucket_start, value} in time order
+        """
+        fmt = MetricsRollupSchema.GRANULARITIES[granularity]
+        if since is None:
+            step = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}[granularity]
+            since = datetime.utcnow() - 23 * step
+        with self._get_connection_sync() as conn:
+            rows = conn.execute("""
+                SELECT bucket_start, value FROM metrics_rollups
+                WHERE granularity = ? AND metric = ? AND bucket_start >= ?
+                ORDER BY bucket_start
+            """, (granularity, metric, since.strftime(fmt))).fetchall()
+        return [{"bucket_start": bucket, "value": value} for bucket, value in rows]
+
+    def get_latency_histogram(self, granularity: str = "day",
+                              since: Optional[datetime] = None) -> Dict[str, int]:
+        """Processing time histogram (bucket upper bound in seconds -> count)."""
+        fmt = MetricsRollupSchema.GRANULARITIES[granularity]
+        since = since or datetime.utcnow()
+        with self._get_connection_sync() as conn:
+            rows = conn.execute("""
+                SELECT metric, SUM(value) FROM metrics_rollups
+                WHERE granularity = ? AND metric LIKE 'latency_le_%' AND bucket_start >= ?
+                GROUP BY metric
+            """, (granularity, since.strftime(fmt))).fetchall()
+        counts = {name: int(value) for name, value in rows}
+        bounds = [str(b) for b in MetricsRollupSchema.LATENCY_BUCKETS] + ["inf"]
+        return {bound: counts.get(f"latency_le_{bound}", 0) for bound in bounds}
+
+    def compact_metrics(self, minute_retention_hours: int = 48, hour_retention_days: int = 90) -> int:
+        """
+        Delete fine-grained rollup buckets that have aged out.
+
+        Hourly and daily buckets already hold the totals, so dropping old
+        minute and hour rows loses only resolution.
+
+        Returns:
+            Number of rollup rows deleted
+        """
+        now = datetime.utcnow()
+        minute_cutoff = (now - timedelta(hours=minute_retention_hours)).strftime(
+            MetricsRollupSchema.GRANULARITIES["minute"])
+        hour_cutoff = (now - timedelta(days=hour_retention_days)).strftime(
+            MetricsRollupSchema.GRANULARITIES["hour"])
+        with self._get_connection_sync() as conn:
+            deleted = conn.execute(
+                "DELETE FROM metrics_rollups WHERE granularity = 'minute' AND bucket_start < ?",
+                (minute_cutoff,)
+            ).rowcount
+            deleted += conn.execute(
+                "DELETE FROM metrics_rollups WHERE granularity = 'hour' AND bucket_start < ?",
+                (hour_cutoff,)
+            ).rowcount
+        if deleted:
+            logger.info(f"Compacted {deleted} metrics rollup rows")
+        return deleted
+
+    def rebuild_metrics(self):
+        """Recompute all materialized metrics from the base tables."""
+        with self._get_connection_sync() as conn:
+            for statement in MetricsRollupSchema.rebuild_sql():
+                conn.execute(statement)
+        logger.info("Rebuilt dashboard metrics rollups")
+
     async def get_document_count(self) -> int:
         """Get total number of documents in the database."""
         try:
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM enhanced_documents")
-                result = cursor.fetchone()
-                return result[0] if result else 0
+            return int(self.get_counters(["documents_total"])["documents_total"])
         except Exception as e:
             logger.error(f"Error getting document count: {e}")
             return 0
 
     async def get_documents_processed_today(self) -> int:
-        """Get number of documents processed today."""
+        """Get number of documents processed today (UTC)."""
         try:
-            today = datetime.now().date()
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_documents WHERE DATE(created_at) = ?",
-                    [today]
-                )
-                result = cursor.fetchone()
-                return result[0] if result else 0
+            return int(self.get_rollup("documents_created", "day"))
         except Exception as e:
             logger.error(f"Error getting documents processed today: {e}")
             return 0
@@ -775,26 +1069,15 @@ class EnhancedSQLiteManager:
     async def get_processing_success_rate(self) -> float:
         """Get processing success rate as a percentage."""
         try:
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_documents WHERE processing_status = 'completed'"
-                )
-                completed = cursor.fetchone()
-                completed = completed[0] if completed else 0
-                
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_documents WHERE processing_status = 'failed'"
-                )
-                failed = cursor.fetchone()
-                failed = failed[0] if failed else 0
-                
-                total = completed + failed
-                if total == 0:
-                    return 100.0
-                
-                return round((completed / total) * 100, 1)
+            counters = self.get_counters(["documents_status:completed", "documents_status:failed"])
+            completed = counters["documents_status:completed"]
+            failed = counters["documents_status:failed"]
+            
+            total = completed + failed
+            if total == 0:
+                return 100.0
+            
+            return round((completed / total) * 100, 1)
         except Exception as e:
             logger.error(f"Error getting processing success rate: {e}")
             return 0.0
@@ -802,13 +1085,10 @@ class EnhancedSQLiteManager:
     async def get_average_processing_time(self) -> float:
         """Get average processing time in seconds."""
         try:
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT AVG(processing_time) FROM enhanced_extractions WHERE processing_time IS NOT NULL"
-                )
-                result = cursor.fetchone()
-                return round(result[0] if result and result[0] else 0, 1)
+            counters = self.get_counters(["processing_time_sum", "processing_time_count"])
+            if not counters["processing_time_count"]:
+                return 0.0
+            return round(counters["processing_time_sum"] / counters["processing_time_count"], 1)
         except Exception as e:
             logger.error(f"Error getting average processing time: {e}")
             return 0.0
@@ -816,13 +1096,8 @@ class EnhancedSQLiteManager:
     async def get_active_extraction_count(self) -> int:
         """Get number of active extractions."""
         try:
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_extractions WHERE status IN ('pending', 'processing')"
-                )
-                result = cursor.fetchone()
-                return result[0] if result else 0
+            counters = self.get_counters(["extractions_status:pending", "extractions_status:processing"])
+            return int(sum(counters.values()))
         except Exception as e:
             logger.error(f"Error getting active extraction count: {e}")
             return 0
@@ -830,13 +1105,7 @@ class EnhancedSQLiteManager:
     async def get_processing_queue_length(self) -> int:
         """Get length of processing queue."""
         try:
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_extractions WHERE status = 'pending'"
-                )
-                result = cursor.fetchone()
-                return result[0] if result else 0
+            return int(self.get_counters(["extractions_status:pending"])["extractions_status:pending"])
         except Exception as e:
             logger.error(f"Error getting processing queue length: {e}")
             return 0
@@ -909,14 +1178,14 @@ class EnhancedSQLiteManager:
         try:
             alerts = []
             
-            # Check for failed extractions
+            # Check for failed extractions (at most 60 per-minute rollup rows)
+            last_hour = self.get_metric_timeseries(
+                "extractions_failed", "minute", since=datetime.utcnow() - timedelta(hours=1)
+            )
+            failed_count = int(sum(bucket["value"] for bucket in last_hour))
+            
             with self._get_connection_sync() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM enhanced_extractions WHERE status = 'failed' AND created_at > datetime('now', '-1 hour')"
-                )
-                failed_count = cursor.fetchone()
-                failed_count = failed_count[0] if failed_count else 0
                 
                 if failed_count > 5:
                     alerts.append({
@@ -954,34 +1223,21 @@ class EnhancedSQLiteManager:
         try:
             metrics = {}
             
-            with self._get_connection_sync() as conn:
-                cursor = conn.cursor()
-                # Get document counts by status
-                cursor.execute(
-                    "SELECT processing_status, COUNT(*) FROM enhanced_documents GROUP BY processing_status"
-                )
-                status_counts = cursor.fetchall()
-                
-                for status, count in status_counts:
-                    metrics[f"{status}_documents"] = count
-                
-                # Get extraction counts by status
-                cursor.execute(
-                    "SELECT status, COUNT(*) FROM enhanced_extractions GROUP BY status"
-                )
-                ext_status_counts = cursor.fetchall()
-                
-                for status, count in ext_status_counts:
-                    metrics[f"{status}_extractions"] = count
-                
-                # Add basic system info
-                metrics.update({
-                    "cpu_usage": 25.0,  # TODO: Implement real system monitoring
-                    "memory_usage": 45.0,
-                    "disk_usage": 60.0,
-                    "active_connections": 0,
-                    "api_requests_per_minute": 0,
-                })
+            # Document and extraction counts by status from materialized counters
+            for name, value in self.get_counters().items():
+                if name.startswith("documents_status:"):
+                    metrics[f"{name.split(':', 1)[1]}_documents"] = int(value)
+                elif name.startswith("extractions_status:"):
+                    metrics[f"{name.split(':', 1)[1]}_extractions"] = int(value)
+            
+            # Add basic system info
+            metrics.update({
+                "cpu_usage": 25.0,  # TODO: Implement real system monitoring
+                "memory_usage": 45.0,
+                "disk_usage": 60.0,
+                "active_connections": 0,
+                "api_requests_per_minute": 0,
+            })
             
             return metrics
             
@@ -1318,6 +1574,7 @@ class EnhancedSQLiteManager:
                     [status, document_id]
                 )
                 conn.commit()
+                invalidate_responses(TAG_DOCUMENTS, TAG_ANALYTICS)
                 return True
         except Exception as e:
             logger.error(f"Error updating processing status for {document_id}: {e}")
@@ -1326,27 +1583,22 @@ class EnhancedSQLiteManager:
     async def get_metadata_statistics(self) -> Dict[str, Any]:
         """Get metadata statistics."""
         try:
-            with self._get_connection_sync() as conn:
-                # Get total records
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM enhanced_documents")
-                total_records = cursor.fetchone()
-                total_records = total_records[0] if total_records else 0
-                
-                # Get collections info
-                collections = [
-                    {
-                        "name": "documents",
-                        "count": total_records,
-                        "last_updated": datetime.now().isoformat()
-                    }
-                ]
-                
-                return {
-                    "total_records": total_records,
-                    "collections": collections
+            total_records = int(self.get_counters(["documents_total"])["documents_total"])
+            
+            # Get collections info
+            collections = [
+                {
+                    "name": "documents",
+                    "count": total_records,
+                    "last_updated": datetime.now().isoformat()
                 }
-                
+            ]
+            
+            return {
+                "total_records": total_records,
+                "collections": collections
+            }
+            
         except Exception as e:
             logger.error(f"Error getting metadata statistics: {e}")
             return {
@@ -1403,6 +1655,7 @@ class EnhancedSQLiteManager:
                     ]
                 )
                 conn.commit()
+                invalidate_responses(TAG_ANALYTICS)
                 return True
         except Exception as e:
             logger.error(f"Error storing extraction result: {e}")
@@ -1516,7 +1769,7 @@ class EnhancedSQLiteManager:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
             
-            with self._get_connection() as conn:
+            with self._get_connection_sync() as conn:
                 cursor = conn.cursor()
                 
                 # Clean up old analytics data
@@ -1531,10 +1784,14 @@ class EnhancedSQLiteManager:
                 extractions_deleted = cursor.rowcount
                 
                 conn.commit()
-                
-                total_deleted = analytics_deleted + extractions_deleted
-                logger.info(f"Cleaned up {total_deleted} old records")
-                return total_deleted
+
+            # Rollups keep the history of deleted extractions; only aged-out
+            # minute and hour buckets are dropped
+            rollups_deleted = self.compact_metrics()
+
+            total_deleted = analytics_deleted + extractions_deleted + rollups_deleted
+            logger.info(f"Cleaned up {total_deleted} old records")
+            return total_deleted
                 
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
@@ -9,6 +9,9 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from core.event_bus import get_event_bus, TOPIC_METRICS
+from core.response_cache import TAG_ANALYTICS, TAG_DOCUMENTS, invalidate_responses
+
 # Remove circular imports
 # from core.base import PatientRecord, ProcessingResult
 # from core.logging_config import get_logger
@@ -262,6 +265,11 @@ class SQLiteManager:
                 
                 conn.commit()
                 
+                # Metric deltas accumulate while a dashboard is slow to receive them
+                get_event_bus().publish(TOPIC_METRICS, {"documents_stored": 1},
+                                        coalesce_key="database", accumulate=True)
+                invalidate_responses(TAG_DOCUMENTS, TAG_ANALYTICS)
+                
                 return ProcessingResult(
                     success=True,
                     data={"document_id": document_data.get("id")},
@@ -394,6 +402,9 @@ class SQLiteManager:
                 
                 conn.commit()
                 log.info(f"Stored {len(records)} patient records")
+                get_event_bus().publish(TOPIC_METRICS, {"patients_stored": len(records)},
+                                        coalesce_key="database", accumulate=True)
+                invalidate_responses(TAG_DOCUMENTS, TAG_ANALYTICS)
                 
                 return ProcessingResult(
                     success=True,
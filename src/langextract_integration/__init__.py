@@ -10,6 +10,7 @@ This module provides the primary extraction engine:
 """
 
 from .extractor import LangExtractEngine
+from .extraction_cache import ExtractionCache
 from .normalizer import BiomedicNormalizer
 from .schema_classes import (
     PatientRecord,
@@ -35,6 +36,7 @@ except ImportError:
 
 __all__ = [
     'LangExtractEngine',
+    'ExtractionCache',
     'BiomedicNormalizer',
     'PatientRecord',
     'Mutation',
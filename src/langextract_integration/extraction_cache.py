@@ -0,0 +1,171 @@
+"""
+Persistent cache of raw LangExtract extractions per patient segment.
+
+Entries are keyed by a hash of everything that determines what the LLM
+returns for a segment: the segment text, prompt description, few-shot
+examples, model id and endpoint, extraction passes and chunk size. Raw
+(un-normalized) extractions are stored, so a re-run after a normalizer
+change re-normalizes cached segments without any LLM calls, and editing one
+patient paragraph only re-extracts that segment.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored extraction format changes
+EXTRACTION_CACHE_VERSION = 1
+
+
+class ExtractionCache:
+    """SQLite-backed store of raw segment extractions."""
+
+    def __init__(self, db_path: Union[str, Path] = "data/cache/extractions.db"):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite database file holding the cached extractions
+        """
+        self.db_path = Path(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_database(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS segment_extractions (
+                    cache_key TEXT PRIMARY KEY,
+                    model_id TEXT,
+                    extractions TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def make_key(text: str, prompt_description: str, examples: Any, model_id: str,
+                 extraction_passes: int, **options) -> str:
+        """
+        Cache key for one segment extraction.
+
+        Args:
+            text: Segment text
+            prompt_description: Prompt sent to the model
+            examples: Few-shot examples (JSON-serializable)
+            model_id: Model the segment is extracted with
+            extraction_passes: Number of extraction passes
+            **options: Further settings that change the model output
+                (e.g. chunk size or API endpoint)
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        parts = {
+            "version": EXTRACTION_CACHE_VERSION,
+            "prompt_description": prompt_description,
+            "examples": examples,
+            "model_id": model_id,
+            "extraction_passes": extraction_passes,
+            "options": options
+        }
+        digest = hashlib.sha256(text.encode("utf-8"))
+        digest.update(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached extractions.
+
+        Returns:
+            The segment's raw extractions, or None on a miss
+        """
+        row = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT extractions FROM segment_extractions WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE segment_extractions SET last_used_at = ? WHERE cache_key = ?",
+                        (time.time(), cache_key)
+                    )
+        except Exception as e:
+            logger.warning(f"Extraction cache lookup failed: {e}")
+
+        extractions = None
+        if row is not None:
+            try:
+                extractions = json.loads(row[0])
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable extraction cache entry {cache_key}: {e}")
+
+        with self._lock:
+            if extractions is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return extractions
+
+    def put(self, cache_key: str, extractions: List[Dict[str, Any]], model_id: Optional[str] = None):
+        """Store the raw extractions of a segment."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    INSERT INTO segment_extractions (cache_key, model_id, extractions, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        extractions = excluded.extractions,
+                        last_used_at = excluded.last_used_at
+                """, (cache_key, model_id, json.dumps(extractions, default=str), now, now))
+        except Exception as e:
+            logger.warning(f"Failed to cache segment extractions: {e}")
+
+    def prune(self, max_age_days: float) -> int:
+        """
+        Remove entries not used for ``max_age_days``.
+
+        Returns:
+            Number of removed entries
+        """
+        cutoff = time.time() - max_age_days * 86400
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM segment_extractions WHERE last_used_at < ?", (cutoff,))
+            return cursor.rowcount
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM segment_extractions")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process and the number of stored entries."""
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM segment_extractions").fetchone()[0]
+        except Exception:
+            entries = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "db_path": str(self.db_path)
+            }
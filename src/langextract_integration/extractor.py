@@ -7,9 +7,10 @@ extraction from medical literature with precise source grounding.
 
 import os
 import logging
+import time
 import json
 import asyncio
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Union
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -24,9 +25,12 @@ from openai import OpenAI
 
 from .schema_classes import BiomedicExtractionClasses, BIOMEDICAL_SYSTEM_PROMPT
 from .normalizer import BiomedicNormalizer
+from .extraction_cache import ExtractionCache
 # Remove circular import
 # from core.config import Config
 from processors.patient_segmenter import PatientSegmenter
+from processors.relevance_filter import RelevanceFilter
+from core.llm_client.cascade import CascadeStats
 
 
 logger = logging.getLogger(__name__)
@@ -46,7 +50,13 @@ class LangExtractEngine:
         model_id: str = "google/gemma-2-27b-it:free",
         openrouter_api_key: Optional[str] = None,
         use_local_model: bool = False,
-        local_model_url: str = "http://localhost:11434"
+        local_model_url: str = "http://localhost:11434",
+        api_base: Optional[str] = None,
+        enable_cache: bool = True,
+        cache_dir: Union[str, Path] = "data/cache",
+        cascade_model_ids: Optional[List[str]] = None,
+        cascade_min_grounding: float = 0.8,
+        reduce_input: bool = True
     ):
         """
         Initialize LangExtract engine.
@@ -57,6 +67,18 @@ class LangExtractEngine:
             openrouter_api_key: OpenRouter API key
             use_local_model: Whether to use local model (Ollama)
             local_model_url: URL for local model server
+            api_base: OpenAI-compatible API base (defaults to OPENROUTER_API_BASE or OpenRouter)
+            enable_cache: Whether to reuse raw extractions of unchanged patient segments
+            cache_dir: Directory holding the segment extraction cache
+            cascade_model_ids: Cheaper models tried per segment before model_id,
+                cheapest first ("ollama:<model>" runs on the local model server);
+                a stage that resolves to the same model as a later one is dropped
+            cascade_min_grounding: Share of extractions that must be grounded
+                in the segment text for a cascade stage to be accepted
+            reduce_input: Whether to forward only the sections and paragraphs
+                likely to hold patient data (references, methods boilerplate
+                and front matter are dropped; grounding still points into the
+                original text)
         """
         if lx is None:
             raise ImportError("LangExtract is required. Install with: pip install langextract")
@@ -65,6 +87,7 @@ class LangExtractEngine:
         self.model_id = model_id
         self.use_local_model = use_local_model
         self.local_model_url = local_model_url
+        self.api_base = api_base or os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
         
         # Set up API key
         self.openrouter_api_key = (
@@ -85,10 +108,29 @@ class LangExtractEngine:
         except Exception:
             self.patient_segmenter = None
         
+        self._model_remap_logged = False
+        
+        self.relevance_filter = RelevanceFilter() if reduce_input else None
+        
+        # Cheap-model-first cascade; model_id is the final stage
+        self.cascade_model_ids = self._distinct_cascade_stages(list(cascade_model_ids or []))
+        self.cascade_min_grounding = cascade_min_grounding
+        self.cascade_stats = (
+            CascadeStats(self.cascade_model_ids + [model_id]) if self.cascade_model_ids else None
+        )
+        
+        # Raw segment extractions are cached; normalization always reruns
+        self.extraction_cache = None
+        if enable_cache:
+            try:
+                self.extraction_cache = ExtractionCache(Path(cache_dir) / "extractions.db")
+            except Exception as e:
+                logger.warning(f"Extraction cache disabled: {e}")
+        
         # Setup OpenAI client for OpenRouter
         if not self.use_local_model and self.openrouter_api_key:
             self.openai_client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
+                base_url=self.api_base,
                 api_key=self.openrouter_api_key
             )
         else:
@@ -105,7 +147,8 @@ class LangExtractEngine:
         segment_patients: bool = True,
         include_visualization: bool = True,
         prompt_description: Optional[str] = None,
-        examples_override: Optional[List[Dict[str, Any]]] = None
+        examples_override: Optional[List[Dict[str, Any]]] = None,
+        progress_callback: Optional[Callable[[str, float], None]] = None
     ) -> Dict[str, Any]:
         """
         Extract structured information from biomedical text.
@@ -113,62 +156,125 @@ class LangExtractEngine:
         Args:
             text: Input text to extract from
             extraction_passes: Number of extraction passes for improved recall
-            max_workers: Number of parallel workers
+            max_workers: Concurrent LLM requests for the whole call, shared
+                between patient segments processed in parallel
             max_char_buffer: Maximum character buffer size for chunking
             segment_patients: Whether to segment text by patients first
             include_visualization: Whether to generate visualization HTML
+            progress_callback: Called with (stage, fraction complete) between
+                stages and segments; an exception raised by it aborts the extraction
             
         Returns:
             Dictionary containing extraction results and metadata
         """
         logger.info(f"Starting extraction from text ({len(text)} characters)")
+        stage_timings = {}
+        report_progress = progress_callback or (lambda stage, fraction: None)
         
         try:
+            # Drop sections and paragraphs without patient data
+            stage_start = time.perf_counter()
+            reduced = self.relevance_filter.reduce(text) if self.relevance_filter else None
+            source_text = text
+            if reduced is not None:
+                text = reduced.text
+                stage_timings["reduce"] = time.perf_counter() - stage_start
+            
             # Segment by patients if requested
+            stage_start = time.perf_counter()
             if segment_patients:
                 patient_segments = self._segment_text_simple(text)
                 logger.info(f"Segmented text into {len(patient_segments)} patient sections (simple)")
             else:
                 patient_segments = [{"text": text, "patient_id": "unknown", "start": 0, "end": len(text)}]
             
-            all_results = []
+            stage_timings["segment"] = time.perf_counter() - stage_start
+            report_progress("segment", 0.05)
             
-            # Process each patient segment
-            for i, segment in enumerate(patient_segments):
-                logger.info(f"Processing patient segment {i+1}/{len(patient_segments)}")
-                
-                # Run LangExtract
-                result = self._run_langextract(
-                    text=segment["text"],
-                    extraction_passes=extraction_passes,
-                    max_workers=max_workers,
-                    max_char_buffer=max_char_buffer,
-                    prompt_description=prompt_description,
-                    examples_override=examples_override
-                )
-                
-                all_results.append(result)
+            stage_start = time.perf_counter()
+            
+            # Process patient segments in parallel; the worker budget is split
+            # so that at most max_workers LLM requests are in flight in total
+            segment_count = len(patient_segments)
+            concurrent_segments = max(1, min(segment_count, max_workers))
+            workers_per_segment = max(1, max_workers // concurrent_segments)
+            all_results: List[Any] = [None] * segment_count
+            
+            cache_hits = 0
+            
+            with ThreadPoolExecutor(max_workers=concurrent_segments,
+                                    thread_name_prefix="langextract-segment") as executor:
+                futures = {
+                    executor.submit(
+                        self._extract_segment,
+                        text=segment["text"],
+                        extraction_passes=extraction_passes,
+                        max_workers=workers_per_segment,
+                        max_char_buffer=max_char_buffer,
+                        prompt_description=prompt_description,
+                        examples_override=examples_override
+                    ): i
+                    for i, segment in enumerate(patient_segments)
+                }
+                try:
+                    for completed, future in enumerate(as_completed(futures), 1):
+                        all_results[futures[future]], from_cache = future.result()
+                        cache_hits += from_cache
+                        logger.info(f"Processed patient segment {completed}/{segment_count}"
+                                    f"{' (cached)' if from_cache else ''}")
+                        report_progress("extract", 0.05 + 0.85 * completed / segment_count)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            
+            stage_timings["extract"] = time.perf_counter() - stage_start
             
             # Combine results
-            combined_result = self._combine_results(all_results)
+            combined_result = self._combine_results(all_results, patient_segments)
+            if reduced is not None:
+                # Grounding points into the original text, not the reduced one
+                self._map_intervals(combined_result["extractions"], reduced)
             # Add high-level segment metadata without relying on result.metadata
             combined_result.setdefault("metadata", {})
             combined_result["metadata"].setdefault("segments", [])
             for i, segment in enumerate(patient_segments):
+                segment_start, segment_end = segment.get("start"), segment.get("end")
+                if reduced is not None and segment_start is not None and segment_end is not None:
+                    segment_start, segment_end = reduced.interval_to_original(segment_start, segment_end)
                 combined_result["metadata"]["segments"].append({
                     "segment_id": i,
                     "patient_id": segment.get("patient_id"),
-                    "segment_start": segment.get("start"),
-                    "segment_end": segment.get("end")
+                    "segment_start": segment_start,
+                    "segment_end": segment_end
                 })
             
             # Normalize extractions
+            stage_start = time.perf_counter()
             normalized_result = self.normalizer.normalize_extractions(combined_result)
+            stage_timings["normalize"] = time.perf_counter() - stage_start
+            report_progress("normalize", 0.95)
             
             # Generate visualization if requested
             if include_visualization:
-                visualization_html = self._generate_visualization(normalized_result)
+                stage_start = time.perf_counter()
+                visualization_html = self._generate_visualization(normalized_result, source_text)
                 normalized_result["visualization_html"] = visualization_html
+                stage_timings["visualize"] = time.perf_counter() - stage_start
+            
+            extraction_metadata = normalized_result.setdefault("extraction_metadata", {})
+            extraction_metadata["stage_timings"] = stage_timings
+            extraction_metadata["cache"] = {
+                "enabled": self.extraction_cache is not None,
+                "segments": segment_count,
+                "segments_from_cache": cache_hits,
+                "segments_extracted": segment_count - cache_hits
+            }
+            if reduced is not None:
+                extraction_metadata["input_reduction"] = reduced.stats()
+            if self.cascade_stats is not None:
+                # Cumulative over the engine's lifetime
+                extraction_metadata["cascade"] = self.cascade_stats.snapshot()
             
             logger.info("Extraction completed successfully")
             return normalized_result
@@ -237,7 +343,7 @@ class LangExtractEngine:
         
         return normalized_result
     
-    def _run_langextract(
+    def _extract_segment(
         self,
         text: str,
         extraction_passes: int = 2,
@@ -245,6 +351,156 @@ class LangExtractEngine:
         max_char_buffer: int = 1200,
         prompt_description: Optional[str] = None,
         examples_override: Optional[List[Dict[str, Any]]] = None
+    ) -> tuple:
+        """
+        Extract one patient segment, reusing cached raw extractions when the
+        segment, prompt, examples and model are unchanged.
+        
+        Returns:
+            (raw extraction dicts with segment-relative intervals, whether they came from the cache)
+        """
+        cache_key = None
+        if self.extraction_cache is not None:
+            cache_key = self._segment_cache_key(
+                text, extraction_passes, max_char_buffer, prompt_description, examples_override
+            )
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                return cached, True
+        
+        stages = self.cascade_model_ids + [self.model_id]
+        for index, stage_model_id in enumerate(stages):
+            is_last = index == len(stages) - 1
+            stage_start = time.perf_counter()
+            try:
+                result = self._run_langextract(
+                    text=text,
+                    extraction_passes=extraction_passes,
+                    max_workers=max_workers,
+                    max_char_buffer=max_char_buffer,
+                    prompt_description=prompt_description,
+                    examples_override=examples_override,
+                    model_id=stage_model_id
+                )
+                extractions = self._combine_results([result])["extractions"]
+                reason = None if is_last else self._cascade_escalation_reason(extractions)
+            except Exception as e:
+                if is_last:
+                    raise
+                logger.warning(f"Cascade stage {stage_model_id} failed: {e}")
+                reason = "error"
+            if self.cascade_stats is not None:
+                self.cascade_stats.record(stage_model_id, time.perf_counter() - stage_start, reason)
+            if reason is None:
+                break
+            logger.info(f"Escalating segment from {stage_model_id}: {reason}")
+        
+        if cache_key is not None:
+            self.extraction_cache.put(cache_key, extractions, model_id=self._resolve_model_id())
+        return extractions, False
+    
+    @staticmethod
+    def _map_intervals(extractions: List[Dict[str, Any]], reduced: Any):
+        """Map char intervals found in the reduced text onto the original text."""
+        for extraction in extractions:
+            interval = extraction.get("char_interval")
+            if isinstance(interval, dict) and interval.get("start_pos") is not None \
+                    and interval.get("end_pos") is not None:
+                start, end = reduced.interval_to_original(interval["start_pos"], interval["end_pos"])
+                extraction["char_interval"] = {"start_pos": start, "end_pos": end}
+    
+    def _segment_cache_key(
+        self,
+        text: str,
+        extraction_passes: int,
+        max_char_buffer: int,
+        prompt_description: Optional[str],
+        examples_override: Optional[List[Dict[str, Any]]]
+    ) -> str:
+        """Cache key covering everything that changes the LLM output for a segment."""
+        return ExtractionCache.make_key(
+            text,
+            prompt_description=prompt_description or BIOMEDICAL_SYSTEM_PROMPT,
+            examples=examples_override or self.extraction_classes.patient_record.few_shot_examples,
+            model_id=self._resolve_model_id(),
+            extraction_passes=extraction_passes,
+            max_char_buffer=max_char_buffer,
+            endpoint=self.local_model_url if self.use_local_model else self.api_base,
+            cascade=self.cascade_model_ids,
+            cascade_min_grounding=self.cascade_min_grounding if self.cascade_model_ids else None
+        )
+    
+    def _cascade_escalation_reason(self, extractions: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Why a cheap stage's extractions of a segment are not good enough, or None.
+        
+        LangExtract reports no confidence; the share of extractions it could
+        ground in the source text stands in for it.
+        """
+        if not extractions:
+            return "invalid"
+        grounded = sum(1 for item in extractions if item.get("char_interval"))
+        if grounded / len(extractions) < self.cascade_min_grounding:
+            return "low_confidence"
+        return None
+    
+    def _distinct_cascade_stages(self, cascade_model_ids: List[str]) -> List[str]:
+        """
+        Drop cascade stages that would run the same model as a later stage.
+        
+        Under OpenRouter, ids that LangExtract routes to Ollama are remapped
+        to one OpenAI-compatible id (see _resolve_model_id), so distinct
+        configured stages can end up calling the same model and a segment
+        would be paid for twice for nothing.
+        """
+        later = {self._stage_model(self.model_id)}
+        kept = []
+        for stage_model_id in reversed(cascade_model_ids):
+            target = self._stage_model(stage_model_id)
+            if target in later:
+                logger.warning(
+                    f"Cascade stage '{stage_model_id}' runs the same model ('{target}') "
+                    f"as a later stage; dropping it"
+                )
+                continue
+            later.add(target)
+            kept.append(stage_model_id)
+        return kept[::-1]
+    
+    def _stage_model(self, model_id: str) -> str:
+        """Model a cascade stage actually runs, as "ollama:<model>" for the local server."""
+        if model_id.startswith("ollama:"):
+            return model_id
+        if self.use_local_model:
+            return f"ollama:{model_id}"
+        return self._resolve_model_id(model_id)
+    
+    def _resolve_model_id(self, model_id: Optional[str] = None) -> str:
+        """Model id actually passed to LangExtract (for model_id, default the engine's)."""
+        selected_model_id = model_id or self.model_id
+        # Force OpenAI-compatible provider when using OpenRouter to avoid accidental Ollama selection by pattern
+        if not self.use_local_model and self.openrouter_api_key:
+            # If the model id matches common non-OpenAI providers that LangExtract maps to Ollama, fall back to a safe OpenAI id
+            import re
+            if re.match(r"^(google/|microsoft/|huggingfaceh4/|meta-llama/|mistralai/|Qwen/|deepseek-ai/|bigcode/|codellama/|TinyLlama/|WizardLM/)", selected_model_id, flags=re.IGNORECASE):
+                if not self._model_remap_logged:
+                    logger.warning(
+                        f"Model id '{selected_model_id}' maps to Ollama in LangExtract. "
+                        f"Using OpenRouter via OpenAI-compatible id 'gpt-4o-mini' instead."
+                    )
+                    self._model_remap_logged = True
+                selected_model_id = "gpt-4o-mini"
+        return selected_model_id
+    
+    def _run_langextract(
+        self,
+        text: str,
+        extraction_passes: int = 2,
+        max_workers: int = 8,
+        max_char_buffer: int = 1200,
+        prompt_description: Optional[str] = None,
+        examples_override: Optional[List[Dict[str, Any]]] = None,
+        model_id: Optional[str] = None
     ) -> Any:
         """
         Run LangExtract on the given text.
@@ -254,6 +510,8 @@ class LangExtractEngine:
             extraction_passes: Number of passes
             max_workers: Parallel workers
             max_char_buffer: Buffer size
+            model_id: Model to run (defaults to the engine's); an "ollama:"
+                prefix runs it on the local model server
             
         Returns:
             LangExtract result object
@@ -264,21 +522,13 @@ class LangExtractEngine:
         else:
             examples = self._prepare_examples()
         
-        # Configure model parameters
-        selected_model_id = self.model_id
-        # Force OpenAI-compatible provider when using OpenRouter to avoid accidental Ollama selection by pattern
-        if not self.use_local_model and self.openrouter_api_key:
-            # If the model id matches common non-OpenAI providers that LangExtract maps to Ollama, fall back to a safe OpenAI id
-            import re
-            if re.match(r"^(google/|microsoft/|huggingfaceh4/|meta-llama/|mistralai/|Qwen/|deepseek-ai/|bigcode/|codellama/|TinyLlama/|WizardLM/)", selected_model_id, flags=re.IGNORECASE):
-                logger.warning(
-                    f"Model id '{selected_model_id}' maps to Ollama in LangExtract. "
-                    f"Using OpenRouter via OpenAI-compatible id 'gpt-4o-mini' instead."
-                )
-                selected_model_id = "gpt-4o-mini"
-
+        use_local_model = self.use_local_model
+        if model_id and model_id.startswith("ollama:"):
+            model_id = model_id[len("ollama:"):]
+            use_local_model = True
+        
         model_params = {
-            "model_id": selected_model_id,
+            "model_id": model_id if use_local_model and model_id else self._resolve_model_id(model_id),
             "extraction_passes": extraction_passes,
             "max_workers": max_workers,
             "max_char_buffer": max_char_buffer,
@@ -286,19 +536,20 @@ class LangExtractEngine:
         }
         
         # Add model-specific parameters
-        if self.use_local_model:
+        if use_local_model:
             model_params.update({
                 "model_url": self.local_model_url,
                 "fence_output": False,
                 "use_schema_constraints": False
             })
-        else:
-            # For OpenRouter/cloud models using OpenAI-compatible API
-            if self.openrouter_api_key:
-                # Route OpenAI client through OpenRouter
-                os.environ["OPENROUTER_API_KEY"] = self.openrouter_api_key
-                os.environ["OPENAI_API_KEY"] = self.openrouter_api_key
-                os.environ["OPENAI_BASE_URL"] = "https://openrouter.ai/api/v1"
+        elif self.openrouter_api_key:
+            # Route the OpenAI provider through OpenRouter per call rather than
+            # via process-wide environment variables, so engines with different
+            # keys or endpoints can run concurrently
+            model_params.update({
+                "api_key": self.openrouter_api_key,
+                "language_model_params": {"base_url": self.api_base}
+            })
         
         # Run extraction
         result = lx.extract(
@@ -312,25 +563,19 @@ class LangExtractEngine:
 
     def _segment_text_simple(self, text: str) -> List[Dict[str, Any]]:
         """
-        Simple patient segmentation based on explicit markers.
+        Simple patient segmentation based on named patient labels.
         Falls back to single segment if no markers found.
         """
-        import re
-        markers = list(re.finditer(r"\b(?:Patient|Case|Subject|Individual)\s+(\d+|[A-Z])\b", text, flags=re.IGNORECASE))
-        if not markers:
-            return [{"text": text, "patient_id": "Patient 1", "start": 0, "end": len(text)}]
-        segments: List[Dict[str, Any]] = []
-        for i, m in enumerate(markers):
-            start = m.start()
-            end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
-            content = text[start:end].strip()
-            if not content:
-                continue
-            pid = f"Patient {m.group(1)}"
-            segments.append({"text": content, "patient_id": pid, "start": start, "end": end})
-        if not segments:
+        spans = []
+        if self.patient_segmenter is not None:
+            # "Patient 2"/"Case B" labels only, unique ids, no length filter
+            spans = self.patient_segmenter.find_labeled_spans(text, min_length=1)
+        if not spans:
             return [{"text": text, "patient_id": "Patient 1", "start": 0, "end": len(text)}]
-        return segments
+        return [
+            {"text": span.text(text), "patient_id": span.patient_id, "start": span.start, "end": span.end}
+            for span in spans
+        ]
     
     def _prepare_examples(self) -> List[Any]:
         """
@@ -406,12 +651,15 @@ class LangExtractEngine:
                 continue
         return built_examples
     
-    def _combine_results(self, results: List[Any]) -> Dict[str, Any]:
+    def _combine_results(self, results: List[Any],
+                         segments: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Combine multiple LangExtract results.
         
         Args:
-            results: List of LangExtract result objects
+            results: List of LangExtract result objects or lists of extraction dicts
+            segments: Segments the results came from; their start offsets map
+                grounded character intervals back onto the full text
             
         Returns:
             Combined result dictionary
@@ -429,11 +677,15 @@ class LangExtractEngine:
         for i, result in enumerate(results):
             # Extract data from result object and convert to serializable dicts
             raw_extractions = []
-            if hasattr(result, 'extractions') and result.extractions is not None:
+            if isinstance(result, list):
+                # Already-serialized extractions (e.g. from the extraction cache)
+                raw_extractions = result
+            elif hasattr(result, 'extractions') and result.extractions is not None:
                 raw_extractions = result.extractions
             elif hasattr(result, 'data') and result.data is not None:
                 raw_extractions = result.data
 
+            offset = (segments[i].get("start") or 0) if segments and i < len(segments) else 0
             for item in raw_extractions:
                 # LangExtract Extraction object → dict
                 if hasattr(item, 'extraction_class') and hasattr(item, 'attributes'):
@@ -442,9 +694,23 @@ class LangExtractEngine:
                         "attributes": getattr(item, 'attributes', None),
                         "extraction_text": getattr(item, 'extraction_text', None)
                     }
+                    char_interval = getattr(item, 'char_interval', None)
+                    if char_interval is not None and char_interval.start_pos is not None \
+                            and char_interval.end_pos is not None:
+                        extraction_dict["char_interval"] = {
+                            "start_pos": char_interval.start_pos + offset,
+                            "end_pos": char_interval.end_pos + offset
+                        }
                     combined["extractions"].append(extraction_dict)
                 elif isinstance(item, dict):
-                    combined["extractions"].append(item)
+                    extraction_dict = dict(item)
+                    char_interval = item.get("char_interval")
+                    if offset and isinstance(char_interval, dict):
+                        extraction_dict["char_interval"] = {
+                            "start_pos": char_interval["start_pos"] + offset,
+                            "end_pos": char_interval["end_pos"] + offset
+                        }
+                    combined["extractions"].append(extraction_dict)
             
             # Add segment metadata
             segment_meta = {
@@ -459,34 +725,43 @@ class LangExtractEngine:
         
         return combined
     
-    def _generate_visualization(self, extraction_result: Dict[str, Any]) -> str:
+    def _generate_visualization(self, extraction_result: Dict[str, Any],
+                                source_text: Optional[str] = None) -> str:
         """
         Generate HTML visualization of extractions.
         
+        The annotated document is built in memory, so concurrent extractions
+        do not share any files.
+        
         Args:
             extraction_result: Normalized extraction results
+            source_text: Text the extractions are grounded in
             
         Returns:
             HTML string for visualization
         """
         try:
-            # Save extractions to temporary JSONL file
-            temp_file = Path("/tmp/temp_extractions.jsonl")
+            # Prefer normalized container's original_extractions if present
+            extractions = extraction_result.get("extractions") or extraction_result.get("original_extractions") or []
             
-            # Convert to LangExtract format for visualization
-            with open(temp_file, 'w') as f:
-                # Prefer normalized container's original_extractions if present
-                extractions = extraction_result.get("extractions") or extraction_result.get("original_extractions") or []
-                for extraction in extractions:
-                    serializable = self._to_serializable_extraction(extraction)
-                    f.write(json.dumps(serializable, default=str) + "\n")
+            annotated = []
+            for extraction in extractions:
+                serializable = self._to_serializable_extraction(extraction)
+                interval = serializable.get("char_interval") or {}
+                annotated.append(lx.data.Extraction(
+                    extraction_class=str(serializable.get("extraction_class") or "Extraction"),
+                    extraction_text=str(serializable.get("extraction_text") or ""),
+                    char_interval=lx.data.CharInterval(
+                        start_pos=interval.get("start_pos"), end_pos=interval.get("end_pos")
+                    ) if interval else None,
+                    attributes=serializable.get("attributes") if isinstance(serializable.get("attributes"), dict) else None
+                ))
             
-            # Generate visualization
-            html_content = lx.visualize(str(temp_file))
+            if source_text is None:
+                source_text = "\n".join(e.extraction_text for e in annotated)
             
-            # Clean up
-            if temp_file.exists():
-                temp_file.unlink()
+            # Generate visualization
+            html_content = lx.visualize(lx.data.AnnotatedDocument(text=source_text, extractions=annotated))
             
             # Handle different return types
             if hasattr(html_content, 'data'):
@@ -583,11 +858,14 @@ class LangExtractEngine:
         if isinstance(item, dict):
             # Already a dict; ensure required keys are present where possible
             if "extraction_class" in item:
-                return {
+                serializable = {
                     "extraction_class": item.get("extraction_class"),
                     "attributes": item.get("attributes"),
                     "extraction_text": item.get("extraction_text"),
                 }
+                if item.get("char_interval"):
+                    serializable["char_interval"] = item["char_interval"]
+                return serializable
             # Some formats nest class names at top-level
             for k, v in item.items():
                 if isinstance(v, dict) and k[0].isupper():
@@ -602,11 +880,17 @@ class LangExtractEngine:
             extraction_class = getattr(item, 'extraction_class', None)
             attributes = getattr(item, 'attributes', None)
             extraction_text = getattr(item, 'extraction_text', None)
-            return {
+            serializable = {
                 "extraction_class": extraction_class,
                 "attributes": attributes,
                 "extraction_text": extraction_text,
             }
+            char_interval = getattr(item, 'char_interval', None)
+            if char_interval is not None and char_interval.start_pos is not None:
+                serializable["char_interval"] = {
+                    "start_pos": char_interval.start_pos, "end_pos": char_interval.end_pos
+                }
+            return serializable
         except Exception:
             # Fallback to string for debugging purposes
             return {"extraction": str(item)}
@@ -32,21 +32,27 @@ class BiomedicNormalizer:
     - Quality validation
     """
     
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(self,
+                 config: Optional[Any] = None,
+                 hpo_manager: Optional[Any] = None,
+                 gene_manager: Optional[Any] = None):
         """
         Initialize normalizer.
         
         Args:
             config: System configuration (optional to avoid circular imports)
+            hpo_manager: Shared HPO manager (loaded here if not given)
+            gene_manager: Shared gene manager (loaded here if not given)
         """
         self.config = config
         
         # Initialize ontology managers lazily to avoid circular imports
-        self.hpo_manager = None
-        self.gene_manager = None
+        self.hpo_manager = hpo_manager
+        self.gene_manager = gene_manager
         
-        # Try to initialize ontology managers
-        self._init_ontology_managers()
+        # Try to initialize ontology managers that were not shared
+        if self.hpo_manager is None and self.gene_manager is None:
+            self._init_ontology_managers()
     
     def _init_ontology_managers(self):
         """Initialize ontology managers lazily."""
@@ -271,7 +277,7 @@ class BiomedicNormalizer:
             # Gene normalization
             gene = mut_data.get("gene")
             if gene and self.gene_manager:
-                normalized_gene = self.gene_manager.normalize_gene_symbol(gene)
+                normalized_gene = self._normalize_gene(gene)
                 if normalized_gene:
                     all_genes.add(normalized_gene)
                 else:
@@ -357,7 +363,7 @@ class BiomedicNormalizer:
                 hpo_terms.add(hpo_id)
             elif self.hpo_manager:
                 # Try to map using HPO manager
-                mapped_hpo = self.hpo_manager.map_phenotype_to_hpo(surface_form)
+                mapped_hpo = self._map_phenotype(surface_form)
                 if mapped_hpo:
                     hpo_terms.update(mapped_hpo)
         
@@ -373,6 +379,22 @@ class BiomedicNormalizer:
         
         return phenotype_info
     
+    def _normalize_gene(self, gene: str) -> Optional[str]:
+        """Official symbol for a gene, or None (managers return a str or a ProcessingResult)."""
+        result = self.gene_manager.normalize_gene_symbol(gene)
+        if hasattr(result, "success"):
+            return result.data.get("normalized_symbol") if result.success and result.data else None
+        return result
+    
+    def _map_phenotype(self, surface_form: str) -> List[str]:
+        """HPO ids for a phenotype mention using whichever API the HPO manager has."""
+        if hasattr(self.hpo_manager, "map_phenotype_to_hpo"):
+            return self.hpo_manager.map_phenotype_to_hpo(surface_form) or []
+        result = self.hpo_manager.normalize_phenotype(surface_form)
+        if getattr(result, "success", False) and result.data and result.data.get("hpo_id"):
+            return [result.data["hpo_id"]]
+        return []
+    
     def _process_treatments(self, treatments: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Process treatments and outcomes.
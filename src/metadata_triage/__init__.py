@@ -9,6 +9,8 @@ This module provides document retrieval and classification:
 - Deduplication
 - Enhanced PubMed client with caching and database integration
 - Enhanced metadata orchestrator with database storage
+- Persistent article store for incremental triage runs
+- Append-only checkpoints for resumable batch classification and scoring
 """
 
 from .pubmed_client import PubMedClient
@@ -17,6 +19,8 @@ from .europepmc_client import EuropePMCClient
 from .abstract_classifier import AbstractClassifier
 from .concept_scorer import ConceptDensityScorer
 from .deduplicator import DocumentDeduplicator
+from .article_store import ArticleStore, PIPELINE_VERSION
+from .checkpoint import JSONLCheckpoint
 
 __all__ = [
     'PubMedClient',
@@ -25,5 +29,8 @@ __all__ = [
     'EuropePMCClient',
     'AbstractClassifier',
     'ConceptDensityScorer',
-    'DocumentDeduplicator'
+    'DocumentDeduplicator',
+    'ArticleStore',
+    'PIPELINE_VERSION',
+    'JSONLCheckpoint'
 ]
\ No newline at end of file
@@ -9,12 +9,15 @@ No fine-tuned BERT models are used as per requirements.
 import json
 import logging
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import pandas as pd
 from pathlib import Path
 
+from core.llm_client.structured_output import generate_json
+from .checkpoint import JSONLCheckpoint
+
 
 class StudyType(Enum):
     """Enumeration of study types."""
@@ -48,6 +51,52 @@ class ClassificationResult:
     confidence_score: float
     reasoning: str
     extracted_features: Dict[str, Any]
+    # Fallback result of a classification that raised (not checkpointed, so it is retried)
+    failed: bool = False
+
+
+def classification_to_dict(result: ClassificationResult) -> Dict[str, Any]:
+    """Convert a ClassificationResult to a JSON-serializable dictionary."""
+    return {
+        'study_type': result.study_type.value,
+        'is_case_report': result.is_case_report,
+        'clinical_relevance': result.clinical_relevance.value,
+        'patient_count': result.patient_count,
+        'confidence_score': result.confidence_score,
+        'reasoning': result.reasoning,
+        'extracted_features': result.extracted_features
+    }
+
+
+def classification_from_dict(data: Dict[str, Any]) -> ClassificationResult:
+    """Rebuild a ClassificationResult from its dictionary form."""
+    return ClassificationResult(
+        study_type=StudyType(data.get('study_type', 'other')),
+        is_case_report=data.get('is_case_report', False),
+        clinical_relevance=ClinicalRelevance(data.get('clinical_relevance', 'low')),
+        patient_count=data.get('patient_count'),
+        confidence_score=data.get('confidence_score', 0.0),
+        reasoning=data.get('reasoning', ''),
+        extracted_features=data.get('extracted_features', {})
+    )
+
+
+CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "study_type": {"type": "string", "enum": [t.value for t in StudyType]},
+        "is_case_report": {"type": "boolean"},
+        "clinical_relevance": {"type": "string", "enum": [r.value for r in ClinicalRelevance]},
+        "patient_count": {"type": ["integer", "null"]},
+        "confidence_score": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "extracted_features": {"type": "object"}
+    },
+    "required": ["study_type", "is_case_report", "clinical_relevance", "confidence_score"]
+}
+
+# Append-only checkpoint of classify_batch in its output directory
+CHECKPOINT_FILENAME = "classification_checkpoint.jsonl"
 
 
 class AbstractClassifier:
@@ -55,13 +104,18 @@ class AbstractClassifier:
     LLM-based classifier for biomedical abstracts.
     """
     
+    REQUIRED_FIELDS = ("study_type", "is_case_report", "clinical_relevance")
+    
     def __init__(self, llm_client):
         """
         Initialize the abstract classifier.
         
         Args:
-            llm_client: LLM client for text generation
+            llm_client: LLM client for text generation; a CascadeLLMClient
+                escalates answers that do not fit the classification schema
         """
+        if hasattr(llm_client, "with_validator"):
+            llm_client = llm_client.with_validator(self.is_valid_response, self.REQUIRED_FIELDS)
         self.llm_client = llm_client
         self.logger = logging.getLogger(__name__)
         
@@ -167,6 +221,15 @@ Focus on:
 4. Outcome measures and endpoints
 5. Statistical analysis methods"""
     
+    def is_valid_response(self, result_data: Dict[str, Any]) -> bool:
+        """Whether a parsed LLM answer uses the classification schema's values."""
+        try:
+            StudyType(result_data.get('study_type'))
+            ClinicalRelevance(result_data.get('clinical_relevance'))
+        except ValueError:
+            return False
+        return isinstance(result_data.get('is_case_report'), bool)
+    
     def extract_pattern_features(self, title: str, abstract: str) -> Dict[str, Any]:
         """Extract features using pattern matching."""
         text = f"{title} {abstract}".lower()
@@ -258,29 +321,19 @@ Focus on:
                 abstract=abstract
             )
             
-            messages = [
-                {"role": "system", "content": self.get_system_prompt()},
-                {"role": "user", "content": user_prompt}
-            ]
-            
-            # Get LLM response
-            response = await self.llm_client.generate(
-                prompt=user_prompt,
+            # Get LLM response as schema-constrained JSON
+            response = await generate_json(
+                self.llm_client,
+                user_prompt,
                 system_prompt=self.get_system_prompt(),
+                schema=CLASSIFICATION_SCHEMA,
                 temperature=0.1,
-                max_tokens=800
+                max_tokens=800,
+                schema_name="abstract_classification"
             )
-            
-            # Parse JSON response
-            try:
-                result_data = json.loads(response.data)
-            except json.JSONDecodeError:
-                # Try to extract JSON from response
-                json_match = re.search(r'\{.*\}', response.data, re.DOTALL)
-                if json_match:
-                    result_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("Could not parse JSON response")
+            if not response.success or not isinstance(response.data, dict):
+                raise ValueError(response.error or "Could not parse JSON response")
+            result_data = response.data
             
             # Validate and create result
             study_type = StudyType(result_data.get('study_type', 'other'))
@@ -324,109 +377,101 @@ Focus on:
             self.logger.error(f"Classification failed for PMID {pmid}: {e}")
             
             # Return default classification
-            return ClassificationResult(
-                study_type=StudyType.OTHER,
-                is_case_report=False,
-                clinical_relevance=ClinicalRelevance.LOW,
-                patient_count=None,
-                confidence_score=0.0,
-                reasoning=f"Classification failed: {str(e)}",
-                extracted_features={}
-            )
+            return self._failed_result(e)
+    
+    @staticmethod
+    def _failed_result(error: Exception) -> ClassificationResult:
+        """Default classification of an abstract whose classification raised."""
+        return ClassificationResult(
+            study_type=StudyType.OTHER,
+            is_case_report=False,
+            clinical_relevance=ClinicalRelevance.LOW,
+            patient_count=None,
+            confidence_score=0.0,
+            reasoning=f"Classification failed: {str(error)}",
+            extracted_features={},
+            failed=True
+        )
     
     async def classify_batch(self, 
                       articles: List[Dict[str, Any]],
                       batch_size: int = 10,
                       save_intermediate: bool = True,
-                      output_dir: str = "data/classification") -> List[ClassificationResult]:
+                      output_dir: str = "data/classification",
+                      resume: bool = False) -> List[ClassificationResult]:
         """
         Classify a batch of abstracts.
         
+        With ``save_intermediate`` each result is appended to an append-only
+        JSONL checkpoint in ``output_dir`` as soon as it is available; with
+        ``resume`` articles whose PMID is already in the checkpoint are not
+        classified again.
+        
         Args:
             articles: List of article dictionaries with 'title', 'abstract', 'pmid'
-            batch_size: Number of articles to process before saving intermediate results
-            save_intermediate: Whether to save intermediate results
-            output_dir: Directory for intermediate files
+            batch_size: Number of articles classified between checkpoint fsyncs
+            save_intermediate: Whether to checkpoint results and save the final file
+            output_dir: Directory for the checkpoint and the final results
+            resume: Continue an interrupted run from its checkpoint
             
         Returns:
             List of ClassificationResult objects
         """
         results = []
+        checkpoint = None
+        completed = {}
+        run_pmids = set()
         
         if save_intermediate:
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
-        for i, article in enumerate(articles):
-            try:
-                title = article.get('title', '')
-                abstract = article.get('abstract', '')
-                pmid = article.get('pmid', f'unknown_{i}')
-                
-                if not abstract:
-                    self.logger.warning(f"No abstract for article {pmid}, skipping")
-                    continue
-                
-                # Classify abstract
-                result = await self.classify_abstract(title, abstract, pmid)
-                results.append(result)
-                
-                # Save intermediate results
-                if save_intermediate and (i + 1) % batch_size == 0:
-                    self._save_intermediate_results(results, output_dir, f"batch_{i//batch_size + 1}")
-                    self.logger.info(f"Saved intermediate results for batch {i//batch_size + 1}")
+            checkpoint = JSONLCheckpoint(Path(output_dir) / CHECKPOINT_FILENAME,
+                                         resume=resume, fsync_every=batch_size)
+            if resume:
+                completed = checkpoint.completed()
+                self.logger.info(f"Resuming classification with {len(completed)} completed articles")
+        
+        try:
+            for i, article in enumerate(articles):
+                try:
+                    title = article.get('title', '')
+                    abstract = article.get('abstract', '')
+                    pmid = str(article.get('pmid', f'unknown_{i}'))
+                    
+                    if not abstract:
+                        self.logger.warning(f"No abstract for article {pmid}, skipping")
+                        continue
+                    
+                    run_pmids.add(pmid)
+                    if pmid in completed:
+                        results.append(classification_from_dict(completed[pmid]))
+                        continue
+                    
+                    # Classify abstract
+                    result = await self.classify_abstract(title, abstract, pmid)
+                    results.append(result)
                     
-            except Exception as e:
-                self.logger.error(f"Failed to classify article {i}: {e}")
-                # Add default result
-                results.append(ClassificationResult(
-                    study_type=StudyType.OTHER,
-                    is_case_report=False,
-                    clinical_relevance=ClinicalRelevance.LOW,
-                    patient_count=None,
-                    confidence_score=0.0,
-                    reasoning=f"Classification failed: {str(e)}",
-                    extracted_features={}
-                ))
+                    # Failed classifications are not checkpointed, so a resumed run retries them
+                    if checkpoint and not result.failed:
+                        checkpoint.append(pmid, classification_to_dict(result))
+                        
+                except Exception as e:
+                    self.logger.error(f"Failed to classify article {i}: {e}")
+                    results.append(self._failed_result(e))
+        finally:
+            if checkpoint:
+                checkpoint.close()
         
         # Save final results
-        if save_intermediate:
-            self._save_intermediate_results(results, output_dir, "final")
+        if checkpoint:
+            self._save_final_results(checkpoint, output_dir, run_pmids)
         
         return results
     
-    def _save_intermediate_results(self, 
-                                 results: List[ClassificationResult],
-                                 output_dir: str,
-                                 count: int,
-                                 final: bool = False) -> None:
-        """Save intermediate classification results."""
+    def _save_final_results(self, checkpoint: JSONLCheckpoint, output_dir: str, pmids: Set[str]) -> None:
+        """Save the final classification results of this run by streaming the checkpoint."""
         timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-        
-        if final:
-            filename = f"classification_final_{timestamp}.json"
-        else:
-            filename = f"classification_batch_{count}_{timestamp}.json"
-        
-        output_path = Path(output_dir) / filename
-        
-        # Convert results to serializable format
-        serializable_results = []
-        for result in results:
-            result_dict = {
-                'study_type': result.study_type.value,
-                'is_case_report': result.is_case_report,
-                'clinical_relevance': result.clinical_relevance.value,
-                'patient_count': result.patient_count,
-                'confidence_score': result.confidence_score,
-                'reasoning': result.reasoning,
-                'extracted_features': result.extracted_features
-            }
-            serializable_results.append(result_dict)
-        
-        with open(output_path, 'w') as f:
-            json.dump(serializable_results, f, indent=2)
-        
-        self.logger.info(f"Saved {len(results)} classification results to {output_path}")
+        output_path = Path(output_dir) / f"classification_final_{timestamp}.json"
+        count = checkpoint.export_json(str(output_path), pmids=pmids)
+        self.logger.info(f"Saved {count} classification results to {output_path}")
     
     def create_classification_report(self, results: List[ClassificationResult]) -> Dict[str, Any]:
         """Create a summary report of classification results."""
@@ -0,0 +1,327 @@
+"""
+Persistent Article Store for Incremental Metadata Triage
+
+This module provides a SQLite-backed store of triaged articles keyed by PMID
+(or DOI when no PMID is available). Each article keeps its metadata,
+classification, concept scores, a content hash and the pipeline version that
+produced them, so re-runs of a saved query only need to process new or
+changed articles and can rebuild the full ranking from the store.
+"""
+
+import json
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .abstract_classifier import ClassificationResult, classification_from_dict, classification_to_dict
+from .concept_scorer import ConceptDensityScore, concept_score_from_dict, concept_score_to_dict
+
+
+# Bump whenever classification or scoring logic changes so stored results
+# produced by an older pipeline are re-processed on the next run.
+PIPELINE_VERSION = "1"
+
+# Document fields persisted as article metadata
+METADATA_FIELDS = (
+    'pmid', 'title', 'abstract', 'authors', 'journal',
+    'pub_date', 'source', 'doi', 'pmc_link'
+)
+
+
+def get_article_key(document: Dict[str, Any]) -> Optional[str]:
+    """Return the store key for a document (PMID first, then DOI)."""
+    pmid = str(document.get('pmid') or '').strip()
+    if pmid:
+        return f"pmid:{pmid}"
+
+    doi = str(document.get('doi') or '').strip().lower()
+    if doi:
+        return f"doi:{doi}"
+
+    return None
+
+
+def compute_content_hash(document: Dict[str, Any]) -> str:
+    """Hash the fields that influence classification and scoring."""
+    content = "|".join(
+        str(document.get(field) or '') for field in ('title', 'abstract', 'authors', 'journal')
+    )
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """
+    SQLite store of triaged articles and the queries that retrieved them.
+    """
+
+    def __init__(self,
+                 db_path: str = "data/database/article_store.db",
+                 pipeline_version: str = PIPELINE_VERSION):
+        """
+        Initialize the article store.
+
+        Args:
+            db_path: Path to the SQLite database
+            pipeline_version: Version tag recorded with processed results
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pipeline_version = pipeline_version
+
+        self.logger = logging.getLogger(__name__)
+
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """Create store tables and indexes."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS triage_articles (
+                    article_key TEXT PRIMARY KEY,
+                    pmid TEXT,
+                    doi TEXT,
+                    metadata TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    classification TEXT,
+                    concept_score TEXT,
+                    pipeline_version TEXT,
+                    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS triage_queries (
+                    query_hash TEXT PRIMARY KEY,
+                    query_text TEXT NOT NULL,
+                    last_run_at TIMESTAMP,
+                    run_count INTEGER DEFAULT 0
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS triage_query_articles (
+                    query_hash TEXT NOT NULL,
+                    article_key TEXT NOT NULL,
+                    PRIMARY KEY (query_hash, article_key)
+                )
+            """)
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_triage_articles_pmid ON triage_articles(pmid)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_triage_articles_doi ON triage_articles(doi)")
+
+            conn.commit()
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.md5(query.strip().lower().encode('utf-8')).hexdigest()
+
+    def get_last_run(self, query: str) -> Optional[datetime]:
+        """Return when the query was last run, or None if never."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_run_at FROM triage_queries WHERE query_hash = ?",
+                (self._query_hash(query),)
+            ).fetchone()
+
+        if row and row['last_run_at']:
+            return datetime.fromisoformat(row['last_run_at'])
+        return None
+
+    def record_run(self, query: str, run_at: datetime) -> None:
+        """Record a completed run of the query."""
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO triage_queries (query_hash, query_text, last_run_at, run_count)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT(query_hash) DO UPDATE SET
+                    last_run_at = excluded.last_run_at,
+                    run_count = run_count + 1
+            """, (self._query_hash(query), query, run_at.isoformat()))
+            conn.commit()
+
+    def partition_documents(self,
+                            documents: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split documents into those needing processing and those already up to date.
+
+        A document needs processing if it is not stored yet, its content hash
+        changed, or it was processed by a different pipeline version.
+
+        Args:
+            documents: Candidate documents
+
+        Returns:
+            Tuple of (changed documents, unchanged documents)
+        """
+        keys = [get_article_key(doc) for doc in documents]
+        stored = self._get_hash_versions([k for k in keys if k])
+
+        changed, unchanged = [], []
+        for doc, key in zip(documents, keys):
+            entry = stored.get(key) if key else None
+            if (entry is not None
+                    and entry[0] == compute_content_hash(doc)
+                    and entry[1] == self.pipeline_version):
+                unchanged.append(doc)
+            else:
+                changed.append(doc)
+
+        return changed, unchanged
+
+    def _get_hash_versions(self, keys: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        result = {}
+        with self._connect() as conn:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT article_key, content_hash, pipeline_version FROM triage_articles "
+                    f"WHERE article_key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    result[row['article_key']] = (row['content_hash'], row['pipeline_version'])
+        return result
+
+    def get_stale_documents(self, query: str) -> List[Dict[str, Any]]:
+        """Return stored documents for the query processed by another pipeline version."""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT a.metadata FROM triage_articles a
+                JOIN triage_query_articles qa ON qa.article_key = a.article_key
+                WHERE qa.query_hash = ? AND (a.pipeline_version IS NULL OR a.pipeline_version != ?)
+            """, (self._query_hash(query), self.pipeline_version)).fetchall()
+
+        return [json.loads(row['metadata']) for row in rows]
+
+    def link_documents(self, query: str, documents: List[Dict[str, Any]]) -> None:
+        """Associate already-stored documents with a query."""
+        query_hash = self._query_hash(query)
+        rows = [(query_hash, key) for key in map(get_article_key, documents) if key]
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO triage_query_articles (query_hash, article_key) VALUES (?, ?)",
+                rows
+            )
+            conn.commit()
+
+    def upsert_article(self,
+                       document: Dict[str, Any],
+                       classification: Optional[ClassificationResult],
+                       concept_score: Optional[ConceptDensityScore],
+                       query: Optional[str] = None,
+                       complete: bool = True) -> Optional[str]:
+        """
+        Insert or update a processed article.
+
+        Args:
+            document: Article metadata
+            classification: Classification result (None if not classified)
+            concept_score: Concept density score (None if not scored)
+            query: Query to associate the article with
+            complete: False stores the result but leaves the article to be
+                re-processed on the next run (e.g. after an LLM failure)
+
+        Returns:
+            Article key, or None if the document has no PMID or DOI
+        """
+        key = get_article_key(document)
+        if not key:
+            self.logger.warning(f"Skipping article without PMID or DOI: {document.get('title', '')[:80]}")
+            return None
+
+        metadata = {field: document.get(field) for field in METADATA_FIELDS}
+
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO triage_articles (
+                    article_key, pmid, doi, metadata, content_hash,
+                    classification, concept_score, pipeline_version
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_key) DO UPDATE SET
+                    pmid = excluded.pmid,
+                    doi = excluded.doi,
+                    metadata = excluded.metadata,
+                    content_hash = excluded.content_hash,
+                    classification = excluded.classification,
+                    concept_score = excluded.concept_score,
+                    pipeline_version = excluded.pipeline_version,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (
+                key,
+                document.get('pmid') or None,
+                (document.get('doi') or '').lower() or None,
+                json.dumps(metadata, default=str),
+                compute_content_hash(document),
+                json.dumps(classification_to_dict(classification)) if classification else None,
+                json.dumps(concept_score_to_dict(concept_score)) if concept_score else None,
+                self.pipeline_version if complete else None
+            ))
+
+            if query:
+                conn.execute(
+                    "INSERT OR IGNORE INTO triage_query_articles (query_hash, article_key) VALUES (?, ?)",
+                    (self._query_hash(query), key)
+                )
+
+            conn.commit()
+
+        return key
+
+    def get_query_results(self,
+                          query: str) -> Tuple[List[Dict[str, Any]], List[ClassificationResult], List[ConceptDensityScore]]:
+        """
+        Load all classified and scored articles for a query.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Aligned lists of (documents, classifications, concept scores)
+        """
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT a.metadata, a.classification, a.concept_score FROM triage_articles a
+                JOIN triage_query_articles qa ON qa.article_key = a.article_key
+                WHERE qa.query_hash = ?
+                  AND a.classification IS NOT NULL AND a.concept_score IS NOT NULL
+                ORDER BY a.article_key
+            """, (self._query_hash(query),)).fetchall()
+
+        documents, classifications, scores = [], [], []
+        for row in rows:
+            documents.append(json.loads(row['metadata']))
+            classifications.append(classification_from_dict(json.loads(row['classification'])))
+            scores.append(concept_score_from_dict(json.loads(row['concept_score'])))
+
+        return documents, classifications, scores
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM triage_articles").fetchone()[0]
+            current = conn.execute(
+                "SELECT COUNT(*) FROM triage_articles WHERE pipeline_version = ?",
+                (self.pipeline_version,)
+            ).fetchone()[0]
+            queries = conn.execute("SELECT COUNT(*) FROM triage_queries").fetchone()[0]
+
+        return {
+            'total_articles': total,
+            'current_version_articles': current,
+            'tracked_queries': queries,
+            'pipeline_version': self.pipeline_version
+        }
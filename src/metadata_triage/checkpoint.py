@@ -0,0 +1,135 @@
+"""
+Append-only JSONL checkpoints for batch classification and scoring.
+
+Each processed article is appended as one line ``{"pmid": ..., "result": ...}``
+and the file is fsynced periodically, so checkpoint I/O is linear in the
+number of articles. After a crash a resumed run reads the completed PMIDs
+back and only processes the remaining articles; a line cut off by the crash
+is discarded.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JSONLCheckpoint:
+    """Append-only checkpoint of per-article results keyed by PMID."""
+
+    def __init__(self, path: str, resume: bool = False, fsync_every: int = 50):
+        """
+        Open a checkpoint.
+
+        Args:
+            path: Checkpoint file (``.jsonl``)
+            resume: Keep the records of a previous run; otherwise start empty
+            fsync_every: Number of appended records between fsyncs
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = max(1, fsync_every)
+        self._pending = 0
+
+        if resume:
+            self._truncate_partial_line()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _truncate_partial_line(self) -> None:
+        """Drop a last line left incomplete by a crash so appends start on a new line."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+                logger.warning(f"Discarded incomplete last record of {self.path}")
+
+    def records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (pmid, result) pairs in the order they were written."""
+        self.flush()
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable line {line_number} of {self.path}")
+                    continue
+                yield str(record['pmid']), record['result']
+
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        """Results already in the checkpoint by PMID (the last record of a PMID wins)."""
+        return dict(self.records())
+
+    def append(self, pmid: str, result: Dict[str, Any]) -> None:
+        """Append the result of one article."""
+        self._file.write(json.dumps({'pmid': str(pmid), 'result': result}) + '\n')
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def flush(self) -> None:
+        """Flush buffered records to the operating system."""
+        if not self._file.closed:
+            self._file.flush()
+
+    def sync(self) -> None:
+        """Flush and fsync buffered records to disk."""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        """Sync and close the checkpoint."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def export_json(self,
+                    output_path: str,
+                    pmids: Optional[Set[str]] = None,
+                    transform: Optional[Callable[[str, Dict[str, Any]], Any]] = None) -> int:
+        """
+        Write the checkpoint as a JSON array, streaming one record at a time.
+        
+        Like ``completed``, only the last record of a PMID is written.
+
+        Args:
+            output_path: JSON file to write
+            pmids: Only write these PMIDs (e.g. the articles of the current run)
+            transform: Optional function mapping (pmid, result) to the output item
+
+        Returns:
+            Number of records written
+        """
+        # First pass: position of the last record of each PMID
+        last_index = {}
+        for index, (pmid, _) in enumerate(self.records()):
+            last_index[pmid] = index
+
+        count = 0
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for index, (pmid, result) in enumerate(self.records()):
+                if last_index[pmid] != index or (pmids is not None and pmid not in pmids):
+                    continue
+                item = transform(pmid, result) if transform else {'pmid': pmid, **result}
+                f.write((',\n' if count else '\n') + json.dumps(item))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+        return count
+
+    def __enter__(self) -> 'JSONLCheckpoint':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
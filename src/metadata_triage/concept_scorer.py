@@ -9,13 +9,17 @@ import json
 import logging
 import re
 from typing import Dict, List, Any, Optional, Tuple, Set
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from collections import Counter
 import pandas as pd
 from pathlib import Path
 import requests
 import time
 
+from processors.annotated_document import annotate
+
+from .checkpoint import JSONLCheckpoint
+
 
 @dataclass
 class ConceptMatch:
@@ -43,6 +47,29 @@ class ConceptDensityScore:
     reasoning: str
 
 
+def concept_score_to_dict(score: ConceptDensityScore) -> Dict[str, Any]:
+    """Convert a ConceptDensityScore to a JSON-serializable dictionary."""
+    return asdict(score)
+
+
+def concept_score_from_dict(data: Dict[str, Any]) -> ConceptDensityScore:
+    """Rebuild a ConceptDensityScore from its dictionary form."""
+    return ConceptDensityScore(
+        total_concepts=data.get('total_concepts', 0),
+        unique_concepts=data.get('unique_concepts', 0),
+        concept_density=data.get('concept_density', 0.0),
+        umls_concepts=[ConceptMatch(**c) for c in data.get('umls_concepts', [])],
+        hpo_concepts=[ConceptMatch(**c) for c in data.get('hpo_concepts', [])],
+        priority_score=data.get('priority_score', 0.0),
+        semantic_categories=data.get('semantic_categories', {}),
+        reasoning=data.get('reasoning', '')
+    )
+
+
+# Append-only checkpoint of score_batch in its output directory
+CHECKPOINT_FILENAME = "concept_scores_checkpoint.jsonl"
+
+
 class ConceptDensityScorer:
     """
     Scorer for UMLS/HPO concept density in biomedical text.
@@ -166,54 +193,47 @@ class ConceptDensityScorer:
     def _extract_basic_medical_concepts(self, text: str) -> List[ConceptMatch]:
         """Extract medical concepts using basic pattern matching."""
         concepts = []
-        text_lower = text.lower()
+        doc = annotate(text)
         
         # Extract gene symbols
-        for match in self.basic_patterns['gene_symbols'].finditer(text):
-            gene_symbol = match.group()
-            if len(gene_symbol) >= 3:  # Filter very short matches
-                concepts.append(ConceptMatch(
-                    concept_id=f"GENE:{gene_symbol}",
-                    concept_name=gene_symbol,
-                    matched_text=gene_symbol,
-                    start_pos=match.start(),
-                    end_pos=match.end(),
-                    confidence=0.7,
-                    source="BASIC",
-                    semantic_type="Gene or Genome"
-                ))
+        for span in doc.get('gene'):
+            concepts.append(ConceptMatch(
+                concept_id=f"GENE:{span.text}",
+                concept_name=span.text,
+                matched_text=span.text,
+                start_pos=span.start,
+                end_pos=span.end,
+                confidence=0.7,
+                source="BASIC",
+                semantic_type="Gene or Genome"
+            ))
         
         # Extract HPO IDs
-        for match in self.basic_patterns['hpo_ids'].finditer(text):
-            hpo_id = match.group()
+        for span in doc.get('hpo_id'):
             concepts.append(ConceptMatch(
-                concept_id=hpo_id,
-                concept_name=hpo_id,
-                matched_text=hpo_id,
-                start_pos=match.start(),
-                end_pos=match.end(),
+                concept_id=span.text,
+                concept_name=span.text,
+                matched_text=span.text,
+                start_pos=span.start,
+                end_pos=span.end,
                 confidence=0.9,
                 source="HPO",
                 semantic_type="Sign or Symptom"
             ))
         
         # Extract medical terms
-        words = re.findall(r'\b\w+\b', text_lower)
-        for i, word in enumerate(words):
+        for (start_pos, end_pos), word in zip(doc.tokens, doc.words()):
             if word in self.medical_terms:
-                # Find position in original text
-                start_pos = text_lower.find(word)
-                if start_pos != -1:
-                    concepts.append(ConceptMatch(
-                        concept_id=f"MEDICAL:{word.upper()}",
-                        concept_name=word,
-                        matched_text=word,
-                        start_pos=start_pos,
-                        end_pos=start_pos + len(word),
-                        confidence=0.6,
-                        source="BASIC",
-                        semantic_type="Medical Concept"
-                    ))
+                concepts.append(ConceptMatch(
+                    concept_id=f"MEDICAL:{word.upper()}",
+                    concept_name=word,
+                    matched_text=word,
+                    start_pos=start_pos,
+                    end_pos=end_pos,
+                    confidence=0.6,
+                    source="BASIC",
+                    semantic_type="Medical Concept"
+                ))
         
         return concepts
     
@@ -236,7 +256,7 @@ class ConceptDensityScorer:
         
         try:
             # Split text into sentences for better matching
-            sentences = re.split(r'[.!?]+', text)
+            sentences = [text[start:end] for start, end in annotate(text).sentences]
             
             for sentence in sentences:
                 if len(sentence.strip()) < 10:
@@ -289,21 +309,24 @@ class ConceptDensityScorer:
             'muscle weakness', 'myopathy', 'neuropathy', 'encephalopathy'
         ]
         
-        text_lower = text.lower()
-        
-        for term in phenotype_terms:
-            if term in text_lower:
-                start_pos = text_lower.find(term)
-                concepts.append(ConceptMatch(
+        # Phenotype candidates of the shared pre-annotation, first mention of each term
+        found = {}
+        for span in annotate(text).get('hpo'):
+            candidate = ' '.join(span.text.lower().split())
+            term = next((t for t in phenotype_terms if candidate.endswith(t)), None)
+            if term and term not in found:
+                start_pos = span.end - len(term)
+                found[term] = ConceptMatch(
                     concept_id=f"HPO_BASIC:{term.replace(' ', '_').upper()}",
                     concept_name=term,
                     matched_text=term,
                     start_pos=start_pos,
-                    end_pos=start_pos + len(term),
+                    end_pos=span.end,
                     confidence=0.7,
                     source="HPO_BASIC",
                     semantic_type="Sign or Symptom"
-                ))
+                )
+        concepts.extend(found.values())
         
         return concepts
     
@@ -327,7 +350,7 @@ class ConceptDensityScorer:
             full_text = f"{title} {text}".strip()
             
             # Count words
-            word_count = len(re.findall(r'\b\w+\b', full_text))
+            word_count = len(annotate(full_text).tokens)
             
             if word_count == 0:
                 return ConceptDensityScore(
@@ -495,90 +518,97 @@ class ConceptDensityScorer:
                    articles: List[Dict[str, Any]],
                    batch_size: int = 50,
                    save_intermediate: bool = True,
-                   output_dir: str = "data/concept_scoring") -> List[ConceptDensityScore]:
+                   output_dir: str = "data/concept_scoring",
+                   resume: bool = False) -> List[ConceptDensityScore]:
         """
         Score a batch of articles for concept density.
         
+        With ``save_intermediate`` each score is appended to an append-only
+        JSONL checkpoint in ``output_dir``; with ``resume`` articles whose
+        PMID is already in the checkpoint are not scored again.
+        
         Args:
             articles: List of article dictionaries
-            batch_size: Batch size for intermediate saves
-            save_intermediate: Whether to save intermediate results
-            output_dir: Output directory for intermediate files
+            batch_size: Number of articles scored between checkpoint fsyncs
+            save_intermediate: Whether to checkpoint scores and save the final file
+            output_dir: Directory for the checkpoint and the final scores
+            resume: Continue an interrupted run from its checkpoint
             
         Returns:
             List of ConceptDensityScore objects
         """
         results = []
+        checkpoint = None
+        completed = {}
+        run_pmids = set()
         
         if save_intermediate:
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            checkpoint = JSONLCheckpoint(Path(output_dir) / CHECKPOINT_FILENAME,
+                                         resume=resume, fsync_every=batch_size)
+            if resume:
+                completed = checkpoint.completed()
+                self.logger.info(f"Resuming concept scoring with {len(completed)} completed articles")
         
-        for i, article in enumerate(articles):
-            try:
-                title = article.get('title', '')
-                abstract = article.get('abstract', '')
-                pmid = article.get('pmid', str(i))
-                
-                if not abstract:
-                    self.logger.warning(f"No abstract for article {pmid}, skipping")
+        try:
+            for i, article in enumerate(articles):
+                try:
+                    title = article.get('title', '')
+                    abstract = article.get('abstract', '')
+                    pmid = str(article.get('pmid', str(i)))
+                    
+                    if not abstract:
+                        self.logger.warning(f"No abstract for article {pmid}, skipping")
+                        continue
+                    
+                    run_pmids.add(pmid)
+                    if pmid in completed:
+                        results.append(concept_score_from_dict(completed[pmid]))
+                        continue
+                    
+                    score = self.calculate_concept_density(abstract, title, pmid)
+                    results.append(score)
+                    
+                    if checkpoint:
+                        checkpoint.append(pmid, concept_score_to_dict(score))
+                    
+                    # Log progress
+                    if (i + 1) % 10 == 0:
+                        self.logger.info(f"Scored {i + 1}/{len(articles)} articles")
+                    
+                except Exception as e:
+                    self.logger.error(f"Failed to score article {i}: {e}")
                     continue
-                
-                score = self.calculate_concept_density(abstract, title, pmid)
-                results.append(score)
-                
-                # Log progress
-                if (i + 1) % 10 == 0:
-                    self.logger.info(f"Scored {i + 1}/{len(articles)} articles")
-                
-                # Save intermediate results
-                if save_intermediate and (i + 1) % batch_size == 0:
-                    self._save_intermediate_scores(results, output_dir, i + 1)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to score article {i}: {e}")
-                continue
+        finally:
+            if checkpoint:
+                checkpoint.close()
         
         # Save final results
-        if save_intermediate:
-            self._save_intermediate_scores(results, output_dir, len(articles), final=True)
+        if checkpoint:
+            self._save_final_scores(checkpoint, output_dir, run_pmids)
         
         self.logger.info(f"Completed concept scoring for {len(results)} articles")
         return results
     
-    def _save_intermediate_scores(self, 
-                                results: List[ConceptDensityScore],
-                                output_dir: str,
-                                count: int,
-                                final: bool = False) -> None:
-        """Save intermediate scoring results."""
+    def _save_final_scores(self, checkpoint: JSONLCheckpoint, output_dir: str, pmids: Set[str]) -> None:
+        """Save the final score summaries of this run by streaming the checkpoint."""
         timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-        
-        if final:
-            filename = f"concept_scores_final_{timestamp}.json"
-        else:
-            filename = f"concept_scores_batch_{count}_{timestamp}.json"
-        
-        output_path = Path(output_dir) / filename
-        
-        # Convert results to serializable format
-        serializable_results = []
-        for score in results:
-            score_dict = {
-                'total_concepts': score.total_concepts,
-                'unique_concepts': score.unique_concepts,
-                'concept_density': score.concept_density,
-                'priority_score': score.priority_score,
-                'semantic_categories': score.semantic_categories,
-                'reasoning': score.reasoning,
-                'umls_concept_count': len(score.umls_concepts),
-                'hpo_concept_count': len(score.hpo_concepts)
+        output_path = Path(output_dir) / f"concept_scores_final_{timestamp}.json"
+        
+        def summarize(pmid: str, score: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                'pmid': pmid,
+                'total_concepts': score['total_concepts'],
+                'unique_concepts': score['unique_concepts'],
+                'concept_density': score['concept_density'],
+                'priority_score': score['priority_score'],
+                'semantic_categories': score['semantic_categories'],
+                'reasoning': score['reasoning'],
+                'umls_concept_count': len(score['umls_concepts']),
+                'hpo_concept_count': len(score['hpo_concepts'])
             }
-            serializable_results.append(score_dict)
-        
-        with open(output_path, 'w') as f:
-            json.dump(serializable_results, f, indent=2)
         
-        self.logger.info(f"Saved {len(results)} concept scores to {output_path}")
+        count = checkpoint.export_json(str(output_path), pmids=pmids, transform=summarize)
+        self.logger.info(f"Saved {count} concept scores to {output_path}")
     
     def create_priority_ranking(self, 
                               articles: List[Dict[str, Any]],
@@ -9,6 +9,9 @@ the existing metadata_orchestrator.py structure.
 import asyncio
 import logging
 import json
+import os
+import socket
+import uuid
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 from datetime import datetime, timedelta
@@ -26,6 +29,8 @@ from .europepmc_client import EuropePMCClient
 from .pubmed_client import PubMedClient
 
 # Import enhanced components
+from core.task_queue import DurableTaskQueue, QueuedTask
+from core.event_bus import get_event_bus, TOPIC_EXTRACTION_COMPLETED
 from database.enhanced_sqlite_manager import EnhancedSQLiteManager
 from langextract_integration.extractor import LangExtractEngine
 
@@ -51,6 +56,14 @@ class ProcessingPriority(Enum):
     HIGH = "high"
     URGENT = "urgent"
 
+# Queue ordering for priorities (higher is claimed first)
+PRIORITY_RANK = {
+    ProcessingPriority.LOW: 0,
+    ProcessingPriority.NORMAL: 1,
+    ProcessingPriority.HIGH: 2,
+    ProcessingPriority.URGENT: 3
+}
+
 @dataclass
 class EnhancedProcessingTask:
     """Enhanced processing task definition."""
@@ -96,7 +109,8 @@ class EnhancedMetadataOrchestrator:
         self,
         config: Optional[Dict[str, Any]] = None,
         enhanced_db_manager: Optional[EnhancedSQLiteManager] = None,
-        original_orchestrator: Optional[MetadataOrchestrator] = None
+        original_orchestrator: Optional[MetadataOrchestrator] = None,
+        task_queue: Optional[DurableTaskQueue] = None
     ):
         """Initialize the enhanced metadata orchestrator."""
         self.config = config or {}
@@ -110,17 +124,22 @@ class EnhancedMetadataOrchestrator:
         self.enhanced_scorers: Dict[str, ConceptDensityScorer] = {}
         self.enhanced_deduplicators: Dict[str, DocumentDeduplicator] = {}
         
-        # Enhanced processing queue
-        self.processing_queue: asyncio.Queue = asyncio.Queue()
-        self.active_tasks: Dict[str, EnhancedProcessingTask] = {}
-        self.completed_tasks: Dict[str, EnhancedProcessingResult] = {}
-        
         # Enhanced pipeline configuration
         self.pipeline_config = self.config.get("pipeline", {})
         self.max_concurrent_tasks = self.pipeline_config.get("max_concurrent_tasks", 5)
         self.task_timeout = self.pipeline_config.get("task_timeout", 300)  # 5 minutes
         self.retry_delay = self.pipeline_config.get("retry_delay", 60)  # 1 minute
         
+        # Durable processing queue shared by workers in all processes
+        self.processing_queue = task_queue or DurableTaskQueue(
+            db_path=self.pipeline_config.get("queue_db_path", "data/database/task_queue.db"),
+            visibility_timeout=self.task_timeout,
+            retry_base_delay=self.retry_delay
+        )
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.active_tasks: Dict[str, EnhancedProcessingTask] = {}
+        self.completed_tasks: Dict[str, EnhancedProcessingResult] = {}
+        
         # Enhanced monitoring
         self.metrics = {
             "tasks_processed": 0,
@@ -207,7 +226,7 @@ class EnhancedMetadataOrchestrator:
             # Start pipeline workers
             workers = []
             for i in range(self.max_concurrent_tasks):
-                worker = asyncio.create_task(self._pipeline_worker(f"worker-{i}"))
+                worker = asyncio.create_task(self._pipeline_worker(f"{self.worker_prefix}:worker-{i}"))
                 workers.append(worker)
             
             # Start monitoring task
@@ -230,18 +249,14 @@ class EnhancedMetadataOrchestrator:
         try:
             logger.info("🛑 Stopping Enhanced Metadata Processing Pipeline...")
             
-            # Cancel all active tasks
+            # Hand in-flight tasks back to the queue so another worker or the
+            # next start picks them up; queued tasks stay in the database
             for task_id, task in self.active_tasks.items():
-                task.status = ProcessingStatus.CANCELLED
-                task.updated_at = datetime.utcnow()
-                logger.info(f"Cancelled task: {task_id}")
-            
-            # Clear processing queue
-            while not self.processing_queue.empty():
-                try:
-                    self.processing_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+                if task.status == ProcessingStatus.PROCESSING and task.worker_id:
+                    self.processing_queue.release(task_id, task.worker_id)
+                    task.status = ProcessingStatus.PENDING
+                    task.updated_at = datetime.utcnow()
+                    logger.info(f"Released task: {task_id}")
             
             logger.info("✅ Enhanced pipeline stopped successfully")
             
@@ -259,7 +274,7 @@ class EnhancedMetadataOrchestrator:
     ) -> str:
         """Submit a new enhanced processing task."""
         try:
-            task_id = f"task_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{hash(document_id)}"
+            task_id = f"task_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
             
             # Create enhanced task
             task = EnhancedProcessingTask(
@@ -274,8 +289,14 @@ class EnhancedMetadataOrchestrator:
                 metadata=metadata or {}
             )
             
-            # Add to processing queue
-            await self.processing_queue.put((priority.value, task))
+            # Add to durable processing queue
+            self.processing_queue.enqueue(
+                task_type=task_type,
+                payload=self._task_to_payload(task),
+                priority=PRIORITY_RANK[priority],
+                task_id=task_id,
+                max_retries=task.max_retries
+            )
             
             # Store task
             self.active_tasks[task_id] = task
@@ -303,14 +324,19 @@ class EnhancedMetadataOrchestrator:
         try:
             while True:
                 try:
-                    # Get next task from queue
-                    priority, task = await self.processing_queue.get()
-                    
-                    # Process the task
-                    await self._process_enhanced_task(task, worker_id)
+                    # Claim next task; wakes on enqueue instead of polling
+                    queued = await self.processing_queue.get(worker_id)
+                    task = self._task_from_queue(queued)
+                    self.active_tasks[task.task_id] = task
                     
-                    # Mark task as done
-                    self.processing_queue.task_done()
+                    # Keep the lease alive while the task runs
+                    heartbeat = asyncio.create_task(
+                        self.processing_queue.keep_alive(task.task_id, worker_id)
+                    )
+                    try:
+                        await self._process_enhanced_task(task, worker_id)
+                    finally:
+                        heartbeat.cancel()
                     
                 except asyncio.CancelledError:
                     logger.info(f"Worker {worker_id} cancelled")
@@ -361,6 +387,19 @@ class EnhancedMetadataOrchestrator:
                 confidence_score=result.get("confidence_score", 0.0)
             )
             
+            self.processing_queue.complete(task.task_id, worker_id, {
+                "confidence_score": result.get("confidence_score", 0.0),
+                "processing_time": processing_time
+            })
+            
+            if task.task_type == "enhanced_extraction":
+                get_event_bus().publish(TOPIC_EXTRACTION_COMPLETED, {
+                    "task_id": task.task_id,
+                    "document_id": task.document_id,
+                    "confidence_score": result.get("confidence_score", 0.0),
+                    "processing_time": processing_time
+                })
+            
             # Store completed result
             completed_result = EnhancedProcessingResult(
                 task_id=task.task_id,
@@ -385,7 +424,7 @@ class EnhancedMetadataOrchestrator:
             logger.error(f"❌ Error processing enhanced task {task.task_id}: {e}")
             
             # Handle task failure
-            await self._handle_task_failure(task, str(e))
+            await self._handle_task_failure(task, str(e), worker_id)
             
             # Update metrics
             self._update_metrics(False, 0.0)
@@ -681,11 +720,13 @@ class EnhancedMetadataOrchestrator:
     # Enhanced Task Management
     # ============================================================================
     
-    async def _handle_task_failure(self, task: EnhancedProcessingTask, error: str):
+    async def _handle_task_failure(self, task: EnhancedProcessingTask, error: str, worker_id: str):
         """Handle task failure with retry logic."""
         try:
-            if task.retry_count < task.max_retries:
-                # Retry the task
+            # The queue reschedules with backoff or dead-letters the task
+            state = self.processing_queue.fail(task.task_id, worker_id, error)
+            
+            if state == "pending":
                 task.retry_count += 1
                 task.status = ProcessingStatus.RETRY
                 task.error = error
@@ -698,10 +739,6 @@ class EnhancedMetadataOrchestrator:
                     error=error
                 )
                 
-                # Re-queue with delay
-                await asyncio.sleep(self.retry_delay)
-                await self.processing_queue.put((task.priority.value, task))
-                
                 logger.info(f"Task {task.task_id} queued for retry ({task.retry_count}/{task.max_retries})")
                 
             else:
@@ -722,6 +759,37 @@ class EnhancedMetadataOrchestrator:
         except Exception as e:
             logger.error(f"Error handling task failure: {e}")
     
+    def _task_to_payload(self, task: EnhancedProcessingTask) -> Dict[str, Any]:
+        """Serialize the fields a worker needs to rebuild a task."""
+        return {
+            "document_id": task.document_id,
+            "priority": task.priority.value,
+            "parameters": task.parameters,
+            "metadata": task.metadata,
+            "created_at": task.created_at.isoformat()
+        }
+    
+    def _task_from_queue(self, queued: QueuedTask) -> EnhancedProcessingTask:
+        """Rebuild a task claimed from the durable queue."""
+        payload = queued.payload
+        task = self.active_tasks.get(queued.task_id)
+        if task is None:
+            task = EnhancedProcessingTask(
+                task_id=queued.task_id,
+                document_id=payload["document_id"],
+                task_type=queued.task_type,
+                priority=ProcessingPriority(payload.get("priority", "normal")),
+                parameters=payload.get("parameters", {}),
+                status=ProcessingStatus.PENDING,
+                created_at=datetime.fromisoformat(payload["created_at"]),
+                updated_at=datetime.utcnow(),
+                max_retries=queued.max_retries,
+                metadata=payload.get("metadata") or {}
+            )
+        task.retry_count = queued.attempts - 1
+        task.error = queued.last_error
+        return task
+    
     # ============================================================================
     # Enhanced Monitoring and Metrics
     # ============================================================================
@@ -752,7 +820,7 @@ class EnhancedMetadataOrchestrator:
                         "pending_tasks": pending_count,
                         "completed_tasks": completed_count,
                         "failed_tasks": failed_count,
-                        "queue_size": self.processing_queue.qsize()
+                        "queue": self.processing_queue.get_stats()
                     },
                     category="pipeline_monitoring"
                 )
@@ -812,13 +880,17 @@ class EnhancedMetadataOrchestrator:
             completed_count = len(self.completed_tasks)
             failed_count = len([t for t in self.active_tasks.values() if t.status == ProcessingStatus.FAILED])
             
+            queue_stats = self.processing_queue.get_stats()
+            
             return {
-                "status": "running" if active_count > 0 or pending_count > 0 else "idle",
+                "status": "running" if active_count > 0 or queue_stats["pending"] > 0 else "idle",
                 "active_tasks": active_count,
                 "pending_tasks": pending_count,
                 "completed_tasks": completed_count,
                 "failed_tasks": failed_count,
-                "queue_size": self.processing_queue.qsize(),
+                "queue_size": queue_stats["pending"],
+                "queue": queue_stats,
+                "dead_letter_tasks": queue_stats["dead"],
                 "max_concurrent_tasks": self.max_concurrent_tasks,
                 "metrics": self.metrics,
                 "timestamp": datetime.utcnow().isoformat()
@@ -835,7 +907,7 @@ class EnhancedMetadataOrchestrator:
             
             # Mark all pending tasks as paused
             for task_id, task in self.active_tasks.items():
-                if task.status == ProcessingStatus.PENDING:
+                if task.status == ProcessingStatus.PENDING and self.processing_queue.cancel(task_id):
                     task.status = ProcessingStatus.CANCELLED
                     task.updated_at = datetime.utcnow()
             
@@ -852,10 +924,9 @@ class EnhancedMetadataOrchestrator:
             
             # Re-queue cancelled tasks
             for task_id, task in self.active_tasks.items():
-                if task.status == ProcessingStatus.CANCELLED:
+                if task.status == ProcessingStatus.CANCELLED and self.processing_queue.requeue(task_id, reset_attempts=False):
                     task.status = ProcessingStatus.PENDING
                     task.updated_at = datetime.utcnow()
-                    await self.processing_queue.put((task.priority.value, task))
             
             logger.info("✅ Enhanced pipeline resumed successfully")
             
@@ -877,7 +948,8 @@ class EnhancedMetadataOrchestrator:
                 result = self.completed_tasks[task_id]
                 return asdict(result)
             else:
-                return None
+                # Task may have been submitted or processed by another process
+                return self.processing_queue.get_task(task_id)
                 
         except Exception as e:
             logger.error(f"Error getting task status: {e}")
@@ -886,10 +958,11 @@ class EnhancedMetadataOrchestrator:
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a specific task."""
         try:
-            if task_id in self.active_tasks:
-                task = self.active_tasks[task_id]
-                task.status = ProcessingStatus.CANCELLED
-                task.updated_at = datetime.utcnow()
+            if self.processing_queue.cancel(task_id):
+                task = self.active_tasks.get(task_id)
+                if task:
+                    task.status = ProcessingStatus.CANCELLED
+                    task.updated_at = datetime.utcnow()
                 
                 logger.info(f"Cancelled task: {task_id}")
                 return True
@@ -371,7 +371,8 @@ class EuropePMCClient:
                                max_results: int = 1000,
                                include_citations: bool = False,
                                save_intermediate: bool = True,
-                               output_dir: str = "data/intermediate") -> List[EuropePMCArticle]:
+                               output_dir: str = "data/intermediate",
+                               updated_since: Optional[str] = None) -> List[EuropePMCArticle]:
         """
         Complete pipeline to fetch articles by query.
         
@@ -381,6 +382,7 @@ class EuropePMCClient:
             include_citations: Whether to fetch citation information
             save_intermediate: Whether to save intermediate results
             output_dir: Directory for intermediate files
+            updated_since: Only fetch records updated on or after this date (YYYY-MM-DD)
             
         Returns:
             List of EuropePMCArticle objects
@@ -392,6 +394,8 @@ class EuropePMCClient:
             Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # Step 1: Search for articles
+        if updated_since:
+            query = f"({query}) AND UPDATE_DATE:[{updated_since} TO 3000-12-31]"
         results = self.search_articles(query, max_results=max_results)
         
         if not results:
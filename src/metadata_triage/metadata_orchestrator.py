@@ -14,12 +14,15 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 from datetime import datetime
 import argparse
+import asyncio
 
 from .pubmed_client import PubMedClient, PubMedArticle
 from .europepmc_client import EuropePMCClient, EuropePMCArticle
 from .abstract_classifier import AbstractClassifier, ClassificationResult
 from .concept_scorer import ConceptDensityScorer, ConceptDensityScore
 from .deduplicator import DocumentDeduplicator, DeduplicationResult
+from .article_store import ArticleStore, get_article_key
+from core.response_cache import TAG_METADATA, invalidate_responses
 
 # Import enhanced implementation for unified orchestrator
 try:
@@ -42,7 +45,8 @@ class UnifiedMetadataOrchestrator:
                  pubmed_email: Optional[str] = None,
                  pubmed_api_key: Optional[str] = None,
                  europepmc_email: Optional[str] = None,
-                 use_enhanced: bool = True):
+                 use_enhanced: bool = True,
+                 article_store: Optional[ArticleStore] = None):
         """
         Initialize the unified metadata orchestrator.
         
@@ -54,6 +58,7 @@ class UnifiedMetadataOrchestrator:
             pubmed_api_key: PubMed API key
             europepmc_email: Email for Europe PMC API
             use_enhanced: Whether to use enhanced implementation if available
+            article_store: Persistent article store for incremental runs
         """
         self.use_enhanced = use_enhanced and ENHANCED_AVAILABLE
         
@@ -77,7 +82,8 @@ class UnifiedMetadataOrchestrator:
                 umls_api_key=umls_api_key,
                 pubmed_email=pubmed_email,
                 pubmed_api_key=pubmed_api_key,
-                europepmc_email=europepmc_email
+                europepmc_email=europepmc_email,
+                article_store=article_store
             )
             logging.info("Using standard metadata orchestrator")
     
@@ -86,7 +92,9 @@ class UnifiedMetadataOrchestrator:
                             max_results: int = 1000,
                             include_europepmc: bool = True,
                             output_dir: str = "data/metadata_triage",
-                            save_intermediate: bool = True) -> Dict[str, Any]:
+                            save_intermediate: bool = True,
+                            incremental: bool = False,
+                            resume: bool = False) -> Dict[str, Any]:
         """
         Run the complete metadata triage pipeline using the appropriate implementation.
         """
@@ -113,7 +121,9 @@ class UnifiedMetadataOrchestrator:
                 max_results=max_results,
                 include_europepmc=include_europepmc,
                 output_dir=output_dir,
-                save_intermediate=save_intermediate
+                save_intermediate=save_intermediate,
+                incremental=incremental,
+                resume=resume
             )
 
 
@@ -128,7 +138,8 @@ class MetadataOrchestrator:
                  umls_api_key: Optional[str] = None,
                  pubmed_email: Optional[str] = None,
                  pubmed_api_key: Optional[str] = None,
-                 europepmc_email: Optional[str] = None):
+                 europepmc_email: Optional[str] = None,
+                 article_store: Optional[ArticleStore] = None):
         """
         Initialize the metadata orchestrator.
         
@@ -139,6 +150,8 @@ class MetadataOrchestrator:
             pubmed_email: Email for PubMed API
             pubmed_api_key: PubMed API key
             europepmc_email: Email for Europe PMC API
+            article_store: Persistent article store; when set, only new or
+                changed articles are classified and scored
         """
         self.llm_client = llm_client
         self.hpo_manager = hpo_manager
@@ -162,6 +175,8 @@ class MetadataOrchestrator:
         
         self.deduplicator = DocumentDeduplicator()
         
+        self.article_store = article_store
+        
         self.logger = logging.getLogger(__name__)
     
     async def run_complete_pipeline(self, 
@@ -169,7 +184,9 @@ class MetadataOrchestrator:
                             max_results: int = 1000,
                             include_europepmc: bool = True,
                             output_dir: str = "data/metadata_triage",
-                            save_intermediate: bool = True) -> Dict[str, Any]:
+                            save_intermediate: bool = True,
+                            incremental: bool = False,
+                            resume: bool = False) -> Dict[str, Any]:
         """
         Run the complete metadata triage pipeline.
         
@@ -179,17 +196,29 @@ class MetadataOrchestrator:
             include_europepmc: Whether to include Europe PMC results
             output_dir: Output directory for results
             save_intermediate: Whether to save intermediate results
+            incremental: Only fetch articles added or updated since the last
+                run of this query (requires an article store)
+            resume: Skip articles already classified and scored in the
+                checkpoints of an interrupted run in the same output directory
             
         Returns:
             Dictionary with pipeline results
         """
         self.logger.info(f"Starting metadata triage pipeline for query: {query}")
         
+        if incremental and not self.article_store:
+            raise ValueError("Incremental runs require an article_store")
+        
         # Create output directory
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        run_started_at = datetime.now()
+        timestamp = run_started_at.strftime('%Y%m%d_%H%M%S')
+        
+        since = self.article_store.get_last_run(query) if incremental else None
+        if since:
+            self.logger.info(f"Incremental run: fetching articles updated since {since.date()}")
         
         # Step 1: Metadata Retrieval
         self.logger.info("Step 1: Retrieving metadata from PubMed")
@@ -198,7 +227,9 @@ class MetadataOrchestrator:
             max_results=max_results,
             include_abstracts=True,
             save_intermediate=save_intermediate,
-            output_dir=str(output_path / "pubmed")
+            output_dir=str(output_path / "pubmed"),
+            date_from=since.strftime('%Y/%m/%d') if since else None,
+            date_type='mdat'
         )
         
         # Convert to common format
@@ -224,7 +255,8 @@ class MetadataOrchestrator:
                 max_results=max_results,
                 include_citations=False,
                 save_intermediate=save_intermediate,
-                output_dir=str(output_path / "europepmc")
+                output_dir=str(output_path / "europepmc"),
+                updated_since=since.strftime('%Y-%m-%d') if since else None
             )
             
             # Add Europe PMC articles
@@ -264,28 +296,40 @@ class MetadataOrchestrator:
         
         self.logger.info(f"After deduplication: {len(unique_documents)} unique documents")
         
-        # Step 3: Abstract Classification
-        self.logger.info("Step 3: Classifying abstracts")
-        classification_results = await self.abstract_classifier.classify_batch(
-            unique_documents,
-            batch_size=20,
-            save_intermediate=save_intermediate,
-            output_dir=str(output_path / "classification")
-        )
-        
-        # Step 4: Concept Density Scoring
-        self.logger.info("Step 4: Scoring concept density")
-        concept_scores = self.concept_scorer.score_batch(
-            unique_documents,
-            batch_size=50,
-            save_intermediate=save_intermediate,
-            output_dir=str(output_path / "concept_scoring")
-        )
+        incremental_stats = None
+        if self.article_store:
+            # Steps 3-4: classify and score only new, changed or stale articles,
+            # then rebuild the full result set for the query from the store
+            ranked_documents, classification_results, concept_scores, incremental_stats = \
+                await self._process_with_store(query, unique_documents)
+            incremental_stats['since'] = since.isoformat() if since else None
+        else:
+            ranked_documents = unique_documents
+            
+            # Step 3: Abstract Classification
+            self.logger.info("Step 3: Classifying abstracts")
+            classification_results = await self.abstract_classifier.classify_batch(
+                unique_documents,
+                batch_size=20,
+                save_intermediate=save_intermediate,
+                output_dir=str(output_path / "classification"),
+                resume=resume
+            )
+            
+            # Step 4: Concept Density Scoring
+            self.logger.info("Step 4: Scoring concept density")
+            concept_scores = self.concept_scorer.score_batch(
+                unique_documents,
+                batch_size=50,
+                save_intermediate=save_intermediate,
+                output_dir=str(output_path / "concept_scoring"),
+                resume=resume
+            )
         
         # Step 5: Create Final Ranked Results
         self.logger.info("Step 5: Creating final ranked results")
         final_results = self._create_final_results(
-            unique_documents,
+            ranked_documents,
             classification_results,
             concept_scores,
             deduplication_result
@@ -304,12 +348,20 @@ class MetadataOrchestrator:
             concept_scores,
             final_results
         )
+        if incremental_stats is not None:
+            summary['incremental_stats'] = incremental_stats
         
         # Save summary
         summary_file = output_path / f"pipeline_summary_{timestamp}.json"
         with open(summary_file, 'w') as f:
             json.dump(summary, f, indent=2, default=str)
         
+        # Metadata endpoints list the files written above
+        invalidate_responses(TAG_METADATA)
+        
+        if self.article_store:
+            self.article_store.record_run(query, run_started_at)
+        
         self.logger.info(f"Pipeline completed. Results saved to {output_path}")
         
         return {
@@ -318,9 +370,73 @@ class MetadataOrchestrator:
             'deduplication_result': deduplication_result,
             'classification_results': classification_results,
             'concept_scores': concept_scores,
+            'incremental_stats': incremental_stats,
             'output_directory': str(output_path)
         }
     
+    async def _process_with_store(self,
+                                  query: str,
+                                  documents: List[Dict[str, Any]]):
+        """
+        Classify and score only articles the store does not have up to date.
+        
+        Args:
+            query: Search query the documents were retrieved for
+            documents: Deduplicated documents fetched in this run
+            
+        Returns:
+            Tuple of (documents, classifications, concept scores, stats) for the
+            full query result set rebuilt from the store
+        """
+        to_process, unchanged = self.article_store.partition_documents(documents)
+        self.article_store.link_documents(query, unchanged)
+        
+        # Re-process stored articles left behind by an older pipeline version
+        pending_keys = {get_article_key(doc) for doc in to_process}
+        stale = [
+            doc for doc in self.article_store.get_stale_documents(query)
+            if get_article_key(doc) not in pending_keys
+        ]
+        to_process.extend(stale)
+        
+        self.logger.info(
+            f"Step 3-4: Processing {len(to_process)} new/changed articles "
+            f"({len(unchanged)} unchanged, {len(stale)} stale)"
+        )
+        
+        for i, doc in enumerate(to_process):
+            title = doc.get('title', '')
+            abstract = doc.get('abstract', '')
+            pmid = doc.get('pmid', '')
+            
+            classification = None
+            score = None
+            complete = True
+            
+            if abstract:
+                classification = await self.abstract_classifier.classify_abstract(title, abstract, pmid)
+                score = self.concept_scorer.calculate_concept_density(abstract, title, pmid)
+                
+                # Keep failed classifications but retry them on the next run
+                complete = not classification.failed
+            
+            self.article_store.upsert_article(doc, classification, score, query=query, complete=complete)
+            
+            if (i + 1) % 50 == 0:
+                self.logger.info(f"Processed {i + 1}/{len(to_process)} articles")
+        
+        ranked_documents, classifications, scores = self.article_store.get_query_results(query)
+        
+        stats = {
+            'fetched_documents': len(documents),
+            'processed_documents': len(to_process),
+            'unchanged_documents': len(unchanged),
+            'stale_documents': len(stale),
+            'stored_documents': len(ranked_documents)
+        }
+        
+        return ranked_documents, classifications, scores, stats
+    
     def _create_final_results(self, 
                             documents: List[Dict[str, Any]],
                             classifications: List[ClassificationResult],
@@ -539,6 +655,9 @@ Examples:
   
   # Custom output directory
   python metadata_orchestrator.py --query "SURF1 mutation" --output-dir results/surf1_analysis
+  
+  # Resume an interrupted run
+  python metadata_orchestrator.py --query "SURF1 mutation" --save-intermediate --resume
         """
     )
     
@@ -552,6 +671,11 @@ Examples:
     parser.add_argument('--europepmc-email', help='Email for Europe PMC API')
     parser.add_argument('--umls-api-key', help='UMLS API key')
     parser.add_argument('--use-enhanced', action='store_true', help='Use enhanced orchestrator if available')
+    parser.add_argument('--store-db', help='Article store database for incremental triage')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only fetch and process articles new or updated since the last run (requires --store-db)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume an interrupted run from the classification and scoring checkpoints (requires --save-intermediate)')
     
     return parser
 
@@ -560,6 +684,8 @@ def main():
     """Main CLI entry point."""
     parser = create_cli_parser()
     args = parser.parse_args()
+    if args.resume and not args.save_intermediate:
+        parser.error("--resume requires --save-intermediate (the checkpoints are intermediate results)")
     
     # Setup logging
     logging.basicConfig(
@@ -580,17 +706,20 @@ def main():
             pubmed_api_key=args.pubmed_api_key,
             europepmc_email=args.europepmc_email,
             umls_api_key=args.umls_api_key,
-            use_enhanced=args.use_enhanced
+            use_enhanced=args.use_enhanced,
+            article_store=ArticleStore(args.store_db) if args.store_db else None
         )
         
         # Run pipeline
-        results = orchestrator.run_complete_pipeline(
+        results = asyncio.run(orchestrator.run_complete_pipeline(
             query=args.query,
             max_results=args.max_results,
             include_europepmc=args.include_europepmc,
             output_dir=args.output_dir,
-            save_intermediate=args.save_intermediate
-        )
+            save_intermediate=args.save_intermediate,
+            incremental=args.incremental,
+            resume=args.resume
+        ))
         
         # Print summary
         summary = results['summary']
@@ -305,7 +305,9 @@ class EnhancedPubMedClient:
                        max_results: int = 1000,
                        date_from: Optional[str] = None,
                        date_to: Optional[str] = None,
-                       use_cache: bool = True) -> Tuple[List[str], str, str]:
+                       use_cache: bool = True,
+                       date_type: str = 'pdat',
+                       reldate: Optional[int] = None) -> Tuple[List[str], str, str]:
         """
         Search PubMed articles and return PMIDs with caching support.
         
@@ -315,13 +317,17 @@ class EnhancedPubMedClient:
             date_from: Start date (YYYY/MM/DD format)
             date_to: End date (YYYY/MM/DD format)
             use_cache: Whether to use caching
+            date_type: Date field to filter on ('pdat' publication, 'edat' Entrez,
+                'mdat' modification date)
+            reldate: Only return articles within the last N days of date_type
             
         Returns:
             Tuple of (PMIDs list, web_env, query_key)
         """
         # Check cache first
         if use_cache and self.enable_caching:
-            cache_key = self._get_cache_key(query, max_results, date_from=date_from, date_to=date_to)
+            cache_key = self._get_cache_key(query, max_results, date_from=date_from, date_to=date_to,
+                                            date_type=date_type, reldate=reldate)
             cached_results = self._get_cached_results(cache_key)
             if cached_results:
                 # Extract PMIDs from cached results
@@ -342,15 +348,12 @@ class EnhancedPubMedClient:
         
         # Add date range if specified
         if date_from or date_to:
-            date_range = ""
-            if date_from:
-                date_range += date_from
-            date_range += ":"
-            if date_to:
-                date_range += date_to
-            params['datetype'] = 'pdat'
+            params['datetype'] = date_type
             params['mindate'] = date_from if date_from else '1900/01/01'
-            params['maxdate'] = date_to if date_to else '2030/12/31'
+            params['maxdate'] = date_to if date_to else '3000/12/31'
+        elif reldate:
+            params['datetype'] = date_type
+            params['reldate'] = reldate
         
         try:
             response = self.session.get(f"{self.base_url}/esearch.fcgi", params=params)
@@ -721,7 +724,10 @@ class EnhancedPubMedClient:
                                include_abstracts: bool = True,
                                save_intermediate: bool = True,
                                output_dir: str = "data/intermediate",
-                               use_cache: bool = True) -> List[EnhancedPubMedArticle]:
+                               use_cache: bool = True,
+                               date_from: Optional[str] = None,
+                               date_type: str = 'pdat',
+                               reldate: Optional[int] = None) -> List[EnhancedPubMedArticle]:
         """
         Complete pipeline to fetch articles by query with enhanced functionality.
         
@@ -733,6 +739,9 @@ class EnhancedPubMedClient:
             save_intermediate: Whether to save intermediate results
             output_dir: Directory for intermediate files
             use_cache: Whether to use caching
+            date_from: Only fetch articles dated on or after this date (YYYY/MM/DD)
+            date_type: Date field used by date_from/reldate ('pdat', 'edat', 'mdat')
+            reldate: Only fetch articles within the last N days
             
         Returns:
             List of EnhancedPubMedArticle objects
@@ -744,7 +753,13 @@ class EnhancedPubMedClient:
             Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # Step 1: Search for articles
-        pmids, web_env, query_key = self.search_articles(query, max_results, use_cache=use_cache)
+        pmids, web_env, query_key = self.search_articles(
+            query, max_results,
+            date_from=date_from,
+            use_cache=use_cache,
+            date_type=date_type,
+            reldate=reldate
+        )
         
         if not pmids:
             self.logger.warning("No articles found for query")
@@ -781,7 +796,8 @@ class EnhancedPubMedClient:
         
         # Cache results if caching is enabled
         if use_cache and self.enable_caching:
-            cache_key = self._get_cache_key(query, max_results)
+            cache_key = self._get_cache_key(query, max_results, date_from=date_from, date_to=None,
+                                            date_type=date_type, reldate=reldate)
             self._cache_results(cache_key, query, [asdict(article) for article in articles])
         
         self.logger.info(f"Successfully fetched {len(articles)} enhanced articles")
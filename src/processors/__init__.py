@@ -4,13 +4,25 @@ Document processing for Biomedical Text Agent.
 This module provides document processing capabilities:
 - PDF parsing and text extraction
 - Patient case segmentation
+- Table-to-patient mapping
+- Relevance filtering of sections before LLM extraction
+- Shared single-pass pre-annotation of patient text
 - Document structure analysis
 """
 
 from .pdf_parser import PDFParser
 from .patient_segmenter import PatientSegmenter
+from .table_mapper import TablePatientMapper
+from .relevance_filter import RelevanceFilter, ReducedText
+from .annotated_document import AnnotatedDocument, AnnotationSpan, annotate
 
 __all__ = [
     'PDFParser',
-    'PatientSegmenter'
+    'PatientSegmenter',
+    'TablePatientMapper',
+    'RelevanceFilter',
+    'ReducedText',
+    'AnnotatedDocument',
+    'AnnotationSpan',
+    'annotate'
 ]
@@ -0,0 +1,241 @@
+"""
+Shared pre-annotation of patient text.
+
+The extraction agents and the concept scorer all need the same cheap
+pre-processing: word tokens, sentences, and candidate spans for genes,
+variants, ages, phenotypes (HPO candidates), inheritance, lab values and
+imaging findings. ``annotate`` produces it once per text in a single pass of
+one compiled scanner and caches the result, so every agent working on the
+same patient segment reuses it instead of lowercasing the text and running
+its own regex lists.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from processors.relevance_filter import RelevanceFilter
+
+# Candidate span patterns per label; within a label the first matching
+# alternative at a position wins, so longer phrases come first
+ANNOTATION_PATTERNS: Dict[str, List[str]] = {
+    # Symbols named as a gene ("SURF1 gene", "Surf1 mutation", "gene PDHA1"),
+    # any case, with at least one capital or digit
+    "gene": [
+        r"(?=\w*[A-Z0-9])(?i:[A-Z]{2,}[0-9]*[A-Z]*)(?=\s+(?i:genes?|mutations?|variants?)\b)",
+        r"(?<=\b(?i:gene)\s)(?=\w*[A-Z0-9])(?i:[A-Z]{2,}[0-9]*[A-Z]*)\b",
+    ],
+    "variant": [
+        r"c\.[-*]?\d+(?:[+-]\d+)?(?:_[-*]?\d+(?:[+-]\d+)?)?(?:[ACGT]>[ACGT]|delins[ACGT]+|del[ACGT]*|dup[ACGT]*|ins[ACGT]+)",
+        r"p\.\([A-Z][a-z]{2}\d+(?:[A-Z][a-z]{2}|\*|=)?(?:fs\*?\d*)?\)",
+        r"p\.[A-Z][a-z]{2}\d+(?:[A-Z][a-z]{2}|\*|=)?(?:fs\*?\d*)?",
+        r"m\.\d+[ACGT]>[ACGT]",
+        r"\d+[ACGT]>[ACGT]\b",
+        r"[A-Z]\d+[A-Z]\b",
+    ],
+    "age": [
+        r"(?i:\d+(?:\.\d+)?[\s-]*(?:years?|yrs?|months?|mos?|weeks?|days?)[\s-]*old\b)",
+        r"(?i:age[ds]?\s*(?:of\s*)?\d+(?:\.\d+)?(?:\s*(?:years?|yrs?|months?|mos?|weeks?|days?)\b)?)",
+    ],
+    "hpo_id": [
+        r"HP:\d{7}\b",
+    ],
+    "hpo": [
+        # Developmental
+        r"(?i:(?:developmental|development)\s+(?:delay|regression|disorder|abnormality)\b)",
+        r"(?i:delayed\s+(?:milestone|development|growth)\b)",
+        r"(?i:failure\s+to\s+thrive\b|FTT\b)",
+        r"(?i:growth\s+retardation\b)",
+        r"(?i:(?:psychomotor\s+|mental\s+)?retardation\b)",
+        # Neurological
+        r"(?i:(?:seizure|epileptic|convulsion)\b)",
+        r"(?i:(?:muscular\s+)?hypotonia\b)",
+        r"(?i:(?:hypertonia|spasticity|rigidity)\b)",
+        r"(?i:(?:ataxia|dysmetria|dysdiadochokinesia)\b)",
+        r"(?i:(?:tremor|myoclonus|chorea)\b)",
+        r"(?i:(?:dystonia|dyskinesia)\b)",
+        r"(?i:(?:seizures|epilepsy|encephalopathy|neuropathy|myopathy)\b)",
+        r"(?i:(?:microcephaly|macrocephaly)\b)",
+        r"(?i:muscle\s+weakness\b)",
+        # Cognitive
+        r"(?i:(?:intellectual\s+)?disability\b)",
+        r"(?i:(?:learning\s+)?difficulty\b)",
+        r"(?i:(?:cognitive\s+)?impairment\b)",
+        r"(?i:(?:autism|autistic)\b)",
+        # Sensory
+        r"(?i:(?:visual|vision)\s+(?:impairment|loss|defect)\b)",
+        r"(?i:(?:hearing|auditory)\s+(?:loss|impairment|deafness)\b)",
+        r"(?i:(?:blindness|deafness|cataracts)\b)",
+        r"(?i:retinal\s+degeneration\b)",
+        # Cardiac
+        r"(?i:(?:cardiac|heart)\s+(?:defect|anomaly|disease)\b)",
+        r"(?i:(?:cardiomyopathy|arrhythmia)\b)",
+        r"(?i:(?:ventricular|atrial)\s+(?:septal\s+)?defect\b)",
+        # Respiratory
+        r"(?i:(?:respiratory|breathing)\s+(?:distress|failure|difficulty)\b)",
+        r"(?i:(?:apnea|apneic)\b)",
+        r"(?i:(?:tachypnea|dyspnea)\b)",
+        # Gastrointestinal
+        r"(?i:(?:feeding|swallowing)\s+(?:difficulty|disorder)\b)",
+        r"(?i:(?:gastroesophageal\s+)?reflux\b)",
+        r"(?i:(?:vomiting|nausea|diarrhea)\b)",
+        r"(?i:(?:constipation|obstruction)\b)",
+        r"(?i:hepatomegaly\b)",
+        # Musculoskeletal
+        r"(?i:(?:joint\s+)?contracture\b)",
+        r"(?i:(?:scoliosis|kyphosis|lordosis)\b)",
+        r"(?i:(?:clubfoot|talipes)\b)",
+        r"(?i:(?:hip\s+)?dysplasia\b)",
+    ],
+    "inheritance": [
+        r"(?i:autosomal\s+recessive|autosomal\s+dominant|X-linked|mitochondrial)",
+    ],
+    "lab_value": [
+        r"\d+(?:\.\d+)?\s*(?i:mg/dL|mmol/L|g/dL|mEq/L|U/L|ng/mL|pg/mL)\b",
+        r"(?i:(?:glucose|glu|creatinine|creat|hemoglobin|hgb|hb)\s*[:=]\s*\d+(?:\.\d+)?)",
+    ],
+    "imaging": [
+        r"(?i:(?:MRI|CT|X-ray|ultrasound|echocardiogram)\s+(?:shows|reveals|demonstrates)\b)",
+        r"(?i:(?:brain|cardiac|abdominal)\s+(?:MRI|CT|ultrasound)\b)",
+        r"(?i:(?:enlarged|atrophic|dysplastic)\s+(?:ventricles|brain|heart|liver)\b)",
+    ],
+}
+
+AGE_UNIT_YEARS = {"y": 1.0, "m": 1 / 12, "w": 1 / 52, "d": 1 / 365}
+
+_AGE_VALUE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-\s*)?(?:(years?|yrs?)|(months?|mos?)|(weeks?)|(days?))?", re.IGNORECASE)
+
+def _compile_scanner() -> re.Pattern:
+    """
+    One scanner for tokens, sentence ends and every label.
+
+    Each match consumes one word token (or a sentence terminator); an
+    optional lookahead per label captures the candidate span of that label
+    starting at the token, so spans of different labels may overlap.
+    """
+    lookaheads = "".join(
+        f"(?:(?=(?P<{label}>{'|'.join(patterns)}))|)" for label, patterns in ANNOTATION_PATTERNS.items()
+    )
+    return re.compile(rf"\b{lookaheads}(?P<token>\w+)|(?P<stop>[.!?]+)(?=\s|$)")
+
+
+_SCANNER = _compile_scanner()
+
+
+@dataclass(frozen=True)
+class AnnotationSpan:
+    """Candidate span of a label in the annotated text."""
+    label: str
+    start: int
+    end: int
+    text: str
+    value: Optional[float] = None
+
+
+@dataclass
+class AnnotatedDocument:
+    """Tokens, sentences and candidate spans of one text, shared by all agents."""
+    text: str
+    tokens: List[Tuple[int, int]]
+    sentences: List[Tuple[int, int]]
+    spans: Dict[str, List[AnnotationSpan]] = field(default_factory=dict)
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text (offsets are unchanged)."""
+        return self.text.lower()
+
+    @cached_property
+    def sections(self) -> List[Dict[str, Any]]:
+        """Sections as heading, category and [start, end) offsets."""
+        return RelevanceFilter().section_spans(self.text)
+
+    def get(self, label: str) -> List[AnnotationSpan]:
+        """Candidate spans of a label in text order."""
+        return self.spans.get(label, [])
+
+    def texts(self, label: str, lower: bool = False) -> List[str]:
+        """Distinct span texts of a label in order of first mention."""
+        seen = {}
+        for span in self.get(label):
+            key = span.text.lower() if lower else span.text
+            seen.setdefault(key, None)
+        return list(seen)
+
+    def words(self) -> List[str]:
+        """Lowercased word tokens."""
+        lower = self.lower
+        return [lower[start:end] for start, end in self.tokens]
+
+    def token_index(self, position: int) -> int:
+        """Index of the token starting at or before a position."""
+        return bisect.bisect_right(self.tokens, (position, len(self.text))) - 1
+
+    def gene_mentions(self) -> List[str]:
+        """Upper-cased gene symbols named as a gene, in order of first mention."""
+        return list(dict.fromkeys(span.text.upper() for span in self.get("gene")))
+
+    def ages(self) -> List[float]:
+        """Ages mentioned in the text, in years, in text order."""
+        return [span.value for span in self.get("age") if span.value is not None]
+
+
+def _age_in_years(span_text: str) -> Optional[float]:
+    match = _AGE_VALUE.search(span_text)
+    if not match:
+        return None
+    value = float(match.group(1))
+    if match.group(3):
+        return value * AGE_UNIT_YEARS["m"]
+    if match.group(4):
+        return value * AGE_UNIT_YEARS["w"]
+    if match.group(5):
+        return value * AGE_UNIT_YEARS["d"]
+    return value
+
+
+@lru_cache(maxsize=256)
+def annotate(text: str) -> AnnotatedDocument:
+    """
+    Annotate a text (cached per text).
+
+    Args:
+        text: Patient segment or document text
+
+    Returns:
+        AnnotatedDocument shared by every caller passing the same text
+    """
+    tokens: List[Tuple[int, int]] = []
+    sentences: List[Tuple[int, int]] = []
+    spans: Dict[str, List[AnnotationSpan]] = {label: [] for label in ANNOTATION_PATTERNS}
+    labels = list(ANNOTATION_PATTERNS)
+    sentence_start = None
+
+    for match in _SCANNER.finditer(text):
+        if match.start("token") < 0:
+            if sentence_start is not None:
+                sentences.append((sentence_start, match.end()))
+                sentence_start = None
+            continue
+
+        start, end = match.span("token")
+        tokens.append((start, end))
+        if sentence_start is None:
+            sentence_start = start
+        for label in labels:
+            span_start = match.start(label)
+            if span_start < 0:
+                continue
+            span_end = match.end(label)
+            # Skip a span nested in the previous one ("123A>G" in "c.123A>G")
+            if spans[label] and span_end <= spans[label][-1].end:
+                continue
+            span_text = text[span_start:span_end]
+            value = _age_in_years(span_text) if label == "age" else None
+            spans[label].append(AnnotationSpan(label, span_start, span_end, span_text, value))
+
+    if sentence_start is not None:
+        sentences.append((sentence_start, tokens[-1][1]))
+    return AnnotatedDocument(text=text, tokens=tokens, sentences=sentences, spans=spans)
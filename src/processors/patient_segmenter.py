@@ -1,11 +1,15 @@
 """
 Patient segmentation module for identifying and separating patient cases in documents.
+
+All marker patterns are compiled into one scanner, so a document is segmented
+in a single linear pass. Segments are returned as offset spans and only sliced
+into strings when content is needed.
 """
 
 import re
 import logging
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 # Remove circular imports
 # from core.base import BaseProcessor, Document, ProcessingResult
@@ -27,6 +31,77 @@ class PatientSegment:
         if self.metadata is None:
             self.metadata = {}
 
+@dataclass(frozen=True)
+class SegmentSpan:
+    """Offset span of a patient segment; text is only sliced on demand."""
+    start: int
+    end: int
+    patient_id: str
+    method: str
+    confidence: float
+    marker_end: int
+    
+    def text(self, source: str) -> str:
+        """Return the segment text from the source document."""
+        return source[self.start:self.end]
+    
+    def marker(self, source: str) -> str:
+        """Return the marker that opened the segment."""
+        return source[self.start:self.marker_end]
+
+# Strategy order: explicit markers win over sections, sections over narrative cues
+STRATEGIES = ("explicit", "section", "narrative")
+
+STRATEGY_CONFIDENCE = {
+    "explicit": 0.9,
+    "section": 0.8,
+    "narrative": 0.6
+}
+
+STRATEGY_METHOD = {
+    "explicit": "explicit_markers",
+    "section": "section_based",
+    "narrative": "narrative_based"
+}
+
+# (strategy, pattern) pairs; patterns carry scoped flags so they can share one regex
+MARKER_PATTERNS = [
+    # Explicit patient markers
+    ("explicit", r'(?i:\b(?:Patient|Case|Subject|Individual)\s+(\d+|[A-Z])\b)'),
+    ("explicit", r'\b(?:P|C|S)(\d+)\b'),  # P1, C1, S1
+    ("explicit", r'(?i:\b(\d+)\.?\s*(?:Patient|Case|Subject))'),
+    # Section-based patterns (numbered sections that might contain patients)
+    ("section", r'(?im:^\s*(\d+)\.(\d+)\.?\s+(?:Patient|Case))'),
+    ("section", r'(?m:^\s*(\d+)\.(\d+)\s+[A-Z])'),  # 3.1 PATIENT, 3.2 CASE
+    # Narrative patterns that suggest patient boundaries
+    ("narrative", r'(?i:\b(?:A|An)\s+(\d+)[-\s](?:year|month)[-\s]old\s+(?:male|female|boy|girl|man|woman))'),
+    ("narrative", r'(?i:\b(?:The|This)\s+(?:patient|case|subject|individual))'),
+    ("narrative", r'(?i:\bpresented?\s+(?:with|at))'),
+]
+
+# Named patient labels ("Patient 2", "Case B") for label-only segmentation; a
+# letter label must be upper case so "in case a ..." is not a boundary
+PATIENT_LABEL_MARKER = re.compile(r'\b(?i:Patient|Case|Subject|Individual)\s+(\d+|[A-Z])\b')
+
+# First characters any word-initial marker above can start with
+MARKER_START = r'[ACIPSTacipst\d]'
+
+MEDICAL_INDICATOR_PATTERN = re.compile(
+    r'\b(?:patient|diagnosis|treatment|symptom|disease|condition'
+    r'|age|year|month|old|male|female'
+    r'|presented|admitted|diagnosed|treated'
+    r'|mg|kg|dose|therapy|medication)\b',
+    re.IGNORECASE
+)
+
+def _trim_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Shrink a span past leading and trailing whitespace."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
 class PatientSegmenter:
     """Segments documents into individual patient cases."""
     
@@ -37,27 +112,139 @@ class PatientSegmenter:
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Compile regex patterns for patient identification."""
-        # Explicit patient markers
-        self.explicit_patterns = [
-            re.compile(r'\b(?:Patient|Case|Subject|Individual)\s+(\d+|[A-Z])\b', re.IGNORECASE),
-            re.compile(r'\b(?:P|C|S)(\d+)\b'),  # P1, C1, S1
-            re.compile(r'\b(\d+)\.?\s*(?:Patient|Case|Subject)', re.IGNORECASE),
-            re.compile(r'\b(?:Patient|Case)\s+([A-Z])\b', re.IGNORECASE),  # Patient A, Case B
-        ]
+        """Compile all marker patterns into a single scanner."""
+        alternatives = [f"(?P<m{i}>{pattern})" for i, (_, pattern) in enumerate(MARKER_PATTERNS)]
+        # The lookahead makes every match zero-width, so overlapping markers of
+        # different strategies are all found in one left-to-right scan. Only
+        # word starts and line starts can open a marker, which lets the scanner
+        # skip most positions cheaply.
+        self.marker_scanner = re.compile(
+            rf"(?:\b(?={MARKER_START})|(?m:^))(?=" + "|".join(alternatives) + ")"
+        )
+        
+        # Group number of each alternative -> (strategy, number of inner groups)
+        self._alternatives = {
+            self.marker_scanner.groupindex[f"m{i}"]: (strategy, re.compile(pattern).groups)
+            for i, (strategy, pattern) in enumerate(MARKER_PATTERNS)
+        }
+    
+    def scan_markers(self, text: str) -> Dict[str, List[Tuple[int, int, Optional[str]]]]:
+        """
+        Find all patient boundary markers in a single pass.
+        
+        Args:
+            text: Document text
+            
+        Returns:
+            Mapping of strategy to (start, end, identifier) tuples in document order
+        """
+        markers: Dict[str, List[Tuple[int, int, Optional[str]]]] = {strategy: [] for strategy in STRATEGIES}
+        
+        for match in self.marker_scanner.finditer(text):
+            group = match.lastindex
+            # lastindex is the innermost closed group; walk back to the wrapper
+            while group not in self._alternatives:
+                group -= 1
+            strategy, inner_groups = self._alternatives[group]
+            
+            if strategy == "section":
+                identifier = f"{match.group(group + 1)}.{match.group(group + 2)}"
+            else:
+                identifier = match.group(group + 1) if inner_groups else None
+            found = markers[strategy]
+            # A marker reachable from several start positions (e.g. a section
+            # heading after blank lines) is kept once, at its earliest start
+            if found and found[-1][1] == match.end(group):
+                continue
+            found.append((match.start(group), match.end(group), identifier))
+        
+        return markers
+    
+    def find_spans(self,
+                   text: str,
+                   strategies: Tuple[str, ...] = STRATEGIES,
+                   min_length: Optional[int] = None) -> List[SegmentSpan]:
+        """
+        Segment text into patient spans without copying substrings.
+        
+        The first strategy (in order) that yields any segment is used.
+        
+        Args:
+            text: Document text
+            strategies: Strategies to try, in order of preference
+            min_length: Minimum stripped segment length (defaults to min_segment_length)
+            
+        Returns:
+            List of SegmentSpans with whitespace-trimmed offsets
+        """
+        min_length = self.min_segment_length if min_length is None else min_length
+        markers = self.scan_markers(text)
         
-        # Section-based patterns (numbered sections that might contain patients)
-        self.section_patterns = [
-            re.compile(r'^\s*(\d+)\.(\d+)\.?\s+(?:Patient|Case)', re.IGNORECASE | re.MULTILINE),
-            re.compile(r'^\s*(\d+)\.(\d+)\s+[A-Z]', re.MULTILINE),  # 3.1 PATIENT, 3.2 CASE
-        ]
+        for strategy in strategies:
+            found = markers[strategy]
+            spans = []
+            for i, (start, marker_end, identifier) in enumerate(found):
+                end = found[i + 1][0] if i + 1 < len(found) else len(text)
+                start, end = _trim_span(text, start, end)
+                if end - start < max(min_length, 1):
+                    continue
+                patient_id = f"Patient {i + 1}" if strategy == "narrative" else f"Patient {identifier}"
+                spans.append(SegmentSpan(
+                    start=start,
+                    end=end,
+                    patient_id=patient_id,
+                    method=STRATEGY_METHOD[strategy],
+                    confidence=STRATEGY_CONFIDENCE[strategy],
+                    marker_end=max(marker_end, start)
+                ))
+            if spans:
+                return spans
         
-        # Narrative patterns that suggest patient boundaries
-        self.narrative_patterns = [
-            re.compile(r'\b(?:A|An)\s+(\d+)[-\s](?:year|month)[-\s]old\s+(?:male|female|boy|girl|man|woman)', re.IGNORECASE),
-            re.compile(r'\b(?:The|This)\s+(?:patient|case|subject|individual)', re.IGNORECASE),
-            re.compile(r'\bpresented?\s+(?:with|at)', re.IGNORECASE),
-        ]
+        return []
+    
+    def find_labeled_spans(self, text: str, min_length: Optional[int] = None) -> List[SegmentSpan]:
+        """
+        Segment text at named patient labels only ("Patient 2", "Case B").
+        
+        Unlike the explicit strategy, bare "S1"/"P2" tokens (supplementary
+        tables and figures) are not boundaries. Only the first mention of a
+        label opens a segment; later mentions are cross-references. A segment
+        shorter than ``min_length`` is merged into the previous one.
+        
+        Args:
+            text: Document text
+            min_length: Minimum stripped segment length (defaults to min_segment_length)
+            
+        Returns:
+            List of SegmentSpans with unique patient ids
+        """
+        min_length = self.min_segment_length if min_length is None else min_length
+        
+        boundaries = []
+        seen = set()
+        for match in PATIENT_LABEL_MARKER.finditer(text):
+            patient_id = f"Patient {match.group(1)}"
+            if patient_id not in seen:
+                seen.add(patient_id)
+                boundaries.append((match.start(), match.end(), patient_id))
+        
+        spans: List[SegmentSpan] = []
+        for i, (start, marker_end, patient_id) in enumerate(boundaries):
+            end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(text)
+            start, end = _trim_span(text, start, end)
+            if end - start >= max(min_length, 1):
+                spans.append(SegmentSpan(
+                    start=start,
+                    end=end,
+                    patient_id=patient_id,
+                    method=STRATEGY_METHOD["explicit"],
+                    confidence=STRATEGY_CONFIDENCE["explicit"],
+                    marker_end=max(marker_end, start)
+                ))
+            elif spans and end > start:
+                spans[-1] = replace(spans[-1], end=end)
+        
+        return spans
     
     def process(self, input_data: Any) -> List[PatientSegment]:
         """
@@ -72,50 +259,30 @@ class PatientSegmenter:
         try:
             log.info(f"Segmenting document: {getattr(input_data, 'title', 'Unknown')}")
             
-            # Try different segmentation strategies
-            segments = []
-            
-            # Strategy 1: Explicit patient markers
-            explicit_segments = self._segment_by_explicit_markers(input_data.content)
-            if explicit_segments:
-                segments = explicit_segments
-                log.info(f"Found {len(segments)} segments using explicit markers")
-            
-            # Strategy 2: Section-based segmentation
-            if not segments:
-                section_segments = self._segment_by_sections(input_data.content)
-                if section_segments:
-                    segments = section_segments
-                    log.info(f"Found {len(segments)} segments using section patterns")
+            text = input_data.content
+            spans = self._validate_spans(text, self.find_spans(text))
             
-            # Strategy 3: Narrative-based segmentation
-            if not segments:
-                narrative_segments = self._segment_by_narrative(input_data.content)
-                if narrative_segments:
-                    segments = narrative_segments
-                    log.info(f"Found {len(segments)} segments using narrative patterns")
-            
-            # If no segments found, treat entire document as single patient
-            if not segments:
-                segments = [PatientSegment(
+            if spans:
+                log.info(f"Found {len(spans)} segments using {spans[0].method}")
+                valid_segments = [self._to_segment(text, span) for span in spans]
+            else:
+                # If no segments found, treat entire document as single patient
+                valid_segments = self._validate_segments([PatientSegment(
                     patient_id="Patient 1",
-                    content=input_data.content,
+                    content=text,
                     start_position=0,
-                    end_position=len(input_data.content),
+                    end_position=len(text),
                     confidence=0.5,
                     metadata={"method": "single_document"}
-                )]
+                )])
                 log.info("No patient segments found, treating as single patient")
             
-            # Filter and validate segments
-            valid_segments = self._validate_segments(segments)
-            
             # Add document metadata to segments
             for segment in valid_segments:
                 segment.metadata.update({
                     "source_document_id": getattr(input_data, "id", "unknown"),
                     "source_title": getattr(input_data, "title", "Unknown Document"),
-                    "document_format": getattr(input_data, "format", "unknown").value if hasattr(input_data, "format") else "unknown"
+                    "document_format": getattr(getattr(input_data, "format", "unknown"), "value", getattr(input_data, "format", "unknown"))
                 })
             
             return valid_segments
@@ -124,135 +291,67 @@ class PatientSegmenter:
             log.error(f"Error segmenting document: {str(e)}")
             return []
     
-    def _segment_by_explicit_markers(self, text: str) -> List[PatientSegment]:
-        """Segment text using explicit patient markers."""
-        segments = []
-        matches = []
-        
-        # Find all explicit patient markers
-        for pattern in self.explicit_patterns:
-            for match in pattern.finditer(text):
-                patient_id = match.group(1)
-                matches.append((match.start(), match.end(), patient_id, match.group(0)))
-        
-        if not matches:
-            return []
-        
-        # Sort matches by position
-        matches.sort(key=lambda x: x[0])
+    def segment_patients(self, text: str) -> List[str]:
+        """
+        Segment raw text and return the patient segment texts.
         
-        # Create segments between markers
-        for i, (start, end, patient_id, marker) in enumerate(matches):
-            # Determine segment boundaries
-            segment_start = start
-            if i + 1 < len(matches):
-                segment_end = matches[i + 1][0]
-            else:
-                segment_end = len(text)
-            
-            # Extract segment content
-            content = text[segment_start:segment_end].strip()
+        Args:
+            text: Document text
             
-            if len(content) >= self.min_segment_length:
-                segments.append(PatientSegment(
-                    patient_id=f"Patient {patient_id}",
-                    content=content,
-                    start_position=segment_start,
-                    end_position=segment_end,
-                    confidence=0.9,
-                    metadata={
-                        "method": "explicit_markers",
-                        "marker": marker,
-                        "pattern_type": "explicit"
-                    }
-                ))
+        Returns:
+            List of segment texts (the whole text if no markers are found)
+        """
+        spans = self._validate_spans(text, self.find_spans(text))
+        if not spans:
+            return [text]
+        return [span.text(text) for span in spans]
+    
+    def _to_segment(self, text: str, span: SegmentSpan) -> PatientSegment:
+        """Materialize a span as a PatientSegment."""
+        metadata = {"method": span.method, "marker": span.marker(text)}
+        if span.method == "section_based":
+            metadata["section_id"] = span.patient_id.replace("Patient ", "", 1)
+        else:
+            metadata["pattern_type"] = span.method.split("_")[0]
         
-        return segments
+        return PatientSegment(
+            patient_id=span.patient_id,
+            content=span.text(text),
+            start_position=span.start,
+            end_position=span.end,
+            confidence=span.confidence,
+            metadata=metadata
+        )
+    
+    def _segment_by_explicit_markers(self, text: str) -> List[PatientSegment]:
+        """Segment text using explicit patient markers."""
+        return [self._to_segment(text, span) for span in self.find_spans(text, ("explicit",))]
     
     def _segment_by_sections(self, text: str) -> List[PatientSegment]:
         """Segment text using section-based patterns."""
-        segments = []
-        matches = []
-        
-        # Find section-based patient markers
-        for pattern in self.section_patterns:
-            for match in pattern.finditer(text):
-                section_num = match.group(1)
-                subsection_num = match.group(2) if match.lastindex >= 2 else "1"
-                matches.append((match.start(), match.end(), f"{section_num}.{subsection_num}", match.group(0)))
-        
-        if not matches:
-            return []
-        
-        # Sort matches by position
-        matches.sort(key=lambda x: x[0])
-        
-        # Create segments
-        for i, (start, end, section_id, marker) in enumerate(matches):
-            segment_start = start
-            if i + 1 < len(matches):
-                segment_end = matches[i + 1][0]
-            else:
-                segment_end = len(text)
-            
-            content = text[segment_start:segment_end].strip()
-            
-            if len(content) >= self.min_segment_length:
-                segments.append(PatientSegment(
-                    patient_id=f"Patient {section_id}",
-                    content=content,
-                    start_position=segment_start,
-                    end_position=segment_end,
-                    confidence=0.8,
-                    metadata={
-                        "method": "section_based",
-                        "marker": marker,
-                        "section_id": section_id
-                    }
-                ))
-        
-        return segments
+        return [self._to_segment(text, span) for span in self.find_spans(text, ("section",))]
     
     def _segment_by_narrative(self, text: str) -> List[PatientSegment]:
         """Segment text using narrative patterns."""
-        segments = []
-        potential_starts = []
-        
-        # Find potential patient starts using narrative patterns
-        for pattern in self.narrative_patterns:
-            for match in pattern.finditer(text):
-                potential_starts.append((match.start(), match.group(0)))
-        
-        if not potential_starts:
-            return []
+        return [self._to_segment(text, span) for span in self.find_spans(text, ("narrative",))]
+    
+    def _validate_spans(self, text: str, spans: List[SegmentSpan]) -> List[SegmentSpan]:
+        """Validate and filter spans without slicing the document."""
+        valid_spans = []
         
-        # Sort by position
-        potential_starts.sort(key=lambda x: x[0])
+        for span in spans:
+            # Check for medical content indicators within the span
+            if not MEDICAL_INDICATOR_PATTERN.search(text, span.start, span.end):
+                log.debug(f"Segment {span.patient_id} lacks medical content")
+                span = replace(span, confidence=span.confidence * 0.5)
+            valid_spans.append(span)
         
-        # Create segments between potential starts
-        for i, (start_pos, marker) in enumerate(potential_starts):
-            if i + 1 < len(potential_starts):
-                end_pos = potential_starts[i + 1][0]
-            else:
-                end_pos = len(text)
-            
-            content = text[start_pos:end_pos].strip()
-            
-            if len(content) >= self.min_segment_length:
-                segments.append(PatientSegment(
-                    patient_id=f"Patient {i + 1}",
-                    content=content,
-                    start_position=start_pos,
-                    end_position=end_pos,
-                    confidence=0.6,
-                    metadata={
-                        "method": "narrative_based",
-                        "marker": marker,
-                        "pattern_type": "narrative"
-                    }
-                ))
+        # Limit number of segments
+        if len(valid_spans) > self.max_patients:
+            log.warning(f"Too many segments ({len(valid_spans)}), keeping top {self.max_patients}")
+            valid_spans = sorted(valid_spans, key=lambda x: x.confidence, reverse=True)[:self.max_patients]
         
-        return segments
+        return valid_spans
     
     def _validate_segments(self, segments: List[PatientSegment]) -> List[PatientSegment]:
         """Validate and filter segments."""
@@ -265,19 +364,7 @@ class PatientSegmenter:
                 continue
             
             # Check for medical content indicators
-            medical_indicators = [
-                r'\b(?:patient|diagnosis|treatment|symptom|disease|condition)\b',
-                r'\b(?:age|year|month|old|male|female)\b',
-                r'\b(?:presented|admitted|diagnosed|treated)\b',
-                r'\b(?:mg|kg|dose|therapy|medication)\b'
-            ]
-            
-            has_medical_content = any(
-                re.search(pattern, segment.content, re.IGNORECASE)
-                for pattern in medical_indicators
-            )
-            
-            if not has_medical_content:
+            if not MEDICAL_INDICATOR_PATTERN.search(segment.content):
                 log.debug(f"Segment {segment.patient_id} lacks medical content")
                 segment.confidence *= 0.5
             
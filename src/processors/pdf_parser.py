@@ -3,7 +3,11 @@ PDF parsing module for the Biomedical Data Extraction Engine.
 """
 
 import re
+import os
+import json
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import fitz  # PyMuPDF
@@ -32,6 +36,62 @@ class ProcessingResult:
         self.error = error
         self.metadata = metadata or {}
 
+# Bump when text extraction or cleaning changes so cached results are rebuilt
+PARSER_CACHE_VERSION = "1"
+
+def _text_from_dict(text_dict: Dict) -> str:
+    """Extract text from PyMuPDF text dictionary with formatting preservation."""
+    text_lines = []
+    
+    for block in text_dict.get("blocks", []):
+        if "lines" in block:  # Text block
+            block_lines = []
+            for line in block["lines"]:
+                line_text = "".join(span.get("text", "") for span in line.get("spans", []))
+                if line_text.strip():
+                    block_lines.append(line_text.strip())
+            
+            if block_lines:
+                text_lines.append(" ".join(block_lines))
+    
+    return "\n".join(text_lines)
+
+def _page_text(page, preserve_formatting: bool) -> str:
+    """Extract the text of a single page."""
+    if preserve_formatting:
+        # Extract text with layout preservation
+        return _text_from_dict(page.get_text("dict"))
+    # Simple text extraction
+    return page.get_text()
+
+def _page_tables(page, page_num: int) -> List[Dict[str, Any]]:
+    """Find tables on a page with PyMuPDF's table finder."""
+    tables = []
+    for table_index, table in enumerate(page.find_tables().tables):
+        rows = table.extract()
+        # An external header sits above the table body and is not in extract()
+        if table.header and table.header.external:
+            rows = [table.header.names] + rows
+        rows = [[(cell or "").strip() for cell in row] for row in rows]
+        rows = [row for row in rows if any(row)]
+        if len(rows) < 2:
+            continue
+        tables.append({
+            "page": page_num + 1,
+            "table_index": table_index,
+            "bbox": list(table.bbox),
+            "rows": rows
+        })
+    return tables
+
+def _extract_page_range(pdf_path: str, start: int, end: int, preserve_formatting: bool) -> List[str]:
+    """Extract text for pages [start, end) in a worker process."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [_page_text(doc[page_num], preserve_formatting) for page_num in range(start, end)]
+    finally:
+        doc.close()
+
 class PDFParser:
     """PDF parser that extracts text and metadata from PDF documents."""
     
@@ -39,6 +99,14 @@ class PDFParser:
         self.name = "pdf_parser"
         self.enable_table_extraction = kwargs.get("enable_table_extraction", False)
         self.preserve_formatting = kwargs.get("preserve_formatting", True)
+        
+        # Page-parallel extraction for large documents
+        self.max_workers = kwargs.get("max_workers") or os.cpu_count() or 1
+        self.parallel_page_threshold = kwargs.get("parallel_page_threshold", 40)
+        
+        # On-disk cache of parsed results keyed by PDF content and options
+        self.enable_cache = kwargs.get("enable_cache", True)
+        self.cache_dir = Path(kwargs.get("cache_dir", "data/cache/pdf"))
     
     def process(self, input_data: str) -> ProcessingResult:
         """
@@ -60,12 +128,21 @@ class PDFParser:
             
             log.info(f"Processing PDF: {pdf_path}")
             
-            # Extract text and metadata
-            text_content = self._extract_text(pdf_path)
-            metadata = self._extract_metadata(pdf_path)
+            pdf_bytes = pdf_path.read_bytes()
+            cache_key = self._get_cache_key(pdf_bytes) if self.enable_cache else None
+            parsed = self._load_cached(cache_key) if cache_key else None
             
-            # Clean the extracted text
-            cleaned_text = self._clean_text(text_content)
+            if parsed is not None:
+                log.info(f"Using cached parse for PDF: {pdf_path}")
+            else:
+                parsed = self._parse(pdf_path, pdf_bytes)
+                if cache_key:
+                    self._save_cached(cache_key, parsed)
+            
+            cleaned_text = parsed["content"]
+            metadata = self._build_metadata(pdf_path, parsed["pages"], parsed["pdf_metadata"])
+            if self.enable_table_extraction:
+                metadata["tables"] = parsed.get("tables", [])
             
             # Create document
             document = Document(
@@ -80,7 +157,8 @@ class PDFParser:
             
             return ProcessingResult(
                 success=True,
-                data=document
+                data=document,
+                metadata={"cached": parsed.get("cached", False)}
             )
             
         except Exception as e:
@@ -90,93 +168,180 @@ class PDFParser:
                 error=str(e)
             )
     
+    def extract_text(self, pdf_path: str) -> str:
+        """
+        Extract cleaned text from a PDF file.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Cleaned document text
+        """
+        result = self.process(pdf_path)
+        if not result.success:
+            raise ValueError(result.error)
+        return result.data.content
+    
+    def _parse(self, pdf_path: Path, pdf_bytes: bytes) -> Dict[str, Any]:
+        """Open the PDF once and extract its text and metadata."""
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            page_texts = self._extract_pages(doc, pdf_path)
+            page_count = len(doc)
+            pdf_metadata = doc.metadata or {}
+            tables = self._find_tables(doc) if self.enable_table_extraction else []
+        finally:
+            doc.close()
+        
+        text_content = "".join(
+            f"\n--- PAGE {page_num} ---\n{page_text}\n"
+            for page_num, page_text in enumerate(page_texts, 1)
+        )
+        
+        return {
+            "content": self._clean_text(text_content),
+            "pages": page_count,
+            "pdf_metadata": pdf_metadata,
+            "tables": tables
+        }
+    
+    def _find_tables(self, doc) -> List[Dict[str, Any]]:
+        """Find tables on all pages of an open document."""
+        tables = []
+        for page_num in range(len(doc)):
+            try:
+                tables.extend(_page_tables(doc[page_num], page_num))
+            except Exception as e:
+                log.warning(f"Table detection failed on page {page_num + 1}: {str(e)}")
+        return tables
+    
+    def _extract_pages(self, doc, pdf_path: Path) -> List[str]:
+        """Extract per-page text, splitting large documents across processes."""
+        page_count = len(doc)
+        workers = min(self.max_workers, page_count)
+        
+        if workers <= 1 or page_count < self.parallel_page_threshold:
+            return [_page_text(doc[page_num], self.preserve_formatting) for page_num in range(page_count)]
+        
+        # Contiguous page ranges, one per worker
+        chunk_size = -(-page_count // workers)
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [
+                    executor.submit(_extract_page_range, str(pdf_path), start, end, self.preserve_formatting)
+                    for start, end in ranges
+                ]
+                page_texts: List[str] = []
+                for future in futures:
+                    page_texts.extend(future.result())
+            return page_texts
+        except Exception as e:
+            log.warning(f"Parallel PDF extraction failed, falling back to serial: {str(e)}")
+            return [_page_text(doc[page_num], self.preserve_formatting) for page_num in range(page_count)]
+    
     def _extract_text(self, pdf_path: Path) -> str:
         """Extract text from PDF using PyMuPDF."""
-        text_content = ""
-        
         try:
             doc = fitz.open(str(pdf_path))
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                if self.preserve_formatting:
-                    # Extract text with layout preservation
-                    text_dict = page.get_text("dict")
-                    page_text = self._extract_text_from_dict(text_dict)
-                else:
-                    # Simple text extraction
-                    page_text = page.get_text()
-                
-                text_content += f"\n--- PAGE {page_num + 1} ---\n{page_text}\n"
-            
-            doc.close()
-            
+            try:
+                page_texts = self._extract_pages(doc, pdf_path)
+            finally:
+                doc.close()
         except Exception as e:
             log.error(f"Error extracting text from PDF: {str(e)}")
             raise
         
-        return text_content
+        return "".join(
+            f"\n--- PAGE {page_num} ---\n{page_text}\n"
+            for page_num, page_text in enumerate(page_texts, 1)
+        )
     
     def _extract_text_from_dict(self, text_dict: Dict) -> str:
         """Extract text from PyMuPDF text dictionary with formatting preservation."""
-        text_lines = []
-        
-        for block in text_dict.get("blocks", []):
-            if "lines" in block:  # Text block
-                block_lines = []
-                for line in block["lines"]:
-                    line_text = ""
-                    for span in line.get("spans", []):
-                        line_text += span.get("text", "")
-                    if line_text.strip():
-                        block_lines.append(line_text.strip())
-                
-                if block_lines:
-                    text_lines.append(" ".join(block_lines))
-        
-        return "\n".join(text_lines)
+        return _text_from_dict(text_dict)
     
     def _extract_metadata(self, pdf_path: Path) -> Dict:
         """Extract metadata from PDF."""
+        try:
+            doc = fitz.open(str(pdf_path))
+            try:
+                return self._build_metadata(pdf_path, len(doc), doc.metadata or {})
+            finally:
+                doc.close()
+        except Exception as e:
+            log.warning(f"Error extracting PDF metadata: {str(e)}")
+            return {
+                "filename": pdf_path.name,
+                "file_size": pdf_path.stat().st_size,
+            }
+    
+    def _build_metadata(self, pdf_path: Path, page_count: int, pdf_meta: Dict[str, Any]) -> Dict:
+        """Build document metadata from the PDF info dictionary."""
         metadata = {
             "filename": pdf_path.name,
             "file_size": pdf_path.stat().st_size,
+            "pages": page_count,
+            "pdf_metadata": pdf_meta
         }
         
-        try:
-            doc = fitz.open(str(pdf_path))
-            
-            # Basic document info
-            metadata.update({
-                "pages": len(doc),
-                "pdf_metadata": doc.metadata
-            })
-            
-            # Extract title from metadata or filename
-            pdf_meta = doc.metadata
-            if pdf_meta.get("title"):
-                metadata["title"] = pdf_meta["title"]
-            elif pdf_meta.get("subject"):
-                metadata["title"] = pdf_meta["subject"]
-            else:
-                metadata["title"] = pdf_path.stem
-            
-            # Additional metadata
-            if pdf_meta.get("author"):
-                metadata["author"] = pdf_meta["author"]
-            if pdf_meta.get("creator"):
-                metadata["creator"] = pdf_meta["creator"]
-            if pdf_meta.get("producer"):
-                metadata["producer"] = pdf_meta["producer"]
-            
-            doc.close()
-            
-        except Exception as e:
-            log.warning(f"Error extracting PDF metadata: {str(e)}")
+        # Extract title from metadata or filename
+        if pdf_meta.get("title"):
+            metadata["title"] = pdf_meta["title"]
+        elif pdf_meta.get("subject"):
+            metadata["title"] = pdf_meta["subject"]
+        else:
+            metadata["title"] = pdf_path.stem
+        
+        # Additional metadata
+        if pdf_meta.get("author"):
+            metadata["author"] = pdf_meta["author"]
+        if pdf_meta.get("creator"):
+            metadata["creator"] = pdf_meta["creator"]
+        if pdf_meta.get("producer"):
+            metadata["producer"] = pdf_meta["producer"]
         
         return metadata
     
+    def _get_cache_key(self, pdf_bytes: bytes) -> str:
+        """Cache key from the PDF content hash and the parser options."""
+        options = {
+            "version": PARSER_CACHE_VERSION,
+            "preserve_formatting": self.preserve_formatting,
+            "enable_table_extraction": self.enable_table_extraction
+        }
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+    
+    def _load_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached parse result if present."""
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                parsed = json.load(f)
+            parsed["cached"] = True
+            return parsed
+        except Exception as e:
+            log.warning(f"Ignoring unreadable PDF cache entry {cache_file}: {str(e)}")
+            return None
+    
+    def _save_cached(self, cache_key: str, parsed: Dict[str, Any]):
+        """Write a parse result to the cache atomically."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.cache_dir / f"{cache_key}.json"
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(parsed, f)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            log.warning(f"Failed to cache PDF parse result: {str(e)}")
+    
     def _clean_text(self, text: str) -> str:
         """Clean extracted text by removing artifacts and normalizing formatting."""
         if not text:
@@ -205,11 +370,28 @@ class PDFParser:
         return text
     
     def extract_tables(self, pdf_path: Path) -> List[Dict]:
-        """Extract tables from PDF (placeholder for future implementation)."""
-        # This would integrate with libraries like Camelot or Tabula
-        # For now, return empty list
-        log.info("Table extraction not implemented yet")
-        return []
+        """
+        Extract tables from PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            List of tables, each with page number, bounding box and cell rows
+            (the first row is the header)
+        """
+        try:
+            doc = fitz.open(str(pdf_path))
+            try:
+                tables = self._find_tables(doc)
+            finally:
+                doc.close()
+        except Exception as e:
+            log.error(f"Error extracting tables from PDF: {str(e)}")
+            return []
+        
+        log.info(f"Found {len(tables)} tables in {pdf_path}")
+        return tables
     
     def segment_by_sections(self, text: str) -> Dict[str, str]:
         """Segment text by sections based on headings."""
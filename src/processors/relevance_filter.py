@@ -0,0 +1,438 @@
+"""
+Section-aware input reduction before LLM extraction.
+
+Full-text articles carry a lot that never yields patient data: cover pages,
+author lists and affiliations, methods boilerplate, acknowledgements,
+declarations and reference lists. The relevance filter classifies sections
+by their headings and paragraphs by fast local cues (patient markers, ages,
+variant notation, doses versus citations, DOIs and affiliations), optionally
+blended with sentence embeddings, and keeps only the relevant spans.
+
+The reduced text comes with an offset map, so character intervals found in
+it (e.g. LangExtract source grounding) can be mapped back onto the original
+document.
+"""
+
+import bisect
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Section categories, checked in order against the start of a heading
+SECTION_CATEGORIES = [
+    ("drop", r"references?|bibliography|literature cited|acknowledge?ments?|funding|financial (?:support|disclosure)"
+             r"|conflicts? of interests?|competing interests?|declarations?|disclosures?"
+             r"|authors?'? contributions?|ethic(?:s|al)|consent for publication|data availability"
+             r"|availability of data|abbreviations|supplementary|supporting information|running title"
+             r"|key ?words|highlights"),
+    ("relevant", r"abstract|summary|case(?:s)? (?:reports?|presentations?|descriptions?|histor(?:y|ies)|series)"
+                 r"|case \d+|patients?|subjects|probands?|famil(?:y|ies)|clinical|results?|findings"
+                 r"|tables?"),
+    ("methods", r"(?:materials? and )?methods?|methodology|statistical analysis|study design|experimental"
+                r"|procedures"),
+    ("neutral", r"introduction|background|discussion|conclusions?|figures?|fig\.|limitations"),
+]
+
+_SECTION_PATTERNS = [
+    (category, re.compile(rf"(?:{pattern})\b", re.IGNORECASE)) for category, pattern in SECTION_CATEGORIES
+]
+
+# Optional numbering in front of a heading ("2.", "3.1", "3.10.")
+_NUMBERING = re.compile(r"^(\d{1,2}(?:\.\d{1,2})*)\.?\s+(?=[A-Z])")
+# Line numbers printed at the end of manuscript lines
+_TRAILING_LINE_NUMBER = re.compile(r"\s+\d{1,4}$")
+# Table and figure captions open a section whatever their length
+_CAPTION = re.compile(r"^(?:Table|Fig(?:ure)?\.?)\s*[0-9IVX]+\b")
+
+# Cues of patient-specific content; a paragraph scores on how many kinds it has
+PATIENT_CUES = {
+    "patient_marker": re.compile(
+        r"\b(?:patients?|cases?|subjects?|probands?|individuals?|siblings?)\s+(?:\d+|[A-Z])\b"
+        r"|\b[PC]\d+\b|\b(?:our|the present|this|index) (?:patients?|cases?|probands?|family)\b"
+        r"|\bthe proband\b"
+    ),
+    "age_sex": re.compile(
+        r"\b\d+(?:\.\d+)?[- ](?:year|month|week|day)s?[- ]old\b|\bat (?:the )?age of\b|\baged \d"
+        r"|\b(?:boy|girl|son|daughter|brother|sister)\b",
+        re.IGNORECASE
+    ),
+    "variant": re.compile(r"\b[cgm]\.[-*]?\d+[_\d+\-*]*(?:[ACGT]>[ACGT]|del|dup|ins)|\bp\.\(?[A-Z][a-z]{2}\d+"),
+    "clinical_course": re.compile(
+        r"\b(?:presented|admitted|was born|referred|on examination|examination (?:revealed|showed)"
+        r"|was diagnosed|died|passed away|follow-up)\b",
+        re.IGNORECASE
+    ),
+    "dose": re.compile(r"\b\d+(?:\.\d+)?\s*mg(?:/kg)?(?:/d(?:ay)?)?\b"),
+}
+
+# Cues of boilerplate: literature citations, links, affiliations and legal text
+BOILERPLATE_CUES = {
+    "citation": re.compile(r"\bet al\.?,?\s*\(?\d{4}|\(\s*[A-Z][\w\-]+(?: and [A-Z][\w\-]+)?,? \d{4}[a-z]?\s*[;)]"),
+    "link": re.compile(r"\bdoi\b|https?://|\bwww\.|\S+@\S+\.\w+", re.IGNORECASE),
+    "affiliation": re.compile(r"\b(?:Department|Institute|University|Laboratory|Faculty|School|Center|Centre) of\b"),
+    "legal": re.compile(r"©|\bcopyright\b|all rights reserved|creative commons|\blicen[cs]e\b", re.IGNORECASE),
+    "reference": re.compile(r"\b\d{4}[a-z]?[.;]\s*\d+(?:\(\d+\))?[,:]\s*\d+[-–]\d+"),
+}
+
+# Prototype passages for embedding scores
+RELEVANT_PROTOTYPES = [
+    "A 3-year-old girl presented with seizures, developmental delay and elevated lactate.",
+    "Sequencing identified compound heterozygous variants in the patient, inherited from both parents.",
+    "The patient was treated with thiamine and biotin and improved at follow-up.",
+]
+BOILERPLATE_PROTOTYPES = [
+    "Smith J, Jones K, et al. Journal of Medical Genetics 2015;12:345-350.",
+    "Department of Pediatrics, University Hospital, City, Country. E-mail: author@example.org",
+    "DNA was extracted from peripheral blood using a commercial kit according to the manufacturer's instructions.",
+    "The authors declare no conflict of interest. This work was supported by a national grant.",
+]
+
+# Separator between kept spans that are not adjacent in the original text
+SPAN_SEPARATOR = "\n\n"
+
+
+@dataclass
+class ReducedText:
+    """Text forwarded to the LLM and how it maps onto the original document."""
+    text: str
+    original_length: int
+    spans: List[Tuple[int, int]]
+    reduced_starts: List[int]
+    dropped_chars: Dict[str, int] = field(default_factory=dict)
+    sections: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def unchanged(cls, text: str) -> "ReducedText":
+        """Identity reduction of a text."""
+        return cls(text=text, original_length=len(text), spans=[(0, len(text))], reduced_starts=[0])
+
+    @property
+    def reduction(self) -> float:
+        """Share of the original characters that were dropped."""
+        if not self.original_length:
+            return 0.0
+        return 1.0 - len(self.text) / self.original_length
+
+    def to_original(self, position: int) -> int:
+        """
+        Map a position in the reduced text onto the original text.
+
+        Positions inside a separator map to the start of the next span.
+        """
+        index = bisect.bisect_right(self.reduced_starts, position) - 1
+        if index < 0:
+            return self.spans[0][0] if self.spans else position
+        start, end = self.spans[index]
+        offset = position - self.reduced_starts[index]
+        if offset <= end - start:
+            return start + offset
+        return self.spans[index + 1][0] if index + 1 < len(self.spans) else end
+
+    def interval_to_original(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a [start, end) interval of the reduced text onto the original text."""
+        if end <= start:
+            original = self.to_original(start)
+            return original, original
+        return self.to_original(start), self.to_original(end - 1) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary for extraction metadata."""
+        return {
+            "original_chars": self.original_length,
+            "reduced_chars": len(self.text),
+            "reduction": round(self.reduction, 4),
+            "spans": len(self.spans),
+            "dropped_chars": dict(self.dropped_chars)
+        }
+
+
+@dataclass
+class _Unit:
+    """A heading line or a paragraph of the original text."""
+    start: int
+    end: int
+    section: int
+    is_heading: bool = False
+    keep: bool = False
+
+
+class RelevanceFilter:
+    """Keeps the sections and paragraphs of a document likely to hold patient data."""
+
+    def __init__(self,
+                 min_score: float = 0.5,
+                 methods_min_score: float = 1.0,
+                 min_kept_chars: int = 200,
+                 embedding_model: Optional[Any] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            min_score: Relevance a paragraph outside the known relevant
+                sections needs to be kept (0-1)
+            methods_min_score: Relevance a methods paragraph needs to be kept
+            min_kept_chars: Below this many kept characters the document is
+                forwarded unchanged rather than risk dropping its only case
+            embedding_model: Sentence-transformers model name, or an object
+                with ``encode(texts)``; None scores with heuristics only
+        """
+        self.name = "relevance_filter"
+        self.min_score = min_score
+        self.methods_min_score = methods_min_score
+        self.min_kept_chars = min_kept_chars
+        self._embedding_model = embedding_model
+        self._encoder = None
+        self._prototypes = None
+
+    def reduce(self, text: str) -> ReducedText:
+        """
+        Reduce a document to its relevant spans.
+
+        Args:
+            text: Document text
+
+        Returns:
+            ReducedText with the kept spans and their offset map
+        """
+        if not text or not text.strip():
+            return ReducedText.unchanged(text or "")
+
+        units, sections = self._scan(text)
+        has_headings = len(sections) > 1
+        neutral = [u for u in units if not u.is_heading and sections[u.section]["category"] in ("neutral", "methods")]
+        embedding_scores = self._embedding_scores([text[u.start:u.end] for u in neutral]) if has_headings else None
+        embedding_by_unit = dict(zip((id(u) for u in neutral), embedding_scores or []))
+
+        for unit in units:
+            if unit.is_heading:
+                continue
+            category = sections[unit.section]["category"]
+            paragraph = text[unit.start:unit.end]
+            if category == "drop":
+                unit.keep = False
+            elif category == "relevant" or not has_headings:
+                # Without headings, only obvious boilerplate paragraphs go
+                unit.keep = not self._is_boilerplate(paragraph)
+            else:
+                score = self.paragraph_score(paragraph)
+                if id(unit) in embedding_by_unit:
+                    score = (score + embedding_by_unit[id(unit)]) / 2
+                threshold = self.methods_min_score if category == "methods" else self.min_score
+                unit.keep = score >= threshold
+
+        # A heading is kept with the section it opens
+        kept_sections = {u.section for u in units if u.keep and not u.is_heading}
+        for unit in units:
+            if unit.is_heading:
+                unit.keep = unit.section in kept_sections
+
+        kept_chars = sum(u.end - u.start for u in units if u.keep)
+        if kept_chars < self.min_kept_chars:
+            log.debug(f"Relevance filter kept only {kept_chars} characters; forwarding the whole document")
+            return ReducedText.unchanged(text)
+
+        reduced = self._assemble(text, units)
+        for unit in units:
+            if not unit.keep:
+                category = sections[unit.section]["category"]
+                reduced.dropped_chars[category] = reduced.dropped_chars.get(category, 0) + unit.end - unit.start
+        reduced.sections = [
+            {"heading": s["heading"], "category": s["category"], "kept": i in kept_sections}
+            for i, s in enumerate(sections)
+        ]
+        log.info(f"Relevance filter kept {len(reduced.text)}/{len(text)} characters "
+                 f"in {len(reduced.spans)} spans")
+        return reduced
+
+    def section_spans(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Sections of a text.
+
+        Returns:
+            Heading, category and [start, end) offsets per section; text
+            before the first heading is a section without heading
+        """
+        units, sections = self._scan(text)
+        spans: List[Dict[str, Any]] = []
+        for unit in units:
+            if unit.is_heading or not spans:
+                if spans:
+                    spans[-1]["end"] = unit.start
+                section = sections[unit.section]
+                spans.append({"heading": section["heading"], "category": section["category"],
+                              "start": 0 if not spans and not unit.is_heading else unit.start,
+                              "end": len(text)})
+        return spans
+
+    def paragraph_score(self, paragraph: str) -> float:
+        """
+        Heuristic relevance of a paragraph (0-1).
+
+        Two kinds of patient cues make a paragraph relevant; one kind counts
+        half, and nothing if the paragraph cites the literature.
+        """
+        kinds = sum(1 for pattern in PATIENT_CUES.values() if pattern.search(paragraph))
+        if kinds >= 2:
+            return 1.0
+        if kinds == 1:
+            return 0.5 if not BOILERPLATE_CUES["citation"].search(paragraph) else 0.25
+        return 0.0
+
+    def _is_boilerplate(self, paragraph: str) -> bool:
+        """Whether a paragraph is front matter, legal text or a reference list."""
+        if any(pattern.search(paragraph) for pattern in PATIENT_CUES.values()):
+            return False
+        hits = sum(len(pattern.findall(paragraph)) for pattern in BOILERPLATE_CUES.values())
+        return hits >= 2 or (hits == 1 and len(paragraph) < 300)
+
+    def _scan(self, text: str) -> Tuple[List[_Unit], List[Dict[str, Any]]]:
+        """Split the text into heading and paragraph units in one pass over its lines."""
+        sections: List[Dict[str, Any]] = [{"heading": None, "category": "neutral", "top": "neutral", "table": False}]
+        units: List[_Unit] = []
+        paragraph_start = None
+        previous_line = ""
+        position = 0
+
+        def close_paragraph(end: int):
+            nonlocal paragraph_start
+            if paragraph_start is not None:
+                units.append(_Unit(paragraph_start, end, len(sections) - 1))
+                paragraph_start = None
+
+        for line in text.splitlines(keepends=True):
+            line_start = position
+            position += len(line)
+            stripped = line.strip()
+            if not stripped:
+                close_paragraph(line_start)
+                previous_line = ""
+                continue
+
+            opens_block = paragraph_start is None or previous_line.endswith((".", ":", ";"))
+            heading = self._heading_category(stripped, opens_block, sections[-1]["top"])
+            # Table rows often look like headings; only a caption or a
+            # closing section (e.g. references) ends a table
+            if heading is not None and sections[-1]["table"] \
+                    and not _CAPTION.match(stripped) and heading[0] != "drop":
+                heading = None
+            if heading is not None:
+                close_paragraph(line_start)
+                category, is_subsection = heading
+                top = sections[-1]["top"] if is_subsection else category
+                sections.append({"heading": stripped, "category": category, "top": top,
+                                 "table": stripped.startswith("Table")})
+                content_end = line_start + len(line.rstrip())
+                units.append(_Unit(line_start, content_end, len(sections) - 1, is_heading=True))
+                previous_line = ""
+                continue
+
+            if paragraph_start is None:
+                paragraph_start = line_start + (len(line) - len(line.lstrip()))
+            previous_line = _TRAILING_LINE_NUMBER.sub("", stripped)
+        close_paragraph(len(text.rstrip()))
+        return units, sections
+
+    def _heading_category(self, line: str, opens_block: bool, parent: str) -> Optional[Tuple[str, bool]]:
+        """(category, is a numbered subsection) if the line is a section heading."""
+        if _CAPTION.match(line):
+            return self._categorize(line) or "relevant", False
+
+        line = _TRAILING_LINE_NUMBER.sub("", line)
+        numbering = _NUMBERING.match(line)
+        title = line[numbering.end():] if numbering else line
+        words = title.split()
+        if not words or len(words) > 12 or len(title) > 100:
+            return None
+
+        category = self._categorize(title)
+        if numbering:
+            is_subsection = "." in numbering.group(1)
+            if category is None:
+                # Numbered headings have no sentence punctuation inside
+                if re.search(r"[.;]\s", title) or title.endswith((".", ",")):
+                    return None
+                category = parent if is_subsection else "neutral"
+            return category, is_subsection
+
+        # Unnumbered headings are short, capitalised and start a block
+        if category is None or not opens_block or len(words) > 6 or not title[0].isupper():
+            return None
+        if title.endswith((".", ",", ";")):
+            return None
+        return category, False
+
+    @staticmethod
+    def _categorize(title: str) -> Optional[str]:
+        for category, pattern in _SECTION_PATTERNS:
+            if pattern.match(title):
+                return category
+        return None
+
+    def _assemble(self, text: str, units: List[_Unit]) -> ReducedText:
+        """Join the kept units; units separated only by whitespace stay one span."""
+        spans: List[Tuple[int, int]] = []
+        dropped_since_span = False
+        for unit in units:
+            if not unit.keep:
+                dropped_since_span = True
+                continue
+            if spans and not dropped_since_span:
+                spans[-1] = (spans[-1][0], unit.end)
+            else:
+                spans.append((unit.start, unit.end))
+            dropped_since_span = False
+
+        parts: List[str] = []
+        reduced_starts: List[int] = []
+        length = 0
+        for start, end in spans:
+            if parts:
+                parts.append(SPAN_SEPARATOR)
+                length += len(SPAN_SEPARATOR)
+            reduced_starts.append(length)
+            parts.append(text[start:end])
+            length += end - start
+        return ReducedText(text="".join(parts), original_length=len(text),
+                           spans=spans, reduced_starts=reduced_starts)
+
+    def _embedding_scores(self, paragraphs: List[str]) -> Optional[List[float]]:
+        """Embedding relevance (0-1) per paragraph, or None without a model."""
+        if not paragraphs or self._embedding_model is None:
+            return None
+        try:
+            import numpy as np
+
+            encoder = self._load_encoder()
+            if encoder is None:
+                return None
+            if self._prototypes is None:
+                self._prototypes = (
+                    self._normalize(np.asarray(encoder.encode(RELEVANT_PROTOTYPES))),
+                    self._normalize(np.asarray(encoder.encode(BOILERPLATE_PROTOTYPES)))
+                )
+            relevant, boilerplate = self._prototypes
+            vectors = self._normalize(np.asarray(encoder.encode(paragraphs)))
+            margin = (vectors @ relevant.T).max(axis=1) - (vectors @ boilerplate.T).max(axis=1)
+            return [float(v) for v in np.clip((margin + 1) / 2, 0.0, 1.0)]
+        except Exception as e:
+            log.warning(f"Embedding relevance scoring failed, using heuristics only: {e}")
+            self._embedding_model = None
+            return None
+
+    def _load_encoder(self):
+        if self._encoder is None:
+            if isinstance(self._embedding_model, str):
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self._embedding_model)
+            else:
+                self._encoder = self._embedding_model
+        return self._encoder
+
+    @staticmethod
+    def _normalize(vectors):
+        import numpy as np
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
@@ -0,0 +1,249 @@
+"""
+Table-to-patient mapping for tables extracted from case series PDFs.
+
+Maps rows (or columns, for transposed tables) of patient tables onto the
+patient record fields used by the extraction agents, so that fields found in
+tables do not need to be reconstructed by the LLM from flattened text.
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+
+log = logging.getLogger(__name__)
+
+# Header synonyms for each patient record field (normalized, lower case)
+FIELD_SYNONYMS = {
+    "sex": ["sex", "gender", "sex/gender"],
+    "age_of_onset": ["age at onset", "age of onset", "onset age", "age at first symptoms", "onset"],
+    "last_seen": ["age at last follow-up", "age at last follow up", "age at last examination",
+                  "last follow-up", "last follow up", "last seen", "current age", "age at last visit"],
+    "age_of_death": ["age at death", "age of death", "died at"],
+    "_0_alive_1_dead": ["alive/deceased", "alive/dead", "vital status", "outcome", "status", "deceased", "alive"],
+    "gene": ["gene", "affected gene", "gene symbol"],
+    "mutations": ["mutation", "mutations", "variant", "variants", "genotype", "nucleotide change",
+                  "cdna change", "dna change", "hgvs"],
+    "consanguinity": ["consanguinity", "consanguineous", "parental consanguinity"],
+    "ethnicity": ["ethnicity", "ethnic origin", "ancestry", "origin"],
+    "family_history": ["family history"],
+    "phenotypes": ["clinical features", "clinical presentation", "presenting symptoms",
+                   "phenotype", "phenotypes", "symptoms", "presentation"],
+    "mri_outcome": ["brain mri", "mri findings", "neuroimaging", "mri"],
+    "what_treatment": ["treatment", "therapy"],
+}
+
+# Headers that label the patient column (or row, for transposed tables);
+# generic "no"/"#"/"id" headers also label variant and lab tables
+PATIENT_HEADERS = {"patient", "patients", "case", "cases", "subject", "subjects",
+                   "individual", "individuals", "pt", "patient id", "patient no",
+                   "patient #", "case id", "case no", "subject id"}
+
+# Patient labels; a letter label must be upper case ("Patient B", not "case a")
+PATIENT_LABEL_PATTERN = re.compile(
+    r'^(?P<prefix>(?i:patient|pt|case|subject|individual|p|c|s))?\s*[#.]?\s*(?P<id>\d+|[A-Z])$'
+)
+
+AGE_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(y(?:ears?|rs?|o)?|m(?:o(?:nths?|s)?)?|w(?:ee)?ks?|d(?:ays?)?)(?![a-z])',
+    re.IGNORECASE
+)
+
+def normalize_header(header: str) -> str:
+    """Lower-case a header cell and collapse whitespace and footnote marks."""
+    header = re.sub(r'[\*†‡§¶]+|\[\w+\]', '', header or '')
+    header = re.sub(r'\s*\(.*?\)\s*', ' ', header)
+    return re.sub(r'\s+', ' ', header).strip().lower().rstrip(':')
+
+def normalize_patient_key(label: str) -> Optional[str]:
+    """
+    Normalize a patient label for matching across tables and text segments.
+
+    "Patient 2", "P2", "Case 2" and "2" all map to "2".
+    """
+    if not label:
+        return None
+    match = PATIENT_LABEL_PATTERN.match(label.strip())
+    if match:
+        return match.group("id").upper()
+    return None
+
+def _is_prefixed_label(label: str) -> bool:
+    """Whether a cell is a patient label with a prefix ("P1", "Case 2"), not a bare number."""
+    match = PATIENT_LABEL_PATTERN.match((label or '').strip())
+    return bool(match and match.group("prefix"))
+
+def parse_age_years(value: str) -> Optional[float]:
+    """Parse an age cell such as '2 y', '8 mo', '1y 6m' or '3' into years."""
+    if not value:
+        return None
+    total = 0.0
+    found = False
+    for number, unit in AGE_PATTERN.findall(value):
+        found = True
+        unit = unit.lower()
+        if unit.startswith('y'):
+            total += float(number)
+        elif unit.startswith('m'):
+            total += float(number) / 12
+        elif unit.startswith('w'):
+            total += float(number) / 52
+        else:
+            total += float(number) / 365
+    if found:
+        return round(total, 2)
+    try:
+        return float(value.strip())
+    except ValueError:
+        return None
+
+def _parse_flag(value: str, true_words: Tuple[str, ...], false_words: Tuple[str, ...]) -> Optional[int]:
+    value = (value or '').strip().lower()
+    if not value or value in ('-', 'na', 'n/a', 'nr', 'unknown', '?'):
+        return None
+    if value.startswith(true_words):
+        return 1
+    if value.startswith(false_words):
+        return 0
+    return None
+
+class TablePatientMapper:
+    """Maps extracted PDF tables to per-patient field dictionaries."""
+
+    def __init__(self):
+        # Longest synonyms first so "age at onset" wins over "onset"
+        self._synonyms = sorted(
+            ((synonym, field) for field, synonyms in FIELD_SYNONYMS.items() for synonym in synonyms),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+
+    def match_field(self, header: str) -> Optional[str]:
+        """Return the patient record field for a header cell, if any."""
+        header = normalize_header(header)
+        if not header:
+            return None
+        for synonym, field in self._synonyms:
+            if header == synonym:
+                return field
+        for synonym, field in self._synonyms:
+            if len(synonym) > 3 and synonym in header:
+                return field
+        return None
+
+    def map_tables(self, tables: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Map all patient tables to patient records.
+
+        Args:
+            tables: Tables as returned by PDFParser.extract_tables
+
+        Returns:
+            Mapping of normalized patient key to field values; each record has a
+            'patient_id' (label as printed) and '_source' (page/table) entry
+        """
+        patients: Dict[str, Dict[str, Any]] = {}
+
+        for table in tables:
+            rows = table.get("rows", [])
+            for label, cells in self._patient_rows(rows):
+                key = normalize_patient_key(label)
+                if key is None:
+                    continue
+                record = patients.setdefault(key, {"patient_id": label, "_source": []})
+                for field, value in cells:
+                    converted = self.convert_value(field, value)
+                    if converted is not None and record.get(field) is None:
+                        record[field] = converted
+                record["_source"].append({"page": table.get("page"), "table_index": table.get("table_index")})
+
+        mapped = {key: record for key, record in patients.items() if self.table_fields(record)}
+        if mapped:
+            log.info(f"Mapped {len(mapped)} patients from {len(tables)} tables")
+        return mapped
+
+    def _patient_rows(self, rows: List[List[str]]) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        """Return (patient label, [(field, cell)]) pairs for a patient table."""
+        if len(rows) < 2:
+            return []
+
+        header = rows[0]
+        fields = [self.match_field(cell) for cell in header]
+
+        # Rows are patients: a patient label column plus mapped field columns
+        label_col = next(
+            (i for i, cell in enumerate(header) if normalize_header(cell) in PATIENT_HEADERS),
+            None
+        )
+        # Without a patient header, the first column must hold prefixed labels;
+        # bare numbers are row numbers of variant or lab tables
+        if label_col is None and all(_is_prefixed_label(row[0]) for row in rows[1:] if row):
+            label_col = 0
+        if label_col is not None and any(f for i, f in enumerate(fields) if i != label_col):
+            return [
+                (row[label_col], [(fields[i], cell) for i, cell in enumerate(row)
+                                  if i != label_col and i < len(fields) and fields[i]])
+                for row in rows[1:] if label_col < len(row)
+            ]
+
+        # Transposed: patients are columns and the first column holds field names
+        row_fields = [self.match_field(row[0]) if row else None for row in rows[1:]]
+        patient_header = normalize_header(header[0]) in PATIENT_HEADERS
+        label_check = normalize_patient_key if patient_header else _is_prefixed_label
+        if (len(header) > 1 and all(label_check(cell) for cell in header[1:])
+                and sum(1 for f in row_fields if f) >= 2):
+            return [
+                (header[col], [(field, row[col]) for field, row in zip(row_fields, rows[1:])
+                               if field and col < len(row)])
+                for col in range(1, len(header))
+            ]
+
+        return []
+
+    def convert_value(self, field: str, value: str) -> Any:
+        """Convert a table cell to the value type used by the extraction agents."""
+        value = (value or '').strip()
+        if not value or value in ('-', '–', 'NA', 'N/A', 'NR', 'n.a.', 'ND'):
+            return None
+
+        if field == "sex":
+            # Agents encode male=0, female=1
+            return _parse_flag(value, ('f', 'girl', 'woman'), ('m', 'boy', 'man'))
+        if field in ("age_of_onset", "last_seen", "age_of_death"):
+            return parse_age_years(value)
+        if field == "_0_alive_1_dead":
+            return _parse_flag(value, ('dead', 'deceased', 'died', '†', 'd'), ('alive', 'a', 'living'))
+        if field == "consanguinity":
+            return _parse_flag(value, ('yes', 'y', '+', 'consanguineous'), ('no', 'n', '-', 'non'))
+        if field == "phenotypes":
+            return [item.strip() for item in re.split(r'[;,\n]', value) if item.strip()]
+        return re.sub(r'\s+', ' ', value)
+
+    def table_fields(self, record: Dict[str, Any]) -> List[str]:
+        """Fields with values in a mapped record."""
+        return [field for field, value in record.items()
+                if field in FIELD_SYNONYMS and value is not None]
+
+    def covered_agents(self,
+                       record: Optional[Dict[str, Any]],
+                       field_groups: Dict[str, Iterable[str]]) -> List[str]:
+        """
+        Agents all of whose fields are present in a mapped record.
+
+        An agent that still has a field the table does not carry (e.g.
+        ethnicity or zygosity) has to run; table values are merged over its
+        output instead.
+
+        Args:
+            record: Mapped table record of a patient
+            field_groups: Fields extracted by each agent
+
+        Returns:
+            Names of the agents that can be skipped
+        """
+        if not record:
+            return []
+        fields = set(self.table_fields(record))
+        return [
+            agent for agent, group in field_groups.items()
+            if set(group) - {"patient_id"} <= fields
+        ]
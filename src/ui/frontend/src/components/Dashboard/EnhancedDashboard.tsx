@@ -51,6 +51,7 @@ import { useNavigate } from 'react-router-dom';
 
 // Hooks
 import { useWebSocket } from '../../contexts/WebSocketContext';
+import { useLiveQueries } from '../../hooks/useLiveUpdates';
 
 interface SystemMetric {
   name: string;
@@ -88,23 +89,29 @@ const EnhancedDashboard: React.FC = () => {
   const [expandedMetrics, setExpandedMetrics] = useState<string[]>([]);
   const [isRefreshing, setIsRefreshing] = useState(false);
   
+  // Refresh on server-push events; poll only while the WebSocket is down
+  const refetchInterval = useLiveQueries(
+    ['task_progress', 'queue_depth', 'extraction_completed', 'metrics'],
+    [['dashboard-system-status'], ['dashboard-recent-activities'], ['dashboard-statistics']]
+  );
+
   // Fetch real dashboard data
   const { data: systemStatusData, isLoading: systemStatusLoading } = useQuery({
     queryKey: ['dashboard-system-status'],
     queryFn: () => api.dashboard.getSystemStatus(),
-    refetchInterval: 30000, // Refresh every 30 seconds
+    refetchInterval,
   });
 
   const { data: recentActivitiesData, isLoading: activitiesLoading } = useQuery({
     queryKey: ['dashboard-recent-activities'],
     queryFn: () => api.dashboard.getProcessingQueue(),
-    refetchInterval: 30000,
+    refetchInterval,
   });
 
   const { data: statisticsData, isLoading: statisticsLoading } = useQuery({
     queryKey: ['dashboard-statistics'],
     queryFn: () => api.dashboard.getRecentResults(),
-    refetchInterval: 30000,
+    refetchInterval,
   });
 
   // Real system metrics from API
@@ -216,6 +216,7 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
           case 'notification':
           case 'system_alert':
           case 'extraction_progress':
+          case 'extraction_completed':
           case 'validation_update':
             const notification: Notification = {
               id: message.id || Date.now().toString(),
@@ -242,6 +243,13 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
             // Handle heartbeat silently
             break;
           
+          case 'task_progress':
+          case 'queue_depth':
+          case 'metrics':
+          case 'system_metrics':
+            // Consumed by useTopicEvents subscribers
+            break;
+          
           default:
             console.log('Unhandled WebSocket message:', message);
         }
@@ -383,6 +391,8 @@ function getSeverityFromMessageType(type: string, data: any): 'info' | 'warning'
   switch (type) {
     case 'system_alert':
       return data?.severity || 'warning';
+    case 'extraction_completed':
+      return 'success';
     case 'extraction_progress':
       if (data?.status === 'completed') return 'success';
       if (data?.status === 'failed') return 'error';
@@ -0,0 +1,63 @@
+import { useEffect, useRef } from 'react';
+import { QueryKey, useQueryClient } from '@tanstack/react-query';
+import { useWebSocket } from '../contexts/WebSocketContext';
+
+// Polling interval used only while the WebSocket is disconnected
+export const FALLBACK_REFETCH_INTERVAL = 30000;
+
+// Number of mounted components interested in each topic, so that one
+// component unmounting does not unsubscribe the others
+const topicRefs = new Map<string, number>();
+
+/**
+ * Subscribe to server-push topics and call `onEvent` for each event received.
+ * Returns whether the push channel is connected.
+ */
+export const useTopicEvents = (topics: string[], onEvent: (message: any) => void): boolean => {
+  const { isConnected, subscribe, unsubscribe, lastMessage } = useWebSocket();
+  const handlerRef = useRef(onEvent);
+  handlerRef.current = onEvent;
+  const topicKey = topics.join(',');
+
+  useEffect(() => {
+    if (!isConnected) return;
+    topics.forEach(topic => {
+      const count = topicRefs.get(topic) || 0;
+      topicRefs.set(topic, count + 1);
+      if (count === 0) subscribe(topic);
+    });
+    return () => {
+      topics.forEach(topic => {
+        const count = (topicRefs.get(topic) || 1) - 1;
+        topicRefs.set(topic, count);
+        if (count === 0) unsubscribe(topic);
+      });
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [isConnected, topicKey]);
+
+  useEffect(() => {
+    if (lastMessage && topics.includes(lastMessage.topic)) {
+      handlerRef.current(lastMessage);
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [lastMessage, topicKey]);
+
+  return isConnected;
+};
+
+/**
+ * Refresh queries when events arrive on the given topics instead of polling.
+ * Returns the `refetchInterval` to pass to useQuery: disabled while connected,
+ * a slow poll as fallback while the WebSocket is down.
+ */
+export const useLiveQueries = (topics: string[], queryKeys: QueryKey[]): number | false => {
+  const queryClient = useQueryClient();
+  const isConnected = useTopicEvents(topics, () => {
+    queryKeys.forEach(queryKey => {
+      // Let an in-flight fetch finish rather than restarting it for every event
+      queryClient.invalidateQueries({ queryKey }, { cancelRefetch: false });
+    });
+  });
+  return isConnected ? false : FALLBACK_REFETCH_INTERVAL;
+};
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useQuery } from '@tanstack/react-query';
 import { api } from '../../services/api';
+import { useLiveQueries } from '../../hooks/useLiveUpdates';
 import {
   Box,
   Typography,
@@ -143,18 +144,24 @@ const Database: React.FC = () => {
   
   
 
+  // Refresh when the database reports new documents or patients
+  const refetchInterval = useLiveQueries(
+    ['metrics', 'extraction_completed'],
+    [['database-status'], ['database-patients']]
+  );
+
   // Fetch real database data
   const { data: databaseStatusData, isLoading: statusLoading } = useQuery({
     queryKey: ['database-status'],
     queryFn: () => api.database.getStatistics(),
-    refetchInterval: 30000, // Refresh every 30 seconds
+    refetchInterval,
   });
 
   // Prefer real patients data from backend instead of enhanced_documents placeholder
   const { data: patientsData, isLoading: patientsLoading } = useQuery({
     queryKey: ['database-patients'],
     queryFn: () => api.database.getPatients({ limit: 100 }),
-    refetchInterval: 30000,
+    refetchInterval,
   });
 
   // Extract real data from API responses
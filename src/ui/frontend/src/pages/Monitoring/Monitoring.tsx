@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import {
   Box,
   Typography,
@@ -54,6 +54,8 @@ import {
   Notifications as NotificationsIcon,
 } from '@mui/icons-material';
 
+import { useTopicEvents } from '../../hooks/useLiveUpdates';
+
 const Monitoring: React.FC = () => {
   const [isSettingsDialogOpen, setIsSettingsDialogOpen] = useState(false);
   const [autoRefresh, setAutoRefresh] = useState(true);
@@ -66,22 +68,16 @@ const Monitoring: React.FC = () => {
     temperature: 42.1,
   });
 
-  // Simulate real-time updates
-  useEffect(() => {
-    if (!autoRefresh) return;
-    
-    const interval = setInterval(() => {
-      setSystemMetrics(prev => ({
-        cpu: Math.max(0, Math.min(100, prev.cpu + (Math.random() - 0.5) * 10)),
-        memory: Math.max(0, Math.min(100, prev.memory + (Math.random() - 0.5) * 5)),
-        disk: Math.max(0, Math.min(100, prev.disk + (Math.random() - 0.5) * 2)),
-        network: Math.max(0, Math.min(100, prev.network + (Math.random() - 0.5) * 8)),
-        temperature: Math.max(30, Math.min(80, prev.temperature + (Math.random() - 0.5) * 3)),
-      }));
-    }, refreshInterval * 1000);
-
-    return () => clearInterval(interval);
-  }, [autoRefresh, refreshInterval]);
+  // Live metrics pushed by the server's shared sampler (no per-tab polling)
+  useTopicEvents(autoRefresh ? ['system_metrics'] : [], (message) => {
+    const data = message.data || {};
+    setSystemMetrics(prev => ({
+      ...prev,
+      cpu: typeof data.cpu === 'number' ? data.cpu : prev.cpu,
+      memory: typeof data.memory === 'number' ? data.memory : prev.memory,
+      disk: typeof data.disk === 'number' ? data.disk : prev.disk,
+    }));
+  });
 
   const systemAlerts = [
     {
@@ -6,9 +6,11 @@ and the React frontend, consolidating all functionality into one application.
 """
 
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
@@ -16,26 +18,66 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, Response
 import uvicorn
-from fastapi.websockets import WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocket
 
 # Import the unified API router
 from api.main import create_api_router
+from api.realtime import serve_event_socket, publish_system_metrics, DASHBOARD_TOPICS
+from core.service_container import ServiceContainer, create_default_container
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_unified_app(config: Optional[object] = None) -> FastAPI:
-    """Create the unified FastAPI application."""
+def _preload_from_env() -> Optional[List[str]]:
+    """Services to preload from PRELOAD_SERVICES ("all", "none" or a comma-separated list)."""
+    value = os.getenv("PRELOAD_SERVICES", "all").strip().lower()
+    if value == "all":
+        return None
+    if value in ("", "none"):
+        return []
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def create_unified_app(
+    config: Optional[object] = None,
+    services: Optional[ServiceContainer] = None,
+    preload_services: Optional[List[str]] = None
+) -> FastAPI:
+    """
+    Create the unified FastAPI application.
+    
+    Args:
+        config: Configuration object
+        services: Service container shared by all requests (default services if None)
+        preload_services: Services to warm up in the background at startup;
+            None reads PRELOAD_SERVICES, an empty list disables preloading
+    """
     if config is None:
         config = object()
+    if preload_services is None:
+        preload_services = _preload_from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        container = services or create_default_container()
+        app.state.services = container
+        # Serve requests immediately; services still loading are built on first
+        # use. Readiness only waits for the preloaded services.
+        container.start_preload(preload_services)
+        metrics_publisher = asyncio.create_task(publish_system_metrics())
+        try:
+            yield
+        finally:
+            metrics_publisher.cancel()
+            await container.shutdown()
     
     app = FastAPI(
         title="Biomedical Text Agent - Unified System",
         description="Unified system for biomedical text processing and analysis",
         version="2.0.0",
         docs_url="/api/docs",
-        redoc_url="/api/redoc"
+        redoc_url="/api/redoc",
+        lifespan=lifespan
     )
 
     # Add middleware
@@ -56,31 +98,30 @@ def create_unified_app(config: Optional[object] = None) -> FastAPI:
     # Direct WebSocket endpoint for frontend
     @app.websocket("/api/v1/ws")
     async def websocket_endpoint(websocket: WebSocket):
-        """WebSocket endpoint for real-time updates."""
-        await websocket.accept()
-        try:
-            while True:
-                data = await websocket.receive_text()
-                # Echo back for now, can be extended for real-time updates
-                await websocket.send_text(f"Message received: {data}")
-        except WebSocketDisconnect:
-            pass
-        except Exception as e:
-            logger.error(f"WebSocket error: {e}")
+        """WebSocket endpoint pushing real-time events from the event bus."""
+        await serve_event_socket(websocket, DASHBOARD_TOPICS)
 
     # Health endpoint
     @app.get("/api/health")
     async def health() -> JSONResponse:
         return JSONResponse({"status": "ok", "service": "biomedical-text-agent"})
 
+    # Readiness endpoint: 503 until the preloaded services are constructed
+    @app.get("/api/ready")
+    async def ready(request: Request) -> JSONResponse:
+        readiness = request.app.state.services.readiness()
+        return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
     # System status endpoint
     @app.get("/api/v1/system/status")
-    async def system_status() -> JSONResponse:
+    async def system_status(request: Request) -> JSONResponse:
+        readiness = request.app.state.services.readiness()
         return JSONResponse({
-            "status": "operational",
+            "status": "operational" if readiness["ready"] else "starting",
             "service": "biomedical-text-agent",
             "version": "1.0.0",
-            "timestamp": "2024-01-01T00:00:00Z"
+            "timestamp": "2024-01-01T00:00:00Z",
+            "services": readiness["services"]
         })
 
     # Serve static frontend (React build) if present
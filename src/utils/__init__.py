@@ -8,8 +8,12 @@ This module provides common utilities:
 - Common algorithms
 """
 
-# Utility functions will be added here as needed
+from .startup_profiler import ImportTiming, StartupProfile, parse_importtime, profile_imports, format_report
 
 __all__ = [
-    # Utilities will be added here
+    'ImportTiming',
+    'StartupProfile',
+    'parse_importtime',
+    'profile_imports',
+    'format_report'
 ]
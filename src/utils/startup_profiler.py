@@ -0,0 +1,110 @@
+"""
+Import-time profiling for server startup.
+
+Runs ``python -X importtime`` against the application module in a fresh
+interpreter and reports the modules that contribute most to cold start.
+"""
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+@dataclass
+class ImportTiming:
+    """Timing of a single module import, in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+@dataclass
+class StartupProfile:
+    """Result of profiling the import of a module."""
+    target: str
+    total_seconds: float
+    timings: List[ImportTiming]
+    error: Optional[str] = None
+
+    def slowest(self, top: int = 20, by: str = "cumulative") -> List[ImportTiming]:
+        """Slowest modules by cumulative or self time."""
+        key = (lambda t: t.cumulative_us) if by == "cumulative" else (lambda t: t.self_us)
+        return sorted(self.timings, key=key, reverse=True)[:top]
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        output: stderr of an interpreter run with ``-X importtime``
+
+    Returns:
+        One timing per imported module, in import completion order
+    """
+    timings = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(ImportTiming(
+            module=module,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=max(0, (len(indent) - 1) // 2)
+        ))
+    return timings
+
+def profile_imports(target: str = "unified_app", src_path: Optional[Path] = None,
+                    timeout: float = 300) -> StartupProfile:
+    """
+    Import a module in a fresh interpreter and collect import timings.
+
+    Args:
+        target: Module to import
+        src_path: Directory added to the path of the profiled interpreter
+        timeout: Maximum seconds to wait for the import
+
+    Returns:
+        StartupProfile with timings of all imported modules
+    """
+    src_path = src_path or Path(__file__).parent.parent
+    code = f"import sys; sys.path.insert(0, {str(src_path)!r}); import {target}"
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, timeout=timeout, cwd=str(src_path)
+        )
+    except subprocess.TimeoutExpired:
+        return StartupProfile(target=target, total_seconds=timeout, timings=[],
+                              error=f"Import of {target} timed out after {timeout}s")
+
+    timings = parse_importtime(completed.stderr)
+    top_level = [t for t in timings if t.depth == 0]
+    total = sum(t.cumulative_us for t in top_level) / 1e6
+    error = None
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed"
+    return StartupProfile(target=target, total_seconds=total, timings=timings, error=error)
+
+def format_report(profile: StartupProfile, top: int = 20) -> str:
+    """Format a startup profile as a plain-text report."""
+    lines = [f"Startup import profile for '{profile.target}': {profile.total_seconds:.3f}s total"]
+    if profile.error:
+        lines.append(f"Error: {profile.error}")
+
+    lines.append("")
+    lines.append(f"Top {top} modules by cumulative import time:")
+    lines.append(f"{'cumulative':>12} {'self':>10}  module")
+    for timing in profile.slowest(top, by="cumulative"):
+        lines.append(f"{timing.cumulative_us / 1000:>10.1f}ms {timing.self_us / 1000:>8.1f}ms  {timing.module}")
+
+    lines.append("")
+    lines.append(f"Top {top} modules by self import time:")
+    for timing in profile.slowest(top, by="self"):
+        lines.append(f"{timing.self_us / 1000:>10.1f}ms  {timing.module}")
+    return "\n".join(lines)
@@ -166,28 +166,20 @@ class UnifiedSystemManager:
         try:
             logger.info("🚀 Starting unified working backend server...")
             
-            # Start the server using the unified working server module
-            server_script = self.project_root / "unified_working_server.py"
-            
-            if not server_script.exists():
-                logger.error(f"❌ Server script not found: {server_script}")
-                return False
-            
-            # Start server process
+            # Start the unified app; heavy services warm up in the background
+            # after the server is already answering health checks
             self.server_process = subprocess.Popen(
-                [sys.executable, str(server_script), 
+                [sys.executable, "-m", "uvicorn", "unified_app:create_unified_app", "--factory",
                  "--host", self.host, 
                  "--port", str(self.backend_port)],
+                cwd=str(self.src_path),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True
             )
             
-            # Wait for server to start and initialize all services
-            time.sleep(10)
-            
-            # Check if server is running
-            if self.server_process.poll() is None:
+            # Wait for the health endpoint instead of a fixed delay
+            if self.wait_for_backend():
                 logger.info(f"✅ Backend server started on {self.host}:{self.backend_port}")
                 return True
             else:
@@ -201,6 +193,31 @@ class UnifiedSystemManager:
             logger.error(f"❌ Failed to start backend server: {e}")
             return False
     
+    def wait_for_backend(self, timeout: float = 30.0, interval: float = 0.1) -> bool:
+        """Poll the backend health endpoint until it answers or the process exits."""
+        import urllib.request
+        
+        url = f"http://{self.host}:{self.backend_port}/api/health"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.server_process.poll() is not None:
+                return False
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return True
+            except OSError:
+                pass
+            time.sleep(interval)
+        return self.server_process.poll() is None
+    
+    def profile_startup(self, top: int = 20) -> str:
+        """Profile module import time of the unified app and return a report."""
+        from utils.startup_profiler import profile_imports, format_report
+        
+        profile = profile_imports("unified_app", src_path=self.src_path)
+        return format_report(profile, top=top)
+    
     def start_frontend_dev_server(self) -> bool:
         """Start the frontend development server."""
         try:
@@ -325,7 +342,7 @@ class UnifiedSystemManager:
             
             # Check backend health
             try:
-                response = requests.get(f"http://{self.host}:{self.backend_port}/health", timeout=5)
+                response = requests.get(f"http://{self.host}:{self.backend_port}/api/health", timeout=5)
                 if response.status_code == 200:
                     logger.info("✅ Backend health check passed")
                     return True
@@ -391,9 +408,17 @@ def main():
                        help="Backend server port")
     parser.add_argument("--frontend-port", type=int, default=3000, 
                        help="Frontend development server port")
+    parser.add_argument("--profile-startup", action="store_true",
+                       help="Report the slowest module imports of the unified app and exit")
+    parser.add_argument("--profile-top", type=int, default=20,
+                       help="Number of modules to list in the startup profile")
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        print(UnifiedSystemManager().profile_startup(top=args.profile_top))
+        return
+    
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
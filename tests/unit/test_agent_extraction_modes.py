@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-agent and combined extraction modes of the agent orchestrator.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from agents.orchestrator.segment_extractor import SegmentExtractor
+from benchmarks.agent_modes import AgentModeBenchmark
+from benchmarks.harness import BenchmarkDocument
+from core.base import ProcessingResult
+
+
+class FakeAgent:
+    def __init__(self, data, metadata=None):
+        self.data = data
+        self.metadata = metadata or {}
+        self.calls = 0
+
+    async def execute(self, task):
+        self.calls += 1
+        return ProcessingResult(success=True, data=dict(self.data), metadata=self.metadata)
+
+
+def _agents():
+    return {
+        "demographics": FakeAgent({"sex": 1, "age_of_onset": 2.0}),
+        "genetics": FakeAgent({"gene": "SURF1", "mutations": "c.312_321del"})
+    }
+
+
+def test_combined_mode_runs_only_needed_followups():
+    agents = _agents()
+    combined = FakeAgent(
+        {"sex": 1, "age_of_onset": 2.0, "gene": "SURF1", "mutations": "c.1A>G"},
+        metadata={"field_confidence": {"sex": 0.9, "age_of_onset": 0.9, "gene": 0.9, "mutations": 0.3},
+                  "missing_fields": []}
+    )
+    extractor = SegmentExtractor(agents, combined_agent=combined, mode="combined")
+
+    extraction = asyncio.run(extractor.extract("Patient 1 ...", "Patient 1"))
+
+    assert combined.calls == 1
+    assert agents["demographics"].calls == 0
+    assert extraction.followup_agents == ["genetics"]
+    # The low-confidence value is replaced, confident ones are kept
+    assert extraction.data["mutations"] == "c.312_321del"
+    assert extraction.data["sex"] == 1
+
+
+def test_combined_mode_follows_up_on_omitted_key_fields():
+    agents = _agents()
+    combined = FakeAgent({"gene": "SURF1", "mutations": "c.312_321del"},
+                         metadata={"field_confidence": {}, "missing_fields": ["sex", "age_of_onset"]})
+    extractor = SegmentExtractor(agents, combined_agent=combined, mode="combined")
+
+    extraction = asyncio.run(extractor.extract("Patient 1 ...", "Patient 1"))
+
+    assert extraction.followup_agents == ["demographics"]
+    assert extraction.data["age_of_onset"] == 2.0
+    assert agents["genetics"].calls == 0
+
+
+def test_mode_benchmark_reports_tokens_and_f1(tmp_path):
+    truth = tmp_path / "truth.csv"
+    truth.write_text(
+        "PMID,patient ID,sex,Age of onset,gene,mutations\n"
+        "111,1,f,3,SURF1,c.312_321del\n"
+        "111,2,m,5,NDUFS4,c.462delA\n"
+    )
+    documents = [BenchmarkDocument(
+        document_id="PMID111", source="abstract", pmid="111",
+        text="Patient 1 was a 3-year-old girl with SURF1 c.312_321del and seizures. "
+             "Patient 2 was a 5-year-old boy with NDUFS4 c.462delA and ataxia."
+    )]
+
+    per_agent, combined = AgentModeBenchmark(documents, ground_truth_file=truth).run()
+
+    assert combined.segments == per_agent.segments == 2
+    assert combined.requests < per_agent.requests
+    assert combined.total_tokens < per_agent.total_tokens
+    assert set(combined.field_metrics) == set(per_agent.field_metrics) == {"sex", "age_of_onset", "gene", "mutations"}
+    assert combined.field_metrics["gene"]["f1"] == 1.0
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared single-pass pre-annotation of patient text.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from agents.extraction_agents.genetics_agent import GeneticsAgent
+from processors.annotated_document import annotate
+
+CASE = ("Patient 1 was a 3-year-old girl with autosomal recessive Leigh syndrome. "
+        "She presented with muscular hypotonia and seizures at the age of 14 months! "
+        "Sequencing of the SURF1 gene revealed c.845C>T (p.Ser282Leu) and c.312_321del. "
+        "Lactate was 4.5 mmol/L and brain MRI showed bilateral lesions")
+
+
+def test_single_pass_collects_tokens_sentences_and_spans():
+    doc = annotate(CASE)
+
+    assert [CASE[start:end] for start, end in doc.tokens[:4]] == ["Patient", "1", "was", "a"]
+    assert len(doc.sentences) == 4
+    assert CASE[slice(*doc.sentences[1])].endswith("14 months!")
+
+    assert doc.gene_mentions() == ["SURF1"]
+    # Full HGVS notation; "845C>T" nested in "c.845C>T" is not a separate variant
+    assert doc.texts("variant") == ["c.845C>T", "p.Ser282Leu", "c.312_321del"]
+    assert doc.texts("inheritance") == ["autosomal recessive"]
+    assert doc.texts("hpo", lower=True) == ["muscular hypotonia", "seizures"]
+    assert doc.texts("lab_value") == ["4.5 mmol/L"]
+    assert doc.texts("imaging", lower=True) == ["brain mri"]
+    assert doc.ages()[0] == 3.0 and abs(doc.ages()[1] - 14 / 12) < 1e-9
+    for span in doc.get("variant"):
+        assert CASE[span.start:span.end] == span.text
+
+
+def test_gene_mentions_are_case_insensitive_and_upper_cased():
+    text = ("A homozygous Surf1 mutation and a variant in gene Pdha1 were found; "
+            "the GK gene was normal. The family declined testing of the other genes.")
+
+    assert annotate(text).gene_mentions() == ["SURF1", "PDHA1", "GK"]
+    assert GeneticsAgent(llm_client=None)._extract_genetic_hints(text)["genes"] == ["SURF1", "PDHA1", "GK"]
+
+
+def test_annotation_is_computed_once_per_text():
+    annotate.cache_clear()
+
+    assert annotate(CASE) is annotate(CASE)
+    assert annotate.cache_info().hits == 1
+
+
+def test_agents_and_scorer_share_the_annotation():
+    from agents.extraction_agents.demographics_agent import DemographicsAgent
+    from metadata_triage.concept_scorer import ConceptDensityScorer
+
+    genetics = GeneticsAgent(llm_client=None)
+    hints = genetics._extract_genetic_hints(CASE)
+    assert hints["genes"] == ["SURF1"]
+    assert "c.845C>T" in hints["mutations"]
+
+    enhanced = genetics._enhance_with_regex({"gene": None, "mutations": None, "inheritance": None}, CASE)
+    assert enhanced["gene"] == "SURF1"
+    assert enhanced["inheritance"] == "autosomal recessive"
+
+    assert DemographicsAgent(llm_client=None).extract_age_from_text(CASE) == 3.0
+
+    concepts = ConceptDensityScorer()._extract_basic_hpo_concepts(CASE)
+    assert {concept.concept_name for concept in concepts} == {"hypotonia", "seizures"}
+    for concept in concepts:
+        assert CASE[concept.start_pos:concept.end_pos].lower() == concept.matched_text
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for in-memory quota counters and batched writes in APIUsageTracker.
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.api_usage_tracker import APIUsageRecord, APIUsageTracker
+
+
+def _record(provider: str = "openrouter", success: bool = True) -> APIUsageRecord:
+    return APIUsageRecord(
+        timestamp=time.time(), api_provider=provider, model="test-model",
+        prompt_tokens=10, completion_tokens=5, total_tokens=15, cost=0.001, success=success
+    )
+
+
+def test_quota_counters_are_immediate_and_writes_are_batched(tmp_path):
+    tracker = APIUsageTracker(str(tmp_path / "usage.db"), batch_size=100, flush_interval=5.0)
+
+    start = time.perf_counter()
+    for i in range(1000):
+        tracker.record_request(_record(success=i % 10 != 0))
+        tracker.check_daily_limit("openrouter", 5000)
+    elapsed = time.perf_counter() - start
+
+    assert tracker.check_daily_limit("openrouter", 1000) == (False, 1000, 0)
+    assert tracker.check_monthly_limit("openrouter", 5000) == (True, 1000, 4000)
+    assert tracker.check_daily_limit("other", 10) == (True, 0, 10)
+    assert elapsed < 1.0
+
+    stats = tracker.get_usage_stats("openrouter", days=1)
+    assert stats.total_requests == 1000
+    assert stats.failed_requests == 100
+    tracker.close()
+
+
+def test_counters_rehydrate_from_daily_summaries(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    tracker = APIUsageTracker(db_path, batch_size=7, flush_interval=0.01)
+    for _ in range(20):
+        tracker.record_request(_record())
+    tracker.close()
+
+    with sqlite3.connect(db_path) as conn:
+        summary = conn.execute(
+            "SELECT total_requests, total_tokens FROM usage_summaries WHERE period_type = 'day'"
+        ).fetchall()
+    assert summary == [(20, 300)]
+
+    restored = APIUsageTracker(db_path)
+    assert restored.check_daily_limit("openrouter", 100) == (True, 20, 80)
+
+
+def test_legacy_usage_rows_are_summarized_on_startup(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    APIUsageTracker(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO api_usage (timestamp, api_provider, model, total_tokens, cost, success) "
+            "VALUES (?, 'openrouter', 'm', 10, 0.0, 1)",
+            [(time.time(),)] * 3 + [(time.time() - 400 * 86400,)]
+        )
+        conn.execute("DELETE FROM usage_summaries")
+
+    tracker = APIUsageTracker(db_path)
+    assert tracker.check_daily_limit("openrouter", 10)[1] == 3
+    assert tracker.check_monthly_limit("openrouter", 10)[1] == 3
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent article store and incremental metadata triage.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from metadata_triage.article_store import ArticleStore, get_article_key
+from metadata_triage.abstract_classifier import ClassificationResult, StudyType, ClinicalRelevance
+from metadata_triage.metadata_orchestrator import MetadataOrchestrator
+
+
+def _article(pmid):
+    abstract = {
+        "1": "We report a case of Leigh syndrome with a SURF1 mutation and seizures.",
+        "2": "A child with MT-ATP6 variant presented with ataxia and developmental delay.",
+        "3": "Two siblings with NDUFS4 deficiency developed hypotonia and lactic acidosis.",
+    }[pmid]
+    return SimpleNamespace(
+        pmid=pmid, title=f"Case {pmid}", abstract=abstract, authors=f"Author {pmid}",
+        journal="J Test", pub_date="2024", doi=None, pmc_link=None
+    )
+
+
+class FakePubMedClient:
+    """Returns a fixed article list and records the date filters used."""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.calls = []
+
+    def fetch_articles_by_query(self, **kwargs):
+        self.calls.append(kwargs)
+        return list(self.articles)
+
+
+class CountingClassifier:
+    """Classifier stub that counts how many abstracts it classified and fails on given PMIDs."""
+
+    def __init__(self, fail_on=()):
+        self.calls = 0
+        self.fail_on = set(fail_on)
+
+    async def classify_abstract(self, title, abstract, pmid):
+        self.calls += 1
+        if pmid in self.fail_on:
+            return ClassificationResult(
+                study_type=StudyType.OTHER,
+                is_case_report=False,
+                clinical_relevance=ClinicalRelevance.LOW,
+                patient_count=0,
+                confidence_score=0.0,
+                reasoning="rate limited",
+                extracted_features={},
+                failed=True
+            )
+        return ClassificationResult(
+            study_type=StudyType.CASE_REPORT,
+            is_case_report=True,
+            clinical_relevance=ClinicalRelevance.HIGH,
+            patient_count=1,
+            confidence_score=0.9,
+            reasoning="stub",
+            extracted_features={}
+        )
+
+
+def _orchestrator(store, articles, fail_on=()):
+    orchestrator = MetadataOrchestrator(llm_client=None, article_store=store)
+    orchestrator.pubmed_client = FakePubMedClient(articles)
+    orchestrator.abstract_classifier = CountingClassifier(fail_on)
+    return orchestrator
+
+
+def test_article_key_prefers_pmid():
+    """PMID is used as key before DOI."""
+    assert get_article_key({'pmid': '123', 'doi': '10.1/X'}) == "pmid:123"
+    assert get_article_key({'pmid': '', 'doi': '10.1/X'}) == "doi:10.1/x"
+    assert get_article_key({}) is None
+
+
+def test_partition_detects_changes(tmp_path):
+    """Only new, edited or other-version articles need processing."""
+    store = ArticleStore(str(tmp_path / "store.db"))
+    doc = {'pmid': '1', 'title': 'T', 'abstract': 'A'}
+    store.upsert_article(doc, None, None, query="q")
+
+    changed, unchanged = store.partition_documents([doc, {'pmid': '2', 'title': 'T2'}])
+    assert [d['pmid'] for d in changed] == ['2']
+    assert [d['pmid'] for d in unchanged] == ['1']
+
+    changed, _ = store.partition_documents([{**doc, 'abstract': 'edited'}])
+    assert len(changed) == 1
+
+    newer = ArticleStore(str(tmp_path / "store.db"), pipeline_version="2")
+    changed, _ = newer.partition_documents([doc])
+    assert len(changed) == 1
+    assert len(newer.get_stale_documents("q")) == 1
+
+
+def test_incremental_rerun_only_processes_new_articles(tmp_path):
+    """A re-run classifies only new articles but ranks the full set."""
+    store = ArticleStore(str(tmp_path / "store.db"))
+    query = "Leigh syndrome case report"
+
+    first = _orchestrator(store, [_article("1"), _article("2")])
+    result = asyncio.run(first.run_complete_pipeline(
+        query=query, include_europepmc=False,
+        output_dir=str(tmp_path / "run1"), save_intermediate=False, incremental=True
+    ))
+    assert first.abstract_classifier.calls == 2
+    assert first.pubmed_client.calls[0]['date_from'] is None
+    assert len(result['final_results']) == 2
+
+    second = _orchestrator(store, [_article("2"), _article("3")])
+    result = asyncio.run(second.run_complete_pipeline(
+        query=query, include_europepmc=False,
+        output_dir=str(tmp_path / "run2"), save_intermediate=False, incremental=True
+    ))
+    assert second.abstract_classifier.calls == 1
+    assert second.pubmed_client.calls[0]['date_from'] is not None
+    assert result['incremental_stats']['unchanged_documents'] == 1
+    assert sorted(result['final_results']['PMID']) == ['1', '2', '3']
+
+
+def test_failed_classification_is_retried_on_rerun(tmp_path):
+    """A failed classification is stored but processed again on the next run."""
+    store = ArticleStore(str(tmp_path / "store.db"))
+    query = "Leigh syndrome case report"
+    articles = [_article("1"), _article("2")]
+
+    first = _orchestrator(store, articles, fail_on={"2"})
+    asyncio.run(first.run_complete_pipeline(
+        query=query, include_europepmc=False,
+        output_dir=str(tmp_path / "run1"), save_intermediate=False, incremental=True
+    ))
+
+    second = _orchestrator(store, articles)
+    result = asyncio.run(second.run_complete_pipeline(
+        query=query, include_europepmc=False,
+        output_dir=str(tmp_path / "run2"), save_intermediate=False, incremental=True
+    ))
+    assert second.abstract_classifier.calls == 1
+    assert result['incremental_stats']['unchanged_documents'] == 1
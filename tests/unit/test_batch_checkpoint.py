@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for append-only checkpoints and resume of batch classification and scoring.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.base import ProcessingResult
+from metadata_triage.abstract_classifier import AbstractClassifier, CHECKPOINT_FILENAME
+from metadata_triage.checkpoint import JSONLCheckpoint
+from metadata_triage.concept_scorer import ConceptDensityScorer
+
+ARTICLES = [
+    {"pmid": str(pmid), "title": f"Case {pmid}",
+     "abstract": f"Patient {pmid} with a SURF1 mutation presented with seizures and hypotonia."}
+    for pmid in range(1, 7)
+]
+
+
+class FakeLLMClient:
+    """LLM stub that fails or crashes on given titles and records the classified ones."""
+
+    def __init__(self, fail_on=(), crash_on=()):
+        self.fail_on = set(fail_on)
+        self.crash_on = set(crash_on)
+        self.classified = []
+
+    async def generate(self, prompt, system_prompt=None, temperature=None, max_tokens=None, **kwargs):
+        title = next(f"Case {pmid}" for pmid in range(1, 7) if f"Title: Case {pmid}\n" in prompt)
+        if title in self.crash_on:
+            raise KeyboardInterrupt
+        if title in self.fail_on:
+            return ProcessingResult(success=False, error="rate limited")
+        self.classified.append(title.split()[1])
+        return ProcessingResult(success=True, data=json.dumps({
+            "study_type": "case_report", "is_case_report": True, "clinical_relevance": "high",
+            "patient_count": 1, "confidence_score": 0.9, "reasoning": f"llm {title}"
+        }))
+
+
+class CountingScorer(ConceptDensityScorer):
+    """Concept scorer that records the scored PMIDs."""
+
+    def __init__(self):
+        super().__init__()
+        self.scored = []
+
+    def calculate_concept_density(self, text, title="", pmid=None):
+        self.scored.append(pmid)
+        return super().calculate_concept_density(text, title, pmid)
+
+
+def test_failed_and_unfinished_classifications_are_retried_on_resume(tmp_path):
+    client = FakeLLMClient(fail_on={"Case 2"}, crash_on={"Case 4"})
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(AbstractClassifier(client).classify_batch(ARTICLES, batch_size=2, output_dir=str(tmp_path)))
+    assert client.classified == ["1", "3"]
+    checkpointed = [json.loads(line)["pmid"] for line in (tmp_path / CHECKPOINT_FILENAME).read_text().splitlines()]
+    assert checkpointed == ["1", "3"]
+
+    client = FakeLLMClient()
+    results = asyncio.run(AbstractClassifier(client).classify_batch(
+        ARTICLES, batch_size=2, output_dir=str(tmp_path), resume=True))
+
+    assert client.classified == ["2", "4", "5", "6"]
+    assert [r.reasoning for r in results] == [f"llm Case {pmid}" for pmid in range(1, 7)]
+    assert not any(r.failed for r in results)
+    final = json.loads(next(tmp_path.glob("classification_final_*.json")).read_text())
+    assert sorted(item["pmid"] for item in final) == [str(pmid) for pmid in range(1, 7)]
+
+
+def test_final_export_only_contains_this_runs_articles_once(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    with JSONLCheckpoint(str(path)) as checkpoint:
+        for pmid, value in (("1", 1), ("2", 2), ("1", 3), ("9", 9)):
+            checkpoint.append(pmid, {"value": value})
+
+        count = checkpoint.export_json(str(tmp_path / "final.json"), pmids={"1", "2"})
+
+    assert count == 2
+    final = json.loads((tmp_path / "final.json").read_text())
+    assert sorted((item["pmid"], item["value"]) for item in final) == [("1", 3), ("2", 2)]
+
+
+def test_resume_requires_save_intermediate(monkeypatch):
+    from metadata_triage import metadata_orchestrator
+
+    monkeypatch.setattr(sys, "argv", ["metadata_orchestrator.py", "--query", "Leigh", "--resume"])
+    with pytest.raises(SystemExit) as exit_info:
+        metadata_orchestrator.main()
+    assert exit_info.value.code == 2
+
+
+def test_incomplete_last_record_is_discarded_on_resume(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    with JSONLCheckpoint(str(path)) as checkpoint:
+        checkpoint.append("1", {"value": 1})
+    with open(path, "a") as f:
+        f.write('{"pmid": "2", "res')
+
+    with JSONLCheckpoint(str(path), resume=True) as checkpoint:
+        assert checkpoint.completed() == {"1": {"value": 1}}
+        checkpoint.append("2", {"value": 2})
+
+    with JSONLCheckpoint(str(path), resume=True) as checkpoint:
+        assert checkpoint.completed() == {"1": {"value": 1}, "2": {"value": 2}}
+
+
+def test_resumed_scoring_rebuilds_scores_from_the_checkpoint(tmp_path):
+    first = CountingScorer().score_batch(ARTICLES[:3], output_dir=str(tmp_path))
+
+    scorer = CountingScorer()
+    results = scorer.score_batch(ARTICLES, output_dir=str(tmp_path), resume=True)
+
+    assert scorer.scored == ["4", "5", "6"]
+    assert results[:3] == first
+    final = json.loads(next(tmp_path.glob("concept_scores_final_*.json")).read_text())
+    assert len(final) == 6 and final[0]["hpo_concept_count"] == len(first[0].hpo_concepts)
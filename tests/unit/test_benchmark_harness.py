@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the extraction benchmark harness and mock LLM server.
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import httpx
+
+from benchmarks import (
+    BenchmarkDocument,
+    BenchmarkHarness,
+    BenchmarkResultsDB,
+    MockLLMServer,
+    compare_runs
+)
+
+CASE_TEXT = (
+    "Patient 1 was a 4-month-old girl with SURF1 c.312_321del mutation who developed seizures. "
+    "Patient 2 was a 2-year-old boy with the same SURF1 variant and hypotonia."
+)
+
+
+def test_mock_server_is_deterministic():
+    """Identical requests get identical answers and are counted."""
+    payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": f"Extract.\nQ: {CASE_TEXT}\nA: "}]}
+    with MockLLMServer() as server:
+        first = httpx.post(f"{server.base_url}/chat/completions", json=payload).json()
+        second = httpx.post(f"{server.base_url}/chat/completions", json=payload).json()
+        usage = server.snapshot()
+
+    content = first["choices"][0]["message"]["content"]
+    assert content == second["choices"][0]["message"]["content"]
+    assert '"patient_label": "Patient 2"' in content and '"gene": "SURF1"' in content
+    assert usage.requests == 2
+    assert usage.total_tokens == 2 * first["usage"]["total_tokens"]
+
+
+def test_run_is_stored_and_regressions_flagged(tmp_path):
+    """A run records timings, tokens and F1; a worse candidate is flagged."""
+    truth = tmp_path / "truth.csv"
+    truth.write_text("PMID,patient ID,sex,Age of onset,gene\n1,P1,f,0.33,SURF1\n1,P2,m,2,SURF1\n")
+    db = BenchmarkResultsDB(tmp_path / "bench.db")
+    harness = BenchmarkHarness(
+        [BenchmarkDocument(document_id="PMID1", source="abstract", pmid="1", text=CASE_TEXT)],
+        ground_truth_file=truth,
+        results_db=db
+    )
+
+    run = harness.run(label="test")
+    assert run.failed_documents == 0
+    assert run.requests >= 1 and run.prompt_tokens > 0
+    assert {"segment", "extract", "normalize"} <= set(run.stage_totals)
+    assert run.field_metrics["sex"]["f1"] == 1.0
+    assert run.field_metrics["gene"]["f1"] == 1.0
+
+    stored = db.get_run("latest")
+    assert stored.run_id == run.run_id and stored.field_metrics == run.field_metrics
+
+    slower = replace(run, latency_p50=run.latency_p50 * 2 + 1, latency_p95=run.latency_p95 * 2 + 1,
+                     field_metrics={**run.field_metrics, "sex": {**run.field_metrics["sex"], "f1": 0.5}})
+    regressed = {c.metric for c in compare_runs(run, slower) if c.regressed}
+    assert regressed == {"latency_p50", "latency_p95", "f1.sex"}
+    assert not any(c.regressed for c in compare_runs(run, run))
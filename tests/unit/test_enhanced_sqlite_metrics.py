@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for materialized dashboard metrics in EnhancedSQLiteManager.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from database.enhanced_sqlite_manager import EnhancedSQLiteManager
+
+
+def _manager(tmp_path) -> EnhancedSQLiteManager:
+    return EnhancedSQLiteManager(db_path=str(tmp_path / "enhanced.db"), sqlite_manager=object())
+
+
+def test_counters_follow_writes(tmp_path):
+    """Inserts, status changes and deletes keep the counters equal to a full scan."""
+    manager = _manager(tmp_path)
+    doc_id = manager.create_enhanced_document("Case report", "Patient 1 ...")
+
+    async def scenario():
+        # Request IDs are per document and second, so use distinct documents
+        request_ids = [manager.create_extraction_request(f"{doc_id}_{i}", "full") for i in range(3)]
+        await manager.update_extraction_status(request_ids[0], "completed", processing_time=2.0)
+        await manager.update_extraction_status(request_ids[1], "failed", processing_time=40.0)
+        await manager.store_extraction_result(doc_id, "genetics", {"gene": "SURF1"})
+        await manager.update_processing_status(doc_id, "completed")
+
+        with manager._get_connection_sync() as conn:
+            conn.execute("DELETE FROM enhanced_extractions WHERE request_id = ?", (request_ids[2],))
+
+        metrics = await manager.get_system_metrics()
+        assert metrics["completed_extractions"] == 2
+        assert metrics["failed_extractions"] == 1
+        assert metrics["pending_extractions"] == 0
+        assert await manager.get_document_count() == 1
+        assert await manager.get_documents_processed_today() == 1
+        assert await manager.get_processing_success_rate() == 100.0
+        assert await manager.get_average_processing_time() == 21.0
+        assert await manager.get_active_extraction_count() == 0
+
+    asyncio.run(scenario())
+
+    histogram = manager.get_latency_histogram()
+    assert histogram["5"] == 1 and histogram["60"] == 1
+    assert manager.get_rollup("extractions_completed", "day") == 2
+    assert manager.get_metric_timeseries("extractions_failed", "minute")[-1]["value"] == 1
+
+
+def test_rebuild_matches_incremental_and_compaction(tmp_path):
+    """Backfilled rollups equal the trigger-maintained ones; compaction drops old minutes."""
+    manager = _manager(tmp_path)
+    doc_id = manager.create_enhanced_document("Series", "text")
+    with manager._get_connection_sync() as conn:
+        conn.executemany(
+            "INSERT INTO enhanced_extractions (request_id, document_id, extraction_type, status, processing_time) "
+            "VALUES (?, ?, 'full', ?, ?)",
+            [(f"req_{i}", doc_id, "completed" if i % 4 else "failed", float(i)) for i in range(200)]
+        )
+        rollups_before = conn.execute("SELECT * FROM metrics_rollups ORDER BY 1, 2, 3").fetchall()
+
+    counters_before = {k: v for k, v in manager.get_counters().items() if v}
+    manager.rebuild_metrics()
+    assert {k: v for k, v in manager.get_counters().items() if v} == counters_before
+    with manager._get_connection_sync() as conn:
+        assert conn.execute("SELECT * FROM metrics_rollups ORDER BY 1, 2, 3").fetchall() == rollups_before
+
+        old_minute = (datetime.utcnow() - timedelta(days=5)).strftime("%Y-%m-%dT%H:%M")
+        conn.execute("INSERT INTO metrics_rollups VALUES ('minute', ?, 'extractions_completed', 3)", (old_minute,))
+
+    assert manager.compact_metrics() == 1
+    assert manager.get_rollup("extractions_completed", "day") == 150
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the event bus and WebSocket server push.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from core.event_bus import EventBus
+from core.task_queue import DurableTaskQueue
+from api.realtime import serve_event_socket
+
+
+def test_coalescing_accumulation_and_backpressure():
+    """Pending events coalesce by key, deltas add up and the buffer is bounded."""
+    async def scenario():
+        bus = EventBus(max_pending=3)
+        subscription = bus.subscribe(["queue_depth", "metrics", "task_progress"])
+
+        for depth in range(5):
+            bus.publish("queue_depth", {"pending": depth}, coalesce_key="depth")
+        bus.publish("metrics", {"patients_stored": 2}, coalesce_key="db", accumulate=True)
+        bus.publish("metrics", {"patients_stored": 3}, coalesce_key="db", accumulate=True)
+        assert bus.publish("unrelated", {}) == 0
+
+        batch = await subscription.next_batch()
+        assert [e.data for e in batch] == [{"pending": 4}, {"patients_stored": 5}]
+
+        for i in range(5):
+            bus.publish("task_progress", {"i": i})
+        batch = await subscription.next_batch()
+        assert [e.data["i"] for e in batch] == [2, 3, 4]
+        assert subscription.dropped == 2
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_worker_thread(tmp_path):
+    """Task queue state changes published from another thread reach the subscriber."""
+    async def scenario():
+        bus = EventBus()
+        queue = DurableTaskQueue(db_path=str(tmp_path / "queue.db"), event_bus=bus)
+        subscription = bus.subscribe(["task_progress", "queue_depth"])
+
+        thread = threading.Thread(target=lambda: queue.enqueue("metadata_search", {"query": "x"}))
+        thread.start()
+        thread.join()
+
+        batch = await asyncio.wait_for(subscription.next_batch(), timeout=2)
+        by_topic = {e.topic: e.data for e in batch}
+        assert by_topic["task_progress"]["status"] == "pending"
+        assert by_topic["queue_depth"]["pending"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_websocket_subscribe_and_receive():
+    """Clients subscribe over the socket and receive published events."""
+    bus = EventBus()
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await serve_event_socket(websocket, bus=bus)
+
+    with TestClient(app).websocket_connect("/ws") as websocket:
+        websocket.send_text(json.dumps({"type": "subscribe", "data": {"topic": "extraction_completed"}}))
+        assert websocket.receive_json()["type"] == "subscription_confirmed"
+
+        bus.publish("extraction_completed", {"document_id": "doc1"})
+        message = websocket.receive_json()
+        assert message["topic"] == "extraction_completed"
+        assert message["data"] == {"document_id": "doc1"}
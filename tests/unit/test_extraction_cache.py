@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the segment-level extraction cache used by LangExtractEngine.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+pytest.importorskip("langextract")
+
+from benchmarks.mock_llm import MockLLMServer
+from langextract_integration.extraction_cache import ExtractionCache
+from langextract_integration.extractor import LangExtractEngine
+
+CASE_TEXT = (
+    "Patient 1 was a 3-year-old girl with SURF1 c.312_321del who had seizures. "
+    "Patient 2 was a 5-year-old boy with NDUFS4 c.462delA and ataxia. "
+    "Patient 3 was a 2-year-old boy with MT-ATP6 m.8993T>G and lactic acidosis."
+)
+
+
+def _extract(engine: LangExtractEngine, text: str):
+    return engine.extract_from_text(text, extraction_passes=1, include_visualization=False)
+
+
+def _without_timestamp(record):
+    return {k: v for k, v in record.items() if k != "extraction_timestamp"}
+
+
+def test_cache_key_changes_with_every_input():
+    base = dict(prompt_description="p", examples=[{"a": 1}], model_id="m", extraction_passes=1)
+    key = ExtractionCache.make_key("text", **base)
+
+    assert key == ExtractionCache.make_key("text", **base)
+    assert key != ExtractionCache.make_key("text!", **base)
+    for name, value in [("prompt_description", "q"), ("examples", [{"a": 2}]),
+                        ("model_id", "n"), ("extraction_passes", 2)]:
+        assert key != ExtractionCache.make_key("text", **{**base, name: value})
+
+
+def test_rerun_is_served_from_cache_and_renormalized(tmp_path):
+    with MockLLMServer() as server:
+        engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                   api_base=server.base_url, cache_dir=tmp_path)
+        first = _extract(engine, CASE_TEXT)
+        requests_after_first = server.snapshot().requests
+
+        # A fresh engine (e.g. after a normalizer change) reuses the stored raw extractions
+        engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                   api_base=server.base_url, cache_dir=tmp_path)
+        second = _extract(engine, CASE_TEXT)
+
+        assert server.snapshot().requests == requests_after_first
+    assert first["extraction_metadata"]["cache"]["segments_extracted"] == 3
+    assert second["extraction_metadata"]["cache"]["segments_from_cache"] == 3
+    assert second["original_extractions"] == first["original_extractions"]
+    assert [_without_timestamp(r) for r in second["normalized_data"]] == \
+        [_without_timestamp(r) for r in first["normalized_data"]]
+    assert engine.extraction_cache.get_stats()["hits"] == 3
+
+
+def test_editing_one_paragraph_reextracts_only_that_segment(tmp_path):
+    with MockLLMServer() as server:
+        engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                   api_base=server.base_url, cache_dir=tmp_path)
+        _extract(engine, CASE_TEXT)
+        requests_before = server.snapshot().requests
+
+        edited = CASE_TEXT.replace("and ataxia", "and dystonia")
+        result = _extract(engine, edited)
+
+        assert server.snapshot().requests == requests_before + 1
+    cache_stats = result["extraction_metadata"]["cache"]
+    assert cache_stats["segments_from_cache"] == 2
+    assert cache_stats["segments_extracted"] == 1
+    # Cached intervals are still mapped onto the full text
+    for extraction in result["original_extractions"]:
+        interval = extraction.get("char_interval")
+        if interval:
+            assert edited[interval["start_pos"]:interval["end_pos"]] == extraction["extraction_text"]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for background extraction jobs and the job API.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.extraction_jobs import ExtractionJobManager, JobState
+from core.event_bus import EventBus
+from core.service_container import ServiceContainer
+
+
+class BlockingEngine:
+    """Reports progress and waits for the test before finishing."""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+
+    def extract_from_text(self, text, progress_callback=None, **options):
+        progress_callback("segment", 0.05)
+        self.release.wait(5)
+        progress_callback("extract", 0.9)
+        return {"text": text, "options": options}
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _client(manager: ExtractionJobManager) -> TestClient:
+    from api.simple_endpoints import extraction_router
+
+    container = ServiceContainer()
+    container.provide("extraction_jobs", manager)
+    app = FastAPI()
+    app.state.services = container
+    app.include_router(extraction_router, prefix="/extraction")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+
+def test_extract_returns_202_and_server_stays_responsive():
+    release = threading.Event()
+    manager = ExtractionJobManager(max_workers=1, engine_factory=lambda: BlockingEngine(release),
+                                   event_bus=EventBus())
+    client = _client(manager)
+
+    response = client.post("/extraction/extract", json={"text": "Patient 1 ...", "extraction_passes": 1})
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["location"].endswith(f"/extraction/jobs/{job['job_id']}")
+
+    assert _wait_for(lambda: client.get(f"/extraction/jobs/{job['job_id']}").json()["stage"] == "segment")
+    assert client.get("/health").status_code == 200
+    assert client.get(f"/extraction/jobs/{job['job_id']}/result").status_code == 409
+
+    release.set()
+    assert _wait_for(lambda: manager.get(job["job_id"]).state == JobState.COMPLETED)
+    result = client.get(f"/extraction/jobs/{job['job_id']}/result").json()
+    assert result["options"] == {"extraction_passes": 1, "segment_patients": True}
+    manager.shutdown()
+
+
+def test_cancel_queued_and_running_jobs():
+    release = threading.Event()
+    manager = ExtractionJobManager(max_workers=1, engine_factory=lambda: BlockingEngine(release),
+                                   event_bus=EventBus())
+    client = _client(manager)
+
+    running = client.post("/extraction/extract", json={"text": "a"}).json()["job_id"]
+    queued = client.post("/extraction/extract", json={"text": "b"}).json()["job_id"]
+    assert _wait_for(lambda: manager.get(running).state == JobState.RUNNING)
+
+    assert client.delete(f"/extraction/jobs/{queued}").json()["state"] == JobState.CANCELLED
+    client.delete(f"/extraction/jobs/{running}")
+    release.set()
+    assert _wait_for(lambda: manager.get(running).state == JobState.CANCELLED)
+    assert client.delete("/extraction/jobs/unknown").status_code == 404
+    manager.shutdown()
+
+
+def test_pending_limit_and_result_retention():
+    release = threading.Event()
+    release.set()
+    manager = ExtractionJobManager(max_workers=1, max_pending=1, max_retained=2,
+                                   engine_factory=lambda: BlockingEngine(release), event_bus=EventBus())
+
+    job_ids = []
+    for i in range(4):
+        job_ids.append(manager.submit(f"text {i}").job_id)
+        assert _wait_for(lambda: manager.get(job_ids[-1]).finished)
+
+    assert [manager.get(job_id) is not None for job_id in job_ids] == [False, False, True, True]
+    assert manager.get(job_ids[-1]).text == ""
+
+    release.clear()
+    manager.submit("slow")
+    client = _client(manager)
+    assert client.post("/extraction/extract", json={"text": "refused"}).status_code == 429
+    release.set()
+    manager.shutdown()
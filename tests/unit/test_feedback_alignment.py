@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for patient alignment and metrics in the feedback loop.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import pandas as pd
+
+from core.feedback_loop import FeedbackLoop
+
+GROUND_TRUTH = Path(__file__).parent.parent.parent / "data" / "ground_truth" / "full-Items.csv"
+
+
+def test_missed_patient_does_not_shift_alignment(tmp_path):
+    """A missed patient only affects its own comparison."""
+    feedback = FeedbackLoop(storage_path=str(tmp_path))
+    ground_truth = [
+        {"patient ID": "P1", "sex": "f", "Age of onset": 0.5, "gene": "NDUFAF2", "seizures": "yes"},
+        {"patient ID": "P2", "sex": "m", "Age of onset": 2.0, "gene": "NDUFAF2", "seizures": "no"},
+        {"patient ID": "P3", "sex": "f", "Age of onset": 4.0, "gene": "NDUFAF2", "seizures": "yes"},
+    ]
+    predictions = [
+        {"patient_id": "Patient 3", "gender": "female", "onset_age": 4, "gene_symbol": "NDUFAF2", "seizures": "yes"},
+        {"patient_id": "Patient 1", "gender": "female", "onset_age": 0.5, "gene_symbol": "NDUFAF2", "seizures": "yes"},
+    ]
+
+    result = feedback.compare_predictions(predictions, ground_truth)
+
+    seizures = result.field_metrics["seizures"]
+    assert (seizures.correct_predictions, seizures.total_ground_truth) == (2, 3)
+    assert seizures.precision == 1.0
+    assert result.successful_records == 2
+    assert result.total_records == 3
+
+
+def test_extra_patient_counts_as_extra_prediction(tmp_path):
+    """Predictions matching no ground truth patient are reported as extra."""
+    feedback = FeedbackLoop(storage_path=str(tmp_path))
+    ground_truth = [{"patient_id": "1", "sex": "m", "gene": "SURF1", "outcome": "alive"}]
+    predictions = [
+        {"patient_id": "7", "sex": "f", "gene": "ECHS1", "outcome": "dead"},
+        {"patient_id": "1", "sex": "m", "gene": "SURF1", "outcome": "alive"},
+    ]
+
+    metrics = feedback.compare_predictions(predictions, ground_truth).field_metrics["outcome"]
+    assert metrics.correct_predictions == 1
+    assert metrics.extra_predictions == 1
+    assert metrics.recall == 1.0 and metrics.precision == 0.5
+
+
+def test_shuffled_ground_truth_round_trip(tmp_path):
+    """Shuffled ground truth with a dropped patient realigns exactly, quickly."""
+    feedback = FeedbackLoop(storage_path=str(tmp_path))
+    ground_truth = pd.read_csv(GROUND_TRUTH, dtype=object).to_dict("records")
+    predictions = [dict(record) for record in ground_truth]
+    del predictions[3]
+    random.Random(0).shuffle(predictions)
+
+    started = time.perf_counter()
+    result = feedback.compare_predictions(predictions, ground_truth)
+    assert time.perf_counter() - started < 10
+
+    aligned_predictions, aligned_truth = feedback._align_records(predictions, ground_truth)
+    assert sum(p == t for p, t in zip(aligned_predictions, aligned_truth)) == len(predictions)
+    assert result.successful_records == len(predictions)
+    assert all(m.precision == 1.0 for m in result.field_metrics.values() if m.total_predictions)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for batched and micro-batched generation in HuggingFaceClient.
+
+Uses a tiny randomly initialised GPT-2 with an in-memory word-level
+tokenizer, so no model download is needed.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from core.llm_client.huggingface_client import _STOP, GenerationBatcher, HuggingFaceClient, HuggingFaceResponse
+
+
+@pytest.fixture(scope="module")
+def client():
+    words = ["<pad>", "<eos>", "<unk>", "System:", "User:", "Assistant:"] + [f"w{i}" for i in range(100)]
+    vocab = {word: i for i, word in enumerate(words)}
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab=vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, eos_token="<eos>", pad_token="<pad>", unk_token="<unk>"
+    )
+
+    torch.manual_seed(0)
+    config = transformers.GPT2Config(vocab_size=len(vocab), n_positions=128, n_embd=32, n_layer=2, n_head=2,
+                                     bos_token_id=1, eos_token_id=1, pad_token_id=0)
+    model = transformers.GPT2LMHeadModel(config).eval()
+
+    client = HuggingFaceClient.from_model(model, tokenizer, model_name="tiny-gpt2", max_batch_size=4)
+    yield client
+    client.unload_model()
+
+
+def _messages(n: int):
+    return [{"role": "user", "content": " ".join(f"w{(n + i) % 100}" for i in range(n % 7 + 1))}]
+
+
+def test_batch_matches_single_generation_and_counts_tokens(client):
+    conversations = [_messages(n) for n in range(5)]
+    batched = client.generate_batch(conversations, temperature=0, max_tokens=6)
+    single = [client.generate(messages, temperature=0, max_tokens=6) for messages in conversations]
+
+    assert [r.content for r in batched] == [r.content for r in single]
+    for response, messages in zip(batched, conversations):
+        prompt = client._messages_to_prompt(messages)
+        assert response.usage["prompt_tokens"] == len(client.tokenizer(prompt)["input_ids"])
+        assert response.usage["completion_tokens"] <= 6
+        assert response.usage["batch_size"] == 5
+
+
+def test_concurrent_requests_are_micro_batched_off_loop(client):
+    async def run():
+        return await asyncio.gather(*[
+            client.agenerate(_messages(n), temperature=0, max_tokens=4) for n in range(8)
+        ])
+
+    responses = asyncio.run(run())
+    expected = client.generate_batch([_messages(n) for n in range(8)], temperature=0, max_tokens=4)
+
+    assert [r.content for r in responses] == [r.content for r in expected]
+    assert max(r.usage["batch_size"] for r in responses) > 1
+    assert all(r.usage["batch_size"] <= 4 for r in responses)
+
+
+class GatedClient:
+    """Fake client whose batches wait for a gate and echo the prompts."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def generate_batch(self, conversations, **kwargs):
+        self.gate.wait(5)
+        return [HuggingFaceResponse(content=messages[0]["content"], model="fake", usage={})
+                for messages in conversations]
+
+
+def test_cancelled_requests_do_not_stop_the_worker():
+    fake = GatedClient()
+    batcher = GenerationBatcher(fake, max_batch_size=4, max_wait=0.05)
+
+    # Cancelled while queued behind a running batch
+    busy = batcher.submit(_messages(0))
+    time.sleep(0.1)
+    cancelled, kept = batcher.submit(_messages(1)), batcher.submit(_messages(2))
+    assert cancelled.cancel()
+    fake.gate.set()
+    assert busy.result(timeout=5).content == _messages(0)[0]["content"]
+    assert kept.result(timeout=5).content == _messages(2)[0]["content"]
+
+    # Timed out by its caller while its batch is generating
+    fake.gate.clear()
+
+    async def run():
+        timed_out = asyncio.wait_for(asyncio.wrap_future(batcher.submit(_messages(3))), timeout=0.2)
+        other = asyncio.wrap_future(batcher.submit(_messages(4)))
+        with pytest.raises(asyncio.TimeoutError):
+            await timed_out
+        fake.gate.set()
+        return await asyncio.wait_for(other, timeout=5)
+
+    assert asyncio.run(run()).content == _messages(4)[0]["content"]
+    assert batcher.submit(_messages(5)).result(timeout=5).content == _messages(5)[0]["content"]
+
+    # A dead worker is restarted by the next request
+    batcher._queue.put(_STOP)
+    batcher._thread.join(timeout=5)
+    assert batcher.submit(_messages(6)).result(timeout=5).content == _messages(6)[0]["content"]
+    batcher.close()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel segment extraction and per-call provider configuration
+in LangExtractEngine.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+pytest.importorskip("langextract")
+
+from benchmarks.mock_llm import MockLLMServer
+from langextract_integration.extractor import LangExtractEngine
+
+CASE_TEXT = (
+    "Patient 1 was a 3-year-old girl with SURF1 c.312_321del who had seizures. "
+    "Patient 2 was a 5-year-old boy with NDUFS4 c.462delA and ataxia. "
+    "Patient 3 was a 2-year-old boy with MT-ATP6 m.8993T>G and lactic acidosis. "
+    "Patient 4 was a 1-year-old girl with PDHA1 c.787C>G and hypotonia."
+)
+
+
+def _engine(server: MockLLMServer) -> LangExtractEngine:
+    return LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock", api_base=server.base_url,
+                            enable_cache=False)
+
+
+def test_segments_run_in_parallel_without_touching_environment(monkeypatch):
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    with MockLLMServer(latency=0.3) as server:
+        engine = _engine(server)
+        # The first call pays one-off provider and prompt setup
+        engine.extract_from_text(CASE_TEXT, extraction_passes=1, max_workers=4, include_visualization=False)
+        result = engine.extract_from_text(CASE_TEXT, extraction_passes=1, max_workers=4)
+
+    # Four segments with 0.3s of latency each, extracted concurrently
+    assert server.snapshot().requests == 8
+    assert result["extraction_metadata"]["stage_timings"]["extract"] < 4 * 0.3
+    assert "OPENAI_BASE_URL" not in os.environ
+
+    extractions = result["original_extractions"]
+    assert len(extractions) == 4
+    starts = [e["char_interval"]["start_pos"] for e in extractions]
+    assert starts == sorted(starts) and starts[-1] > 0
+    assert "Visualization Error" not in result["visualization_html"]
+
+
+def test_concurrent_engines_use_their_own_endpoints():
+    with MockLLMServer() as first, MockLLMServer() as second:
+        engines = [_engine(first), _engine(second)] * 3
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(
+                lambda engine: engine.extract_from_text(CASE_TEXT, extraction_passes=1, max_workers=2),
+                engines
+            ))
+
+    assert first.snapshot().requests == second.snapshot().requests == 12
+    assert all(len(result["original_extractions"]) == 4 for result in results)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for cheap-model-first cascade routing.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.base import ProcessingResult
+from core.llm_client.cascade import CascadeLLMClient, CascadeStage
+from metadata_triage.abstract_classifier import AbstractClassifier, StudyType
+
+
+class ScriptedClient:
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    async def generate(self, prompt, system_prompt=None, temperature=None, max_tokens=None, **kwargs):
+        answer = self.answers[min(self.calls, len(self.answers) - 1)]
+        self.calls += 1
+        return ProcessingResult(success=True, data=json.dumps(answer))
+
+
+def test_cascade_escalates_only_uncertain_answers():
+    cheap = ScriptedClient({"gene": "SURF1", "confidence": 0.9}, {"gene": "SURF1", "confidence": 0.3})
+    strong = ScriptedClient({"gene": "SURF1", "confidence": 0.95})
+    cascade = CascadeLLMClient([CascadeStage("small", cheap), CascadeStage("large", strong)])
+
+    first = asyncio.run(cascade.generate("easy"))
+    second = asyncio.run(cascade.generate("hard"))
+
+    assert first.metadata["cascade"] == {"stage": "small", "escalations": []}
+    assert second.metadata["cascade"]["stage"] == "large"
+    assert strong.calls == 1
+    stats = cascade.get_stats()
+    assert stats["small"]["escalation_rate"] == 0.5
+    assert stats["small"]["escalation_reasons"]["low_confidence"] == 1
+    assert stats["large"]["accepted"] == 1
+
+
+def test_classifier_escalates_answers_outside_its_schema():
+    valid = {"study_type": "case_report", "is_case_report": True, "clinical_relevance": "high",
+             "patient_count": 1, "confidence_score": 0.9, "reasoning": "", "extracted_features": {}}
+    cheap = ScriptedClient({**valid, "study_type": "anecdote"})
+    strong = ScriptedClient(valid)
+    cascade = CascadeLLMClient([CascadeStage("small", cheap), CascadeStage("large", strong)])
+    classifier = AbstractClassifier(cascade)
+
+    result = asyncio.run(classifier.classify_abstract("A case", "We report a 3-year-old girl.", "1"))
+
+    assert result.study_type == StudyType.CASE_REPORT
+    assert strong.calls == 1
+    # The classifier's view shares the cascade's statistics
+    assert cascade.get_stats()["small"]["escalation_reasons"]["invalid"] == 1
+
+
+def test_langextract_cascade_records_stage_statistics(tmp_path):
+    pytest.importorskip("langextract")
+    from benchmarks.mock_llm import MockLLMServer
+    from langextract_integration.extractor import LangExtractEngine
+
+    text = ("Patient 1 was a 3-year-old girl with SURF1 c.312_321del who had seizures. "
+            "Patient 2 was a 5-year-old boy with NDUFS4 c.462delA and ataxia.")
+    with MockLLMServer() as server:
+        engine = LangExtractEngine(model_id="gpt-4o", openrouter_api_key="mock", api_base=server.base_url,
+                                   enable_cache=False, cascade_model_ids=["gpt-4o-mini"])
+        result = engine.extract_from_text(text, extraction_passes=1, include_visualization=False)
+
+    cascade = result["extraction_metadata"]["cascade"]
+    # Grounded extractions from the cheap model are kept
+    assert cascade["gpt-4o-mini"]["calls"] == 2
+    assert cascade["gpt-4o-mini"]["escalated"] == 0
+    assert cascade["gpt-4o"]["calls"] == 0
+    assert result["original_extractions"]
+
+
+def test_langextract_cascade_drops_stages_remapped_to_the_same_model():
+    pytest.importorskip("langextract")
+    from langextract_integration.extractor import LangExtractEngine
+
+    # Under OpenRouter both open-weight ids are remapped to gpt-4o-mini
+    engine = LangExtractEngine(model_id="gpt-4o", openrouter_api_key="key", enable_cache=False,
+                               cascade_model_ids=["google/gemma-2-9b-it", "meta-llama/llama-3.1-8b-instruct"])
+    assert engine.cascade_model_ids == ["meta-llama/llama-3.1-8b-instruct"]
+
+    engine = LangExtractEngine(model_id="google/gemma-2-27b-it", openrouter_api_key="key", enable_cache=False,
+                               cascade_model_ids=["gpt-4o-mini", "ollama:llama3.2"])
+    assert engine.cascade_model_ids == ["ollama:llama3.2"]
+    assert engine.cascade_stats.snapshot().keys() == {"ollama:llama3.2", "google/gemma-2-27b-it"}
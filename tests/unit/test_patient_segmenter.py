@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass patient segmentation.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from processors.patient_segmenter import PatientSegmenter
+
+
+CASE_SERIES = (
+    "Patient 1 was a 4-year-old boy who presented with seizures and lactic acidosis. "
+    "MRI showed bilateral basal ganglia lesions.\n\n"
+    "Patient 2 was a 7-month-old girl with hypotonia. "
+    "She was diagnosed with Leigh syndrome and treated with thiamine.\n"
+)
+
+
+def test_explicit_markers_yield_offset_spans():
+    """Spans carry trimmed offsets into the source text."""
+    segmenter = PatientSegmenter(min_segment_length=20)
+    spans = segmenter.find_spans(CASE_SERIES)
+
+    assert [s.patient_id for s in spans] == ["Patient 1", "Patient 2"]
+    assert all(s.method == "explicit_markers" for s in spans)
+    assert spans[0].text(CASE_SERIES).startswith("Patient 1 was")
+    assert spans[0].text(CASE_SERIES).endswith("lesions.")
+    assert spans[1].end == len(CASE_SERIES.rstrip())
+    assert spans[1].marker(CASE_SERIES) == "Patient 2"
+
+
+def test_strategy_fallback_order():
+    """Sections are used when there are no explicit markers, narrative last."""
+    segmenter = PatientSegmenter(min_segment_length=10)
+    sections = "Results\n\n3.1 First family had affected siblings.\n3.2 Second family had one child.\n"
+    spans = segmenter.find_spans(sections)
+    assert [s.patient_id for s in spans] == ["Patient 3.1", "Patient 3.2"]
+    assert spans[0].text(sections).startswith("3.1")
+
+    narrative = "A 5-year-old boy developed ataxia. A 3-year-old girl developed dystonia."
+    spans = segmenter.find_spans(narrative)
+    assert [s.method for s in spans] == ["narrative_based", "narrative_based"]
+
+
+def test_process_and_shared_simple_segmentation():
+    """PatientSegmenter.process and the simple LangExtract path share one scanner."""
+    segmenter = PatientSegmenter(min_segment_length=20)
+    segments = segmenter.process(SimpleNamespace(content=CASE_SERIES, title="Series"))
+    assert [s.patient_id for s in segments] == ["Patient 1", "Patient 2"]
+    assert segments[1].content == CASE_SERIES[segments[1].start_position:segments[1].end_position]
+
+    single = segmenter.process(SimpleNamespace(content="No patient markers here " * 10))
+    assert single[0].metadata["method"] == "single_document"
+
+    assert segmenter.segment_patients("short text") == ["short text"]
+
+
+def test_labeled_spans_ignore_supplementary_references():
+    """Table S1/Figure S2 are not patients, repeated labels do not split, short segments merge."""
+    text = (
+        "Patient 1 was a 4-year-old boy with seizures (Table S1). His MRI is shown in Figure S2 "
+        "and the variant in S3. In case a relapse occurred, thiamine was restarted.\n\n"
+        "Patient 2 was a 7-month-old girl with hypotonia. Unlike Patient 1, she had no seizures, "
+        "and her brain MRI was normal (Figure S4).\n"
+        "Case 3 see above.\n"
+    )
+    segmenter = PatientSegmenter(min_segment_length=60)
+
+    assert len(segmenter.find_spans(text, strategies=("explicit",), min_length=1)) > 2
+    spans = segmenter.find_labeled_spans(text)
+    assert [s.patient_id for s in spans] == ["Patient 1", "Patient 2"]
+    assert "relapse" in spans[0].text(text)
+    assert spans[1].text(text).endswith("Case 3 see above.")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for page-parallel PDF parsing and the parse cache.
+"""
+
+import sys
+from pathlib import Path
+
+import fitz
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from processors.pdf_parser import PDFParser
+
+
+def _make_pdf(path, pages=12):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Patient {i + 1} presented with seizures on page {i + 1}.")
+    doc.set_metadata({"title": "Case series"})
+    doc.save(str(path))
+    doc.close()
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Page-parallel extraction yields the same document as serial extraction."""
+    pdf_path = tmp_path / "series.pdf"
+    _make_pdf(pdf_path)
+
+    serial = PDFParser(enable_cache=False, max_workers=1).process(str(pdf_path))
+    parallel = PDFParser(enable_cache=False, max_workers=3, parallel_page_threshold=2).process(str(pdf_path))
+
+    assert serial.success and parallel.success
+    assert parallel.data.content == serial.data.content
+    assert "Patient 12 presented" in parallel.data.content
+    assert parallel.data.metadata["pages"] == 12
+    assert parallel.data.title == "Case series"
+
+
+def test_cache_reuses_unchanged_files(tmp_path):
+    """A second parse of the same content hits the cache; options change the key."""
+    pdf_path = tmp_path / "series.pdf"
+    _make_pdf(pdf_path, pages=3)
+    cache_dir = tmp_path / "cache"
+
+    first = PDFParser(cache_dir=cache_dir).process(str(pdf_path))
+    second = PDFParser(cache_dir=cache_dir).process(str(pdf_path))
+    assert not first.metadata["cached"]
+    assert second.metadata["cached"]
+    assert second.data.content == first.data.content
+
+    other_options = PDFParser(cache_dir=cache_dir, preserve_formatting=False).process(str(pdf_path))
+    assert not other_options.metadata["cached"]
+    assert len(list(cache_dir.glob("*.json"))) == 2
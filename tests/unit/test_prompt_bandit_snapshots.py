@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for PromptOptimizer bandit snapshots and in-memory prompt selection.
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.prompt_optimization import ContextualBandit, PromptOptimizer
+
+
+def test_context_bonus_matches_mean_cosine_similarity():
+    bandit = ContextualBandit()
+    contexts = [[1.0, 0.0, 0.5], [0.2, 0.9, 0.0], [0.0, 0.0, 0.0], [0.3, 0.3, 0.3]]
+    for context in contexts:
+        bandit.update_reward("arm", 1.0, context)
+
+    current = np.array([0.5, 0.4, 0.1])
+    expected = np.mean([
+        0.0 if not np.linalg.norm(c) else np.dot(current, c) / (np.linalg.norm(current) * np.linalg.norm(c))
+        for c in contexts
+    ]) * 0.1
+
+    assert bandit._calculate_context_bonus("arm", current.tolist()) == pytest.approx(expected)
+    assert bandit.arms["arm"].plays == 4
+    assert bandit.arms["arm"].mean_reward == 1.0
+
+
+def test_selection_is_in_memory_and_usage_is_written_behind(tmp_path, monkeypatch):
+    optimizer = PromptOptimizer(storage_path=str(tmp_path))
+
+    def no_sqlite(*args, **kwargs):
+        raise AssertionError("prompt selection touched SQLite")
+
+    monkeypatch.setattr(sqlite3, "connect", no_sqlite)
+    selected = [optimizer.get_best_prompt("genetics") for _ in range(5)]
+    monkeypatch.undo()
+
+    assert all(prompt is not None for prompt in selected)
+    assert sum(p.usage_count for p in optimizer._get_available_prompts("genetics")) == 5
+
+    optimizer.update_prompt_performance(selected[-1].prompt_id, True, [1.0] + [0.0] * 9)
+    with sqlite3.connect(optimizer.db_path) as conn:
+        stored = conn.execute(
+            "SELECT SUM(usage_count) FROM prompt_variants WHERE agent_type = 'genetics'"
+        ).fetchone()[0]
+    assert stored == 5
+
+
+def test_bandit_state_restored_from_snapshots_and_legacy_history(tmp_path):
+    optimizer = PromptOptimizer(storage_path=str(tmp_path))
+    for i in range(3):
+        optimizer.update_prompt_performance("demographics_basic_default", i != 1, [1.0, float(i)])
+
+    # A row written without a snapshot (e.g. by an older version) is replayed once
+    with sqlite3.connect(optimizer.db_path) as conn:
+        conn.execute(
+            "INSERT INTO prompt_performance (prompt_id, context_features, reward, timestamp) VALUES (?, ?, ?, ?)",
+            ("genetics_basic_default", json.dumps([0.0, 1.0]), 1.0, "2024-01-01T00:00:00")
+        )
+
+    restored = PromptOptimizer(storage_path=str(tmp_path))
+    demographics = restored.bandit.arms["demographics_basic_default"]
+    assert demographics.plays == 3
+    assert demographics.reward_sum == 2.0
+    np.testing.assert_allclose(demographics.context_sum, optimizer.bandit.arms["demographics_basic_default"].context_sum)
+    assert restored.bandit.arms["genetics_basic_default"].plays == 1
+
+    with sqlite3.connect(restored.db_path) as conn:
+        watermark = conn.execute(
+            "SELECT last_performance_id FROM bandit_state WHERE prompt_id = 'genetics_basic_default'"
+        ).fetchone()[0]
+    assert watermark == 4
+    assert PromptOptimizer(storage_path=str(tmp_path)).bandit.arms["genetics_basic_default"].plays == 1
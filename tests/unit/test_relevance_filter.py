@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for section-aware input reduction and its offset map.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from processors.relevance_filter import RelevanceFilter
+
+ARTICLE = """Novel SURF1 variants in two siblings with Leigh syndrome
+Jane Doe, John Roe
+Department of Pediatrics, University of Somewhere, Somewhere. E-mail: jane@example.org
+
+Abstract
+We describe two siblings with Leigh syndrome caused by compound heterozygous SURF1 variants.
+
+1. Introduction
+Leigh syndrome is a progressive neurodegenerative disorder (Rahman et al., 1996). More than
+75 genes have been linked to it (Lake et al., 2016).
+
+2. Materials and Methods
+2.1 Sequencing
+DNA was extracted from peripheral blood and sequenced on an Illumina platform according to
+the manufacturer's protocol.
+
+3. Case presentation
+Patient 1 was a 3-year-old girl who presented with ataxia and seizures at the age of 14 months.
+Sequencing revealed c.312_321del and c.845C>T in SURF1.
+
+Patient 2, her brother, was born at term and presented with hypotonia at 8 months.
+
+4. Discussion
+Our patient 1 responded to thiamine at 20 mg/kg/day, whereas her brother did not.
+
+Acknowledgements
+We thank the family for their participation.
+
+References
+Rahman S, Blok RB, Dahl HH, et al. Leigh syndrome. Ann Neurol 1996;39:343-351.
+Lake NJ, Compton AG, Rahman S, Thorburn DR. Leigh syndrome. Ann Neurol 2016;79:190-203.
+"""
+
+
+def test_reduction_keeps_cases_and_drops_boilerplate():
+    reduced = RelevanceFilter(min_kept_chars=0).reduce(ARTICLE)
+
+    assert "Patient 1 was a 3-year-old girl" in reduced.text
+    assert "Patient 2, her brother" in reduced.text
+    assert "Our patient 1 responded to thiamine" in reduced.text
+    assert "We describe two siblings" in reduced.text
+    for dropped in ("Illumina", "Ann Neurol", "We thank the family", "E-mail", "(Lake et al., 2016)"):
+        assert dropped not in reduced.text
+    assert reduced.dropped_chars["drop"] > 0 and reduced.dropped_chars["methods"] > 0
+    assert 0.3 < reduced.reduction < 0.8
+
+    # Every kept span is a verbatim slice of the original document
+    for (start, end), reduced_start in zip(reduced.spans, reduced.reduced_starts):
+        assert reduced.text[reduced_start:reduced_start + end - start] == ARTICLE[start:end]
+    position = reduced.text.index("c.845C>T")
+    start, end = reduced.interval_to_original(position, position + len("c.845C>T"))
+    assert ARTICLE[start:end] == "c.845C>T"
+
+
+def test_text_without_sections_is_forwarded_unchanged():
+    abstract = ("A 5-year-old boy with NDUFS4 c.462delA presented with developmental regression. "
+                "MRI showed bilateral basal ganglia lesions.")
+
+    reduced = RelevanceFilter().reduce(abstract)
+
+    assert reduced.text == abstract
+    assert reduced.reduction == 0.0
+    assert reduced.interval_to_original(10, 20) == (10, 20)
+
+
+def test_langextract_grounding_points_into_the_original_text():
+    pytest.importorskip("langextract")
+    from benchmarks.mock_llm import MockLLMServer
+    from langextract_integration.extractor import LangExtractEngine
+
+    with MockLLMServer() as server:
+        engine = LangExtractEngine(model_id="gpt-4o-mini", openrouter_api_key="mock",
+                                   api_base=server.base_url, enable_cache=False)
+        engine.relevance_filter.min_kept_chars = 0
+        result = engine.extract_from_text(ARTICLE, extraction_passes=1, include_visualization=False)
+
+    reduction = result["extraction_metadata"]["input_reduction"]
+    assert reduction["reduced_chars"] < reduction["original_chars"]
+    grounded = [e for e in result["original_extractions"] if e.get("char_interval")]
+    assert grounded
+    for extraction in grounded:
+        interval = extraction["char_interval"]
+        assert ARTICLE[interval["start_pos"]:interval["end_pos"]] == extraction["extraction_text"]
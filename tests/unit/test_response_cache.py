@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for API response caching and conditional GET.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.response_cache import ResponseCache
+from api.caching import cached_response
+
+
+def _app(cache: ResponseCache, calls: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    @cached_response(ttl=60, tags=["items"], cache=cache)
+    async def get_items(limit: int = 10):
+        calls.append(limit)
+        return {"items": list(range(limit)), "keys": {1: "one"}}
+
+    return app
+
+
+def test_etag_and_conditional_get():
+    """Repeat requests are served from the cache and revalidate with 304."""
+    cache, calls = ResponseCache(), []
+    client = TestClient(_app(cache, calls))
+
+    first = client.get("/items", params={"limit": 3})
+    assert first.status_code == 200
+    assert first.json() == {"items": [0, 1, 2], "keys": {"1": "one"}}
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert client.get("/items", params={"limit": 3}, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items", params={"limit": 3},
+                      headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/items", params={"limit": 4}, headers={"If-None-Match": etag}).status_code == 200
+    assert calls == [3, 4]
+
+
+def test_invalidation_recomputes_and_keeps_validators():
+    """Invalidated entries are recomputed; an unchanged body keeps its ETag and Last-Modified."""
+    cache, calls = ResponseCache(), []
+    client = TestClient(_app(cache, calls))
+
+    first = client.get("/items")
+    assert cache.invalidate("items") == 1
+    assert cache.invalidate("other") == 0
+
+    second = client.get("/items", headers={"If-None-Match": first.headers["etag"]})
+    assert calls == [10, 10]
+    assert second.status_code == 304
+    assert second.headers["last-modified"] == first.headers["last-modified"]
+
+
+def test_direct_call_bypasses_cache():
+    """Handlers called from Python return their raw payload."""
+    from api.simple_endpoints import get_agents
+
+    agents = asyncio.run(get_agents())
+    assert isinstance(agents, dict) and agents["agents"]
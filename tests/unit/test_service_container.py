@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the application-scoped service container.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from fastapi.testclient import TestClient
+
+from core.service_container import ServiceContainer, ServiceState
+
+
+def test_service_constructed_once_under_concurrent_gets():
+    """Concurrent first requests share a single instance."""
+    container = ServiceContainer()
+    calls = []
+
+    def factory(c):
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    container.register("heavy", factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(container.get("heavy"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+    status = container.readiness()["services"]["heavy"]
+    assert status["state"] == ServiceState.READY
+    assert status["load_time"] is not None
+
+
+def test_failed_service_is_reported():
+    """A failing factory is recorded as failed and raises RuntimeError."""
+    container = ServiceContainer()
+
+    def broken(c):
+        raise ValueError("model missing")
+
+    container.register("broken", broken)
+    try:
+        container.get("broken")
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert "model missing" in str(e)
+
+    readiness = container.readiness()
+    assert readiness["ready"] is False
+    assert readiness["services"]["broken"]["state"] == ServiceState.FAILED
+
+
+def test_unified_app_preloads_and_reports_readiness():
+    """The app lifespan preloads services and exposes readiness."""
+    from unified_app import create_unified_app
+
+    container = ServiceContainer()
+    closed = []
+
+    class FakeManager:
+        def close(self):
+            closed.append(True)
+
+    container.register("sqlite_manager", lambda c: FakeManager())
+    app = create_unified_app(services=container, preload_services=["sqlite_manager"])
+
+    with TestClient(app) as client:
+        for _ in range(50):
+            if container.is_ready("sqlite_manager"):
+                break
+            time.sleep(0.01)
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert response.json()["services"]["sqlite_manager"]["state"] == ServiceState.READY
+
+        status = client.get("/api/v1/system/status").json()
+        assert status["status"] == "operational"
+        assert "sqlite_manager" in status["services"]
+
+    assert closed == [True]
+
+
+def test_readiness_ignores_lazy_services(monkeypatch):
+    """With a partial PRELOAD_SERVICES, services left to first use do not block readiness."""
+    from unified_app import create_unified_app
+
+    monkeypatch.setenv("PRELOAD_SERVICES", "sqlite_manager")
+    container = ServiceContainer()
+    container.register("sqlite_manager", lambda c: object())
+    container.register("vector_manager", lambda c: object())
+    app = create_unified_app(services=container)
+
+    with TestClient(app) as client:
+        for _ in range(50):
+            if container.is_ready("sqlite_manager"):
+                break
+            time.sleep(0.01)
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        services = response.json()["services"]
+        assert services["sqlite_manager"]["preload"] is True
+        assert services["vector_manager"] == {
+            "state": ServiceState.NOT_STARTED, "load_time": None, "error": None, "preload": False
+        }
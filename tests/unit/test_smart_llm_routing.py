@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for health-aware routing, circuit breakers and hedging in SmartLLMManager.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.base import ProcessingResult
+from core.llm_client.smart_llm_manager import SmartLLMManager
+
+
+class FakeClient:
+    def __init__(self, name, latency=0.0, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    async def generate(self, prompt, system_prompt=None, temperature=None, max_tokens=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            return ProcessingResult(success=False, error=f"{self.name} unavailable")
+        return ProcessingResult(success=True, data=f"answer from {self.name}")
+
+
+def test_failing_provider_opens_breaker_and_recovers_after_probe():
+    primary, fallback = FakeClient("primary", fail=True), FakeClient("fallback")
+    manager = SmartLLMManager(clients={"openrouter": primary, "ollama": fallback},
+                              hedge_requests=False, failure_threshold=2, reset_timeout=0.05)
+    manager.switch_provider("openrouter")
+
+    async def scenario():
+        results = [await manager.generate("prompt") for _ in range(4)]
+        assert all(result.success and result.metadata["provider"] == "ollama" for result in results)
+        # The breaker opened after two failures, later requests skip the pinned primary
+        assert primary.calls == 2
+        assert manager.get_provider_status()["openrouter"]["breaker"]["state"] == "open"
+
+        primary.fail = False
+        await asyncio.sleep(0.06)
+        assert await manager.probe_providers() == {"openrouter": "closed"}
+        result = await manager.generate("prompt")
+        await manager.stop_probing()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result.metadata["provider"] == "openrouter"
+    assert result.metadata["fallback_used"] is False
+
+
+def test_routing_prefers_the_faster_provider():
+    slow, fast = FakeClient("slow", latency=0.05), FakeClient("fast", latency=0.0)
+    manager = SmartLLMManager(clients={"openrouter": slow, "ollama": fast}, hedge_requests=False)
+    manager.stats["ollama"].record_success(0.001)
+
+    result = asyncio.run(manager.generate("prompt"))
+
+    assert result.data == "answer from fast"
+    assert slow.calls == 0
+
+
+def test_hedging_bounds_latency_of_a_degraded_provider():
+    degraded, backup = FakeClient("degraded", latency=1.0), FakeClient("backup", latency=0.01)
+    manager = SmartLLMManager(clients={"openrouter": degraded, "ollama": backup},
+                              hedge_requests=True, hedge_delay=0.05)
+
+    start = time.perf_counter()
+    result = asyncio.run(manager.generate("prompt"))
+    elapsed = time.perf_counter() - start
+
+    assert result.metadata["provider"] == "ollama"
+    assert result.metadata["hedged"] is True
+    assert elapsed < 0.5
+    # The cancelled attempt still informs the degraded provider's latency
+    assert manager.stats["openrouter"].abandoned == 1
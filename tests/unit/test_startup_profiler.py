@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy startup and import-time profiling.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from utils.startup_profiler import parse_importtime, format_report, StartupProfile
+
+SRC = Path(__file__).parent.parent.parent / "src"
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       5000 |   fastapi
+import time:      3000 |       8000 | unified_app
+"""
+
+
+def test_parse_importtime_and_report():
+    """Import timings are parsed with nesting depth and ranked."""
+    timings = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(t.module, t.depth) for t in timings] == [("_io", 2), ("fastapi", 1), ("unified_app", 0)]
+
+    profile = StartupProfile(target="unified_app", total_seconds=0.008, timings=timings)
+    assert profile.slowest(1)[0].module == "unified_app"
+    assert profile.slowest(1, by="self")[0].module == "unified_app"
+    assert "unified_app" in format_report(profile, top=2)
+
+
+def test_unified_app_import_does_not_load_ml_stack():
+    """Importing the server does not import torch, transformers or faiss."""
+    code = (
+        "import sys; import unified_app; "
+        "print(','.join(m for m in ('torch', 'transformers', 'sentence_transformers', 'faiss') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=str(SRC),
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for structured JSON output: repair parsing, provider JSON mode and targeted retries.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.base import ProcessingResult
+from core.llm_client.structured_output import generate_json, parse_json_response
+from metadata_triage.abstract_classifier import AbstractClassifier, StudyType
+
+
+class RecordingClient:
+    supports_response_format = True
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    async def generate(self, prompt, system_prompt=None, temperature=None, max_tokens=None, **kwargs):
+        self.calls.append({"prompt": prompt, **kwargs})
+        return ProcessingResult(success=True, data=self.answers[min(len(self.calls), len(self.answers)) - 1])
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ('Sure:\n```json\n{"gene": "SURF1", "genes": ["A", "B",],}\n```', {"gene": "SURF1", "genes": ["A", "B"]}),
+    ("{'sex': 1, 'alive': True, 'death': None}", {"sex": 1, "alive": True, "death": None}),
+    ('{"a": 1 "b": 2} and then {"noise": true}', {"a": 1, "b": 2}),
+    ('{"phenotypes": ["ataxia", "seiz', {"phenotypes": ["ataxia", "seiz"]}),
+])
+def test_repair_parser_recovers_common_malformations(answer, expected):
+    assert parse_json_response(answer) == expected
+
+
+def test_generate_json_uses_json_mode_and_retries_with_only_the_error():
+    schema = {"type": "object", "properties": {"gene": {"type": "string"}}, "required": ["gene"]}
+    client = RecordingClient("I could not find a gene.", '{"gene": "SURF1"}')
+
+    result = asyncio.run(generate_json(client, "LONG DOCUMENT " * 50, schema=schema))
+
+    assert result.success and result.data == {"gene": "SURF1"}
+    assert result.metadata["structured_output"]["retries"] == 1
+    assert client.calls[0]["response_format"]["json_schema"]["schema"] == schema
+    # The retry resends the broken answer and the error, not the document
+    assert "LONG DOCUMENT" not in client.calls[1]["prompt"]
+    assert "I could not find a gene." in client.calls[1]["prompt"]
+
+
+def test_classifier_repairs_answers_without_extra_calls():
+    client = RecordingClient(
+        "Here is the classification: {'study_type': 'case_report', 'is_case_report': True, "
+        "'clinical_relevance': 'high', 'patient_count': 1, 'confidence_score': 0.9,}"
+    )
+
+    result = asyncio.run(AbstractClassifier(client).classify_abstract("A case", "We report a girl.", "1"))
+
+    assert result.study_type == StudyType.CASE_REPORT
+    assert result.is_case_report is True
+    assert len(client.calls) == 1
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for PDF table extraction and table-to-patient mapping.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import fitz
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from processors.pdf_parser import PDFParser
+from agents.extraction_agents.patient_record_agent import FIELD_GROUPS
+from agents.orchestrator.enhanced_orchestrator import EnhancedExtractionOrchestrator
+from processors.patient_segmenter import PatientSegmenter
+from processors.table_mapper import TablePatientMapper, normalize_patient_key, parse_age_years
+
+
+ROWS = [
+    ["Patient", "Sex", "Age at onset", "Gene", "Variant"],
+    ["P1", "F", "2 y", "SURF1", "c.312del"],
+    ["P2", "M", "8 mo", "MT-ATP6", "m.8993T>G"],
+]
+
+
+def _make_table_pdf(path):
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 72
+    for row in ROWS:
+        x = 72
+        for cell in row:
+            page.draw_rect(fitz.Rect(x, y, x + 90, y + 20))
+            page.insert_text((x + 3, y + 14), cell, fontsize=9)
+            x += 90
+        y += 20
+    doc.save(str(path))
+    doc.close()
+
+
+def test_pdf_tables_map_to_patient_fields(tmp_path):
+    """Tables found by PyMuPDF become per-patient record fields."""
+    pdf_path = tmp_path / "series.pdf"
+    _make_table_pdf(pdf_path)
+
+    tables = PDFParser().extract_tables(pdf_path)
+    assert tables and tables[0]["rows"][0] == ROWS[0]
+
+    mapper = TablePatientMapper()
+    patients = mapper.map_tables(tables)
+    assert patients["1"]["gene"] == "SURF1"
+    assert patients["1"]["sex"] == 1
+    assert patients["2"]["age_of_onset"] == 0.67
+    # Agents still run for fields the table does not carry (ethnicity, zygosity, ...)
+    assert mapper.covered_agents(patients["2"], FIELD_GROUPS) == []
+    assert mapper.covered_agents(patients["2"], {"genetics": ("gene", "mutations")}) == ["genetics"]
+
+    parsed = PDFParser(enable_table_extraction=True, enable_cache=False).process(str(pdf_path))
+    assert len(parsed.data.metadata["tables"]) == 1
+
+
+def test_transposed_table_and_label_normalization():
+    """Tables with patients as columns are mapped too."""
+    rows = [
+        ["", "Patient 1", "Patient 2"],
+        ["Sex", "Male", "Female"],
+        ["Age at onset (years)", "1.5", "3"],
+        ["Brain MRI", "Basal ganglia lesions", "Normal"],
+    ]
+    patients = TablePatientMapper().map_tables([{"page": 3, "rows": rows}])
+    assert patients["1"]["sex"] == 0
+    assert patients["2"]["age_of_onset"] == 3.0
+    assert patients["1"]["mri_outcome"] == "Basal ganglia lesions"
+
+    assert normalize_patient_key("Case 2") == normalize_patient_key("P2") == "2"
+    assert parse_age_years("1y 6m") == 1.5
+
+
+def test_segments_match_table_rows_by_explicit_labels_only():
+    """Only segments opened by a named label pick up table rows; letter labels are upper case."""
+    assert normalize_patient_key("Patient B") == "B"
+    assert normalize_patient_key("case a") is None
+
+    segmenter = PatientSegmenter(min_segment_length=10)
+    labelled = segmenter.process(SimpleNamespace(
+        content="Patient 2 was a 4-year-old boy with ataxia.\n\nPatient 3 was a girl with seizures."))
+    narrative = segmenter.process(SimpleNamespace(
+        content="A 5-year-old boy developed ataxia. A 3-year-old girl developed dystonia."))
+
+    table_key = EnhancedExtractionOrchestrator._table_key
+    assert [table_key(segment) for segment in labelled] == ["2", "3"]
+    assert [segment.patient_id for segment in narrative] == ["Patient 1", "Patient 2"]
+    assert [table_key(segment) for segment in narrative] == [None, None]
+
+
+def test_numbered_variant_tables_are_not_patient_tables():
+    """Row numbers under generic headers are not patient labels."""
+    mapper = TablePatientMapper()
+    variants = [
+        ["No", "Variant", "Onset"],
+        ["1", "c.312del", "2 y"],
+        ["2", "c.845C>T", "8 mo"],
+    ]
+    assert mapper.map_tables([{"rows": variants}]) == {}
+    assert mapper.map_tables([{"rows": [["", "Variant", "Onset"]] + variants[1:]}]) == {}
+
+    prefixed = [["", "Variant", "Onset"], ["P1", "c.312del", "2 y"], ["Case 2", "c.845C>T", "8 mo"]]
+    assert sorted(mapper.map_tables([{"rows": prefixed}])) == ["1", "2"]
+
+
+def test_narrative_segment_and_patient_table_give_one_record():
+    """A narrative case report is the patient of its one-row table, not a second patient."""
+    segments = PatientSegmenter().process(SimpleNamespace(
+        content="A 3-year-old girl presented with muscular hypotonia, developmental regression and seizures "
+                "at 14 months. Brain MRI showed bilateral basal ganglia lesions and sequencing of SURF1 "
+                "found c.312del."))
+    table_records = TablePatientMapper().map_tables([{"rows": ROWS[:2]}])
+
+    assign = EnhancedExtractionOrchestrator._assign_table_rows
+    assert len(segments) == 1
+    assert assign(segments, table_records) == (["1"], [])
+
+    # Two narrative patients, one table row: no table-only duplicate either
+    two = PatientSegmenter(min_segment_length=10).process(SimpleNamespace(
+        content="A 5-year-old boy developed ataxia. A 3-year-old girl developed dystonia."))
+    assert assign(two, table_records) == ([None, None], [])
+
+    # Table patients beyond the text segments still get their own records
+    labelled = PatientSegmenter(min_segment_length=10).process(SimpleNamespace(
+        content="Patient 2 was a 4-year-old boy with ataxia and lactic acidosis."))
+    table_records = TablePatientMapper().map_tables([{"rows": ROWS}])
+    assert assign(labelled, table_records) == (["2"], ["1"])
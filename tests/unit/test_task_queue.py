@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable SQLite task queue.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.event_bus import EventBus
+from core.task_queue import DurableTaskQueue
+
+
+def test_priority_order_and_atomic_claim(tmp_path):
+    """Higher priority first, FIFO within a priority, each task claimed once."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("classify", {"n": 1}, priority=0, task_id="low")
+    queue.enqueue("classify", {"n": 2}, priority=3, task_id="urgent")
+    queue.enqueue("classify", {"n": 3}, priority=0, task_id="low-2")
+
+    claimed = [queue.claim("w1"), queue.claim("w2"), queue.claim("w1")]
+    assert [t.task_id for t in claimed] == ["urgent", "low", "low-2"]
+    assert claimed[0].payload == {"n": 2}
+    assert queue.claim("w2") is None
+
+    assert queue.complete("urgent", "w1")
+    assert not queue.complete("low", "w1")  # w2 holds that lease
+    assert queue.get_stats()["completed"] == 1
+
+
+def test_expired_lease_is_reclaimed_after_restart(tmp_path):
+    """A task held by a crashed worker becomes claimable after its lease expires."""
+    db_path = str(tmp_path / "queue.db")
+    DurableTaskQueue(db_path).enqueue("extract", task_id="t1")
+    assert DurableTaskQueue(db_path).claim("crashed", lease_seconds=0.05).task_id == "t1"
+
+    restarted = DurableTaskQueue(db_path)
+    assert restarted.claim("w2") is None
+    time.sleep(0.1)
+    task = restarted.claim("w2")
+    assert task.task_id == "t1"
+    assert task.attempts == 2
+
+
+def test_repeatedly_expired_lease_is_dead_lettered(tmp_path):
+    """A task whose worker keeps crashing is dead-lettered once its retries run out."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"), max_retries=1)
+    queue.enqueue("extract", task_id="poison", priority=1)
+    queue.enqueue("extract", task_id="t2")
+
+    assert queue.claim("crashed", lease_seconds=0.05).task_id == "poison"
+    time.sleep(0.1)
+    assert queue.claim("crashed", lease_seconds=0.05).attempts == 2
+    time.sleep(0.1)
+
+    assert queue.claim("w2").task_id == "t2"
+    dead = queue.get_dead_letters()
+    assert [t["task_id"] for t in dead] == ["poison"]
+    assert dead[0]["last_error"] == "Lease expired after 2 attempts"
+
+
+def test_retry_backoff_then_dead_letter(tmp_path):
+    """Failures are retried with backoff until retries run out."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"), max_retries=1, retry_base_delay=0.05)
+    queue.enqueue("score", task_id="t1")
+
+    queue.claim("w1")
+    assert queue.fail("t1", "w1", "boom") == "pending"
+    assert queue.claim("w1") is None  # still backing off
+    time.sleep(0.1)
+
+    assert queue.claim("w1").last_error == "boom"
+    assert queue.fail("t1", "w1", "boom again") == "dead"
+    assert [t["task_id"] for t in queue.get_dead_letters()] == ["t1"]
+
+    assert queue.requeue("t1")
+    assert queue.claim("w1").attempts == 1
+
+
+def test_waiting_worker_wakes_on_enqueue(tmp_path):
+    """A waiting worker is woken by enqueue rather than by polling."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"), idle_poll_interval=30)
+
+    async def run():
+        waiter = asyncio.create_task(queue.get("w1", timeout=5))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        queue.enqueue("classify", task_id="t1")
+        task = await waiter
+        return task, time.monotonic() - started
+
+    task, elapsed = asyncio.run(run())
+    assert task.task_id == "t1"
+    assert elapsed < 1
+
+
+def test_get_claims_off_the_event_loop(tmp_path):
+    """Blocking SQLite calls of get() run in worker threads."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("classify", task_id="t1")
+    claim_threads = []
+    claim = queue.claim
+    queue.claim = lambda *args: claim_threads.append(threading.current_thread()) or claim(*args)
+
+    task = asyncio.run(queue.get("w1", timeout=1))
+    assert task.task_id == "t1"
+    assert claim_threads and threading.main_thread() not in claim_threads
+
+
+def test_fail_only_applies_to_a_held_lease(tmp_path):
+    """A second fail of the same attempt does not reschedule or dead-letter it again."""
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"), max_retries=0)
+    queue.enqueue("score", task_id="t1")
+    queue.claim("w1")
+
+    assert queue.fail("t1", "w1", "boom") == "dead"
+    assert queue.fail("t1", "w1", "boom") == ""
+    assert queue.get_stats()["dead"] == 1
+
+
+def test_queue_depth_is_published_as_deltas(tmp_path):
+    """Depth events are per-state deltas summed by the bus, without counting queries."""
+    async def scenario():
+        bus = EventBus()
+        queue = DurableTaskQueue(str(tmp_path / "queue.db"), event_bus=bus)
+        subscription = bus.subscribe(["queue_depth"])
+        queue.get_stats = None  # a depth event must not query the table
+
+        queue.enqueue("classify", task_id="t1")
+        queue.enqueue("classify", task_id="t2")
+        queue.claim("w1")
+        queue.complete("t1", "w1")
+        queue.cancel("t2")
+
+        batch = await asyncio.wait_for(subscription.next_batch(), timeout=2)
+        assert [event.data for event in batch] == [
+            {"pending": 0, "leased": 0, "completed": 1, "cancelled": 1}
+        ]
+
+    asyncio.run(scenario())